@@ -0,0 +1,423 @@
+"""
+Headless Acquisition - Fatigue Tester Data Acquisition System
+Reads, parses and logs test data without the GUI (no Qt or pyqtgraph)
+
+Intended for long unattended tests on small lab PCs:
+
+    python acquire.py --port /dev/ttyUSB0 --out logs
+    python acquire.py --port COM3 --format binary --stats-interval 60
+    python acquire.py --mock --mock-interval 0.01 --duration 60
+
+With --serve it runs as the acquisition daemon: GUI viewers attach over a
+local socket (see acquisition_ipc) and may come and go, or freeze, without
+affecting reading and logging:
+
+    python acquire.py --port COM3 --serve
+"""
+
+import argparse
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, TextIO
+
+from config import SerialConfig, LogConfig, WatchdogConfig, BatchConfig, IpcConfig
+from data_parser import (DataParser, FatigueTestData, FRAME_VALID, FRAME_TEST_END,
+                         FRAME_ERROR_CODE, FRAME_INVALID, FRAME_MALFORMED, records_to_array)
+from serial_reader import SerialReader, MockSerialReader, drain_batches
+from process_reader import create_serial_reader
+from data_logger import DataLogger
+from acquisition_ipc import AcquisitionServer
+
+
+def _rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class HeadlessWatchdog:
+    """
+    Data reception watchdog on the monotonic clock
+
+    Polled by the acquisition loop instead of running a timer; while no data
+    arrives an alert is due once per timeout period, like the GUI watchdog.
+    Wall clock changes (NTP, daylight saving) cannot trigger or hide alerts.
+    """
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self.timeouts = 0
+        self.reset()
+
+    def reset(self, now: Optional[float] = None):
+        """Reset watchdog (call when data is received)"""
+        self.last_data_time = time.monotonic() if now is None else now
+        self._next_alert = self.last_data_time + self.timeout_seconds
+
+    def check(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Check if timeout has occurred
+
+        Returns:
+            Seconds since the last data if an alert is due, otherwise None
+        """
+        now = time.monotonic() if now is None else now
+        if now < self._next_alert:
+            return None
+        self._next_alert = now + self.timeout_seconds
+        self.timeouts += 1
+        return now - self.last_data_time
+
+
+class HeadlessAcquisition:
+    """
+    Reader, parser and logger pipeline without a GUI
+
+    The serial (or mock) reader thread fills the data queue as in the GUI;
+    the calling thread takes the place of the processing worker, parsing
+    each drained batch and handing it straight to the DataLogger. Between
+    batches it polls the watchdog, reconnects a serial port that failed and
+    prints a statistics line every stats_interval seconds.
+
+    With an IpcConfig it also serves viewers: each logged batch is streamed
+    to them, and attaching viewers get the records logged so far first.
+    """
+
+    def __init__(self, serial_config: SerialConfig, log_config: LogConfig, output_dir: str = "./logs",
+                 batch_config: Optional[BatchConfig] = None,
+                 watchdog_config: Optional[WatchdogConfig] = None,
+                 mock_interval: Optional[float] = None, stats_interval: float = 10.0,
+                 reconnect_interval: float = 5.0, out: Optional[TextIO] = None,
+                 ipc_config: Optional[IpcConfig] = None):
+        """
+        Initialize headless acquisition
+
+        Args:
+            serial_config: Serial configuration
+            log_config: Logging configuration
+            output_dir: Directory for log files
+            batch_config: Optional batching limits for queue handoff
+            watchdog_config: Optional watchdog configuration
+            mock_interval: Use the mock reader with this interval (seconds)
+                instead of the serial port
+            stats_interval: Seconds between statistics lines (0 = none)
+            reconnect_interval: Seconds between attempts to reopen a serial
+                port that failed during the test
+            out: Stream for status and statistics lines (default stdout)
+            ipc_config: Serve viewers on this local socket (None = no viewers)
+        """
+        self.serial_config = serial_config
+        self.batch_config = batch_config or BatchConfig()
+        self.mock_interval = mock_interval
+        self.stats_interval = stats_interval
+        self.reconnect_interval = reconnect_interval
+        self.out = out or sys.stdout
+
+        self.data_queue = queue.Queue()
+        self.parser = DataParser()
+        self.logger = DataLogger(log_config, output_dir=output_dir,
+                                 status_callback=self.log_error, event_callback=self.log_status)
+        self.watchdog = HeadlessWatchdog((watchdog_config or WatchdogConfig()).timeout_seconds)
+        self.serial_reader = None
+        self.server = AcquisitionServer(ipc_config) if ipc_config else None
+        self._stop_event = threading.Event()
+
+        # Statistics
+        self.records_received = 0
+        self.validation_errors = 0
+        self.test_errors = 0
+        self.reconnects = 0
+        self._start_time = 0.0
+        self._start_cpu = 0.0
+
+    def run(self, duration: Optional[float] = None) -> int:
+        """
+        Acquire and log until stop() is called or duration has passed
+
+        Args:
+            duration: Optional run time in seconds
+
+        Returns:
+            Exit code: 0 after a normal stop, 1 if the port (or the viewer
+            socket) could not be opened
+        """
+        if self.server:
+            try:
+                self.server.start()
+            except OSError as e:
+                self.log_error(f"Cannot serve viewers on port {self.server.config.port}: {e}")
+                return 1
+            statistics_interval = self.server.config.statistics_interval_ms / 1000.0
+            next_server_stats = 0.0
+
+        if not self._start_reader():
+            self.log_error("Failed to connect")
+            if self.server:
+                self.server.stop()
+            return 1
+
+        log_file = self.logger.start_new_log()
+        self.log_status(f"Logging to: {log_file}")
+
+        self._start_time = time.monotonic()
+        deadline = self._start_time + duration if duration else None
+        next_stats = self._start_time + self.stats_interval
+        next_reconnect = 0.0
+        self._start_cpu = time.process_time()
+        last_stats = (self._start_time, self._start_cpu, 0)
+        self.watchdog.reset(self._start_time)
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    lines = drain_batches(self.data_queue, self.batch_config.max_batch_size, timeout=0.1)
+                except queue.Empty:
+                    lines = []
+
+                now = time.monotonic()
+                if self.server:
+                    # Before logging the batch, so new viewers get it live and not in the history
+                    self.server.attach_pending(self.logger.data_store.records, self._viewer_info())
+
+                if lines:
+                    batch = self._process_lines(lines)
+                    if batch:
+                        self.watchdog.reset(now)
+                        self._log_batch(batch)
+
+                elapsed = self.watchdog.check(now)
+                if elapsed is not None:
+                    self.log_status(f"WARNING: No data received for {elapsed:.1f} seconds")
+
+                if self._reader_failed() and now >= next_reconnect:
+                    next_reconnect = now + self.reconnect_interval
+                    self._reconnect()
+
+                if self.stats_interval > 0 and now >= next_stats:
+                    next_stats = now + self.stats_interval
+                    last_stats = self._print_statistics(now, last_stats)
+
+                if self.server:
+                    for command in self.server.take_commands():
+                        self._handle_command(command)
+                    if now >= next_server_stats:
+                        next_server_stats = now + statistics_interval
+                        self.server.send_statistics(self._viewer_statistics())
+
+                if deadline is not None and now >= deadline:
+                    break
+        finally:
+            self._stop_reader()
+            # Frames still queued by the reader are logged before closing
+            while not self.data_queue.empty():
+                self._log_batch(self._process_lines(
+                    drain_batches(self.data_queue, self.batch_config.max_batch_size, 0)))
+            self.logger.close_log()
+            # Final line: averages over the whole run
+            self._print_statistics(time.monotonic(), (self._start_time, self._start_cpu, 0))
+            self.log_status("Acquisition stopped")
+            if self.server:
+                self.server.stop()
+
+        return 0
+
+    def stop(self):
+        """Ask the acquisition loop to finish (safe from signal handlers and other threads)"""
+        self._stop_event.set()
+
+    def _start_reader(self) -> bool:
+        """Create and start the serial or mock reader"""
+        if self.mock_interval is not None:
+            self.serial_reader = MockSerialReader(self.data_queue, interval=self.mock_interval,
+                                                  status_callback=self.log_status)
+            self.serial_reader.start()
+            return True
+
+        self.serial_reader = create_serial_reader(self.serial_config, self.data_queue,
+                                                  status_callback=self.log_status,
+                                                  batch_config=self.batch_config)
+        if not self.serial_reader.connect():
+            return False
+        self.serial_reader.start()
+        return True
+
+    def _stop_reader(self):
+        """Stop the reader thread and close the port"""
+        if self.serial_reader is None:
+            return
+        if isinstance(self.serial_reader, SerialReader):
+            self.serial_reader.disconnect()
+        else:
+            self.serial_reader.stop()
+        self.serial_reader.join(timeout=2.0)
+        self.serial_reader = None
+
+    def _reader_failed(self) -> bool:
+        """True if the serial reader thread ended on its own (port error)"""
+        return isinstance(self.serial_reader, SerialReader) and not self.serial_reader.is_alive()
+
+    def _reconnect(self):
+        """Reopen the serial port with a new reader thread"""
+        self._stop_reader()
+        if self._start_reader():
+            self.reconnects += 1
+            self.log_status(f"Reconnected to {self.serial_config.port}")
+
+    def _log_batch(self, batch: List[FatigueTestData]):
+        """Log a batch and stream it to the viewers"""
+        if not batch:
+            return
+        self.records_received += len(batch)
+        self.logger.log_batch(batch)
+        if self.server:
+            self.server.publish(records_to_array([data.to_record() for data in batch]))
+
+    def _viewer_info(self) -> dict:
+        """Daemon information sent to attaching viewers"""
+        return {'current_file': self.logger.current_filename,
+                'source': "mock" if self.mock_interval is not None else self.serial_config.port}
+
+    def _viewer_statistics(self) -> dict:
+        """Statistics sent to viewers: the logger's plus acquisition counters"""
+        return {**self.logger.get_statistics(), 'records_received': self.records_received,
+                'parse_errors': self.parser.parse_errors, 'viewers': self.server.viewer_count,
+                'up_seconds': time.monotonic() - self._start_time}
+
+    def _handle_command(self, command: dict):
+        """Run a command sent by a viewer"""
+        name = command.get('command')
+        if name == "capture_event":
+            self.logger.trigger_event(command.get('reason', "Manual trigger"))
+            self.log_status("Event capture triggered by a viewer")
+        elif name == "new_log":
+            self.logger.close_log()
+            self.logger.start_new_log()
+            self.log_status(f"Started new log: {self.logger.current_filename}")
+        else:
+            self.log_error(f"Unknown viewer command: {name}")
+
+    def _process_lines(self, lines: list) -> List[FatigueTestData]:
+        """Parse, validate and classify frames; returns the records to log"""
+        batch = []
+        for raw_data in lines:
+            parsed_data, frame_class = self.parser.parse_frame(raw_data)
+
+            # Fast path: valid DTA record without error code
+            if frame_class == FRAME_VALID:
+                batch.append(parsed_data)
+                continue
+            if frame_class & FRAME_MALFORMED:
+                continue
+
+            if frame_class & FRAME_INVALID:
+                self.validation_errors += 1
+                self.log_error(f"Validation error: {self.parser.validate_data(parsed_data)[1]}")
+
+            if frame_class & FRAME_TEST_END:
+                self.log_status("Test ended")
+
+            if frame_class & FRAME_ERROR_CODE:
+                self.test_errors += 1
+                self.log_error(f"Test error: {self.parser.get_error_description(parsed_data.error_code)}")
+
+            if not frame_class & FRAME_INVALID:
+                batch.append(parsed_data)
+        return batch
+
+    def _print_statistics(self, now: float, last_stats: tuple) -> tuple:
+        """
+        Print one statistics line covering the time since last_stats
+
+        Returns:
+            (monotonic time, process CPU time, records) for the next line
+        """
+        last_time, last_cpu, last_records = last_stats
+        cpu = time.process_time()
+        interval = max(now - last_time, 1e-9)
+        rate = (self.records_received - last_records) / interval
+        logger_stats = self.logger.get_statistics()
+        reader_stats = self.serial_reader.get_statistics() if isinstance(self.serial_reader, SerialReader) else {}
+        rss = _rss_mb()
+
+        self.log_status(
+            f"Up {now - self._start_time:.0f} s | Records: {self.records_received} ({rate:.1f}/s) | "
+            f"Written: {logger_stats['points_written']} | Queue: {logger_stats['queue_depth']} | "
+            f"Write errors: {logger_stats['write_errors']} | Parse errors: {self.parser.parse_errors} | "
+            f"Test errors: {self.test_errors} | Events: {logger_stats['events_captured']} | "
+            f"Watchdog: {self.watchdog.timeouts} | CPU: {(cpu - last_cpu) / interval * 100:.1f}%"
+            + (f" | RSS: {rss:.1f} MB" if rss is not None else "")
+            + (f" | Ring overruns: {reader_stats['frames_overrun']}" if 'frames_overrun' in reader_stats else ""))
+        return now, cpu, self.records_received
+
+    def log_status(self, message: str):
+        """Print a timestamped status line (and pass it to the viewers)"""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", file=self.out, flush=True)
+        if self.server:
+            self.server.send_text("status", message)
+
+    def log_error(self, message: str):
+        """Print a timestamped error line (and pass it to the viewers)"""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ERROR: {message}", file=self.out, flush=True)
+        if self.server:
+            self.server.send_text("error", message)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line options of the headless acquisition"""
+    parser = argparse.ArgumentParser(description="Fatigue tester data acquisition without GUI")
+    parser.add_argument("--port", default=SerialConfig.port, help="Serial port (default: %(default)s)")
+    parser.add_argument("--baudrate", type=int, default=SerialConfig.baudrate,
+                        help="Baud rate (default: %(default)s)")
+    parser.add_argument("--out", default="./logs", help="Log directory (default: %(default)s)")
+    parser.add_argument("--reader-process", action="store_true",
+                        help="Read the port in a separate process (shared-memory ring)")
+    parser.add_argument("--format", dest="log_format", default=LogConfig.log_format,
+                        choices=["csv", "binary", "both", "compressed"],
+                        help="Log file format (default: %(default)s)")
+    parser.add_argument("--log-every-cycles", type=int, default=LogConfig.log_every_cycles,
+                        help="Log the first record per this many cycles (default: %(default)s)")
+    parser.add_argument("--watchdog", type=float, default=WatchdogConfig.timeout_seconds,
+                        help="Seconds without data before a warning (default: %(default)s)")
+    parser.add_argument("--stats-interval", type=float, default=10.0,
+                        help="Seconds between statistics lines, 0 = none (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after this many seconds (default: run until interrupted)")
+    parser.add_argument("--mock", action="store_true", help="Use simulated data instead of the port")
+    parser.add_argument("--mock-interval", type=float, default=0.5,
+                        help="Seconds between simulated records (default: %(default)s)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as daemon that GUI viewers can attach to")
+    parser.add_argument("--ipc-port", type=int, default=IpcConfig.port,
+                        help="Local port for viewers with --serve (default: %(default)s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point; stops cleanly on Ctrl+C or SIGTERM"""
+    args = build_arg_parser().parse_args(argv)
+
+    acquisition = HeadlessAcquisition(
+        SerialConfig(port=args.port, baudrate=args.baudrate, reader_process=args.reader_process),
+        LogConfig(log_format=args.log_format, log_every_cycles=args.log_every_cycles),
+        output_dir=args.out,
+        watchdog_config=WatchdogConfig(timeout_seconds=args.watchdog),
+        mock_interval=args.mock_interval if args.mock else None,
+        stats_interval=args.stats_interval,
+        ipc_config=IpcConfig(port=args.ipc_port) if args.serve else None)
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: acquisition.stop())
+
+    return acquisition.run(duration=args.duration)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
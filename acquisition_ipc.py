@@ -0,0 +1,419 @@
+"""
+Acquisition IPC module - Local socket link between the acquisition daemon and viewers
+The daemon (acquire.py --serve) keeps reading and logging on its own; any
+number of GUI viewers attach and detach without affecting it
+
+Every message is a 4-byte type tag and a 32-bit payload length, followed
+by the payload. Records travel as raw RECORD_DTYPE bytes
+(RECORD_DTYPE.itemsize per record, no per-record encoding on either side):
+
+    HELO  daemon -> viewer  JSON: protocol version, record layout, history size
+    HIST  daemon -> viewer  History records, in chunks, right after HELO
+    LIVE  daemon -> viewer  One batch of live records
+    TEXT  daemon -> viewer  JSON: status or error message
+    STAT  daemon -> viewer  JSON: logger statistics
+    CMND  viewer -> daemon  JSON: command ("capture_event", "new_log")
+"""
+
+import json
+import queue
+import socket
+import struct
+import threading
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from config import IpcConfig
+from data_parser import RECORD_DTYPE, MONOTONIC_EPOCH_OFFSET_NS
+
+
+PROTOCOL_VERSION = 1
+MESSAGE_HEADER = struct.Struct('<4sI')  # Type tag, payload length
+
+
+def send_message(sock: socket.socket, kind: bytes, payload=b''):
+    """
+    Send one message
+
+    Args:
+        sock: Connected socket
+        kind: 4-byte type tag
+        payload: bytes, or a contiguous RECORD_DTYPE array (sent without copying)
+    """
+    if isinstance(payload, np.ndarray):
+        payload = np.ascontiguousarray(payload).view(np.uint8)
+    sock.sendall(MESSAGE_HEADER.pack(kind, len(payload)))
+    if len(payload):
+        sock.sendall(payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Tuple[bytes, bytearray]]:
+    """
+    Receive one message
+
+    Returns:
+        (type tag, payload), or None when the peer closed the connection
+    """
+    header = _recv_exact(sock, MESSAGE_HEADER.size)
+    if header is None:
+        return None
+    kind, length = MESSAGE_HEADER.unpack(header)
+    payload = _recv_exact(sock, length)
+    if payload is None:
+        return None
+    return kind, payload
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytearray]:
+    """Read exactly size bytes into a new buffer (None on end of stream)"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return buffer
+
+
+def _json(value) -> bytes:
+    return json.dumps(value).encode('utf-8')
+
+
+class _ViewerConnection:
+    """
+    One attached viewer on the daemon side
+
+    Messages wait in a bounded queue for a sender thread, so the daemon
+    never waits on a slow or frozen viewer; a second thread receives the
+    viewer's commands.
+    """
+
+    def __init__(self, sock: socket.socket, address, ipc_config: IpcConfig,
+                 on_command: Callable[[dict], None]):
+        self.sock = sock
+        self.address = address
+        self.chunk_rows = ipc_config.snapshot_chunk_rows
+        self.on_command = on_command
+        self.closed = False
+        self._queue = queue.Queue(ipc_config.max_pending_messages)
+        self._sender = threading.Thread(target=self._send_loop, name="ViewerSender", daemon=True)
+        self._receiver = threading.Thread(target=self._receive_loop, name="ViewerReceiver", daemon=True)
+
+    def start(self):
+        self._sender.start()
+        self._receiver.start()
+
+    def enqueue(self, kind: bytes, payload) -> bool:
+        """Queue a message without waiting; False if the viewer is too far behind"""
+        try:
+            self._queue.put_nowait((kind, payload))
+            return True
+        except queue.Full:
+            return False
+
+    def close(self):
+        """Disconnect (any thread); wakes both threads"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # The sender is inside sendall, which fails on the closed socket
+
+    def _send_loop(self):
+        try:
+            while not self.closed:
+                item = self._queue.get()
+                if item is None:
+                    break
+                kind, payload = item
+                if kind == b'HIST':
+                    # History goes out in chunks the viewer can plot as they arrive
+                    for start in range(0, len(payload), self.chunk_rows):
+                        send_message(self.sock, kind, payload[start:start + self.chunk_rows])
+                else:
+                    send_message(self.sock, kind, payload)
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def _receive_loop(self):
+        try:
+            while not self.closed:
+                message = recv_message(self.sock)
+                if message is None:
+                    break
+                kind, payload = message
+                if kind == b'CMND':
+                    self.on_command(json.loads(payload))
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.close()
+
+
+class AcquisitionServer:
+    """
+    Daemon side: accepts viewers and streams history and live records to them
+
+    attach_pending() and publish() are called from the acquisition thread,
+    so each viewer's history snapshot ends exactly where its live stream
+    begins. A viewer whose queue is full is detached; records are never
+    held back for a viewer.
+    """
+
+    def __init__(self, ipc_config: IpcConfig):
+        """
+        Initialize server
+
+        Args:
+            ipc_config: Address and per-viewer limits (port 0 = any free port)
+        """
+        self.config = ipc_config
+        self.port = ipc_config.port
+        self._listener: Optional[socket.socket] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._running = False
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[socket.socket, tuple]] = []  # Accepted, waiting for their snapshot
+        self._viewers: List[_ViewerConnection] = []
+        self._commands = queue.Queue()
+
+        # Statistics
+        self.viewers_attached = 0
+        self.viewers_dropped = 0  # Detached for falling behind
+        self.live_rows_sent = 0
+
+    def start(self):
+        """Listen for viewers"""
+        self._listener = socket.create_server((self.config.host, self.config.port))
+        self._listener.settimeout(0.5)
+        self.port = self._listener.getsockname()[1]
+        self._running = True
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="ViewerAccept", daemon=True)
+        self._accept_thread.start()
+        print(f"[AcquisitionServer] Listening on {self.config.host}:{self.port}")
+
+    def stop(self):
+        """Stop listening and detach all viewers"""
+        self._running = False
+        if self._accept_thread:
+            self._accept_thread.join()
+            self._accept_thread = None
+        if self._listener:
+            self._listener.close()
+            self._listener = None
+        with self._lock:
+            for sock, _ in self._pending:
+                sock.close()
+            for viewer in self._viewers:
+                viewer.close()
+            self._pending = []
+            self._viewers = []
+
+    @property
+    def viewer_count(self) -> int:
+        with self._lock:
+            return sum(not viewer.closed for viewer in self._viewers)
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                sock, address = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._pending.append((sock, address))
+
+    def attach_pending(self, snapshot: Callable[[], np.ndarray], info: dict):
+        """
+        Send the history to newly accepted viewers and start streaming to them
+
+        Args:
+            snapshot: Returns the history as a RECORD_DTYPE array (called at
+                most once, only if viewers are waiting)
+            info: Extra fields for the HELO message
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        history = snapshot()
+        hello = _json({**info, 'version': PROTOCOL_VERSION, 'fields': list(RECORD_DTYPE.names),
+                       'itemsize': RECORD_DTYPE.itemsize, 'epoch_offset_ns': MONOTONIC_EPOCH_OFFSET_NS,
+                       'history_rows': len(history)})
+        for sock, address in pending:
+            viewer = _ViewerConnection(sock, address, self.config, self._commands.put)
+            viewer.enqueue(b'HELO', hello)
+            if len(history):
+                viewer.enqueue(b'HIST', history)
+            viewer.start()
+            with self._lock:
+                self._viewers.append(viewer)
+            self.viewers_attached += 1
+            print(f"[AcquisitionServer] Viewer attached from {address[0]}:{address[1]} "
+                  f"({len(history)} history records)")
+
+    def publish(self, records: np.ndarray):
+        """Stream a batch of live records (RECORD_DTYPE array) to all viewers"""
+        if len(records) and self._broadcast(b'LIVE', records):
+            self.live_rows_sent += len(records)
+
+    def send_text(self, level: str, text: str):
+        """Send a status ("status") or error ("error") message to all viewers (any thread)"""
+        self._broadcast(b'TEXT', _json({'level': level, 'text': text}))
+
+    def send_statistics(self, statistics: dict):
+        """Send a statistics dictionary (JSON-serializable) to all viewers"""
+        self._broadcast(b'STAT', _json(statistics))
+
+    def take_commands(self) -> List[dict]:
+        """Commands received from viewers since the last call"""
+        commands = []
+        while True:
+            try:
+                commands.append(self._commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def _broadcast(self, kind: bytes, payload) -> bool:
+        """Queue a message for every viewer; detaches viewers that fell behind"""
+        with self._lock:
+            if not self._viewers:
+                return False
+            for viewer in list(self._viewers):
+                if viewer.closed:
+                    self._viewers.remove(viewer)
+                elif not viewer.enqueue(kind, payload):
+                    print(f"[AcquisitionServer] Viewer {viewer.address[0]}:{viewer.address[1]} "
+                          f"fell behind, detached")
+                    viewer.close()
+                    self._viewers.remove(viewer)
+                    self.viewers_dropped += 1
+            return bool(self._viewers)
+
+
+class AcquisitionClient:
+    """
+    Viewer side: attaches to a daemon and receives its records
+
+    Callbacks are called from the client's receiver thread.
+    """
+
+    def __init__(self, on_records: Callable[[np.ndarray, bool], None],
+                 on_message: Optional[Callable[[str, str], None]] = None,
+                 on_statistics: Optional[Callable[[dict], None]] = None,
+                 on_disconnect: Optional[Callable[[], None]] = None):
+        """
+        Initialize client
+
+        Args:
+            on_records: Called with (RECORD_DTYPE array, is_history) per message
+            on_message: Called with (level, text) per daemon message
+            on_statistics: Called with the daemon's statistics dictionary
+            on_disconnect: Called once the connection ended (not after close())
+        """
+        self.on_records = on_records
+        self.on_message = on_message
+        self.on_statistics = on_statistics
+        self.on_disconnect = on_disconnect
+        self.sock: Optional[socket.socket] = None
+        self.info: dict = {}
+        self._closing = False
+        self._send_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.history_rows = 0
+        self.live_rows = 0
+
+    def connect(self, host: str, port: int, timeout: float = 2.0) -> dict:
+        """
+        Attach to a daemon
+
+        Returns:
+            Daemon information from the HELO message
+
+        Raises:
+            OSError: If the daemon cannot be reached
+            ConnectionError: If the peer does not speak this protocol
+        """
+        sock = socket.create_connection((host, port), timeout=timeout)
+        try:
+            message = recv_message(sock)
+            if message is None or message[0] != b'HELO':
+                raise ConnectionError("No acquisition daemon at this address")
+            info = json.loads(message[1])
+            if info.get('version') != PROTOCOL_VERSION or info.get('itemsize') != RECORD_DTYPE.itemsize:
+                raise ConnectionError(f"Incompatible daemon protocol {info.get('version')}")
+        except (OSError, ValueError):
+            sock.close()
+            raise
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.sock = sock
+        self.info = info
+        self._closing = False
+        self.history_rows = 0
+        self.live_rows = 0
+        self._thread = threading.Thread(target=self._receive_loop, name="AcquisitionClient", daemon=True)
+        self._thread.start()
+        return info
+
+    def send_command(self, command: str, **arguments):
+        """Ask the daemon to run a command ("capture_event", "new_log")"""
+        with self._send_lock:
+            send_message(self.sock, b'CMND', _json({'command': command, **arguments}))
+
+    def close(self):
+        """Detach from the daemon (the daemon keeps acquiring)"""
+        self._closing = True
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.sock = None
+
+    def _receive_loop(self):
+        try:
+            while True:
+                message = recv_message(self.sock)
+                if message is None:
+                    break
+                kind, payload = message
+                if kind in (b'HIST', b'LIVE'):
+                    records = np.frombuffer(payload, dtype=RECORD_DTYPE)
+                    history = kind == b'HIST'
+                    if history:
+                        self.history_rows += len(records)
+                    else:
+                        self.live_rows += len(records)
+                    self.on_records(records, history)
+                elif kind == b'TEXT' and self.on_message:
+                    message = json.loads(payload)
+                    self.on_message(message['level'], message['text'])
+                elif kind == b'STAT' and self.on_statistics:
+                    self.on_statistics(json.loads(payload))
+        except (OSError, ValueError):
+            pass
+        if not self._closing and self.on_disconnect:
+            self.on_disconnect()
@@ -0,0 +1,1070 @@
+"""
+Benchmarks for the acquisition pipeline
+Measures throughput, latency and CPU cost of individual components
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+
+from config import SerialConfig
+from sample_data_generator import generate_sample_data
+
+
+def _open_pty_pair():
+    """
+    Create a pseudo terminal pair standing in for a serial cable
+
+    Returns:
+        (master_fd, slave_device_path, slave_fd)
+    """
+    import tty
+    master_fd, slave_fd = os.openpty()
+    tty.setraw(slave_fd)
+    return master_fd, os.ttyname(slave_fd), slave_fd
+
+
+def _write_all(fd: int, payload: bytes):
+    """Write the whole payload to a file descriptor"""
+    view = memoryview(payload)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def benchmark_serial_reader(num_lines: int = 20000, latency_samples: int = 200,
+                            idle_seconds: float = 2.0):
+    """
+    Compare SerialReader read modes over a pseudo terminal
+
+    Args:
+        num_lines: Number of records streamed for the throughput test
+        latency_samples: Number of single records timed for latency
+        idle_seconds: Duration of the idle CPU measurement
+    """
+    from serial_reader import SerialReader
+
+    print(f"\nSERIAL READER BENCHMARK ({num_lines} lines)")
+    print("=" * 60)
+
+    if sys.platform.startswith("win"):
+        print("Pseudo terminals are not available on Windows - skipped")
+        return
+
+    payload = ''.join(line + '\r\n' for line in generate_sample_data(num_lines)).encode()
+
+    for mode in ("readline", "block"):
+        master_fd, slave_path, slave_fd = _open_pty_pair()
+        data_queue = queue.Queue()
+        reader = SerialReader(SerialConfig(port=slave_path, read_mode=mode), data_queue)
+        reader.connect()
+        reader.start()
+
+        # Throughput: stream everything as fast as the pty accepts it
+        writer = threading.Thread(target=_write_all, args=(master_fd, payload), daemon=True)
+        start_time = time.perf_counter()
+        writer.start()
+        received = 0
+        while received < num_lines:
+            received += len(data_queue.get(timeout=10))
+        throughput = num_lines / (time.perf_counter() - start_time)
+        writer.join()
+
+        # Latency: one record at a time on an otherwise quiet line
+        line = (generate_sample_data(1)[0] + '\r\n').encode()
+        latencies = []
+        for _ in range(latency_samples):
+            sent = time.perf_counter()
+            os.write(master_fd, line)
+            data_queue.get(timeout=5)
+            latencies.append(time.perf_counter() - sent)
+            time.sleep(0.002)
+        latencies.sort()
+
+        # Idle CPU: nothing arrives, measure process CPU time
+        cpu_start = time.process_time()
+        time.sleep(idle_seconds)
+        idle_cpu = (time.process_time() - cpu_start) / idle_seconds * 100.0
+
+        reader.disconnect()
+        reader.join(timeout=2)
+        os.close(master_fd)
+        os.close(slave_fd)
+
+        print(f"Mode: {mode}")
+        print(f"  Throughput:        {throughput:.0f} lines/second")
+        print(f"  Latency median:    {latencies[len(latencies) // 2] * 1000:.3f} ms")
+        print(f"  Latency p99:       {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms")
+        print(f"  Idle CPU:          {idle_cpu:.2f} %")
+
+    print("=" * 60)
+
+
+def benchmark_queue_handoff(num_lines: int = 200000, batch_size: int = 500):
+    """
+    Compare per-line and batched handoff between two threads
+
+    Args:
+        num_lines: Number of lines passed from producer to consumer
+        batch_size: Lines per queue item in batched mode
+    """
+    from serial_reader import drain_batches
+
+    print(f"\nQUEUE HANDOFF BENCHMARK ({num_lines} lines)")
+    print("=" * 60)
+
+    lines = generate_sample_data(1000)
+    lines = (lines * (num_lines // len(lines) + 1))[:num_lines]
+
+    def per_line_producer(data_queue):
+        for line in lines:
+            data_queue.put(line)
+
+    def batched_producer(data_queue):
+        for start in range(0, num_lines, batch_size):
+            data_queue.put(lines[start:start + batch_size])
+
+    def per_line_consumer(data_queue):
+        received = 0
+        while received < num_lines:
+            data_queue.get(timeout=5)
+            received += 1
+
+    def batched_consumer(data_queue):
+        received = 0
+        while received < num_lines:
+            received += len(drain_batches(data_queue, batch_size, timeout=5))
+
+    for name, producer, consumer in (("per-line", per_line_producer, per_line_consumer),
+                                     ("batched", batched_producer, batched_consumer)):
+        data_queue = queue.Queue()
+        thread = threading.Thread(target=producer, args=(data_queue,))
+        start_time = time.perf_counter()
+        cpu_start = time.process_time()
+        thread.start()
+        consumer(data_queue)
+        thread.join()
+        elapsed = time.perf_counter() - start_time
+        cpu = time.process_time() - cpu_start
+
+        print(f"Mode: {name}")
+        print(f"  Throughput:        {num_lines / elapsed:.0f} lines/second")
+        print(f"  CPU per line:      {cpu / num_lines * 1e6:.3f} us")
+
+    print("=" * 60)
+
+
+def benchmark_data_logger(num_rows: int = 20000):
+    """
+    Compare open/append/close per row with the persistent CSV writer
+
+    Args:
+        num_rows: Number of rows written
+    """
+    import csv
+    import shutil
+    import tempfile
+    from config import LogConfig
+    from data_logger import DataLogger
+    from data_parser import DataParser
+
+    print(f"\nDATA LOGGER BENCHMARK ({num_rows} rows)")
+    print("=" * 60)
+
+    parser = DataParser()
+    records = [parser.parse(line) for line in generate_sample_data(num_rows)]
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        # Previous behavior: open, build a DictWriter and close for every row
+        path = os.path.join(temp_dir, "per_row.csv")
+        start_time = time.perf_counter()
+        for data in records:
+            data_dict = data.to_dict()
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=data_dict.keys())
+                writer.writerow(data_dict)
+        elapsed = time.perf_counter() - start_time
+        print(f"Open/close per row:  {num_rows / elapsed:.0f} rows/second")
+
+        for label, fsync in (("Persistent writer:", False), ("Persistent + fsync:", True)):
+            logger = DataLogger(LogConfig(fsync_on_flush=fsync), output_dir=temp_dir)
+            logger.start_new_log()
+            start_time = time.perf_counter()
+            for data in records:
+                logger.log_data(data)
+            logger.close_log()
+            elapsed = time.perf_counter() - start_time
+            print(f"{label:20s} {num_rows / elapsed:.0f} rows/second")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("=" * 60)
+
+
+def benchmark_binary_log(num_rows: int = 200000):
+    """
+    Compare file size and load time of CSV and binary columnar logs
+
+    Args:
+        num_rows: Number of rows written
+    """
+    import shutil
+    import tempfile
+    import pandas as pd
+    from config import LogConfig
+    from data_logger import DataLogger
+    from data_parser import DataParser
+    from binary_log import read_binary_log
+
+    print(f"\nBINARY LOG BENCHMARK ({num_rows} rows)")
+    print("=" * 60)
+
+    parser = DataParser()
+    records = [parser.parse(line) for line in generate_sample_data(num_rows)]
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        logger = DataLogger(LogConfig(log_format="both"), output_dir=temp_dir)
+        logger.start_new_log()
+        for start in range(0, num_rows, 1000):
+            logger.log_batch(records[start:start + 1000])
+        csv_path, binary_path = logger.current_file, logger.binary_file
+        logger.close_log()
+
+        csv_size = os.path.getsize(csv_path)
+        binary_size = os.path.getsize(binary_path)
+        print(f"CSV size:            {csv_size / num_rows:.1f} bytes/row")
+        print(f"Binary size:         {binary_size / num_rows:.1f} bytes/row "
+              f"({csv_size / binary_size:.1f}x smaller)")
+
+        start_time = time.perf_counter()
+        pd.read_csv(csv_path)
+        csv_load = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        read_binary_log(binary_path)
+        binary_load = time.perf_counter() - start_time
+
+        print(f"CSV load (pandas):   {csv_load * 1000:.1f} ms")
+        print(f"Binary load:         {binary_load * 1000:.1f} ms ({csv_load / binary_load:.0f}x faster)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("=" * 60)
+
+
+def benchmark_frame_processing(num_frames: int = 100000):
+    """
+    Compare worker CPU per frame: decode + separate parse/validate/classify
+    calls against the fused DataParser.parse_frame on raw bytes
+
+    Args:
+        num_frames: Number of frames processed per mode
+    """
+    import contextlib
+    import io
+    from data_parser import (DataParser, FRAME_TEST_END, FRAME_ERROR_CODE,
+                             FRAME_INVALID, FRAME_MALFORMED)
+
+    print(f"\nFRAME PROCESSING BENCHMARK ({num_frames} frames)")
+    print("=" * 60)
+
+    frames = [line.encode('utf-8') for line in generate_sample_data(1000)]
+    frames = (frames * (num_frames // len(frames) + 1))[:num_frames]
+    parser = DataParser()
+
+    def separate(frame):
+        data = parser.parse(frame.decode('utf-8', errors='ignore').strip())
+        if data is None:
+            return None
+        is_valid, _ = parser.validate_data(data)
+        if data.is_test_end() or data.has_error():
+            parser.get_error_description(data.error_code)
+        return data if is_valid else None
+
+    def fused(frame):
+        data, frame_class = parser.parse_frame(frame)
+        if frame_class & (FRAME_TEST_END | FRAME_ERROR_CODE):
+            parser.get_error_description(data.error_code)
+        return None if frame_class & (FRAME_INVALID | FRAME_MALFORMED) else data
+
+    for name, process in (("separate calls", separate), ("parse_frame", fused)):
+        # Parse errors of the generated sample data are printed; keep them quiet
+        with contextlib.redirect_stdout(io.StringIO()):
+            cpu_start = time.process_time()
+            for frame in frames:
+                process(frame)
+            cpu = time.process_time() - cpu_start
+
+        print(f"Mode: {name}")
+        print(f"  CPU per frame:     {cpu / num_frames * 1e6:.2f} us")
+
+    print("=" * 60)
+
+
+def _draw_plot_frame(app, plotter, widget=None) -> tuple:
+    """
+    Run one LivePlotter frame to completion (request, background preparation, setData)
+
+    Returns:
+        (GUI thread seconds, including rendering if widget is given;
+         preparer thread seconds)
+    """
+    app.processEvents()  # Pending repaints of earlier frames
+    prepared = plotter.preparer.frames_prepared
+    start_time = time.perf_counter()
+    plotter._update_plots()
+    gui_time = time.perf_counter() - start_time
+    if plotter._frame_started is None:
+        return gui_time, 0.0
+
+    while plotter.preparer.frames_prepared == prepared:
+        time.sleep(0.0005)
+    start_time = time.perf_counter()
+    app.sendPostedEvents(plotter, 0)  # Delivers frame_ready only
+    if widget is not None:
+        widget.grab()  # Renders the scene, also offscreen
+    return gui_time + time.perf_counter() - start_time, plotter.prepare_time_s
+
+
+def benchmark_plot_update(sizes=(1000, 100000, 1000000), repeats: int = 5):
+    """
+    Measure LivePlotter frame time for growing test lengths, with and
+    without min/max decimation (offscreen Qt): GUI thread time including
+    rendering, and preparation time on the preparer thread
+
+    Args:
+        sizes: Numbers of points in the plot buffers
+        repeats: Timed redraws per size
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import numpy as np
+    import pyqtgraph as pg
+    from PyQt5.QtWidgets import QApplication
+    from config import PlotConfig
+    from data_parser import FatigueTestData
+    from live_plotter import LivePlotter
+
+    print(f"\nPLOT UPDATE BENCHMARK ({repeats} redraws per size)")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication([])
+    rng = np.random.default_rng(0)
+
+    for decimation in (True, False):
+        print(f"Mode: {'min/max decimation' if decimation else 'all points'}")
+        for size in sizes:
+            widget = pg.GraphicsLayoutWidget()
+            widget.resize(1200, 900)
+            plotter = LivePlotter(PlotConfig(decimation=decimation))
+            plotter.setup_plots(widget)
+            widget.show()
+            app.processEvents()
+
+            raw = rng.integers(0, 3000, size=(size, 7))
+            batch = [FatigueTestData.from_scaled(0, "DTA", cycle, *row, 0)
+                     for cycle, row in enumerate(raw.tolist(), start=1)]
+            for start in range(0, size, 1000):
+                plotter.add_batch(batch[start:start + 1000])
+            del batch
+
+            gui_times, prepare_times = [], []
+            for _ in range(repeats):
+                plotter._redraw_needed = True  # Redraw although no new points arrived
+                gui_time, prepare_time = _draw_plot_frame(app, plotter, widget)
+                gui_times.append(gui_time)
+                prepare_times.append(prepare_time)
+
+            print(f"  {size:>9} points:  GUI {min(gui_times) * 1000:8.1f} ms/frame, "
+                  f"prepare {min(prepare_times) * 1000:6.1f} ms "
+                  f"({plotter.points_plotted} points per curve drawn)")
+            widget.close()
+            plotter.shutdown()
+
+    print("=" * 60)
+
+
+def benchmark_plot_tick(sizes=(100000, 1000000), new_points: int = 10, repeats: int = 5):
+    """
+    Measure GUI thread CPU time and peak allocation of one LivePlotter
+    timer tick, with a few new points and with none (offscreen Qt, without
+    rendering; array preparation runs on the preparer thread)
+
+    Args:
+        sizes: Numbers of points in the plot buffers
+        new_points: Points added before each "new data" tick
+        repeats: Ticks measured per case
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import tracemalloc
+    import numpy as np
+    import pyqtgraph as pg
+    from PyQt5.QtWidgets import QApplication
+    from config import PlotConfig
+    from data_parser import FatigueTestData
+    from live_plotter import LivePlotter
+
+    print(f"\nPLOT TICK BENCHMARK ({repeats} ticks per case)")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication([])
+    rng = np.random.default_rng(0)
+
+    for size in sizes:
+        widget = pg.GraphicsLayoutWidget()
+        widget.resize(1200, 900)
+        plotter = LivePlotter(PlotConfig())
+        plotter.setup_plots(widget)
+        widget.show()
+        app.processEvents()
+
+        raw = rng.integers(0, 3000, size=(size + 2 * repeats * new_points, 7))
+        batch = [FatigueTestData.from_scaled(0, "DTA", cycle, *row, 0)
+                 for cycle, row in enumerate(raw.tolist(), start=1)]
+        for start in range(0, size, 1000):
+            plotter.add_batch(batch[start:start + 1000])
+        _draw_plot_frame(app, plotter)
+        next_point = size
+
+        for label, count in (("new data", new_points), ("idle", 0)):
+            cpu_times, peaks = [], []
+            for _ in range(repeats):
+                for measure_memory in (False, True):
+                    if count:
+                        plotter.add_batch(batch[next_point:next_point + count])
+                        next_point += count
+                    if measure_memory:
+                        tracemalloc.start()
+                    gui_time = _draw_plot_frame(app, plotter)[0]
+                    if measure_memory:
+                        peaks.append(tracemalloc.get_traced_memory()[1])
+                        tracemalloc.stop()
+                    else:
+                        cpu_times.append(gui_time)
+
+            print(f"  {size:>9} points, {label:8s} GUI {min(cpu_times) * 1000:7.1f} ms/tick, "
+                  f"peak allocation {min(peaks) / 1e6:6.2f} MB")
+        widget.close()
+        plotter.shutdown()
+
+    print("=" * 60)
+
+
+def benchmark_plot_responsiveness(size: int = 1000000, duration_s: float = 3.0,
+                                  batch_size: int = 100, probe_interval_ms: int = 5):
+    """
+    Measure how late GUI events are handled while a long test is plotted
+    live (offscreen Qt)
+
+    Batches arrive at the processor's GUI emit rate while a probe timer
+    stands in for button clicks and window moves; its lateness is the
+    time the GUI thread was busy with plotting.
+
+    Args:
+        size: Points already in the plot buffers
+        duration_s: Measured acquisition time
+        batch_size: Points per batch
+        probe_interval_ms: Probe timer interval
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import numpy as np
+    import pyqtgraph as pg
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from config import BatchConfig, PlotConfig
+    from data_parser import FatigueTestData
+    from live_plotter import LivePlotter
+
+    print(f"\nPLOT RESPONSIVENESS BENCHMARK ({size} points, {duration_s:.0f} s live)")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication([])
+    rng = np.random.default_rng(0)
+    emit_interval_ms = int(1000 / BatchConfig().gui_emit_rate_hz)
+    batches = int(duration_s * 1000 / emit_interval_ms) + 1
+
+    raw = rng.integers(0, 3000, size=(size + batches * batch_size, 7))
+    batch = [FatigueTestData.from_scaled(0, "DTA", cycle, *row, 0)
+             for cycle, row in enumerate(raw.tolist(), start=1)]
+
+    widget = pg.GraphicsLayoutWidget()
+    widget.resize(1200, 900)
+    plotter = LivePlotter(PlotConfig())
+    plotter.setup_plots(widget)
+    widget.show()
+    for start in range(0, size, 1000):
+        plotter.add_batch(batch[start:start + 1000])
+    _draw_plot_frame(app, plotter)
+    plotter.start_plotting()
+
+    next_point = size
+    lateness = []
+    expected = [time.perf_counter()]
+
+    def feed():
+        nonlocal next_point
+        plotter.add_batch(batch[next_point:next_point + batch_size])
+        next_point += batch_size
+
+    def probe():
+        now = time.perf_counter()
+        lateness.append(max(0.0, now - expected[0]))
+        expected[0] = now + probe_interval_ms / 1000.0
+
+    feed_timer = QTimer()
+    feed_timer.timeout.connect(feed)
+    feed_timer.start(emit_interval_ms)
+    probe_timer = QTimer()
+    probe_timer.setTimerType(0)  # Qt.PreciseTimer
+    probe_timer.timeout.connect(probe)
+    expected[0] = time.perf_counter() + probe_interval_ms / 1000.0
+    probe_timer.start(probe_interval_ms)
+
+    end_time = time.perf_counter() + duration_s
+    while time.perf_counter() < end_time:
+        app.processEvents()
+        time.sleep(0.0005)
+
+    feed_timer.stop()
+    probe_timer.stop()
+    stats = plotter.get_statistics()
+    plotter.shutdown()
+    widget.close()
+
+    lateness = np.array(lateness) * 1000.0
+    print(f"  Event lateness:    median {np.median(lateness):6.2f} ms, "
+          f"p99 {np.percentile(lateness, 99):6.2f} ms, max {lateness.max():6.2f} ms")
+    print(f"  Refresh rate:      {stats['refresh_rate_hz']:.1f} Hz "
+          f"({stats['points_plotted']} points per curve drawn)")
+    print("=" * 60)
+
+
+def benchmark_trend_bands(sizes=(100000, 2000000), window_cycles: int = 1000, batch_size: int = 100):
+    """
+    Measure the preparer cost of new batches with and without trend
+    overlays, after tests of different lengths
+
+    Args:
+        sizes: Points already stored before the measured batches
+        window_cycles: Trend window length in cycles
+        batch_size: Points per measured batch
+    """
+    import numpy as np
+    from data_parser import FatigueTestData
+    from plot_preparer import PlotFramePreparer
+
+    print(f"\nTREND BANDS BENCHMARK ({window_cycles}-cycle window, {batch_size}-point batches)")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    batches = 200
+    for size in sizes:
+        raw = rng.integers(0, 3000, size=(size + batches * batch_size, 7))
+        records = [FatigueTestData.from_scaled(0, "DTA", cycle, *row, 0)
+                   for cycle, row in enumerate(raw.tolist(), start=1)]
+
+        for trend in (False, True):
+            preparer = PlotFramePreparer(on_frame=lambda frame: None)
+            for start in range(0, size, 10000):
+                preparer.add_batch(records[start:start + 10000])
+
+            enable_time = 0.0
+            if trend:
+                start_time = time.perf_counter()
+                preparer.set_trend(window_cycles, 2.0)
+                enable_time = time.perf_counter() - start_time
+
+            start_time = time.process_time()
+            for start in range(size, size + batches * batch_size, batch_size):
+                preparer.add_batch(records[start:start + batch_size])
+            per_point = (time.process_time() - start_time) / (batches * batch_size)
+
+            label = "with trend bands" if trend else "without"
+            print(f"  {size:>9} points, {label:17s} {per_point * 1e6:6.2f} us/point"
+                  + (f" (enabling: {enable_time * 1000:.0f} ms)" if trend else ""))
+        del records
+
+    print("=" * 60)
+
+
+def benchmark_detectors(num_records: int = 100000, batch_sizes=(10, 100, 1000)):
+    """
+    Measure the detector stage cost per record for different batch sizes,
+    with the default DetectionConfig detectors
+
+    Args:
+        num_records: Records fed per batch size
+        batch_sizes: Records per batch (the processing worker's emit batches)
+    """
+    import numpy as np
+    from config import DetectionConfig
+    from data_parser import FatigueTestData
+    from detection import DetectorStage
+
+    detection_config = DetectionConfig()
+    print(f"\nDETECTORS BENCHMARK ({len(detection_config.detectors)} detectors, {num_records} records)")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    raw = np.column_stack([rng.integers(900, 1100, num_records), rng.integers(230, 270, num_records),
+                           rng.integers(40, 60, num_records), rng.integers(900, 1100, num_records),
+                           rng.integers(2150, 2250, num_records), rng.integers(140, 160, num_records),
+                           rng.integers(605, 615, num_records)])
+    records = [FatigueTestData.from_scaled(0, "DTA", cycle, *row, 0)
+               for cycle, row in enumerate(raw.tolist(), start=1)]
+
+    for batch_size in batch_sizes:
+        stage = DetectorStage.from_config(detection_config)
+        start_time = time.process_time()
+        for start in range(0, num_records, batch_size):
+            stage.process(records[start:start + batch_size])
+        per_record = (time.process_time() - start_time) / num_records
+        print(f"  {batch_size:>5}-record batches: {per_record * 1e6:6.2f} us/record "
+              f"({per_record * batch_size * 1000:.2f} ms/batch, {stage.detections_found} detections)")
+
+    print("=" * 60)
+
+
+def benchmark_headless(mock_interval: float = 0.001, duration_s: float = 5.0):
+    """
+    Compare startup cost of the headless entry point and the GUI, and
+    measure the steady-state cost of headless acquisition
+
+    Each startup runs in a fresh interpreter that imports the entry point,
+    builds the acquisition objects (the GUI offscreen) and reports its own
+    wall time and peak RSS.
+
+    Args:
+        mock_interval: Seconds between simulated records in the steady-state run
+        duration_s: Length of the steady-state run
+    """
+    import subprocess
+    import tempfile
+
+    print("\nHEADLESS ACQUISITION BENCHMARK")
+    print("=" * 60)
+
+    report = ("import resource, time; "
+              "print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)")
+    startups = {
+        'headless': ("import time; start = time.perf_counter(); "
+                     "from acquire import HeadlessAcquisition; from config import SerialConfig, LogConfig; "
+                     "import tempfile; HeadlessAcquisition(SerialConfig(), LogConfig(), tempfile.mkdtemp()); "),
+        'GUI': ("import time; start = time.perf_counter(); "
+                "from PyQt5.QtWidgets import QApplication; app = QApplication([]); "
+                "import main_application; window = main_application.MainWindow(); "),
+    }
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    for name, code in startups.items():
+        result = subprocess.run([sys.executable, "-c", code + report], capture_output=True, text=True,
+                                env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode != 0:
+            print(f"  {name:>8} startup: failed ({result.stderr.strip().splitlines()[-1]})")
+            continue
+        elapsed, rss = map(float, result.stdout.split()[-2:])
+        print(f"  {name:>8} startup: {elapsed * 1000:7.1f} ms, peak RSS {rss:6.1f} MB")
+
+    from acquire import HeadlessAcquisition
+    from config import SerialConfig, LogConfig
+    with tempfile.TemporaryDirectory() as output_dir:
+        acquisition = HeadlessAcquisition(SerialConfig(), LogConfig(log_format="binary", event_capture=False),
+                                          output_dir, mock_interval=mock_interval, stats_interval=0,
+                                          out=open(os.devnull, "w"))
+        start_cpu = time.process_time()
+        acquisition.run(duration=duration_s)
+        cpu = time.process_time() - start_cpu
+    rate = acquisition.records_received / duration_s
+    print(f"  steady state: {rate:.0f} records/s, CPU {cpu / duration_s * 100:.1f}% "
+          f"({cpu / max(acquisition.records_received, 1) * 1e6:.1f} us/record incl. mock reader)")
+
+    print("=" * 60)
+
+
+def benchmark_ipc_attach(history_rows: int = 1000000, live_batches: int = 1000, batch_size: int = 50):
+    """
+    Time a viewer attaching to the acquisition daemon with a large history
+
+    Measures, over the loopback socket, the time from connect until the
+    whole history has arrived as record arrays, the cost of taking the
+    history snapshot on the acquisition thread, and the live batch latency.
+
+    Args:
+        history_rows: Records in the daemon's history
+        live_batches: Live batches timed after the attach
+        batch_size: Records per live batch
+    """
+    import numpy as np
+    from acquisition_ipc import AcquisitionClient, AcquisitionServer
+    from config import IpcConfig
+    from data_parser import RECORD_DTYPE
+    from data_store import ColumnStore
+
+    print(f"\nIPC ATTACH BENCHMARK ({history_rows} history records)")
+    print("=" * 60)
+
+    store = ColumnStore(memory_limit_mb=1024)
+    chunk = np.zeros(65536, dtype=RECORD_DTYPE)
+    for start in range(0, history_rows, len(chunk)):
+        count = min(len(chunk), history_rows - start)
+        chunk['Cycles'][:count] = np.arange(start + 1, start + count + 1)
+        store.append_records(chunk[:count])
+
+    server = AcquisitionServer(IpcConfig(port=0))
+    server.start()
+    done = threading.Event()
+    arrived = threading.Event()
+    arrivals = []
+
+    def on_records(records, history):
+        if history:
+            if client.history_rows == history_rows:
+                done.set()
+        else:
+            arrivals.append(time.perf_counter())
+            arrived.set()
+
+    client = AcquisitionClient(on_records)
+    connected = threading.Thread(target=client.connect, args=("127.0.0.1", server.port))
+    start_time = time.perf_counter()
+    connected.start()
+    while not server._pending:
+        time.sleep(0.0005)
+    snapshot_start = time.perf_counter()
+    server.attach_pending(store.records, {})
+    snapshot_time = time.perf_counter() - snapshot_start
+    connected.join()
+    done.wait(30)
+    attach_time = time.perf_counter() - start_time
+    size_mb = history_rows * RECORD_DTYPE.itemsize / 1e6
+    print(f"  Snapshot on acquisition thread: {snapshot_time * 1000:7.1f} ms")
+    print(f"  Attach until history received:  {attach_time * 1000:7.1f} ms "
+          f"({size_mb:.0f} MB, {size_mb / attach_time:.0f} MB/s)")
+
+    batch = np.zeros(batch_size, dtype=RECORD_DTYPE)
+    latencies = []
+    for _ in range(live_batches):
+        arrived.clear()
+        sent = time.perf_counter()
+        server.publish(batch)
+        arrived.wait(1.0)
+        latencies.append(arrivals[-1] - sent)
+    latencies.sort()
+    print(f"  Live batch latency ({batch_size} records): median {latencies[len(latencies) // 2] * 1e6:.0f} us, "
+          f"max {latencies[-1] * 1e6:.0f} us")
+
+    client.close()
+    server.stop()
+    print("=" * 60)
+
+
+def benchmark_reader_jitter(rate_hz: float = 1000.0, duration_s: float = 3.0):
+    """
+    Show how a busy GUI thread affects the read loop, thread vs. child process
+
+    A separate writer process sends one record every 1/rate_hz seconds to
+    a pseudo terminal. The read loop records the bytes already waiting at
+    every read (ReadLoopStats); at the known data rate the backlog gives
+    how late the loop came back to the port. Each reader runs once on a
+    quiet process and once next to a thread that keeps the GIL busy, as a
+    GUI thread redrawing plots does: long calls into C code that hold the
+    GIL throughout (stood in for by sorting a large list), with a little
+    pure-Python work in between.
+
+    Args:
+        rate_hz: Records per second sent by the writer
+        duration_s: Length of each run
+    """
+    import subprocess
+    from process_reader import create_serial_reader
+    from serial_reader import drain_batches
+
+    print(f"\nREADER JITTER BENCHMARK ({rate_hz:.0f} records/s for {duration_s:.0f} s)")
+    print("=" * 60)
+
+    if sys.platform.startswith("win"):
+        print("Pseudo terminals are not available on Windows - skipped")
+        return
+
+    writer_code = ("import os, sys, time; fd, rate, duration = int(sys.argv[1]), float(sys.argv[2]), "
+                   "float(sys.argv[3]); start = time.perf_counter(); count = int(rate * duration)\n"
+                   "for cycle in range(count):\n"
+                   "    delay = start + cycle / rate - time.perf_counter()\n"
+                   "    if delay > 0: time.sleep(delay)\n"
+                   "    os.write(fd, b'DTA;%d;182;263;0;793;2238;0;611;0;!\\r\\n' % cycle)\n")
+
+    # With a single core the reader process would also wait for the CPU; a
+    # lowered thread priority leaves the core to it but not the GIL
+    single_core = os.cpu_count() == 1
+
+    def busy_gui(stop: threading.Event):
+        import random
+        if single_core:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        values = list(range(200000))
+        random.shuffle(values)
+        while not stop.is_set():
+            sorted(values)
+            ''.join(str(value) for value in range(2000))
+
+    frame_bytes = len(b'DTA;%d;182;263;0;793;2238;0;611;0;!\r\n' % int(rate_hz * duration_s))
+    bytes_per_ms = frame_bytes * rate_hz / 1000.0
+    if single_core:
+        print("  Single CPU: the busy thread runs at nice 19 so the reader process is not starved of CPU")
+    print(f"  {'Reader':<8} {'GUI':<5} {'Records':>8} {'Reads':>7} {'p99 backlog (late)':>21} "
+          f"{'Max backlog (late)':>21}")
+    for reader_process in (False, True):
+        for busy in (False, True):
+            master_fd, slave_path, slave_fd = _open_pty_pair()
+            data_queue = queue.Queue()
+            reader = create_serial_reader(SerialConfig(port=slave_path, reader_process=reader_process),
+                                          data_queue)
+            reader.connect()
+            reader.start()
+
+            # Processing side: drain the queue like DataProcessorWorker
+            received = [0]
+            stop = threading.Event()
+
+            def consume():
+                while not stop.is_set():
+                    try:
+                        received[0] += len(drain_batches(data_queue, 500, timeout=0.1))
+                    except queue.Empty:
+                        pass
+
+            threads = [threading.Thread(target=consume, daemon=True)]
+            if busy:
+                threads.append(threading.Thread(target=busy_gui, args=(stop,), daemon=True))
+            for thread in threads:
+                thread.start()
+
+            count = int(rate_hz * duration_s)
+            subprocess.run([sys.executable, "-c", writer_code, str(master_fd), str(rate_hz), str(duration_s)],
+                           pass_fds=(master_fd,), check=True)
+            deadline = time.monotonic() + 5.0
+            while received[0] < count and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=2)
+            statistics = reader.get_statistics()
+            reader.disconnect()
+            reader.join(timeout=2)
+            os.close(master_fd)
+            os.close(slave_fd)
+
+            print(f"  {'process' if reader_process else 'thread':<8} {'busy' if busy else 'idle':<5} "
+                  f"{received[0]:>8} {statistics['reads']:>7} "
+                  f"{statistics['p99_backlog_bytes']:>7} B ({statistics['p99_backlog_bytes'] / bytes_per_ms:5.1f} ms) "
+                  f"{statistics['max_backlog_bytes']:>7} B ({statistics['max_backlog_bytes'] / bytes_per_ms:5.1f} ms)")
+
+    print("=" * 60)
+
+
+def benchmark_multi_station(station_counts=(1, 4, 16), rate_hz: float = 50.0, duration_s: float = 5.0):
+    """
+    CPU cost of acquiring N testers: one selector loop vs. one pipeline each
+
+    A separate writer process sends rate_hz records per second to each of N
+    pseudo terminals. MultiStationAcquisition serves all of them from one
+    loop; the baseline runs one HeadlessAcquisition (reader thread, queue
+    and processing loop) per tester in the same process. CPU is the
+    benchmark process's own (the writer is not counted).
+
+    Args:
+        station_counts: Numbers of simulated testers
+        rate_hz: Records per second per tester
+        duration_s: Length of each run
+    """
+    import subprocess
+    import tempfile
+    from acquire import HeadlessAcquisition
+    from config import LogConfig, StationConfig
+    from multi_station import MultiStationAcquisition
+
+    print(f"\nMULTI-STATION BENCHMARK ({rate_hz:.0f} records/s per tester for {duration_s:.0f} s)")
+    print("=" * 60)
+
+    if sys.platform.startswith("win"):
+        print("Pseudo terminals are not available on Windows - skipped")
+        return
+
+    writer_code = ("import os, sys, time; rate, duration = float(sys.argv[1]), float(sys.argv[2]); "
+                   "fds = [int(fd) for fd in sys.argv[3:]]; start = time.perf_counter()\n"
+                   "for cycle in range(int(rate * duration)):\n"
+                   "    delay = start + cycle / rate - time.perf_counter()\n"
+                   "    if delay > 0: time.sleep(delay)\n"
+                   "    for fd in fds: os.write(fd, b'DTA;%d;182;263;0;793;2238;0;611;0;!\\r\\n' % (cycle + 1))\n")
+    log_config = LogConfig(log_format="binary", event_capture=False)
+    devnull = open(os.devnull, "w")
+
+    def run_single_loop(paths, output_dir):
+        acquisition = MultiStationAcquisition(
+            [StationConfig(name=f"Station {index}", serial=SerialConfig(port=path))
+             for index, path in enumerate(paths)],
+            log_config, output_dir=output_dir, stats_interval=0, out=devnull)
+        return [acquisition], [threading.Thread(target=acquisition.run)]
+
+    def run_pipelines(paths, output_dir):
+        acquisitions = [HeadlessAcquisition(SerialConfig(port=path), log_config,
+                                            os.path.join(output_dir, str(index)), stats_interval=0, out=devnull)
+                        for index, path in enumerate(paths)]
+        return acquisitions, [threading.Thread(target=acquisition.run) for acquisition in acquisitions]
+
+    print(f"  {'Stations':>8} {'Engine':<22} {'Records':>8} {'CPU':>7} {'us/record':>10} {'Threads':>8}")
+    for count in station_counts:
+        for name, build in (("one selector loop", run_single_loop), ("pipeline per tester", run_pipelines)):
+            ptys = [_open_pty_pair() for _ in range(count)]
+            with tempfile.TemporaryDirectory() as output_dir:
+                acquisitions, threads = build([path for _, path, _ in ptys], output_dir)
+                for thread in threads:
+                    thread.start()
+                time.sleep(0.5)  # Ports open before the writer starts
+                thread_count = threading.active_count() - 1
+
+                start_cpu = time.process_time()
+                master_fds = [master_fd for master_fd, _, _ in ptys]
+                subprocess.run([sys.executable, "-c", writer_code, str(rate_hz), str(duration_s)]
+                               + [str(fd) for fd in master_fds], pass_fds=master_fds, check=True)
+                expected = count * int(rate_hz * duration_s)
+                deadline = time.monotonic() + 5.0
+                while (sum(acquisition.records_received for acquisition in acquisitions) < expected
+                       and time.monotonic() < deadline):
+                    time.sleep(0.01)
+                cpu = time.process_time() - start_cpu
+
+                for acquisition in acquisitions:
+                    acquisition.stop()
+                for thread in threads:
+                    thread.join(timeout=10)
+            for master_fd, _, slave_fd in ptys:
+                os.close(master_fd)
+                os.close(slave_fd)
+
+            records = sum(acquisition.records_received for acquisition in acquisitions)
+            print(f"  {count:>8} {name:<22} {records:>8} {cpu / duration_s * 100:6.1f}% "
+                  f"{cpu / max(records, 1) * 1e6:>10.1f} {thread_count:>8}")
+
+    devnull.close()
+    print("=" * 60)
+
+
+def benchmark_fanout(rate_hz: float = 1000.0, emit_hz: float = 30.0, duration_s: float = 3.0,
+                     stall_ms: float = 200.0, stall_every: int = 15):
+    """
+    Plotter latency next to a stalling logger: serial calls vs. fan-out consumers
+
+    The producer publishes rate_hz records per second in emit_hz batches, as
+    DataProcessorWorker does. The logger stalls for stall_ms on every
+    stall_every-th batch (a slow disk or fsync). Serially, as the GUI thread
+    used to call logger then plotter, every stall delays the plotter; with
+    FanOut it only delays the logger. The last run adds four more consumers
+    (publishers doing a little work per record) to show they cost the
+    existing ones nothing.
+
+    Args:
+        rate_hz: Records per second
+        emit_hz: Batches per second
+        duration_s: Length of each run
+        stall_ms: Length of a logger stall
+        stall_every: Batches between logger stalls
+    """
+    from fanout import FanOut, OVERFLOW_DECIMATE, OVERFLOW_DROP_OLDEST
+
+    print(f"\nFAN-OUT BENCHMARK ({rate_hz:.0f} records/s, logger stalls {stall_ms:.0f} ms "
+          f"every {stall_every} batches)")
+    print("=" * 60)
+
+    batch_size = int(rate_hz / emit_hz)
+    batch_count = int(duration_s * emit_hz)
+
+    def run(mode: str, extra_consumers: int = 0):
+        plot_latencies = []
+        logged = [0]
+
+        def logger(records):
+            logged[0] += 1
+            if logged[0] % stall_every == 0:
+                time.sleep(stall_ms / 1000.0)
+
+        def plotter(records):
+            plot_latencies.append(time.monotonic() - records[-1])
+
+        def publisher(records):
+            sum(len(str(value)) for value in records)
+
+        fanout = None
+        if mode == "fan-out":
+            fanout = FanOut()
+            fanout.register('logger', logger)
+            fanout.register('plotter', plotter, OVERFLOW_DECIMATE)
+            for index in range(extra_consumers):
+                fanout.register(f'publisher{index}', publisher, OVERFLOW_DROP_OLDEST)
+            fanout.start()
+
+        start = time.monotonic()
+        for index in range(batch_count):
+            delay = start + index / emit_hz - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Records carry their publish time; the plotter measures the delay to drawing
+            batch = [time.monotonic()] * batch_size
+            if fanout:
+                fanout.publish(batch)
+            else:
+                logger(batch)
+                plotter(batch)
+        if fanout:
+            fanout.stop()
+
+        plot_latencies.sort()
+
+        def percentile(fraction):
+            return plot_latencies[min(len(plot_latencies) - 1, int(len(plot_latencies) * fraction))] * 1000
+
+        label = mode + (f" + {extra_consumers} consumers" if extra_consumers else "")
+        print(f"  {label:<26} plotter latency p50 {percentile(0.5):7.2f} ms, p99 {percentile(0.99):7.2f} ms, "
+              f"max {plot_latencies[-1] * 1000:7.2f} ms")
+
+    run("serial")
+    run("fan-out")
+    run("fan-out", extra_consumers=4)
+
+    print("=" * 60)
+
+
+BENCHMARKS = {
+    'serial_reader': benchmark_serial_reader,
+    'queue_handoff': benchmark_queue_handoff,
+    'data_logger': benchmark_data_logger,
+    'binary_log': benchmark_binary_log,
+    'frame_processing': benchmark_frame_processing,
+    'plot_update': benchmark_plot_update,
+    'plot_tick': benchmark_plot_tick,
+    'plot_responsiveness': benchmark_plot_responsiveness,
+    'trend_bands': benchmark_trend_bands,
+    'detectors': benchmark_detectors,
+    'headless': benchmark_headless,
+    'ipc_attach': benchmark_ipc_attach,
+    'reader_jitter': benchmark_reader_jitter,
+    'multi_station': benchmark_multi_station,
+    'fanout': benchmark_fanout,
+}
+
+
+def main():
+    """Run the benchmarks named on the command line (default: all)"""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
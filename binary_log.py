@@ -0,0 +1,196 @@
+"""
+Binary Log module - Compact columnar log format
+Writes, reads and converts chunked fixed-point log files (.ftb)
+
+File layout:
+    MAGIC, u32 header length, JSON header (fields, scales, clock offset)
+    repeated chunks: CHUNK_MARKER, u32 row count, one column after another
+"""
+
+import json
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+import config
+from data_parser import RECORD_DTYPE, MONOTONIC_EPOCH_OFFSET_NS
+
+
+MAGIC = b'FTBLOG1\n'
+CHUNK_MARKER = b'CHNK'
+FORMAT_VERSION = 1
+
+# Little-endian on disk regardless of platform
+FILE_DTYPE = RECORD_DTYPE.newbyteorder('<')
+
+
+class BinaryLogWriter:
+    """
+    Writer for the binary columnar log format
+
+    Records are collected until chunk_rows are buffered, then written as one
+    chunk of contiguous columns. flush() writes a partial chunk so nothing
+    stays in memory longer than the caller's flush policy allows.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 4096):
+        """
+        Create the file and write its header
+
+        Args:
+            path: Output file path
+            chunk_rows: Rows buffered per chunk
+        """
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self._pending = np.empty(chunk_rows, dtype=FILE_DTYPE)
+        self._pending_rows = 0
+        self.rows_written = 0
+
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'fields': [[name, FILE_DTYPE.fields[name][0].str] for name in FILE_DTYPE.names],
+            'scales': config.FIELD_SCALES,
+            'epoch_offset_ns': MONOTONIC_EPOCH_OFFSET_NS,
+            'created': datetime.now().isoformat(),
+        }).encode('utf-8')
+
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC + struct.pack('<I', len(header)) + header)
+
+    def write_records(self, records: np.ndarray):
+        """
+        Append records
+
+        Args:
+            records: RECORD_DTYPE structured array
+        """
+        start = 0
+        while start < len(records):
+            count = min(len(records) - start, self.chunk_rows - self._pending_rows)
+            self._pending[self._pending_rows:self._pending_rows + count] = records[start:start + count]
+            self._pending_rows += count
+            start += count
+
+            if self._pending_rows == self.chunk_rows:
+                self._write_chunk()
+
+    def _write_chunk(self):
+        """Write buffered rows as one chunk"""
+        rows = self._pending_rows
+        if not rows:
+            return
+
+        self._file.write(CHUNK_MARKER + struct.pack('<I', rows))
+        for name in FILE_DTYPE.names:
+            self._file.write(np.ascontiguousarray(self._pending[name][:rows]).tobytes())
+
+        self.rows_written += rows
+        self._pending_rows = 0
+
+    def flush(self):
+        """Write buffered rows and flush the file"""
+        self._write_chunk()
+        self._file.flush()
+
+    def fileno(self) -> int:
+        """File descriptor (for os.fsync)"""
+        return self._file.fileno()
+
+    def close(self):
+        """Flush and close the file"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+def read_binary_log_header(path: str) -> dict:
+    """
+    Read the JSON header of a binary log file
+
+    Raises:
+        ValueError: If the file is not a binary log
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(len(MAGIC) + 4)
+        length = _header_length(prefix)
+        return _decode_header(f.read(length))
+
+
+def _header_length(prefix: bytes) -> int:
+    """Validate the magic and return the JSON header length"""
+    if len(prefix) < len(MAGIC) + 4 or not prefix.startswith(MAGIC):
+        raise ValueError("Not a binary fatigue log file")
+    return struct.unpack_from('<I', prefix, len(MAGIC))[0]
+
+
+def _decode_header(raw: bytes) -> dict:
+    """Decode and check the JSON header"""
+    header = json.loads(raw.decode('utf-8'))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary log version: {header.get('version')}")
+    return header
+
+
+def read_binary_log(path: str) -> Dict[str, np.ndarray]:
+    """
+    Load a binary log file as columns
+
+    A truncated last chunk (e.g. after a power failure) is ignored.
+
+    Args:
+        path: Binary log file path
+
+    Returns:
+        Dictionary of RECORD_DTYPE field name to 1-D array
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    offset = len(MAGIC) + 4
+    length = _header_length(content[:offset])
+    header = _decode_header(content[offset:offset + length])
+    offset += length
+
+    dtypes = [(name, np.dtype(dtype_str)) for name, dtype_str in header['fields']]
+    row_bytes = sum(dtype.itemsize for _, dtype in dtypes)
+    parts = {name: [] for name, _ in dtypes}
+
+    while offset + 8 <= len(content):
+        if content[offset:offset + 4] != CHUNK_MARKER:
+            raise ValueError(f"Corrupt binary log: no chunk marker at offset {offset}")
+        (rows,) = struct.unpack_from('<I', content, offset + 4)
+        offset += 8
+        if offset + rows * row_bytes > len(content):
+            break
+
+        for name, dtype in dtypes:
+            parts[name].append(np.frombuffer(content, dtype=dtype, count=rows, offset=offset))
+            offset += rows * dtype.itemsize
+
+    return {name: (np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)).astype(
+                dtype.newbyteorder('='), copy=False)
+            for name, dtype in dtypes}
+
+
+def convert_to_csv(path: str, csv_path: Optional[str] = None) -> str:
+    """
+    Convert a binary log file to the CSV log schema
+
+    Args:
+        path: Binary log file path
+        csv_path: Output path (default: same name with .csv extension)
+
+    Returns:
+        Path of the written CSV file
+    """
+    from data_store import columns_to_dataframe
+
+    header = read_binary_log_header(path)
+    frame = columns_to_dataframe(read_binary_log(path), epoch_offset_ns=header['epoch_offset_ns'])
+
+    csv_path = csv_path or str(Path(path).with_suffix('.csv'))
+    frame.to_csv(csv_path, index=False)
+    return csv_path
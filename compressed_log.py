@@ -0,0 +1,401 @@
+"""
+Compressed Log module - Swinging-door / deadband compressed log format
+Stores per-channel samples only where a channel leaves its tolerance band
+and reconstructs every record within tolerance (.ftz files)
+
+File layout:
+    MAGIC, u32 header length, JSON header (mode, channels, tolerances, clock offset)
+    repeated chunks: CHUNK_MARKER, u32 channel, u32 point count, i64 first
+    record index, record index offsets (u32), values (float64)
+"""
+
+import json
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import config
+from data_parser import RECORD_DTYPE, MONOTONIC_EPOCH_OFFSET_NS
+
+
+MAGIC = b'FTZLOG1\n'
+CHUNK_MARKER = b'PNTS'
+FORMAT_VERSION = 1
+
+COMPRESSION_MODES = ("swinging_door", "deadband")
+
+# Channels that change in steps; stored at every change, never interpolated
+STEP_CHANNELS = ("Status", "Error_Code")
+
+
+class ChannelCompressor:
+    """
+    Streaming compressor of one channel, indexed by record number
+
+    "swinging_door": a point is archived when no straight line from the
+    last archived point stays within +/- tolerance of every record since;
+    the archived point lies on a line that does, so linear interpolation
+    between archived points restores every record within tolerance.
+
+    "deadband": a record is archived when it differs from the last archived
+    value by more than the tolerance; the reconstruction holds each value.
+
+    In both modes a point is archived at least every max_gap records, which
+    bounds what an interrupted file can lose.
+    """
+
+    def __init__(self, tolerance: float, mode: str, max_gap: int = 1000):
+        """
+        Args:
+            tolerance: Allowed reconstruction error (in stored units)
+            mode: One of COMPRESSION_MODES
+            max_gap: Largest number of records between archived points
+        """
+        self.tolerance = tolerance
+        self.mode = mode
+        self.max_gap = max(int(max_gap), 1)
+        self.kind = "step" if mode == "deadband" else "linear"  # Reconstruction
+        self.indices: List[int] = []  # Archived points not yet written
+        self.values: List[float] = []
+        self._archived_index: Optional[int] = None
+        self._archived_value = 0.0
+        self._last_index: Optional[int] = None
+        self._last_value = 0.0
+        self._upper = float('inf')  # Door slopes from the archived point
+        self._lower = float('-inf')
+
+    def _archive(self, index: int, value: float):
+        self.indices.append(index)
+        self.values.append(value)
+        self._archived_index = index
+        self._archived_value = value
+        self._upper = float('inf')
+        self._lower = float('-inf')
+
+    def add(self, first_index: int, values: List[float]):
+        """Compress values of consecutive records starting at first_index"""
+        if self.mode == "deadband":
+            self._add_deadband(first_index, values)
+        else:
+            self._add_swinging_door(first_index, values)
+
+    def _add_deadband(self, first_index: int, values: List[float]):
+        tolerance = self.tolerance
+        archived = self._archived_value
+        next_forced = self._archived_index + self.max_gap if self._archived_index is not None else first_index
+        index = first_index
+        for value in values:
+            if abs(value - archived) > tolerance or index >= next_forced:
+                self._archive(index, value)
+                archived = value
+                next_forced = index + self.max_gap
+            index += 1
+        self._last_index = index - 1
+        self._last_value = values[-1]
+
+    def _add_swinging_door(self, first_index: int, values: List[float]):
+        tolerance = self.tolerance
+        max_gap = self.max_gap
+        index = first_index
+        # Hot loop on locals; state is written back at the end
+        archived_index = self._archived_index
+        archived_value = self._archived_value
+        last_index = self._last_index
+        last_value = self._last_value
+        upper = self._upper
+        lower = self._lower
+
+        for value in values:
+            if archived_index is None:
+                self._archive(index, value)
+                archived_index, archived_value = index, value
+            else:
+                span = index - archived_index
+                new_upper = min(upper, (value + tolerance - archived_value) / span)
+                new_lower = max(lower, (value - tolerance - archived_value) / span)
+                if new_lower > new_upper or span > max_gap:
+                    # Door closed: archive the last record on an admissible line
+                    archived_value = self._close(archived_index, archived_value, last_index, last_value,
+                                                 upper, lower)
+                    archived_index = last_index
+                    span = index - archived_index
+                    upper = (value + tolerance - archived_value) / span
+                    lower = (value - tolerance - archived_value) / span
+                else:
+                    upper, lower = new_upper, new_lower
+            last_index, last_value = index, value
+            index += 1
+
+        self._last_index = last_index
+        self._last_value = last_value
+        self._upper, self._lower = upper, lower
+
+    def _close(self, archived_index: int, archived_value: float, last_index: int, last_value: float,
+               upper: float, lower: float) -> float:
+        """Archive the last record, moved onto the door range if needed; returns its value"""
+        slope = (last_value - archived_value) / (last_index - archived_index)
+        if slope > upper or slope < lower:
+            slope = min(max(slope, lower), upper)
+            last_value = archived_value + slope * (last_index - archived_index)
+        self.indices.append(last_index)
+        self.values.append(last_value)
+        self._archived_index = last_index
+        self._archived_value = last_value
+        return last_value
+
+    def close_segment(self):
+        """Archive the last record so everything so far can be reconstructed"""
+        if self._last_index is None or self._last_index == self._archived_index:
+            return
+        if self.mode == "deadband":
+            self._archive(self._last_index, self._last_value)
+        else:
+            self._close(self._archived_index, self._archived_value, self._last_index, self._last_value,
+                        self._upper, self._lower)
+            self._upper = float('inf')
+            self._lower = float('-inf')
+
+    def force(self, index: int, value: float):
+        """Archive a record exactly (after closing the segment before it)"""
+        if self.mode != "deadband":
+            self.close_segment()
+        self._archive(index, value)
+        self._last_index = index
+        self._last_value = value
+
+    def take(self):
+        """Archived points since the last call, as arrays"""
+        indices = np.array(self.indices, dtype=np.int64)
+        values = np.array(self.values, dtype=np.float64)
+        self.indices.clear()
+        self.values.clear()
+        return indices, values
+
+
+def raw_tolerances(tolerances: Dict[str, float], time_tolerance_ms: float) -> Dict[str, float]:
+    """
+    Per-channel tolerances in stored (fixed-point) units
+
+    Physical tolerances are rounded down to whole fixed-point steps, so the
+    rounded reconstruction stays within them.
+
+    Args:
+        tolerances: FIELD_SCALES name -> tolerance in physical units
+        time_tolerance_ms: Timestamp tolerance in milliseconds
+    """
+    raw = {'Timestamp_ns': float(int(time_tolerance_ms * 1e6)), 'Cycles': 0.0}
+    for name, scale in config.FIELD_SCALES.items():
+        raw[name] = float(int(tolerances.get(name, 0.0) * scale + 1e-9))
+    for name in STEP_CHANNELS:
+        raw[name] = 0.0
+    return raw
+
+
+class CompressedLogWriter:
+    """
+    Writer for the compressed log format
+
+    Has the interface of BinaryLogWriter. Every channel of RECORD_DTYPE is
+    compressed on its own against the record number; END and error records
+    are stored exactly in every channel. flush() writes the points archived
+    so far; records after them (at most max_gap per channel) are only
+    stored by later points or by close().
+    """
+
+    def __init__(self, path: str, tolerances: Dict[str, float], mode: str = "swinging_door",
+                 max_gap: int = 1000):
+        """
+        Create the file and write its header
+
+        Args:
+            path: Output file path
+            tolerances: Channel (RECORD_DTYPE name) -> tolerance in stored units
+            mode: One of COMPRESSION_MODES
+            max_gap: Largest number of records between archived points of a channel
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown compression mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.channels = list(RECORD_DTYPE.names)
+        self.compressors = [
+            ChannelCompressor(0.0 if name in STEP_CHANNELS else tolerances.get(name, 0.0),
+                              "deadband" if name in STEP_CHANNELS else mode, max_gap)
+            for name in self.channels]
+        self.rows_written = 0
+        self.points_written = 0
+        self.bytes_written = 0
+
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'mode': mode,
+            'max_gap': max_gap,
+            'channels': [[name, RECORD_DTYPE.fields[name][0].str, compressor.tolerance,
+                          compressor.kind]
+                         for name, compressor in zip(self.channels, self.compressors)],
+            'scales': config.FIELD_SCALES,
+            'epoch_offset_ns': MONOTONIC_EPOCH_OFFSET_NS,
+            'created': datetime.now().isoformat(),
+        }).encode('utf-8')
+
+        self._file = open(self.path, 'wb')
+        self._write(MAGIC + struct.pack('<I', len(header)) + header)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Size of the records as fixed-point rows / bytes written"""
+        return self.rows_written * RECORD_DTYPE.itemsize / self.bytes_written if self.bytes_written else 0.0
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def write_records(self, records: np.ndarray):
+        """
+        Append records
+
+        Args:
+            records: RECORD_DTYPE structured array
+        """
+        if not len(records):
+            return
+        first = self.rows_written
+        columns = [records[name].tolist() for name in self.channels]
+
+        # END and error records split the batch; they are stored exactly
+        kept = np.flatnonzero((records['Status'] != 0) | (records['Error_Code'] != 0)).tolist()
+        start = 0
+        for stop in kept + [len(records)]:
+            for compressor, values in zip(self.compressors, columns):
+                if stop > start:
+                    compressor.add(first + start, values[start:stop])
+                if stop < len(records):
+                    compressor.force(first + stop, values[stop])
+            start = stop + 1
+        self.rows_written += len(records)
+
+    def _write_points(self):
+        """Write the archived points of every channel"""
+        for channel, compressor in enumerate(self.compressors):
+            indices, values = compressor.take()
+            if not len(indices):
+                continue
+            first = int(indices[0])
+            self._write(CHUNK_MARKER + struct.pack('<IIq', channel, len(indices), first)
+                        + (indices - first).astype('<u4').tobytes() + values.astype('<f8').tobytes())
+            self.points_written += len(indices)
+
+    def flush(self):
+        """Write the points archived so far and flush the file"""
+        self._write_points()
+        self._file.flush()
+
+    def fileno(self) -> int:
+        """File descriptor (for os.fsync)"""
+        return self._file.fileno()
+
+    def close(self):
+        """Flush and close the file"""
+        if self._file.closed:
+            return
+        for compressor in self.compressors:
+            compressor.close_segment()
+        self.flush()
+        self._file.close()
+
+
+def read_compressed_log_header(path: str) -> dict:
+    """
+    Read the JSON header of a compressed log file
+
+    Raises:
+        ValueError: If the file is not a compressed log
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(len(MAGIC) + 4)
+        if len(prefix) < len(MAGIC) + 4 or not prefix.startswith(MAGIC):
+            raise ValueError("Not a compressed fatigue log file")
+        length = struct.unpack_from('<I', prefix, len(MAGIC))[0]
+        header = json.loads(f.read(length).decode('utf-8'))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compressed log version: {header.get('version')}")
+    return header
+
+
+def read_compressed_log(path: str) -> Dict[str, np.ndarray]:
+    """
+    Reconstruct every record of a compressed log file as columns
+
+    Linear channels are interpolated between their stored points and
+    rounded to the fixed-point resolution; step channels hold their value.
+    Records after the last point stored in every channel (e.g. an unflushed
+    tail after a power failure) are not restored.
+
+    Args:
+        path: Compressed log file path
+
+    Returns:
+        Dictionary of RECORD_DTYPE field name to 1-D array
+    """
+    header = read_compressed_log_header(path)
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    offset = len(MAGIC) + 4 + struct.unpack_from('<I', content, len(MAGIC))[0]
+    channels = header['channels']
+    indices = [[] for _ in channels]
+    values = [[] for _ in channels]
+
+    while offset + 20 <= len(content):
+        if content[offset:offset + 4] != CHUNK_MARKER:
+            raise ValueError(f"Corrupt compressed log: no chunk marker at offset {offset}")
+        channel, count, first = struct.unpack_from('<IIq', content, offset + 4)
+        offset += 20
+        if offset + count * 12 > len(content):
+            break
+        indices[channel].append(first + np.frombuffer(content, dtype='<u4', count=count, offset=offset)
+                                .astype(np.int64))
+        values[channel].append(np.frombuffer(content, dtype='<f8', count=count, offset=offset + count * 4))
+        offset += count * 12
+
+    points = [(np.concatenate(i) if i else np.empty(0, np.int64), np.concatenate(v) if v else np.empty(0))
+              for i, v in zip(indices, values)]
+    rows = min((int(i[-1]) + 1 if len(i) else 0) for i, _ in points)
+    positions = np.arange(rows)
+
+    columns = {}
+    for (name, dtype_str, _, kind), (channel_indices, channel_values) in zip(channels, points):
+        dtype = np.dtype(dtype_str).newbyteorder('=')
+        if not rows:
+            columns[name] = np.empty(0, dtype=dtype)
+        elif kind == "step":
+            held = np.searchsorted(channel_indices, positions, side='right') - 1
+            columns[name] = channel_values[held].astype(dtype)
+        else:
+            columns[name] = np.rint(np.interp(positions, channel_indices, channel_values)).astype(dtype)
+    return columns
+
+
+def convert_to_csv(path: str, csv_path: Optional[str] = None) -> str:
+    """
+    Convert a compressed log file to the CSV log schema
+
+    Args:
+        path: Compressed log file path
+        csv_path: Output path (default: same name with .csv extension)
+
+    Returns:
+        Path of the written CSV file
+    """
+    from data_store import columns_to_dataframe
+
+    header = read_compressed_log_header(path)
+    frame = columns_to_dataframe(read_compressed_log(path), epoch_offset_ns=header['epoch_offset_ns'])
+
+    csv_path = csv_path or str(Path(path).with_suffix('.csv'))
+    frame.to_csv(csv_path, index=False)
+    return csv_path
@@ -3,8 +3,8 @@ Configuration module for Fatigue Tester Data Acquisition System
 Contains all configuration parameters and error codes
 """
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, List
 
 @dataclass
 class SerialConfig:
@@ -15,6 +15,29 @@ class SerialConfig:
     bytesize: int = 8
     parity: str = 'N'  # None
     stopbits: int = 1
+    read_mode: str = "block"  # "block" (chunked reads + framing) or "readline" (legacy)
+    read_block_size: int = 4096  # Maximum bytes per read() in block mode
+    max_frame_size: int = 1024  # Partial frames longer than this are discarded
+    reader_process: bool = False  # Read the port in a child process (frames via shared-memory ring)
+    ring_buffer_size: int = 4 * 1024 * 1024  # Bytes of the shared-memory ring of the reader process
+
+
+@dataclass
+class BatchConfig:
+    """Batching of records between reader and processor threads"""
+    max_batch_size: int = 500  # Maximum lines per queue item / processing batch
+    max_linger_ms: float = 20.0  # Longest a line may wait in the reader before handoff
+    gui_emit_rate_hz: float = 30.0  # Maximum rate of record batches sent to the GUI thread
+
+
+@dataclass
+class FanOutConfig:
+    """Per-consumer queues behind the processing worker (fanout.FanOut)"""
+    max_pending_batches: int = 64  # Batches a consumer may fall behind before its overflow policy applies
+    logger_overflow: str = "block"  # "block" (lossless, holds up the worker), "drop_oldest" or "decimate"
+    plotter_overflow: str = "decimate"  # Thinned backlog; END and error records are always kept
+    detector_overflow: str = "drop_oldest"
+    logger_call_timeout_s: float = 10.0  # Longest the GUI waits for a logger operation queued behind records
 
 
 @dataclass
@@ -22,17 +45,99 @@ class PlotConfig:
     """Plot configuration"""
     update_interval_ms: int = 1000  # Update plot every 1 second
     max_points_display: int = 0  # 0 = unlimited points (plot all data)
+    decimation: bool = True  # Draw min/max per bucket: max_points_display points, or 2 per pixel if 0
+    zoom_redraw_delay_ms: int = 50  # Re-decimate the zoomed range once it has not changed for this long
+    adaptive_refresh: bool = True  # Redraw on new data within a frame budget (update_interval_ms = longest wait)
+    min_refresh_interval_ms: int = 16  # Shortest time between redraws
+    max_plot_busy_fraction: float = 0.25  # Share of the GUI thread redraws may use
+    trend_bands: bool = False  # Moving mean and +/- k sigma overlays on forces and loss of stiffness
+    trend_window_cycles: int = 1000  # Moving window length in cycles
+    trend_band_sigma: float = 2.0  # Band half-width in standard deviations
     auto_range: bool = True
     
 
+@dataclass
+class PredictionConfig:
+    """Cycles-to-failure prediction from the loss of stiffness trend"""
+    enabled: bool = True
+    stiffness_loss_limit_percent: float = 50.0  # Predict the cycle count at which this loss is reached
+    model: str = "linear"  # "linear" or "exponential" (fit of ln(loss))
+    confidence: float = 0.95  # Confidence level of the predicted cycles band
+    min_points: int = 30  # Records needed before predicting
+    start_cycles: int = 0  # Ignore records before this cycle count (run-in)
+    projection_horizon: float = 1.0  # Draw the projection at most this multiple of the tested cycles ahead
+    
+
+@dataclass
+class DetectionConfig:
+    """Streaming detectors run by the processing worker (see detection.DETECTOR_TYPES)"""
+    enabled: bool = True
+    max_markers: int = 1000  # Detection markers kept on the plots (oldest dropped first)
+    max_log_per_batch: int = 5  # Status log lines per batch (the rest are summarized)
+    trigger_events: bool = False  # Detections also trigger full-resolution event files (LogConfig.event_*)
+    detectors: List[dict] = field(default_factory=lambda: [
+        {'type': 'cusum', 'column': 'force_upper', 'k': 0.5, 'h': 12.0},
+        {'type': 'cusum', 'column': 'force_lower', 'k': 0.5, 'h': 12.0},
+        {'type': 'ewma', 'column': 'travel_at_upper', 'alpha': 0.1, 'limit_sigma': 5.0},
+        {'type': 'ewma', 'column': 'loss_of_stiffness', 'alpha': 0.1, 'limit_sigma': 5.0},
+        {'type': 'rate', 'column': 'loss_of_stiffness', 'max_rate': 5.0},  # % per cycle
+        {'type': 'threshold', 'column': 'loss_of_stiffness', 'high': 50.0},  # %
+    ])
+    
+
 @dataclass
 class LogConfig:
     """Logging configuration"""
     base_filename: str = "fatigue_test"
     file_extension: str = ".csv"
+    log_format: str = "csv"  # "csv", "binary" (columnar .ftb), "both" or "compressed" (.ftz)
+    binary_extension: str = ".ftb"
+    compressed_extension: str = ".ftz"
+    compression_mode: str = "swinging_door"  # "swinging_door" (interpolated) or "deadband" (held values)
+    compression_tolerances: Dict[str, float] = field(default_factory=lambda: {
+        "Position_1_mm": 0.01, "Force_Lower_N": 1.0, "Travel_1_mm": 0.01, "Position_2_mm": 0.01,
+        "Force_Upper_N": 1.0, "Travel_2_mm": 0.01, "Travel_at_Upper_mm": 0.01,
+    })  # Largest reconstruction error per channel (physical units; FIELD_SCALES names)
+    compression_time_tolerance_ms: float = 100.0  # Largest reconstruction error of the timestamps
+    compression_max_gap_rows: int = 1000  # Store every channel at least this often (bounds loss on a crash)
     timestamp_format: str = "%Y%m%d_%H%M%S"
+    flush_every_rows: int = 100  # Flush the open file after this many rows (0 = never by count)
+    flush_interval_ms: int = 1000  # Flush when the last flush is older than this (0 = never by time)
+    flush_on_event: bool = True  # Flush immediately after END or error records
+    fsync_on_flush: bool = False  # Also force data to disk (os.fsync) on every flush
+    background_writer: bool = True  # Write files from a dedicated thread instead of the caller
+    writer_queue_size: int = 1000  # Maximum batches waiting for the writer thread (caller blocks when full)
+    writer_timeout_s: float = 10.0  # Longest close/save wait for the writer thread (then reported)
+    buffer_chunk_rows: int = 65536  # Rows per chunk of the in-memory record store
+    buffer_memory_limit_mb: float = 64.0  # Older chunks beyond this size are spilled to a temporary file
+    log_every_cycles: int = 1  # Decimated logging: first record per this many cycles (END/error records always)
+    event_capture: bool = True  # Write full-resolution event files around trigger records
+    event_trigger_codes: List[int] = field(default_factory=lambda: [code for code in ERROR_CODES if code])
+    event_window_unit: str = "seconds"  # Pre/post-trigger windows in "seconds" or "cycles"
+    event_pre_trigger: float = 10.0  # Window kept before the trigger
+    event_post_trigger: float = 5.0  # Window collected after the trigger (later triggers inside it are merged)
+    event_buffer_rows: int = 200000  # Ring buffer size in records (bounds the pre-trigger window)
+    event_max_files: int = 100  # Event files per log file (later events are counted, not written)
+    event_subdir: str = "events"  # Event files go to this subdirectory of the log directory
     
 
+@dataclass
+class IpcConfig:
+    """Local socket between the acquisition daemon (acquire.py --serve) and attached viewers"""
+    host: str = "127.0.0.1"  # Loopback only; viewers run on the acquisition PC
+    port: int = 47800
+    max_pending_messages: int = 1000  # Per viewer; a viewer this far behind is detached (never blocks logging)
+    snapshot_chunk_rows: int = 65536  # Records per history message on attach
+    statistics_interval_ms: int = 1000  # Logger statistics sent to viewers this often
+
+
+@dataclass
+class StationConfig:
+    """One tester of a multi-station acquisition (multi_station.py)"""
+    name: str = "Station 1"  # Also the log subdirectory of the station
+    serial: SerialConfig = field(default_factory=SerialConfig)
+
+
 @dataclass
 class WatchdogConfig:
     """Watchdog configuration"""
@@ -61,6 +166,18 @@ ERROR_CODES: Dict[int, str] = {
 }
 
 
+# Fixed-point scale of the numeric fields (value sent by the tester = physical value * scale)
+FIELD_SCALES: Dict[str, int] = {
+    "Position_1_mm": 100,
+    "Force_Lower_N": 10,
+    "Travel_1_mm": 100,
+    "Position_2_mm": 100,
+    "Force_Upper_N": 10,
+    "Travel_2_mm": 100,
+    "Travel_at_Upper_mm": 100,
+}
+
+
 # Data format specification
 DATA_FIELDS = [
     "Status",           # DTA or END
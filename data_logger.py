@@ -5,37 +5,93 @@ Handles logging of test data to CSV files -
 
 import os
 import csv
+import time
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
-import pandas as pd
+from typing import Optional, List, TextIO, Callable, TYPE_CHECKING
 from config import LogConfig
-from data_parser import FatigueTestData
+from data_parser import FatigueTestData, records_to_array
+from binary_log import BinaryLogWriter
+from compressed_log import CompressedLogWriter, raw_tolerances
+from data_store import ColumnStore, CSV_COLUMNS, columns_to_dataframe
+from event_capture import EventCapture, EventTrigger
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported on first export only; keeps startup light
+
+
+# Records handed to the event capture at once (it costs a fixed overhead per call)
+CAPTURE_CHUNK_ROWS = 1024
 
 
 class DataLogger:
     """
     Consumer that logs data to CSV files
     Implements file management and CSV writing
+    
+    With LogConfig.background_writer enabled, rows are handed to a writer
+    thread through a bounded queue so the caller never waits on the disk
+    (unless the queue is full).
+    
+    With LogConfig.log_every_cycles > 1 only the first record per that many
+    cycles (and every END or error record) is logged, while all records
+    still pass through the event capture ring buffer, which writes
+    full-resolution event files around error records (see EventCapture).
     """
     
-    def __init__(self, config: LogConfig, output_dir: str = "./logs"):
+    def __init__(self, config: LogConfig, output_dir: str = "./logs",
+                 status_callback: Optional[Callable] = None,
+                 event_callback: Optional[Callable] = None):
         """
         Initialize data logger
         
         Args:
             config: Logging configuration
             output_dir: Directory for log files
+            status_callback: Optional callback for error reports (may be
+                called from the writer thread)
+            event_callback: Optional callback with a message per written
+                event file (may be called from the writer thread)
         """
         self.config = config
+        self.status_callback = status_callback
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
         self.current_file: Optional[Path] = None
         self.current_filename: Optional[str] = None
-        self.data_buffer: List[FatigueTestData] = []
+        # Fixed-point copy of everything logged, for export_to_dataframe
+        self.data_store = ColumnStore(config.buffer_chunk_rows, config.buffer_memory_limit_mb)
         self.total_points_logged = 0
         
+        # Open file handles, kept for the whole log session
+        self._file: Optional[TextIO] = None
+        self._csv_writer = None
+        self.binary_file: Optional[Path] = None
+        self._binary_writer: Optional[BinaryLogWriter] = None  # Or CompressedLogWriter
+        self.compression_ratio: Optional[float] = None  # Of the last compressed log file
+        self._rows_since_flush = 0
+        self._last_flush_time = 0.0
+        self.flush_count = 0
+        
+        # Decimated logging and full-resolution event files
+        self._next_logged_cycle: Optional[int] = None
+        self._last_cycles: Optional[int] = None
+        self.points_decimated = 0
+        self.event_capture = EventCapture(config, event_callback) if config.event_capture else None
+        self._capture_rows: List[tuple] = []  # Fixed-point records not yet passed to event_capture
+        
+        # Background writer thread and its bounded queue
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self.points_written = 0
+        self.write_errors = 0
+        self._latency_total = 0.0
+        self._latency_count = 0
+        self._latency_max = 0.0
+        
     def start_new_log(self) -> str:
         """
         Start a new log file with timestamp
@@ -44,52 +100,85 @@ class DataLogger:
         Returns:
             Path to the new log file
         """
+        if self.current_file:
+            self.close_log()
+        
+        # CSV is the primary file unless only the binary or compressed format is written
+        if self._writes_csv():
+            extension = self.config.file_extension
+        elif self._writes_compressed():
+            extension = self.config.compressed_extension
+        else:
+            extension = self.config.binary_extension
+        
         timestamp = datetime.now().strftime(self.config.timestamp_format)
         base_name = f"{self.config.base_filename}_{timestamp}"
-        filename = f"{base_name}{self.config.file_extension}"
+        filename = f"{base_name}{extension}"
         filepath = self.output_dir / filename
         
-        # Ensure we don't overwrite existing files
+        # Ensure we don't overwrite existing files (of either format)
         counter = 1
-        while filepath.exists():
-            filename = f"{base_name}_{counter:02d}{self.config.file_extension}"
+        while (filepath.exists() or filepath.with_suffix(self.config.binary_extension).exists()
+               or filepath.with_suffix(self.config.compressed_extension).exists()):
+            filename = f"{base_name}_{counter:02d}{extension}"
             filepath = self.output_dir / filename
             counter += 1
         
         self.current_file = filepath
         self.current_filename = filename
         
-        # Create file with header
+        # Create file(s) with header
         self._write_header()
         
+        self._next_logged_cycle = None
+        if self.event_capture:
+            self.event_capture.start(self.output_dir / self.config.event_subdir / filename)
+        
+        if self.config.background_writer:
+            self._start_writer()
+        
         print(f"[DataLogger] Started new log file: {filename}")
         return str(filepath)
     
+    def _writes_csv(self) -> bool:
+        """Check if the configured log format includes CSV"""
+        return self.config.log_format in ("csv", "both")
+    
+    def _writes_binary(self) -> bool:
+        """Check if the configured log format includes the binary columnar file"""
+        return self.config.log_format in ("binary", "both")
+    
+    def _writes_compressed(self) -> bool:
+        """Check if the configured log format is the compressed file"""
+        return self.config.log_format == "compressed"
+    
     def _write_header(self):
-        """Write CSV header to current file"""
+        """Create current file(s), write headers and keep the files open"""
         if not self.current_file:
             return
         
-        headers = [
-            'Timestamp',
-            'Status',
-            'Cycles',
-            'Position_1_mm',
-            'Force_Lower_N',
-            'Travel_1_mm',
-            'Position_2_mm',
-            'Force_Upper_N',
-            'Travel_2_mm',
-            'Travel_at_Upper_mm',
-            'Loss_of_Stiffness_Percent',
-            'Error_Code',
-            'Error_Description',
-            'Raw_Data'
-        ]
-        
-        with open(self.current_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
+        if self._writes_csv():
+            headers = CSV_COLUMNS
+            
+            self._file = open(self.current_file, 'w', newline='', encoding='utf-8')
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow(headers)
+        
+        if self._writes_binary():
+            self.binary_file = self.current_file.with_suffix(self.config.binary_extension)
+            self._binary_writer = BinaryLogWriter(self.binary_file)
+        
+        if self._writes_compressed():
+            # Same interface as the binary writer; it is the only file
+            self.binary_file = self.current_file
+            tolerances = raw_tolerances(self.config.compression_tolerances,
+                                        self.config.compression_time_tolerance_ms)
+            self._binary_writer = CompressedLogWriter(self.binary_file, tolerances,
+                                                      self.config.compression_mode,
+                                                      self.config.compression_max_gap_rows)
+            self.compression_ratio = None
+        
+        self.flush()
     
     def log_data(self, data: FatigueTestData):
         """
@@ -98,31 +187,266 @@ class DataLogger:
         Args:
             data: Parsed fatigue test data
         """
+        self.log_batch([data])
+    
+    def log_batch(self, batch: List[FatigueTestData]):
+        """
+        Log several data points with a single file write
+        
+        Args:
+            batch: Parsed fatigue test data, in arrival order
+        """
+        if not batch:
+            return
+        
         if not self.current_file:
             self.start_new_log()
         
-        # Add to buffer
-        self.data_buffer.append(data)
+        logged = self._decimate(batch)
+        self.data_store.extend(logged)
         
-        # Write to file
-        self._write_to_file(data)
+        if self._write_queue is not None:
+            # Blocks only if the writer has fallen writer_queue_size batches behind
+            self._write_queue.put((time.monotonic(), batch, logged))
+        else:
+            self._process_batch(batch, logged)
         
-        self.total_points_logged += 1
+        self.total_points_logged += len(logged)
+        self.points_decimated += len(batch) - len(logged)
+    
+    def _decimate(self, batch: List[FatigueTestData]) -> List[FatigueTestData]:
+        """Records of a batch to log with LogConfig.log_every_cycles"""
+        step = self.config.log_every_cycles
+        if step <= 1:
+            return batch
+        
+        logged = []
+        next_cycle = self._next_logged_cycle
+        last_cycles = self._last_cycles
+        for data in batch:
+            cycles = data.cycles
+            # A decreasing cycle count starts a new test
+            if last_cycles is not None and cycles < last_cycles:
+                next_cycle = None
+            last_cycles = cycles
+            
+            if next_cycle is None or cycles >= next_cycle:
+                next_cycle = (cycles // step + 1) * step
+                logged.append(data)
+            elif data.error_code or data.is_test_end():
+                logged.append(data)
+        
+        self._next_logged_cycle = next_cycle
+        self._last_cycles = last_cycles
+        return logged
+    
+    def trigger_event(self, reason: str):
+        """
+        Write an event file around the most recent record (user-defined trigger)
+        
+        Args:
+            reason: Text recorded with the event
+        """
+        if not self.event_capture:
+            return
+        if self._write_queue is not None:
+            # In order with the batches still waiting for the writer
+            self._write_queue.put(EventTrigger(reason))
+        else:
+            self._trigger_capture(reason)
+    
+    def _process_batch(self, batch: List[FatigueTestData], logged: List[FatigueTestData]):
+        """Pass all records through the event capture and write the logged ones"""
+        if self.event_capture:
+            self._capture_rows.extend(data.to_record() for data in batch)
+            if len(self._capture_rows) >= CAPTURE_CHUNK_ROWS:
+                self._flush_capture()
+        
+        if logged:
+            self._write_batch_to_file(logged)
+    
+    def _flush_capture(self):
+        """Pass the collected records to the event capture"""
+        if not self._capture_rows:
+            return
+        try:
+            records = records_to_array(self._capture_rows)
+            self._capture_rows.clear()
+            self.event_capture.process(records)
+        except Exception as e:
+            self._capture_rows.clear()
+            self.write_errors += 1
+            self._report_error(f"Error capturing events: {e}")
+    
+    def _trigger_capture(self, reason: str):
+        """User trigger at the last record passed to the logger"""
+        self._flush_capture()
+        self.event_capture.trigger(reason)
     
     def _write_to_file(self, data: FatigueTestData):
         """Write single data point to CSV file"""
-        if not self.current_file:
+        self._write_batch_to_file([data])
+    
+    def _write_batch_to_file(self, batch: List[FatigueTestData]):
+        """Write data points to the open file(s) and apply the flush policy"""
+        if not self._file and not self._binary_writer:
             return
         
         try:
-            data_dict = data.to_dict()
+            if self._csv_writer:
+                self._csv_writer.writerows(data.to_dict().values() for data in batch)
+            if self._binary_writer:
+                self._binary_writer.write_records(records_to_array([data.to_record() for data in batch]))
+            self._rows_since_flush += len(batch)
+            self.points_written += len(batch)
+            
+            if self._flush_due(batch):
+                self.flush()
+                
+        except Exception as e:
+            self.write_errors += 1
+            self._report_error(f"Error writing to file: {e}")
+    
+    def _flush_due(self, batch: List[FatigueTestData]) -> bool:
+        """Check the configured flush policy after writing a batch"""
+        config = self.config
+        
+        if config.flush_on_event and any(data.is_test_end() or data.has_error() for data in batch):
+            return True
+        
+        if config.flush_every_rows and self._rows_since_flush >= config.flush_every_rows:
+            return True
+        
+        if (config.flush_interval_ms and
+                (time.monotonic() - self._last_flush_time) * 1000.0 >= config.flush_interval_ms):
+            return True
+        
+        return False
+    
+    def flush(self):
+        """Flush buffered rows to the operating system (and to disk if fsync is enabled)"""
+        if not self._file and not self._binary_writer:
+            return
+        
+        for handle in (self._file, self._binary_writer):
+            if handle:
+                handle.flush()
+                if self.config.fsync_on_flush:
+                    os.fsync(handle.fileno())
+        
+        self._rows_since_flush = 0
+        self._last_flush_time = time.monotonic()
+        self.flush_count += 1
+    
+    def _start_writer(self):
+        """Start the writer thread for the current log file"""
+        self._write_queue = queue.Queue(maxsize=self.config.writer_queue_size)
+        self._writer_thread = threading.Thread(target=self._writer_loop,
+                                               name="DataLoggerWriter", daemon=True)
+        self._writer_thread.start()
+    
+    def _stop_writer(self):
+        """Let the writer thread drain its queue, then stop it (waits at most writer_timeout_s)"""
+        if self._writer_thread is None:
+            return
+        
+        timeout = self.config.writer_timeout_s
+        deadline = time.monotonic() + timeout
+        try:
+            self._write_queue.put(None, timeout=timeout)
+            self._writer_thread.join(max(deadline - time.monotonic(), 0.0))
+        except queue.Full:
+            pass
+        if self._writer_thread.is_alive():
+            # Detached: the thread stops at its next queue item
+            self.write_errors += 1
+            self._report_error(f"Writer thread did not finish within {timeout:g} s; "
+                               f"rows still queued are not written")
+        self._writer_thread = None
+        self._write_queue = None
+    
+    def _writer_loop(self):
+        """
+        Writer thread loop - owns all file writes while it runs
+        
+        Queue items are (enqueue_time, batch, logged_records) tuples,
+        threading.Event flush requests, EventTrigger user triggers, or None
+        to stop after everything queued before it. A thread that _stop_writer
+        gave up on stops at its next item.
+        """
+        write_queue = self._write_queue
+        idle_timeout = self.config.flush_interval_ms / 1000.0 if self.config.flush_interval_ms else None
+        
+        while True:
+            try:
+                item = write_queue.get(timeout=idle_timeout)
+            except queue.Empty:
+                if write_queue is not self._write_queue:
+                    break
+                # Quiet line - don't leave rows sitting in the buffer
+                if self._rows_since_flush:
+                    self._flush_safely()
+                if self.event_capture:
+                    self._flush_capture()
+                continue
+            
+            if item is None or write_queue is not self._write_queue:
+                break
             
-            with open(self.current_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=data_dict.keys())
-                writer.writerow(data_dict)
+            if isinstance(item, threading.Event):
+                self._flush_safely()
+                item.set()
+                continue
+            
+            # An unexpected error must not end the thread: close_log and
+            # log_batch would then wait for it
+            try:
+                if isinstance(item, EventTrigger):
+                    self._trigger_capture(item.reason)
+                    continue
                 
+                enqueued, batch, logged = item
+                self._process_batch(batch, logged)
+            except Exception as e:
+                self.write_errors += 1
+                self._report_error(f"Error in writer thread: {e}")
+                continue
+            
+            latency = time.monotonic() - enqueued
+            self._latency_total += latency
+            self._latency_count += 1
+            self._latency_max = max(self._latency_max, latency)
+    
+    def _flush_safely(self):
+        """Flush from the writer thread, reporting instead of raising errors"""
+        try:
+            self.flush()
+        except Exception as e:
+            self.write_errors += 1
+            self._report_error(f"Error flushing file: {e}")
+    
+    def _report_error(self, message: str):
+        """Report a file error via callback"""
+        if self.status_callback:
+            self.status_callback(message)
+        print(f"[DataLogger] {message}")
+    
+    def _close_file(self):
+        """Flush and close the open file handles"""
+        try:
+            self.flush()
+            if self._file:
+                self._file.close()
+            if self._binary_writer:
+                self._binary_writer.close()
+                if isinstance(self._binary_writer, CompressedLogWriter):
+                    self.compression_ratio = self._binary_writer.compression_ratio
         except Exception as e:
-            print(f"[DataLogger] Error writing to file: {e}")
+            print(f"[DataLogger] Error closing file: {e}")
+        finally:
+            self._file = None
+            self._csv_writer = None
+            self._binary_writer = None
     
     def save_current_log(self, user_filename: Optional[str] = None) -> Optional[str]:
         """
@@ -138,20 +462,37 @@ class DataLogger:
             print("[DataLogger] No active log file to save")
             return None
         
+        # Make sure everything logged so far is in the file
+        if self._writer_thread is not None:
+            timeout = self.config.writer_timeout_s
+            flushed = threading.Event()
+            try:
+                self._write_queue.put(flushed, timeout=timeout)
+            except queue.Full:
+                pass
+            if not flushed.wait(timeout):
+                self._report_error(f"Writer thread did not flush within {timeout:g} s; "
+                                   f"the saved copy may miss the latest rows")
+        else:
+            self.flush()
+        
         if user_filename:
             # Create new filename
-            new_path = self.output_dir / f"{user_filename}{self.config.file_extension}"
+            extension = self.current_file.suffix
+            new_path = self.output_dir / f"{user_filename}{extension}"
             
             # Ensure no overwriting
             counter = 1
             while new_path.exists():
-                new_path = self.output_dir / f"{user_filename}_{counter:02d}{self.config.file_extension}"
+                new_path = self.output_dir / f"{user_filename}_{counter:02d}{extension}"
                 counter += 1
             
             # Copy current file to new location
             try:
                 import shutil
                 shutil.copy2(self.current_file, new_path)
+                if self.binary_file and self.binary_file != self.current_file:
+                    shutil.copy2(self.binary_file, new_path.with_suffix(self.config.binary_extension))
                 print(f"[DataLogger] Saved log as: {new_path.name}")
                 return str(new_path)
             except Exception as e:
@@ -161,38 +502,67 @@ class DataLogger:
         return str(self.current_file)
     
     def close_log(self):
-        """Close current log file"""
+        """Close current log file (waits until all queued rows are written)"""
+        self._stop_writer()
+        
+        # An event still collecting its post-trigger window is written as is
+        if self.event_capture:
+            self._flush_capture()
+            self.event_capture.finish()
+        
+        if self._file or self._binary_writer:
+            self._close_file()
+        
         if self.current_file:
             print(f"[DataLogger] Closed log file: {self.current_filename}")
             self.current_file = None
             self.current_filename = None
+            self.binary_file = None
     
     def get_statistics(self) -> dict:
         """Get logging statistics"""
+        # Read once: the writer thread is replaced when the log is closed or restarted
+        write_queue = self._write_queue
         return {
             'current_file': self.current_filename,
             'total_points_logged': self.total_points_logged,
-            'buffer_size': len(self.data_buffer),
+            'buffer_size': len(self.data_store),
+            'buffer_memory_bytes': self.data_store.memory_bytes,
+            'buffer_spilled_rows': self.data_store.spilled_rows,
+            'flush_count': self.flush_count,
+            'points_written': self.points_written,
+            'write_errors': self.write_errors,
+            'queue_depth': write_queue.qsize() if write_queue is not None else 0,
+            'write_latency_ms_avg': (self._latency_total / self._latency_count * 1000.0
+                                     if self._latency_count else 0.0),
+            'write_latency_ms_max': self._latency_max * 1000.0,
+            'points_decimated': self.points_decimated,
+            'compression_ratio': (self._binary_writer.compression_ratio
+                                  if isinstance(self._binary_writer, CompressedLogWriter)
+                                  else self.compression_ratio),
+            'events_captured': len(self.event_capture.events) if self.event_capture else 0,
+            'event_rows_written': self.event_capture.event_rows_written if self.event_capture else 0,
             'output_directory': str(self.output_dir)
         }
     
-    def export_to_dataframe(self) -> Optional[pd.DataFrame]:
+    def export_to_dataframe(self) -> Optional["pd.DataFrame"]:
         """
         Export current buffer to pandas DataFrame
         
         Returns:
             DataFrame with logged data
         """
-        if not self.data_buffer:
+        if not len(self.data_store):
             return None
         
-        data_dicts = [data.to_dict() for data in self.data_buffer]
-        return pd.DataFrame(data_dicts)
+        return columns_to_dataframe(self.data_store.columns())
     
     def get_log_files(self) -> List[str]:
         """Get list of all log files in output directory"""
         if not self.output_dir.exists():
             return []
         
-        csv_files = list(self.output_dir.glob(f"*{self.config.file_extension}"))
-        return [f.name for f in sorted(csv_files, reverse=True)]
+        log_files = list(self.output_dir.glob(f"*{self.config.file_extension}"))
+        log_files += self.output_dir.glob(f"*{self.config.binary_extension}")
+        log_files += self.output_dir.glob(f"*{self.config.compressed_extension}")
+        return [f.name for f in sorted(log_files, reverse=True)]
@@ -3,32 +3,259 @@ Data Parser module for Fatigue Tester
 Handles parsing and validation of serial data
 """
 
+import itertools
+import time
 from typing import Dict, Optional, Tuple
-from dataclasses import dataclass
 from datetime import datetime
+import numpy as np
 import config
 
 
-@dataclass
+# Record status values as stored in fixed-point records (-1 = anything else)
+STATUS_CODES = ("DTA", "END")
+
+# Fixed-point layout of one record: the fields of config.DATA_FIELDS as the
+# integers sent by the tester (see config.FIELD_SCALES) plus a timestamp
+RECORD_DTYPE = np.dtype(
+    [("Timestamp_ns", np.int64),  # time.monotonic_ns() clock, see MONOTONIC_EPOCH_OFFSET_NS
+     ("Status", np.int8),
+     ("Cycles", np.int64)]
+    + [(name, np.int32) for name in config.FIELD_SCALES]
+    + [("Error_Code", np.int16)]
+)
+
+# Wall clock time (ns since epoch) = monotonic timestamp + this offset
+MONOTONIC_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+# Bytes allowed after the last ';' of a line: '!', CR, space, tab
+_TAIL_BYTES = np.zeros(256, dtype=bool)
+_TAIL_BYTES[[ord('!'), ord('\r'), ord(' '), ord('\t')]] = True
+
+# Bytes allowed inside the integer fields: digits, '-' and the separators
+_DIGIT_BYTES = np.zeros(256, dtype=bool)
+_DIGIT_BYTES[ord('0'):ord('9') + 1] = True
+# bytes.translate table flagging (1) every other byte
+_NON_NUMBER_TABLE = bytes(0 if chr(code) in '0123456789-;' else 1 for code in range(256))
+
+# Value range of every RECORD_DTYPE column, in field order
+_RECORD_LIMITS = [(int(np.iinfo(RECORD_DTYPE.fields[name][0]).min), int(np.iinfo(RECORD_DTYPE.fields[name][0]).max))
+                  for name in RECORD_DTYPE.names]
+
+# Value ranges of the integer columns after Status (in RECORD_DTYPE order);
+# Cycles is int64 like the parsed values and needs no range check in parse_batch
+_COLUMN_LIMITS = _RECORD_LIMITS[2:]
+
+# The same limits unpacked for the per-frame check of parse_frame: Cycles,
+# the seven int32 measurement columns and Error_Code
+_CYCLES_HIGH = _COLUMN_LIMITS[0][1]
+_MEASUREMENT_LOW, _MEASUREMENT_HIGH = _COLUMN_LIMITS[1]
+_ERROR_CODE_LOW, _ERROR_CODE_HIGH = _COLUMN_LIMITS[8]
+
+
+def _out_of_range_column(values) -> Optional[str]:
+    """Name of the first value (Cycles ... Error_Code) that does not fit its column, or None"""
+    for name, value, (low, high) in zip(RECORD_DTYPE.names[2:], values, _COLUMN_LIMITS):
+        if not low <= value <= high:
+            return name
+    return None
+
+
+# Status strings shared by all records instead of one copy per line
+_STATUS_NAMES = {name: name for name in STATUS_CODES}
+_STATUS_BYTES = {name.encode('ascii'): name for name in STATUS_CODES}
+
+# Integer per field text for the fields after Cycles. Measurements repeat
+# a limited set of values; a dict lookup is much cheaper than int() and
+# the records share one int object per value.
+_FIELD_VALUES: Dict[bytes, int] = {}
+_FIELD_VALUES_LIMIT = 65536
+
+
+def _field_value(text: bytes) -> int:
+    """Convert a field with int() and remember the result"""
+    value = _FIELD_VALUES.get(text)
+    if value is None:
+        value = int(text)
+        if len(_FIELD_VALUES) < _FIELD_VALUES_LIMIT:
+            _FIELD_VALUES[text] = value
+    return value
+
+
+def records_to_array(rows) -> np.ndarray:
+    """
+    Convert FatigueTestData.to_record() tuples to a RECORD_DTYPE array
+
+    A value that does not fit its fixed-point column (e.g. error code
+    99999) is clipped to the column's range instead of failing the batch.
+
+    Args:
+        rows: Sequence of tuples in RECORD_DTYPE field order
+
+    Returns:
+        RECORD_DTYPE structured array
+    """
+    try:
+        return np.array(rows, dtype=RECORD_DTYPE)
+    except OverflowError:
+        return np.array([tuple(min(max(value, low), high) for value, (low, high) in zip(row, _RECORD_LIMITS))
+                         for row in rows], dtype=RECORD_DTYPE)
+
+
+# Classification flags returned by DataParser.parse_frame
+FRAME_VALID = 0
+FRAME_TEST_END = 1      # Status END
+FRAME_ERROR_CODE = 2    # Tester reported a non-zero error code
+FRAME_INVALID = 4       # Parsed, but rejected by validate_data()
+FRAME_MALFORMED = 8     # Could not be parsed at all
+
+# Last formatted second: records arrive in order, so most share it
+_second_text_cache = (None, '')
+
+
+def _wall_clock_text(timestamp_ns: int) -> str:
+    """Format a monotonic timestamp as local 'YYYY-mm-dd HH:MM:SS.mmm'"""
+    global _second_text_cache
+    seconds, nanoseconds = divmod(timestamp_ns + MONOTONIC_EPOCH_OFFSET_NS, 1_000_000_000)
+    cached_seconds, text = _second_text_cache
+    if seconds != cached_seconds:
+        text = datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+        _second_text_cache = (seconds, text)
+    return f"{text}.{nanoseconds // 1_000_000:03d}"
+
+
 class FatigueTestData:
-    """Structured data from fatigue test"""
-    timestamp: datetime
-    status: str
-    cycles: int
-    position_1_mm: float
-    force_lower_n: float
-    travel_1_mm: float
-    position_2_mm: float
-    force_upper_n: float
-    travel_2_mm: float
-    travel_at_upper_mm: float
-    error_code: int
-    raw_data: str
+    """
+    Structured data from fatigue test
+    
+    Kept compact: the fields are stored as the fixed-point integers sent by
+    the tester (see config.FIELD_SCALES) with a time.monotonic_ns()
+    timestamp. Physical values, loss of stiffness, the wall clock timestamp
+    and the raw line are derived on access; the costly ones are cached.
+    
+    The keyword constructor takes physical values (mm, N, datetime);
+    from_scaled() builds a record directly from the integers.
+    """
+    __slots__ = (
+        'timestamp_ns', 'status', 'cycles',
+        'position_1_raw', 'force_lower_raw', 'travel_1_raw', 'position_2_raw',
+        'force_upper_raw', 'travel_2_raw', 'travel_at_upper_raw', 'error_code',
+        # Caches, left unset until first use
+        '_raw_data', '_loss_of_stiffness', '_timestamp_text',
+    )
+    
+    def __init__(self, timestamp: datetime, status: str, cycles: int,
+                 position_1_mm: float, force_lower_n: float, travel_1_mm: float,
+                 position_2_mm: float, force_upper_n: float, travel_2_mm: float,
+                 travel_at_upper_mm: float, error_code: int, raw_data: Optional[str] = None):
+        epoch_ns = int(timestamp.timestamp()) * 1_000_000_000 + timestamp.microsecond * 1000
+        self.timestamp_ns = epoch_ns - MONOTONIC_EPOCH_OFFSET_NS
+        self.status = status
+        self.cycles = cycles
+        self.position_1_raw = round(position_1_mm * 100)
+        self.force_lower_raw = round(force_lower_n * 10)
+        self.travel_1_raw = round(travel_1_mm * 100)
+        self.position_2_raw = round(position_2_mm * 100)
+        self.force_upper_raw = round(force_upper_n * 10)
+        self.travel_2_raw = round(travel_2_mm * 100)
+        self.travel_at_upper_raw = round(travel_at_upper_mm * 100)
+        self.error_code = error_code
+        if raw_data is not None:
+            self._raw_data = raw_data
+    
+    @classmethod
+    def from_scaled(cls, timestamp_ns: int, status: str, cycles: int,
+                    position_1: int, force_lower: int, travel_1: int, position_2: int,
+                    force_upper: int, travel_2: int, travel_at_upper: int,
+                    error_code: int) -> 'FatigueTestData':
+        """
+        Create a record from fixed-point integers
+        
+        Args:
+            timestamp_ns: time.monotonic_ns() at reception
+            status, cycles, error_code: As received
+            position_1 ... travel_at_upper: Integers as sent by the tester
+        """
+        data = cls.__new__(cls)
+        data.timestamp_ns = timestamp_ns
+        data.status = status
+        data.cycles = cycles
+        data.position_1_raw = position_1
+        data.force_lower_raw = force_lower
+        data.travel_1_raw = travel_1
+        data.position_2_raw = position_2
+        data.force_upper_raw = force_upper
+        data.travel_2_raw = travel_2
+        data.travel_at_upper_raw = travel_at_upper
+        data.error_code = error_code
+        return data
+    
+    # Physical values (last 2 digits are decimals for mm, last digit for N)
+    @property
+    def position_1_mm(self) -> float:
+        return self.position_1_raw / 100.0
+    
+    @property
+    def force_lower_n(self) -> float:
+        return self.force_lower_raw / 10.0
+    
+    @property
+    def travel_1_mm(self) -> float:
+        return self.travel_1_raw / 100.0
+    
+    @property
+    def position_2_mm(self) -> float:
+        return self.position_2_raw / 100.0
+    
+    @property
+    def force_upper_n(self) -> float:
+        return self.force_upper_raw / 10.0
+    
+    @property
+    def travel_2_mm(self) -> float:
+        return self.travel_2_raw / 100.0
+    
+    @property
+    def travel_at_upper_mm(self) -> float:
+        return self.travel_at_upper_raw / 100.0
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Local wall clock time of reception"""
+        seconds, nanoseconds = divmod(self.timestamp_ns + MONOTONIC_EPOCH_OFFSET_NS, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
+    
+    @property
+    def timestamp_text(self) -> str:
+        """Timestamp as written to the CSV log (millisecond resolution)"""
+        try:
+            return self._timestamp_text
+        except AttributeError:
+            self._timestamp_text = _wall_clock_text(self.timestamp_ns)
+            return self._timestamp_text
+    
+    @property
+    def raw_data(self) -> str:
+        """Received line (rebuilt from the fields unless given explicitly)"""
+        try:
+            return self._raw_data
+        except AttributeError:
+            pass
+        return (f"{self.status};{self.cycles};{self.position_1_raw};{self.force_lower_raw};"
+                f"{self.travel_1_raw};{self.position_2_raw};{self.force_upper_raw};"
+                f"{self.travel_2_raw};{self.travel_at_upper_raw};{self.error_code};!")
+    
+    def __repr__(self) -> str:
+        return f"FatigueTestData({self.raw_data!r}, timestamp_ns={self.timestamp_ns})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FatigueTestData):
+            return NotImplemented
+        return self.to_record() == other.to_record()
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for CSV export"""
         return {
-            'Timestamp': self.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'Timestamp': self.timestamp_text,
             'Status': self.status,
             'Cycles': self.cycles,
             'Position_1_mm': self.position_1_mm,
@@ -44,11 +271,34 @@ class FatigueTestData:
             'Raw_Data': self.raw_data
         }
     
+    def to_record(self) -> tuple:
+        """Convert to a fixed-point tuple matching RECORD_DTYPE"""
+        status = STATUS_CODES.index(self.status) if self.status in STATUS_CODES else -1
+        return (
+            self.timestamp_ns,
+            status,
+            self.cycles,
+            self.position_1_raw,
+            self.force_lower_raw,
+            self.travel_1_raw,
+            self.position_2_raw,
+            self.force_upper_raw,
+            self.travel_2_raw,
+            self.travel_at_upper_raw,
+            self.error_code,
+        )
+    
     def calculate_loss_of_stiffness(self) -> float:
         """Calculate loss of stiffness percentage"""
-        if self.travel_at_upper_mm == 0:
-            return 0.0
-        return (self.travel_2_mm / self.travel_at_upper_mm) * 100.0
+        try:
+            return self._loss_of_stiffness
+        except AttributeError:
+            pass
+        if self.travel_at_upper_raw == 0:
+            self._loss_of_stiffness = 0.0
+        else:
+            self._loss_of_stiffness = (self.travel_2_mm / self.travel_at_upper_mm) * 100.0
+        return self._loss_of_stiffness
     
     def is_test_end(self) -> bool:
         """Check if test has ended"""
@@ -77,50 +327,126 @@ class DataParser:
         Returns:
             FatigueTestData object or None if parsing fails
         """
-        try:
-            # Remove trailing exclamation mark and whitespace
-            raw_data = raw_data.strip()
-            if raw_data.endswith('!'):
-                raw_data = raw_data[:-1]
-            
-            # Split by semicolon
-            parts = raw_data.split(';')
+        return self.parse_frame(raw_data)[0]
+    
+    def parse_frame(self, frame) -> Tuple[Optional[FatigueTestData], int]:
+        """
+        Parse, validate and classify one received frame in a single pass
+        
+        Works on the frame as received (no decoding to str first), and
+        replaces calling parse(), validate_data(), is_test_end() and
+        has_error() one after another.
+        
+        Args:
+            frame: Raw frame as bytes, bytearray or memoryview (str accepted)
             
+        Returns:
+            (record, frame_class): record is None only for FRAME_MALFORMED;
+            frame_class is FRAME_VALID (0) or a combination of the FRAME_*
+            flags
+        """
+        if type(frame) is not bytes:
+            frame = frame.encode('utf-8', errors='ignore') if isinstance(frame, str) else bytes(frame)
+        
+        # The trailing '!' ends up alone in the last (unused) field
+        parts = frame.strip().split(b';')
+        try:
             if len(parts) != 11:
                 raise ValueError(f"Expected 11 fields, got {len(parts)}")
-            
-            # Parse each field with proper decimal conversion
-            status = parts[0].strip()
-            cycles = int(parts[1])
-            position_1_mm = int(parts[2]) / 100.0  # Last 2 digits are decimals
-            force_lower_n = int(parts[3]) / 10.0    # Last digit is decimal
-            travel_1_mm = int(parts[4]) / 100.0 # Last 2 digits are decimals
-            position_2_mm = int(parts[5]) / 100.0  # Last 2 digits are decimals
-            force_upper_n = int(parts[6]) / 10.0    # Last digit is decimal
-            travel_2_mm = int(parts[7]) / 100.0 # Last 2 digits are decimals
-            travel_at_upper_mm = int(parts[8]) / 100.0  # Last 2 digits are decimals
-            error_code = int(parts[9])
-            
-            # Create structured data object
-            return FatigueTestData(
-                timestamp=datetime.now(),
-                status=status,
-                cycles=cycles,
-                position_1_mm=position_1_mm,
-                force_lower_n=force_lower_n,
-                travel_1_mm=travel_1_mm,
-                position_2_mm=position_2_mm,
-                force_upper_n=force_upper_n,
-                travel_2_mm=travel_2_mm,
-                travel_at_upper_mm=travel_at_upper_mm,
-                error_code=error_code,
-                raw_data=raw_data + '!'
-            )
-            
-        except (ValueError, IndexError) as e:
+            # Fields stay fixed-point integers, see FatigueTestData
+            try:
+                values = (int(parts[1]), *map(_FIELD_VALUES.__getitem__, parts[2:10]))
+            except KeyError:
+                values = (int(parts[1]), *map(_field_value, parts[2:10]))
+        except ValueError as e:
             self.parse_errors += 1
-            print(f"Parse error #{self.parse_errors}: {e} - Data: {raw_data}")
-            return None
+            print(f"Parse error #{self.parse_errors}: {e} - Data: {frame.decode('utf-8', errors='ignore').strip()}")
+            return None, FRAME_MALFORMED
+        
+        frame_class = FRAME_VALID
+        status = _STATUS_BYTES.get(parts[0])
+        if status is None:
+            status = parts[0].strip().decode('utf-8', errors='ignore')
+            status = _STATUS_NAMES.get(status, status)
+            if status not in _STATUS_NAMES:
+                frame_class = FRAME_INVALID
+        # Negative cycles, or a value that does not fit its fixed-point column
+        measurements = values[1:8]
+        if (not 0 <= values[0] <= _CYCLES_HIGH or not _ERROR_CODE_LOW <= values[8] <= _ERROR_CODE_HIGH
+                or min(measurements) < _MEASUREMENT_LOW or max(measurements) > _MEASUREMENT_HIGH):
+            frame_class = FRAME_INVALID
+        
+        if status == "END":
+            frame_class |= FRAME_TEST_END
+        if values[8] != 0:
+            frame_class |= FRAME_ERROR_CODE
+        
+        return FatigueTestData.from_scaled(time.monotonic_ns(), status, *values), frame_class
+    
+    def parse_batch(self, lines) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parse and validate many lines at once into fixed-point records
+        
+        Well-formed lines (DTA/END status, nine plain integers, trailing ';'
+        and optional '!') are converted with vectorized NumPy operations.
+        Any other line falls back to parse() and validate_data(), so the
+        outcome per line matches the single-line path.
+        
+        Args:
+            lines: List of str (or bytes) lines, or one bytes block of
+                newline-separated lines (e.g. a raw capture file)
+            
+        Returns:
+            (records, rejected): RECORD_DTYPE array of the accepted lines in
+            input order, and a boolean mask over the input lines that is True
+            where parsing or validation failed (or a value does not fit its
+            fixed-point column)
+        """
+        if isinstance(lines, (bytes, bytearray, memoryview)):
+            buffer = bytes(lines)
+            if buffer and not buffer.endswith(b'\n'):
+                buffer += b'\n'
+        elif len(lines) == 0:
+            return np.empty(0, dtype=RECORD_DTYPE), np.zeros(0, dtype=bool)
+        elif isinstance(lines[0], str):
+            buffer = ('\n'.join(lines) + '\n').encode('utf-8')
+        else:
+            buffer = b'\n'.join(lines) + b'\n'
+        
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        line_ends = np.flatnonzero(data == ord('\n'))
+        if len(line_ends) == 0:
+            return np.empty(0, dtype=RECORD_DTYPE), np.zeros(0, dtype=bool)
+        line_starts = np.concatenate(([0], line_ends[:-1] + 1)).astype(np.int64)
+        
+        # Status code and the nine integer fields (as columns) of every line
+        status = np.full(len(line_ends), -1, dtype=np.int8)
+        values = np.zeros((9, len(line_ends)), dtype=np.int64)
+        accepted = _parse_well_formed(buffer, data, line_starts, line_ends, status, values)
+        
+        # Slow path for everything the vectorized parser did not accept
+        for index in np.flatnonzero(~accepted):
+            line = buffer[line_starts[index]:line_ends[index]].decode('utf-8', errors='ignore')
+            parsed = self.parse(line)
+            if parsed is None or not self.validate_data(parsed)[0]:
+                continue
+            record = parsed.to_record()
+            status[index] = record[1]
+            values[:, index] = record[2:]
+            accepted[index] = True
+        
+        # Same checks as validate_data, plus the column ranges
+        accepted &= (status >= 0) & (values[0] >= 0)
+        for column, (low, high) in enumerate(_COLUMN_LIMITS[1:], start=1):
+            accepted &= (values[column] >= low) & (values[column] <= high)
+        
+        records = np.zeros(int(accepted.sum()), dtype=RECORD_DTYPE)
+        records['Timestamp_ns'] = time.monotonic_ns()
+        records['Status'] = status[accepted]
+        for column, name in enumerate(RECORD_DTYPE.names[2:]):
+            records[name] = values[column, accepted]
+        
+        return records, ~accepted
     
     def validate_data(self, data: FatigueTestData) -> Tuple[bool, str]:
         """
@@ -136,6 +462,11 @@ class DataParser:
         if data.status not in ["DTA", "END"]:
             return False, f"Invalid status: {data.status}"
         
+        # Every value must fit its fixed-point column (see RECORD_DTYPE)
+        column = _out_of_range_column(data.to_record()[2:])
+        if column is not None:
+            return False, f"Value out of range: {column}"
+        
         # Note: Negative values for force and position are allowed per V2 requirements
         # Upper force should typically be greater than lower force (but not enforced strictly)
         
@@ -144,3 +475,90 @@ class DataParser:
     def get_error_description(self, error_code: int) -> str:
         """Get human-readable error description"""
         return config.ERROR_CODES.get(error_code, f"Unknown Error Code: {error_code}")
+
+
+def _parse_well_formed(buffer: bytes, data: np.ndarray, line_starts: np.ndarray,
+                       line_ends: np.ndarray, status: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized conversion of strictly formatted lines
+    
+    The structure of every line is checked with array operations; the
+    accepted lines are then reduced to one ';'-separated integer string
+    and converted by NumPy's C number parser in a single call.
+    Fills status and values for the lines it accepts.
+    
+    Args:
+        buffer: Input bytes, newline-terminated lines
+        data: The same bytes as uint8 array
+        line_starts: Index of the first byte of each line
+        line_ends: Index of the terminating newline of each line
+        status: Output status code per line
+        values: Output integer fields per line (9 x lines)
+        
+    Returns:
+        Boolean mask of the lines that were converted
+    """
+    accepted = np.zeros(len(line_ends), dtype=bool)
+    
+    # Candidate lines have exactly ten ';' separators
+    separators = np.flatnonzero(data == ord(';'))
+    first_separator = np.searchsorted(separators, line_starts)
+    candidates = np.flatnonzero(np.searchsorted(separators, line_ends) - first_separator == 10)
+    if len(candidates) == 0:
+        return accepted
+    
+    starts = line_starts[candidates]
+    ends = line_ends[candidates]
+    seps = separators[first_separator[candidates, None] + np.arange(10)]
+    
+    # Status: exactly "DTA" or "END"
+    ok = seps[:, 0] - starts == 3
+    first, second, third = data[starts], data[starts + 1], data[starts + 2]
+    ok &= (((first == ord('D')) & (second == ord('T')) & (third == ord('A')))
+           | ((first == ord('E')) & (second == ord('N')) & (third == ord('D'))))
+    
+    # Nothing but '!' and whitespace (at most 4 bytes) after the last separator
+    tail_starts = seps[:, 9] + 1
+    tail_lengths = ends - tail_starts
+    ok &= tail_lengths <= 4
+    for position in range(4):
+        in_tail = position < tail_lengths
+        ok &= ~in_tail | _TAIL_BYTES[data[np.where(in_tail, tail_starts + position, 0)]]
+    
+    # Integer fields: 1..18 characters, only digits and '-' in between
+    field_lengths = np.diff(seps, axis=1) - 1
+    ok &= ((field_lengths >= 1) & (field_lengths <= 18)).all(axis=1)
+    bounds = np.empty(2 * len(candidates), dtype=np.int64)
+    bounds[0::2] = seps[:, 0] + 1
+    bounds[1::2] = seps[:, 9]
+    non_number = np.frombuffer(buffer.translate(_NON_NUMBER_TABLE), dtype=bool)
+    ok &= ~np.logical_or.reduceat(non_number, bounds)[0::2]
+    
+    line_ok = np.zeros(len(line_ends), dtype=bool)
+    line_ok[candidates] = ok
+    
+    # '-' only as the sign of a field, directly followed by a digit
+    minus = np.flatnonzero(data == ord('-'))
+    if len(minus):
+        misplaced = (data[minus - 1] != ord(';')) | ~_DIGIT_BYTES[data[minus + 1]]
+        line_ok[np.searchsorted(line_ends, minus[misplaced])] = False
+    
+    if not line_ok.any():
+        return accepted
+    
+    # Keep the accepted lines, map the status to its code and drop the
+    # line tails, leaving "status;v1;...;v9;" per line back to back
+    if not line_ok.all():
+        buffer = b'\n'.join(itertools.compress(buffer.split(b'\n'), line_ok))
+    text = buffer.translate(None, b'!\r\t \n').replace(b'DTA;', b'0;').replace(b'END;', b'1;')
+    numbers = np.fromstring(text, dtype=np.int64, sep=';')
+    
+    converted = np.flatnonzero(line_ok)
+    if len(numbers) != 10 * len(converted):
+        return accepted
+    numbers = numbers.reshape(-1, 10)
+    
+    status[converted] = numbers[:, 0]
+    values[:, converted] = numbers[:, 1:].T
+    accepted[converted] = True
+    return accepted
@@ -0,0 +1,300 @@
+"""
+Data Store module - Bounded-memory record storage
+Keeps logged records as fixed-point columns with spill-over to disk
+"""
+
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable
+import numpy as np
+import config
+from data_parser import (FatigueTestData, RECORD_DTYPE, STATUS_CODES, MONOTONIC_EPOCH_OFFSET_NS,
+                         records_to_array)
+
+
+# Column order of the CSV log files (see DataLogger._write_header)
+CSV_COLUMNS = [
+    'Timestamp',
+    'Status',
+    'Cycles',
+    'Position_1_mm',
+    'Force_Lower_N',
+    'Travel_1_mm',
+    'Position_2_mm',
+    'Force_Upper_N',
+    'Travel_2_mm',
+    'Travel_at_Upper_mm',
+    'Loss_of_Stiffness_Percent',
+    'Error_Code',
+    'Error_Description',
+    'Raw_Data'
+]
+
+
+class ColumnStore:
+    """
+    Append-only record store with a memory cap
+
+    Records are kept column by column in fixed-size chunks of fixed-point
+    integers (RECORD_DTYPE). When the full chunks held in memory exceed the
+    memory limit, the oldest ones are appended to a temporary file and
+    mapped back in on export.
+    """
+
+    def __init__(self, chunk_rows: int = 65536, memory_limit_mb: float = 64.0,
+                 spill_dir: Optional[str] = None):
+        """
+        Initialize column store
+
+        Args:
+            chunk_rows: Rows per chunk
+            memory_limit_mb: Memory allowed for full chunks before spilling
+            spill_dir: Directory for the temporary spill file (default: system temp)
+        """
+        self.chunk_rows = chunk_rows
+        self.memory_limit_bytes = int(memory_limit_mb * 1024 * 1024)
+        self.spill_dir = spill_dir
+
+        # One chunk = one record of this dtype, holding a sub-array per column
+        self._chunk_dtype = np.dtype([(name, RECORD_DTYPE.fields[name][0], (chunk_rows,))
+                                      for name in RECORD_DTYPE.names])
+
+        self._full_chunks: List[np.void] = []
+        self._current = self._new_chunk()
+        self._current_rows = 0
+
+        self._spill_file = None
+        self.spilled_chunks = 0
+
+    def _new_chunk(self) -> np.void:
+        """Allocate an empty chunk"""
+        return np.zeros(1, dtype=self._chunk_dtype)[0]
+
+    def __len__(self) -> int:
+        return ((self.spilled_chunks + len(self._full_chunks)) * self.chunk_rows
+                + self._current_rows)
+
+    @property
+    def spilled_rows(self) -> int:
+        """Number of rows moved to the spill file"""
+        return self.spilled_chunks * self.chunk_rows
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by in-memory chunks"""
+        return (len(self._full_chunks) + 1) * self._chunk_dtype.itemsize
+
+    def append(self, data: FatigueTestData):
+        """Append a single record"""
+        self.append_records([data.to_record()])
+
+    def extend(self, batch: Iterable[FatigueTestData]):
+        """Append several records"""
+        self.append_records([data.to_record() for data in batch])
+
+    def append_records(self, records):
+        """
+        Append fixed-point records
+
+        Args:
+            records: RECORD_DTYPE structured array, or list of tuples in its field
+                order (values outside a column's range are clipped)
+        """
+        if not isinstance(records, np.ndarray):
+            records = records_to_array(records)
+
+        start = 0
+        while start < len(records):
+            count = min(len(records) - start, self.chunk_rows - self._current_rows)
+            stop = start + count
+
+            for name in RECORD_DTYPE.names:
+                self._current[name][self._current_rows:self._current_rows + count] = records[name][start:stop]
+            self._current_rows += count
+            start = stop
+
+            if self._current_rows == self.chunk_rows:
+                self._full_chunks.append(self._current)
+                self._current = self._new_chunk()
+                self._current_rows = 0
+                self._enforce_memory_limit()
+
+    def _enforce_memory_limit(self):
+        """Move the oldest full chunks to the spill file while over the limit"""
+        while self._full_chunks and self.memory_bytes > self.memory_limit_bytes:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="fatigue_store_", dir=self.spill_dir)
+            self._spill_file.seek(0, 2)
+            self._full_chunks.pop(0).tofile(self._spill_file)
+            self._spill_file.flush()
+            self.spilled_chunks += 1
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get all stored records as columns
+
+        Returns:
+            Dictionary of RECORD_DTYPE field name to 1-D array (oldest first)
+        """
+        spilled = None
+        if self.spilled_chunks:
+            spilled = np.memmap(self._spill_file, dtype=self._chunk_dtype, mode='r',
+                                shape=(self.spilled_chunks,))
+
+        columns = {}
+        for name in RECORD_DTYPE.names:
+            parts = []
+            if spilled is not None:
+                parts.append(spilled[name].reshape(-1))
+            parts.extend(chunk[name] for chunk in self._full_chunks)
+            parts.append(self._current[name][:self._current_rows])
+            columns[name] = np.concatenate(parts)
+
+        return columns
+
+    def records(self) -> np.ndarray:
+        """
+        Get all stored records as one RECORD_DTYPE array (oldest first)
+
+        Returns:
+            Structured array, independent of the store
+        """
+        records = np.empty(len(self), dtype=RECORD_DTYPE)
+        start = 0
+        for chunk, rows in self._chunks():
+            for name in RECORD_DTYPE.names:
+                records[name][start:start + rows] = chunk[name][:rows]
+            start += rows
+        return records
+
+    def _chunks(self):
+        """Yield (chunk, rows used) for all chunks, oldest first (spilled ones mapped from the file)"""
+        if self.spilled_chunks:
+            spilled = np.memmap(self._spill_file, dtype=self._chunk_dtype, mode='r',
+                                shape=(self.spilled_chunks,))
+            for chunk in spilled:
+                yield chunk, self.chunk_rows
+        for chunk in self._full_chunks:
+            yield chunk, self.chunk_rows
+        yield self._current, self._current_rows
+
+    def clear(self):
+        """Remove all records and delete the spill file"""
+        self._full_chunks = []
+        self._current = self._new_chunk()
+        self._current_rows = 0
+        self.spilled_chunks = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+
+class GrowableColumn:
+    """
+    Preallocated 1-D array that grows by amortized doubling
+
+    view() exposes the filled part without copying. Appending never
+    changes elements already visible through an earlier view; growing
+    moves to a new buffer and leaves old views intact.
+    """
+
+    def __init__(self, dtype=np.float64, capacity: int = 1024):
+        """
+        Initialize column
+
+        Args:
+            dtype: Element type
+            capacity: Initial number of elements allocated
+        """
+        self._data = np.empty(max(capacity, 1), dtype=dtype)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        """Number of elements allocated"""
+        return len(self._data)
+
+    def append(self, value):
+        """Append one element"""
+        if self._length == len(self._data):
+            self._reserve(self._length + 1)
+        self._data[self._length] = value
+        self._length += 1
+
+    def extend(self, values):
+        """Append several elements (array-like)"""
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._length + len(values)
+        if end > len(self._data):
+            self._reserve(end)
+        self._data[self._length:end] = values
+        self._length = end
+
+    def _reserve(self, size: int):
+        """Grow to at least size elements, doubling the capacity"""
+        capacity = len(self._data)
+        while capacity < size:
+            capacity *= 2
+        grown = np.empty(capacity, dtype=self._data.dtype)
+        grown[:self._length] = self._data[:self._length]
+        self._data = grown
+
+    def view(self) -> np.ndarray:
+        """Filled part of the column (zero-copy view)"""
+        return self._data[:self._length]
+
+    def clear(self):
+        """Remove all elements (a fresh buffer, earlier views stay valid)"""
+        self._data = np.empty(len(self._data), dtype=self._data.dtype)
+        self._length = 0
+
+
+def columns_to_dataframe(columns: Dict[str, np.ndarray], epoch_offset_ns: Optional[int] = None):
+    """
+    Build a DataFrame in the CSV log schema from fixed-point columns
+
+    Args:
+        columns: Dictionary of RECORD_DTYPE field name to 1-D array
+        epoch_offset_ns: Monotonic-to-wall-clock offset of the process that
+            recorded the data (default: this process)
+
+    Returns:
+        DataFrame with the columns of CSV_COLUMNS
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(index=pd.RangeIndex(len(columns['Cycles'])))
+
+    # Monotonic timestamps back to local wall clock time
+    if epoch_offset_ns is None:
+        epoch_offset_ns = MONOTONIC_EPOCH_OFFSET_NS
+    local_tz = datetime.now().astimezone().tzinfo
+    timestamps = pd.to_datetime(columns['Timestamp_ns'] + epoch_offset_ns, unit='ns', utc=True)
+    timestamps = timestamps.tz_convert(local_tz).tz_localize(None)
+    frame['Timestamp'] = timestamps.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+
+    # Status -1 (anything but DTA/END) wraps around to the last entry
+    status_names = np.array(STATUS_CODES + ("???",), dtype=object)
+    frame['Status'] = status_names[columns['Status']]
+    frame['Cycles'] = columns['Cycles']
+
+    for name, scale in config.FIELD_SCALES.items():
+        frame[name] = columns[name] / float(scale)
+
+    # Same arithmetic as FatigueTestData.calculate_loss_of_stiffness
+    travel_at_upper = frame['Travel_at_Upper_mm'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loss = frame['Travel_2_mm'].to_numpy() / travel_at_upper * 100.0
+    frame['Loss_of_Stiffness_Percent'] = np.where(travel_at_upper == 0, 0.0, loss)
+
+    frame['Error_Code'] = columns['Error_Code']
+    frame['Error_Description'] = frame['Error_Code'].map(config.ERROR_CODES).fillna("Unknown Error")
+
+    raw_fields = [frame['Status']] + [pd.Series(columns[name]).astype(str)
+                                      for name in RECORD_DTYPE.names[2:]]
+    frame['Raw_Data'] = raw_fields[0].str.cat(raw_fields[1:], sep=';') + ';!'
+
+    return frame[CSV_COLUMNS]
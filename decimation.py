@@ -0,0 +1,191 @@
+"""
+Decimation module - Level-of-detail reduction for long curves
+Keeps a min/max pyramid per curve so any index range can be reduced to a
+bounded number of points without touching every sample
+"""
+
+from typing import List
+import numpy as np
+
+
+# One summarized block: position and value of its minimum and maximum
+BLOCK_DTYPE = np.dtype([
+    ('min_index', np.int64),
+    ('max_index', np.int64),
+    ('min_value', np.float64),
+    ('max_value', np.float64),
+])
+
+
+class MinMaxPyramid:
+    """
+    Incrementally built multi-level min/max summary of one curve
+
+    Level 0 holds the index of the minimum and maximum of every block of
+    `base` samples; each higher level merges `factor` blocks of the level
+    below. Only complete blocks are summarized, so appending costs O(1)
+    amortized per sample and a query returns the extremes of every bucket
+    (spikes stay visible) using only the coarsest level that is fine enough.
+    """
+
+    def __init__(self, base: int = 16, factor: int = 4):
+        """
+        Initialize pyramid
+
+        Args:
+            base: Samples per level-0 block
+            factor: Blocks of one level merged into a block of the next level
+        """
+        self.base = base
+        self.factor = factor
+        self.count = 0
+
+        # Samples of the incomplete level-0 block
+        self._pending = np.empty(0, dtype=np.float64)
+
+        # Per level: blocks (index and value of min and max) in an array
+        # grown by doubling, and the number of blocks in use
+        self._levels: List[np.ndarray] = []
+        self._lengths: List[int] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def levels(self) -> int:
+        """Number of levels built so far"""
+        return len(self._levels)
+
+    def block_size(self, level: int) -> int:
+        """Samples summarized by one block of the given level"""
+        return self.base * self.factor ** level
+
+    def level_blocks(self, level: int) -> np.ndarray:
+        """Complete blocks of a level (view, BLOCK_DTYPE)"""
+        return self._levels[level][:self._lengths[level]]
+
+    def append(self, values):
+        """
+        Append samples
+
+        Args:
+            values: 1-D array-like of new samples, in order
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+
+        data = np.concatenate((self._pending, values)) if len(self._pending) else values
+        first_index = self.count - len(self._pending)
+        self.count += len(values)
+
+        complete = len(data) // self.base * self.base
+        self._pending = data[complete:].copy()
+        if complete == 0:
+            return
+
+        blocks = data[:complete].reshape(-1, self.base)
+        rows = np.arange(len(blocks))
+        new = np.empty(len(blocks), dtype=BLOCK_DTYPE)
+        min_pos = blocks.argmin(axis=1)
+        max_pos = blocks.argmax(axis=1)
+        new['min_index'] = first_index + rows * self.base + min_pos
+        new['max_index'] = first_index + rows * self.base + max_pos
+        new['min_value'] = blocks[rows, min_pos]
+        new['max_value'] = blocks[rows, max_pos]
+        self._add_blocks(0, new)
+
+    def _add_blocks(self, level: int, new: np.ndarray):
+        """Append complete blocks to a level and merge full groups upwards"""
+        if level == self.levels:
+            self._levels.append(np.empty(max(len(new), 64), dtype=BLOCK_DTYPE))
+            self._lengths.append(0)
+
+        # Blocks of this level already merged into the next one
+        length = self._lengths[level]
+        merged = length // self.factor * self.factor
+
+        if length + len(new) > len(self._levels[level]):
+            grown = np.empty(max(2 * len(self._levels[level]), length + len(new)), dtype=BLOCK_DTYPE)
+            grown[:length] = self._levels[level][:length]
+            self._levels[level] = grown
+        self._levels[level][length:length + len(new)] = new
+        length += len(new)
+        self._lengths[level] = length
+
+        groups = (length - merged) // self.factor
+        if groups == 0:
+            return
+
+        source = self._levels[level][merged:merged + groups * self.factor]
+        min_values = source['min_value'].reshape(groups, self.factor)
+        max_values = source['max_value'].reshape(groups, self.factor)
+        starts = np.arange(groups) * self.factor
+        lows = source[starts + min_values.argmin(axis=1)]
+        highs = source[starts + max_values.argmax(axis=1)]
+
+        upper = np.empty(groups, dtype=BLOCK_DTYPE)
+        upper['min_index'] = lows['min_index']
+        upper['min_value'] = lows['min_value']
+        upper['max_index'] = highs['max_index']
+        upper['max_value'] = highs['max_value']
+        self._add_blocks(level + 1, upper)
+
+    def indices(self, max_points: int, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Indices of the samples to draw for a range
+
+        Args:
+            max_points: Point budget (two points, min and max, per bucket)
+            start: First sample index of the range
+            stop: End of the range (exclusive, default: all samples)
+
+        Returns:
+            Sorted int64 array of sample indices, between about half and
+            twice max_points (plus a few blocks at the range edges)
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        start = max(0, start)
+        if stop - start <= max(max_points, 2):
+            return np.arange(start, stop, dtype=np.int64)
+
+        # Coarsest level whose blocks are at most two buckets wide
+        bucket = (stop - start) / max(max_points // 2, 1)
+        level = -1
+        while level + 1 < self.levels and self.block_size(level + 1) <= 2 * bucket:
+            level += 1
+
+        parts: List[np.ndarray] = []
+        self._collect(level, start, stop, parts)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def _collect(self, level: int, start: int, stop: int, parts: List[np.ndarray]):
+        """Append the indices for [start, stop) using complete blocks of a level"""
+        if start >= stop:
+            return
+        if level < 0:
+            parts.append(np.arange(start, stop, dtype=np.int64))
+            return
+
+        size = self.block_size(level)
+        first = -(-start // size)
+        last = min(stop // size, self._lengths[level])
+        if first >= last:
+            self._collect(level - 1, start, stop, parts)
+            return
+
+        self._collect(level - 1, start, first * size, parts)
+
+        blocks = self._levels[level][first:last]
+        min_index = blocks['min_index']
+        max_index = blocks['max_index']
+        pairs = np.empty(2 * (last - first), dtype=np.int64)
+        pairs[0::2] = np.minimum(min_index, max_index)
+        pairs[1::2] = np.maximum(min_index, max_index)
+        parts.append(pairs)
+
+        self._collect(level - 1, last * size, stop, parts)
+
+    def clear(self):
+        """Remove all samples"""
+        self.__init__(self.base, self.factor)
@@ -0,0 +1,505 @@
+"""
+Detection module - Streaming anomaly and threshold detectors
+Batch-wise detectors with constant work per record for the processing worker
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import config
+from data_parser import FatigueTestData
+
+
+# Detector column -> (FatigueTestData fixed-point attribute, FIELD_SCALES key)
+FIELD_COLUMNS = {
+    'position_1': ('position_1_raw', 'Position_1_mm'),
+    'force_lower': ('force_lower_raw', 'Force_Lower_N'),
+    'travel_1': ('travel_1_raw', 'Travel_1_mm'),
+    'position_2': ('position_2_raw', 'Position_2_mm'),
+    'force_upper': ('force_upper_raw', 'Force_Upper_N'),
+    'travel_2': ('travel_2_raw', 'Travel_2_mm'),
+    'travel_at_upper': ('travel_at_upper_raw', 'Travel_at_Upper_mm'),
+}
+
+# Every column a detector can watch (loss_of_stiffness is derived)
+DETECTOR_COLUMNS = tuple(FIELD_COLUMNS) + ('loss_of_stiffness',)
+
+
+@dataclass
+class Detection:
+    """One detected event"""
+    detector: str  # Detector label, e.g. "CUSUM force_upper"
+    column: str
+    cycles: int
+    value: float  # Column value of the triggering record
+    message: str
+
+
+class Detector:
+    """
+    Base class of streaming detectors
+
+    Subclasses implement _detect(cycles, values) for one batch of a single
+    column and keep whatever state they need between batches.
+    """
+
+    kind = "Detector"
+
+    def __init__(self, column: str):
+        """
+        Args:
+            column: Watched column (one of DETECTOR_COLUMNS)
+
+        Raises:
+            ValueError: If the column is unknown
+        """
+        if column not in DETECTOR_COLUMNS:
+            raise ValueError(f"Unknown detector column: {column}")
+        self.column = column
+        self.label = f"{self.kind} {column}"
+
+    def update(self, cycles: np.ndarray, values: np.ndarray) -> List[Detection]:
+        """
+        Process one batch
+
+        Args:
+            cycles: Cycle count of each record (int64)
+            values: Column value of each record (float64)
+
+        Returns:
+            Detections in record order
+        """
+        if len(values) == 0:
+            return []
+        return self._detect(cycles, values)
+
+    def _detect(self, cycles: np.ndarray, values: np.ndarray) -> List[Detection]:
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget all state (new test)"""
+
+    def _detection(self, cycles: np.ndarray, values: np.ndarray, index: int, message: str) -> Detection:
+        """Detection for record index of the batch"""
+        return Detection(self.label, self.column, int(cycles[index]), float(values[index]), message)
+
+
+def _rising_edges(violation: np.ndarray, previous: bool) -> np.ndarray:
+    """Indices where a violation starts (one event per excursion)"""
+    before = np.empty_like(violation)
+    before[0] = previous
+    before[1:] = violation[:-1]
+    return np.flatnonzero(violation & ~before)
+
+
+class ThresholdDetector(Detector):
+    """Fixed limits: one event each time the value leaves [low, high]"""
+
+    kind = "Threshold"
+
+    def __init__(self, column: str, low: Optional[float] = None, high: Optional[float] = None):
+        """
+        Args:
+            column: Watched column
+            low: Lower limit (None = none)
+            high: Upper limit (None = none)
+        """
+        super().__init__(column)
+        self.low = low
+        self.high = high
+        self.reset()
+
+    def reset(self):
+        self._violating = False
+
+    def _detect(self, cycles, values):
+        above = values > self.high if self.high is not None else np.zeros(len(values), dtype=bool)
+        below = values < self.low if self.low is not None else np.zeros(len(values), dtype=bool)
+        violation = above | below
+
+        detections = []
+        for index in _rising_edges(violation, self._violating):
+            if above[index]:
+                message = f"{self.column} {values[index]:.2f} above limit {self.high:g}"
+            else:
+                message = f"{self.column} {values[index]:.2f} below limit {self.low:g}"
+            detections.append(self._detection(cycles, values, index, message))
+        self._violating = bool(violation[-1])
+        return detections
+
+
+class RateOfChangeDetector(Detector):
+    """Limit on the change per cycle between consecutive records"""
+
+    kind = "Rate"
+
+    def __init__(self, column: str, max_rate: float):
+        """
+        Args:
+            column: Watched column
+            max_rate: Largest allowed |change| per cycle
+        """
+        super().__init__(column)
+        self.max_rate = max_rate
+        self.reset()
+
+    def reset(self):
+        self._last_cycles = None
+        self._last_value = None
+        self._violating = False
+
+    def _detect(self, cycles, values):
+        if self._last_cycles is None:
+            previous_cycles = np.concatenate(([cycles[0]], cycles[:-1]))
+            previous_values = np.concatenate(([values[0]], values[:-1]))
+        else:
+            previous_cycles = np.concatenate(([self._last_cycles], cycles[:-1]))
+            previous_values = np.concatenate(([self._last_value], values[:-1]))
+        self._last_cycles = cycles[-1]
+        self._last_value = values[-1]
+
+        steps = cycles - previous_cycles
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = (values - previous_values) / steps
+        violation = (steps > 0) & (np.abs(rates) > self.max_rate)
+
+        detections = [self._detection(cycles, values, index,
+                                      f"{self.column} changing {rates[index]:+.3g}/cycle "
+                                      f"(limit {self.max_rate:g})")
+                      for index in _rising_edges(violation, self._violating)]
+        self._violating = bool(violation[-1])
+        return detections
+
+
+class _BaselineDetector(Detector):
+    """
+    Detector that compares against an in-control mean and standard deviation
+
+    Without a given target and sigma, both are estimated from the first
+    `warmup` records (batch-merged running moments), and detection starts
+    after them. _rebaseline() estimates them again from the next `warmup`
+    records (a given sigma is kept).
+    """
+
+    def __init__(self, column: str, warmup: int = 1000, target: Optional[float] = None,
+                 sigma: Optional[float] = None):
+        super().__init__(column)
+        self.warmup = warmup
+        self.target = target
+        self.sigma = sigma
+        self.reset()
+
+    def reset(self):
+        self._learning = self.target is None or self.sigma is None
+        self._use_target = True
+        self._mean = self.target
+        self._std = self.sigma
+        self._count = 0
+        self._moment_mean = 0.0
+        self._moment_m2 = 0.0
+        self._reset_statistic()
+
+    def _rebaseline(self):
+        """Learn the in-control mean (and sigma unless given) from the next warmup records"""
+        self._learning = self.warmup > 0
+        self._use_target = False
+        self._count = 0
+        self._moment_mean = 0.0
+        self._moment_m2 = 0.0
+        self._reset_statistic()
+
+    def _reset_statistic(self):
+        """Reset the detector statistic (after an alarm or a new baseline)"""
+
+    def _learn(self, values: np.ndarray) -> int:
+        """Feed warm-up records; returns how many of values were used"""
+        used = min(len(values), self.warmup - self._count)
+        part = values[:used]
+        total = self._count + used
+        delta = float(part.mean()) - self._moment_mean
+        self._moment_m2 += float(((part - part.mean()) ** 2).sum()) + delta * delta * self._count * used / total
+        self._moment_mean += delta * used / total
+        self._count = total
+
+        if self._count >= self.warmup:
+            self._learning = False
+            self._mean = self.target if self.target is not None and self._use_target else self._moment_mean
+            std = math.sqrt(self._moment_m2 / max(self._count - 1, 1))
+            # A constant warm-up signal would make every change infinitely significant
+            self._std = self.sigma if self.sigma is not None else max(std, 1e-9 * max(abs(self._mean), 1.0))
+        return used
+
+    def _detect(self, cycles, values):
+        start = 0
+        if self._learning:
+            start = self._learn(values)
+            if self._learning or start == len(values):
+                return []
+        return self._detect_in_control(cycles[start:], values[start:])
+
+    def _detect_in_control(self, cycles, values) -> List[Detection]:
+        raise NotImplementedError
+
+
+class CusumDetector(_BaselineDetector):
+    """
+    Two-sided CUSUM change detector on standardized values
+
+    S+ = max(0, S+ + z - k) and S- = max(0, S- - z - k); an alarm is raised
+    when either exceeds h. The mean is then learned again from the next
+    `warmup` records and both sums restart from zero, so a sustained shift
+    becomes the new baseline and is reported once. The recursion is
+    evaluated for a whole batch with cumulative sums and running minima:
+    S_n = C_n - min(-S_0, C_1..C_n).
+    """
+
+    kind = "CUSUM"
+
+    def __init__(self, column: str, k: float = 0.5, h: float = 12.0, warmup: int = 1000,
+                 target: Optional[float] = None, sigma: Optional[float] = None):
+        """
+        Args:
+            column: Watched column
+            k: Allowed slack in standard deviations
+            h: Alarm threshold in standard deviations
+            warmup: Records used to estimate target and sigma when not given,
+                and to estimate the mean again after an alarm
+            target: In-control mean until the first alarm (default: warm-up estimate)
+            sigma: In-control standard deviation (default: warm-up estimate)
+        """
+        self.k = k
+        self.h = h
+        super().__init__(column, warmup, target, sigma)
+
+    def _reset_statistic(self):
+        self._upper = 0.0
+        self._lower = 0.0
+
+    @staticmethod
+    def _lindley(start: float, increments: np.ndarray) -> np.ndarray:
+        """max(0, S + d) recursion for a whole batch"""
+        sums = np.cumsum(increments)
+        floor = np.minimum.accumulate(np.concatenate(([-start], sums)))[1:]
+        return sums - floor
+
+    def _detect_in_control(self, cycles, values):
+        z = (values - self._mean) / self._std
+        upper = self._lindley(self._upper, z - self.k)
+        lower = self._lindley(self._lower, -z - self.k)
+        alarms = np.flatnonzero((upper > self.h) | (lower > self.h))
+        if len(alarms) == 0:
+            self._upper = float(upper[-1])
+            self._lower = float(lower[-1])
+            return []
+
+        index = int(alarms[0])
+        direction = "upward" if upper[index] > self.h else "downward"
+        detection = self._detection(
+            cycles, values, index,
+            f"{direction} shift in {self.column} (mean {self._mean:.2f}, now {values[index]:.2f})")
+        # The rest of the batch goes to the new baseline (at most one alarm per warmup records)
+        self._rebaseline()
+        return [detection] + self.update(cycles[index + 1:], values[index + 1:])
+
+
+class EwmaDetector(_BaselineDetector):
+    """
+    EWMA control chart: one event each time the exponentially weighted
+    moving average leaves mean +/- L * sigma * sqrt(alpha / (2 - alpha))
+
+    The recursion z = (1 - alpha) * z + alpha * x is evaluated for a whole
+    batch in closed form, in blocks short enough for the weights to stay
+    within floating-point range.
+    """
+
+    kind = "EWMA"
+
+    def __init__(self, column: str, alpha: float = 0.1, limit_sigma: float = 5.0, warmup: int = 1000,
+                 target: Optional[float] = None, sigma: Optional[float] = None):
+        """
+        Args:
+            column: Watched column
+            alpha: Weight of the newest value (0 < alpha <= 1)
+            limit_sigma: Control limit width L in standard deviations
+            warmup: Records used to estimate target and sigma when not given
+            target: In-control mean (default: warm-up estimate)
+            sigma: In-control standard deviation (default: warm-up estimate)
+        """
+        self.alpha = alpha
+        self.limit_sigma = limit_sigma
+        decay = 1.0 - alpha
+        self._block = max(1, int(150 / -math.log10(decay))) if decay > 0 else 1
+        super().__init__(column, warmup, target, sigma)
+
+    def _reset_statistic(self):
+        self._average = 0.0  # EWMA of value - mean
+        self._violating = False
+
+    def _smooth(self, deviations: np.ndarray) -> np.ndarray:
+        """EWMA of every element, continuing from the current state"""
+        decay = 1.0 - self.alpha
+        if decay <= 0:
+            self._average = float(deviations[-1])
+            return deviations
+        out = np.empty_like(deviations)
+        for start in range(0, len(deviations), self._block):
+            part = deviations[start:start + self._block]
+            # z_j = w^(j+1) * (z_-1 + alpha * sum_{i<=j} x_i / w^(i+1))
+            powers = decay ** np.arange(1, len(part) + 1)
+            out[start:start + len(part)] = powers * (self._average + self.alpha * np.cumsum(part / powers))
+            self._average = float(out[start + len(part) - 1])
+        return out
+
+    def _detect_in_control(self, cycles, values):
+        average = self._smooth(values - self._mean)
+        limit = self.limit_sigma * self._std * math.sqrt(self.alpha / (2.0 - self.alpha))
+        violation = np.abs(average) > limit
+
+        detections = [self._detection(cycles, values, index,
+                                      f"{self.column} average drifted to {self._mean + average[index]:.2f} "
+                                      f"(mean {self._mean:.2f} +/- {limit:.2f})")
+                      for index in _rising_edges(violation, self._violating)]
+        self._violating = bool(violation[-1])
+        return detections
+
+
+# Detector type name (as used in DetectionConfig.detectors) -> class
+DETECTOR_TYPES = {
+    'threshold': ThresholdDetector,
+    'rate': RateOfChangeDetector,
+    'cusum': CusumDetector,
+    'ewma': EwmaDetector,
+}
+
+
+def build_detector(spec: dict) -> Detector:
+    """
+    Create a detector from a specification
+
+    Args:
+        spec: {'type': <DETECTOR_TYPES key>, 'column': ..., **parameters}
+
+    Raises:
+        ValueError: If the type is unknown
+    """
+    spec = dict(spec)
+    detector_type = spec.pop('type')
+    if detector_type not in DETECTOR_TYPES:
+        raise ValueError(f"Unknown detector type: {detector_type}")
+    return DETECTOR_TYPES[detector_type](**spec)
+
+
+class DetectorStage:
+    """
+    Runs a set of detectors over record batches
+
+    The columns the detectors watch are extracted once per batch; each
+    detector then does constant work per record. A decreasing cycle count
+    (new test) resets every detector.
+    """
+
+    def __init__(self, detectors: Sequence[Detector]):
+        """
+        Args:
+            detectors: Detectors to run, in reporting order
+        """
+        self.detectors = list(detectors)
+        self._columns = sorted({detector.column for detector in self.detectors})
+        fields = [FIELD_COLUMNS[column][0] for column in self._columns if column in FIELD_COLUMNS]
+        if 'loss_of_stiffness' in self._columns:
+            fields += ['travel_2_raw', 'travel_at_upper_raw']
+        self._fields = ['cycles'] + list(dict.fromkeys(fields))
+        self._getter = attrgetter(*self._fields)
+        self._last_cycles = None
+
+        # Statistics
+        self.records_processed = 0
+        self.detections_found = 0
+        self.processing_time_s = 0.0
+
+    @classmethod
+    def from_config(cls, detection_config: 'config.DetectionConfig') -> 'DetectorStage':
+        """Stage with the detectors of a DetectionConfig"""
+        return cls([build_detector(spec) for spec in detection_config.detectors])
+
+    def process(self, batch: List[FatigueTestData]) -> List[Detection]:
+        """
+        Run all detectors over a batch of records
+
+        Returns:
+            Detections, grouped by detector
+        """
+        if not batch or not self.detectors:
+            return []
+        raw = np.array([self._getter(data) for data in batch], dtype=np.int64).reshape(len(batch), -1)
+        fields = {name: raw[:, index] for index, name in enumerate(self._fields)}
+
+        columns = {}
+        for column in self._columns:
+            if column == 'loss_of_stiffness':
+                # Same arithmetic as FatigueTestData.calculate_loss_of_stiffness
+                travel_2 = fields['travel_2_raw'] / 100.0
+                travel_at_upper = fields['travel_at_upper_raw'] / 100.0
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    columns[column] = np.where(travel_at_upper == 0, 0.0, travel_2 / travel_at_upper * 100.0)
+            else:
+                attribute, scale_key = FIELD_COLUMNS[column]
+                columns[column] = fields[attribute] / float(config.FIELD_SCALES[scale_key])
+        return self.process_columns(fields['cycles'], columns)
+
+    def process_records(self, records: np.ndarray) -> List[Detection]:
+        """
+        Run all detectors over fixed-point records (e.g. from the acquisition daemon)
+
+        Args:
+            records: RECORD_DTYPE structured array
+
+        Returns:
+            Detections, grouped by detector
+        """
+        if not len(records) or not self.detectors:
+            return []
+
+        columns = {}
+        for column in self._columns:
+            if column == 'loss_of_stiffness':
+                travel_2 = records['Travel_2_mm'] / 100.0
+                travel_at_upper = records['Travel_at_Upper_mm'] / 100.0
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    columns[column] = np.where(travel_at_upper == 0, 0.0, travel_2 / travel_at_upper * 100.0)
+            else:
+                scale_key = FIELD_COLUMNS[column][1]
+                columns[column] = records[scale_key] / float(config.FIELD_SCALES[scale_key])
+        return self.process_columns(records['Cycles'].astype(np.int64), columns)
+
+    def process_columns(self, cycles: np.ndarray, columns: Dict[str, np.ndarray]) -> List[Detection]:
+        """
+        Run all detectors over columns of a batch
+
+        Args:
+            cycles: Cycle count of each record
+            columns: Detector column name -> float values
+        """
+        started = time.perf_counter()
+        if self._last_cycles is not None and len(cycles) and cycles[0] < self._last_cycles:
+            self.reset()
+        if len(cycles):
+            self._last_cycles = int(cycles[-1])
+
+        detections = []
+        for detector in self.detectors:
+            detections.extend(detector.update(cycles, columns[detector.column]))
+
+        self.records_processed += len(cycles)
+        self.detections_found += len(detections)
+        self.processing_time_s += time.perf_counter() - started
+        return detections
+
+    def reset(self):
+        """Reset every detector (new test)"""
+        for detector in self.detectors:
+            detector.reset()
+        self._last_cycles = None
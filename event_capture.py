@@ -0,0 +1,285 @@
+"""
+Event Capture module - Full-resolution context around error events
+Keeps recent records in a fixed-size ring buffer and writes the window
+before and after a trigger to a separate event file
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+import numpy as np
+import config
+from config import LogConfig
+from data_parser import RECORD_DTYPE
+from binary_log import BinaryLogWriter
+from data_store import columns_to_dataframe
+
+
+class RecordRing:
+    """
+    Fixed-size ring buffer of RECORD_DTYPE records
+
+    The array is allocated once; appending overwrites the oldest records.
+    Records are copied as opaque fixed-size items, which is much cheaper
+    than field-by-field structured assignment for small batches.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Records kept
+        """
+        self.capacity = max(int(capacity), 1)
+        self._records = np.empty(self.capacity, dtype=RECORD_DTYPE)
+        self._items = self._records.view(np.dtype((np.void, RECORD_DTYPE.itemsize)))
+        self._head = 0  # Next write position
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def extend(self, records: np.ndarray):
+        """Append records, keeping the newest capacity ones"""
+        items = np.ascontiguousarray(records, dtype=RECORD_DTYPE).view(self._items.dtype)
+        if len(items) >= self.capacity:
+            self._items[:] = items[-self.capacity:]
+            self._head = 0
+            self._length = self.capacity
+            return
+
+        first = min(len(items), self.capacity - self._head)
+        self._items[self._head:self._head + first] = items[:first]
+        if first < len(items):
+            self._items[:len(items) - first] = items[first:]
+        self._head = (self._head + len(items)) % self.capacity
+        self._length = min(self._length + len(items), self.capacity)
+
+    def ordered(self) -> np.ndarray:
+        """Copy of the retained records, oldest first"""
+        if self._length < self.capacity:
+            return self._records[:self._length].copy()
+        return np.concatenate((self._records[self._head:], self._records[:self._head]))
+
+    def clear(self):
+        """Forget all records"""
+        self._head = 0
+        self._length = 0
+
+
+@dataclass
+class EventTrigger:
+    """User-defined trigger, queued in order with the record batches"""
+    reason: str
+
+
+@dataclass
+class CapturedEvent:
+    """Summary of one written event file"""
+    path: str
+    reason: str
+    cycles: int  # Cycle count of the trigger record
+    rows: int
+    triggers: int  # Triggers merged into this event (including the first)
+
+
+class _OpenCapture:
+    """Event whose post-trigger window is still being collected"""
+
+    def __init__(self, reason: str, cycles: int, end: int, pre: np.ndarray):
+        self.reason = reason
+        self.cycles = cycles
+        self.end = end  # Last window key value (timestamp or cycles) of the post-trigger window
+        self.parts = [pre]
+        self.triggers = 1
+
+
+class EventCapture:
+    """
+    Pre- and post-trigger capture of full-resolution records
+
+    Every record passes through a fixed-size ring buffer holding the most
+    recent event_buffer_rows records. When a record carries one of the
+    trigger error codes, or trigger() is called, the records of the
+    pre-trigger window are taken from the ring and the following records
+    are collected until the post-trigger window has passed; then the whole
+    window is written to an event file named after the log. Triggers inside an
+    open post-trigger window are merged into that event.
+
+    Windows are measured in seconds (record timestamps) or in cycles, see
+    LogConfig.event_window_unit.
+    """
+
+    def __init__(self, log_config: LogConfig, on_event: Optional[Callable[[str], None]] = None):
+        """
+        Initialize event capture
+
+        Args:
+            log_config: Logging configuration (event_* settings and formats)
+            on_event: Optional callback with a message per written event file
+                (called from the thread that processes the records)
+
+        Raises:
+            ValueError: If the window unit is unknown
+        """
+        if log_config.event_window_unit not in ("seconds", "cycles"):
+            raise ValueError(f"Unknown event window unit: {log_config.event_window_unit}")
+        self.config = log_config
+        self.on_event = on_event
+        self.ring = RecordRing(log_config.event_buffer_rows)
+        # Lookup table over all int16 error codes (indexed as uint16)
+        self._is_trigger = np.zeros(1 << 16, dtype=bool)
+        self._is_trigger[np.array(log_config.event_trigger_codes, dtype=np.int16).view(np.uint16)] = True
+
+        if log_config.event_window_unit == "seconds":
+            self._key = 'Timestamp_ns'
+            self._pre = int(log_config.event_pre_trigger * 1e9)
+            self._post = int(log_config.event_post_trigger * 1e9)
+        else:
+            self._key = 'Cycles'
+            self._pre = int(log_config.event_pre_trigger)
+            self._post = int(log_config.event_post_trigger)
+
+        self._base_path: Optional[Path] = None
+        self._open: Optional[_OpenCapture] = None
+
+        # Statistics
+        self.events: List[CapturedEvent] = []
+        self.events_skipped = 0
+        self.event_rows_written = 0
+
+    def start(self, base_path: Path):
+        """
+        Begin a log session; event files are named after base_path
+
+        Args:
+            base_path: Event file path prefix; its suffix is replaced by
+                "_eventNNN_cycleC" and the log format extension(s)
+        """
+        self.finish()
+        self._base_path = Path(base_path)
+        self.events = []
+        self.events_skipped = 0
+
+    def process(self, records: np.ndarray):
+        """
+        Pass a batch of records through the ring and the open capture
+
+        Args:
+            records: RECORD_DTYPE structured array, in arrival order
+        """
+        if not len(records):
+            return
+
+        triggers = np.flatnonzero(self._is_trigger[records['Error_Code'].astype(np.uint16)])
+        if not len(triggers) and self._open is None:
+            self.ring.extend(records)
+            return
+
+        keys = records[self._key]
+        position = 0  # First record not yet passed to the open capture
+
+        for index in triggers:
+            if self._open is not None:
+                if keys[index] <= self._open.end:
+                    self._open.triggers += 1
+                    continue
+                position = self._collect(records, keys, position)
+            code = int(records['Error_Code'][index])
+            reason = f"E{code} {config.ERROR_CODES.get(code, 'Unknown Error').split(':')[0]}"
+            history = np.concatenate((self.ring.ordered(), records[:index + 1]))
+            pre = self._pre_window(history, int(keys[index]))
+            self._open = _OpenCapture(reason, int(records['Cycles'][index]), int(keys[index]) + self._post, pre)
+            position = index + 1
+
+        if self._open is not None:
+            self._collect(records, keys, position)
+        self.ring.extend(records)
+
+    def trigger(self, reason: str):
+        """
+        User-defined trigger at the most recent record
+
+        Args:
+            reason: Text recorded with the event
+        """
+        if self._open is not None:
+            self._open.triggers += 1
+            return
+        if not len(self.ring):
+            print(f"[EventCapture] Trigger '{reason}' ignored: no records yet")
+            return
+
+        history = self.ring.ordered()
+        last = history[-1]
+        pre = self._pre_window(history, int(last[self._key]))
+        self._open = _OpenCapture(reason, int(last['Cycles']), int(last[self._key]) + self._post, pre)
+
+    def finish(self):
+        """Write the open event with the records collected so far"""
+        if self._open is not None:
+            self._write(self._open)
+            self._open = None
+
+    def _pre_window(self, history: np.ndarray, trigger_key: int) -> np.ndarray:
+        """Records of history (ending with the trigger) within the pre-trigger window"""
+        window = history[-self.ring.capacity:]
+        # Last record before the window; robust to a cycle count restart
+        outside = np.flatnonzero(window[self._key] < trigger_key - self._pre)
+        return window[outside[-1] + 1:] if len(outside) else window
+
+    def _collect(self, records: np.ndarray, keys: np.ndarray, position: int) -> int:
+        """
+        Add records from position on to the open capture up to its window end
+
+        Returns:
+            Index of the first record after the window (len(records) if the
+            window is still open)
+        """
+        beyond = np.flatnonzero(keys[position:] > self._open.end)
+        stop = position + int(beyond[0]) if len(beyond) else len(records)
+        if stop > position:
+            self._open.parts.append(records[position:stop])
+        if len(beyond):
+            self._write(self._open)
+            self._open = None
+        return stop
+
+    def _write(self, capture: _OpenCapture):
+        """Write an event file in the configured log format(s)"""
+        if self._base_path is None:
+            return
+        if len(self.events) >= self.config.event_max_files:
+            self.events_skipped += 1
+            return
+
+        records = np.concatenate(capture.parts)
+        stem = f"{self._base_path.stem}_event{len(self.events) + 1:03d}_cycle{capture.cycles}"
+        path = self._base_path.with_name(stem)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            paths = []
+            if self.config.log_format in ("csv", "both"):
+                paths.append(path.with_suffix(self.config.file_extension))
+                columns = {name: records[name] for name in RECORD_DTYPE.names}
+                columns_to_dataframe(columns).to_csv(paths[-1], index=False)
+            # Compressed logs get full-resolution binary event files
+            if self.config.log_format in ("binary", "both", "compressed"):
+                paths.append(path.with_suffix(self.config.binary_extension))
+                writer = BinaryLogWriter(paths[-1])
+                writer.write_records(records)
+                writer.close()
+        except Exception as e:
+            print(f"[EventCapture] Error writing event file: {e}")
+            if self.on_event:
+                self.on_event(f"Error writing event file: {e}")
+            return
+
+        event = CapturedEvent(str(paths[0]), capture.reason, capture.cycles, len(records), capture.triggers)
+        self.events.append(event)
+        self.event_rows_written += len(records)
+
+        message = (f"Event at cycle {event.cycles} ({event.reason}): {event.rows} records "
+                   f"written to {paths[0].name}")
+        print(f"[EventCapture] {message}")
+        if self.on_event:
+            self.on_event(message)
@@ -0,0 +1,458 @@
+"""
+Fan-out module - Per-consumer queues between the processing layer and its consumers
+Every consumer (logger, plotter, detectors, publishers) runs in its own thread
+behind a bounded queue, so a slow consumer only delays itself
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+# What publish() does when a consumer already has max_pending batches waiting
+OVERFLOW_BLOCK = "block"  # Wait for room: nothing is lost, the producer is held up
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # Discard the oldest waiting batch
+OVERFLOW_DECIMATE = "decimate"  # Halve the resolution of everything waiting (kept records excepted)
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DECIMATE)
+
+
+class _Call:
+    """Function queued to run on a consumer's thread, in order with the batches"""
+
+    def __init__(self, function: Callable, args: tuple):
+        self.function = function
+        self.args = args
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        try:
+            self.result = self.function(*self.args)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+class Consumer:
+    """
+    One consumer of the fan-out: a worker thread behind a bounded queue
+
+    Batches waiting when the thread wakes up are joined and passed to the
+    handler in a single call. Lag is the time from publish() of the oldest
+    batch of a delivery until the handler starts on it.
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[Any]], None], overflow: str = OVERFLOW_BLOCK,
+                 max_pending: int = 64, keep: Optional[Callable[[Any], bool]] = None,
+                 error_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize consumer
+
+        Args:
+            name: Consumer name (registry key and statistics label)
+            handler: Called with a list of records on the consumer's thread
+            overflow: Overflow policy, one of OVERFLOW_POLICIES
+            max_pending: Batches that may wait before the overflow policy applies
+            keep: Records the decimate policy never drops (e.g. END or error records)
+            error_callback: Called with a message when the handler raises
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} (use one of {', '.join(OVERFLOW_POLICIES)})")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+
+        self.name = name
+        self.handler = handler
+        self.overflow = overflow
+        self.max_pending = max_pending
+        self.keep = keep
+        self.error_callback = error_callback
+
+        # (publish time, batch) or (None, _Call); guarded by _condition
+        self._pending = deque()
+        self._pending_batches = 0
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._exited = False  # Set by the thread, under the lock, when it takes no more work
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.batches_received = 0
+        self.records_received = 0
+        self.records_delivered = 0
+        self.records_dropped = 0
+        self.deliveries = 0
+        self.handler_errors = 0
+        self.peak_pending = 0
+        self.producer_wait_s = 0.0
+        self.handler_time_s = 0.0
+        self.lag_s_last = 0.0
+        self.lag_s_max = 0.0
+        self.lag_s_total = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the consumer thread"""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._exited = False
+        self._thread = threading.Thread(target=self._run, name=f"Consumer-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Stop the consumer thread
+
+        A thread still busy after the timeout keeps running until it has
+        finished its work; call() then still runs after that work.
+
+        Args:
+            drain: Deliver the batches still waiting before stopping
+                (otherwise they are counted as dropped)
+            timeout: Longest wait for the thread to finish (None = no limit)
+
+        Returns:
+            True if the thread has finished
+        """
+        with self._condition:
+            self._stopping = True
+            if not drain:
+                self._discard_pending()
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                return False
+            self._thread = None
+        return True
+
+    def offer(self, batch: List[Any], published: Optional[float] = None) -> bool:
+        """
+        Queue a batch for the handler (producer side)
+
+        Args:
+            batch: Records, in arrival order (not modified)
+            published: Monotonic publish time (default now)
+
+        Returns:
+            False if the consumer is stopping and the batch was dropped
+        """
+        if not batch:
+            return True
+        published = time.monotonic() if published is None else published
+
+        with self._condition:
+            self.batches_received += 1
+            self.records_received += len(batch)
+            if self._stopping:
+                self.records_dropped += len(batch)
+                return False
+
+            if self._pending_batches >= self.max_pending:
+                if self.overflow == OVERFLOW_BLOCK:
+                    wait_start = time.monotonic()
+                    while self._pending_batches >= self.max_pending and not self._stopping:
+                        self._condition.wait(0.1)
+                    self.producer_wait_s += time.monotonic() - wait_start
+                    if self._stopping:
+                        self.records_dropped += len(batch)
+                        return False
+                elif self.overflow == OVERFLOW_DROP_OLDEST:
+                    self._drop_oldest()
+                else:
+                    batch = self._decimate_pending(batch)
+
+            self._pending.append((published, batch))
+            self._pending_batches += 1
+            self.peak_pending = max(self.peak_pending, self._pending_batches)
+            self._condition.notify_all()
+        return True
+
+    def call(self, function: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run a function on the consumer's thread after the batches queued so far
+
+        Used for operations that must not interleave with the handler (e.g.
+        starting a new log file). Runs directly if the thread has finished
+        (or was never started) or the caller is the consumer thread.
+
+        Args:
+            function: Function to run
+            timeout: Longest wait for the result (None = no limit); on
+                TimeoutError the function still runs later, in order
+
+        Returns:
+            The function's result (its exception is raised here)
+        """
+        if threading.current_thread() is self._thread:
+            return function(*args)
+
+        queued = _Call(function, args)
+        with self._condition:
+            # A stopping thread still runs everything queued before it exits
+            if self._thread is None or self._exited:
+                queued = None
+            else:
+                self._pending.append((None, queued))
+                self._condition.notify_all()
+        if queued is None:
+            return function(*args)
+        if not queued.done.wait(timeout):
+            raise TimeoutError(f"Consumer {self.name} did not run the call within {timeout} s")
+        if queued.error is not None:
+            raise queued.error
+        return queued.result
+
+    def _drop_oldest(self):
+        """Discard the oldest waiting batch (called with the lock held)"""
+        for index, (published, item) in enumerate(self._pending):
+            if published is not None:
+                del self._pending[index]
+                self._pending_batches -= 1
+                self.records_dropped += len(item)
+                return
+
+    def _decimate_pending(self, batch: List[Any]) -> List[Any]:
+        """
+        Join the waiting batches and the new one, keeping every second record
+        (called with the lock held)
+
+        Repeated overflows thin older records further, so the backlog keeps
+        covering the whole time span at a lower resolution.
+
+        Returns:
+            The thinned records, to be queued as one batch
+        """
+        oldest = None
+        records = []
+        remaining = deque()
+        for published, item in self._pending:
+            if published is None:
+                # Calls keep their place after the records queued before them
+                if records:
+                    remaining.append((oldest, self._thin(records)))
+                    records, oldest = [], None
+                remaining.append((published, item))
+            else:
+                oldest = published if oldest is None else oldest
+                records.extend(item)
+        if oldest is not None:
+            remaining.append((oldest, self._thin(records)))
+
+        self._pending = remaining
+        self._pending_batches = sum(published is not None for published, _ in remaining)
+        return self._thin(batch)
+
+    def _thin(self, records: List[Any]) -> List[Any]:
+        """Every second record plus the records to keep; counts the rest as dropped"""
+        keep = self.keep
+        thinned = [data for index, data in enumerate(records)
+                   if index % 2 == 0 or (keep is not None and keep(data))]
+        self.records_dropped += len(records) - len(thinned)
+        return thinned
+
+    def _discard_pending(self):
+        """Drop all waiting batches (called with the lock held); calls still run"""
+        calls = deque()
+        for published, item in self._pending:
+            if published is None:
+                calls.append((published, item))
+            else:
+                self.records_dropped += len(item)
+        self._pending = calls
+        self._pending_batches = 0
+
+    def _take(self):
+        """
+        Wait for work and take it (consumer thread)
+
+        Returns:
+            (oldest publish time, joined records) or (None, _Call), or None
+            when stopped with nothing left
+        """
+        with self._condition:
+            while not self._pending:
+                if self._stopping:
+                    self._exited = True
+                    return None
+                self._condition.wait()
+
+            published, item = self._pending.popleft()
+            if published is None:
+                return published, item
+
+            # Join every batch waiting up to the next call
+            records = list(item)
+            taken = 1
+            while self._pending and self._pending[0][0] is not None:
+                records.extend(self._pending.popleft()[1])
+                taken += 1
+            self._pending_batches -= taken
+            self._condition.notify_all()
+            return published, records
+
+    def _run(self):
+        """Consumer thread loop"""
+        while True:
+            work = self._take()
+            if work is None:
+                return
+            published, item = work
+            if published is None:
+                item.run()
+                continue
+
+            start = time.monotonic()
+            lag = start - published
+            try:
+                self.handler(item)
+            except Exception as e:
+                self.handler_errors += 1
+                if self.error_callback:
+                    self.error_callback(f"{self.name} consumer error: {e}")
+            self.handler_time_s += time.monotonic() - start
+            self.deliveries += 1
+            self.records_delivered += len(item)
+            self.lag_s_last = lag
+            self.lag_s_max = max(self.lag_s_max, lag)
+            self.lag_s_total += lag
+
+    def get_statistics(self) -> dict:
+        """
+        Get consumer statistics
+
+        Returns:
+            Dictionary with queue, drop, lag and handler time figures
+        """
+        deliveries = self.deliveries
+        return {
+            'overflow': self.overflow,
+            'pending_batches': self._pending_batches,
+            'peak_pending_batches': self.peak_pending,
+            'records_received': self.records_received,
+            'records_delivered': self.records_delivered,
+            'records_dropped': self.records_dropped,
+            'lag_ms_last': self.lag_s_last * 1000,
+            'lag_ms_avg': self.lag_s_total / deliveries * 1000 if deliveries else 0.0,
+            'lag_ms_max': self.lag_s_max * 1000,
+            'handler_ms_avg': self.handler_time_s / deliveries * 1000 if deliveries else 0.0,
+            'producer_wait_ms': self.producer_wait_s * 1000,
+            'handler_errors': self.handler_errors,
+        }
+
+
+class FanOut:
+    """
+    Registry of consumers fed from one producer
+
+    publish() only appends the batch to each consumer's queue; consumers
+    run independently, so adding one does not slow down the others. Only
+    a full consumer with the block policy holds up the producer (and with
+    it the consumers after it).
+    """
+
+    def __init__(self, error_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize fan-out
+
+        Args:
+            error_callback: Called with a message when a consumer's handler raises
+        """
+        self.error_callback = error_callback
+        self._consumers: Dict[str, Consumer] = {}
+        # Replaced, never modified, so publish() needs no lock
+        self._consumer_list = ()
+        self._lock = threading.Lock()
+        self._running = False
+        self.batches_published = 0
+
+    def register(self, name: str, handler: Callable[[List[Any]], None], overflow: str = OVERFLOW_BLOCK,
+                 max_pending: int = 64, keep: Optional[Callable[[Any], bool]] = None) -> Consumer:
+        """
+        Add a consumer (started right away if the fan-out is running)
+
+        Args:
+            name: Unique consumer name
+            handler: Called with a list of records on the consumer's thread
+            overflow: Overflow policy, one of OVERFLOW_POLICIES
+            max_pending: Batches that may wait before the overflow policy applies
+            keep: Records the decimate policy never drops
+
+        Returns:
+            The new consumer
+        """
+        consumer = Consumer(name, handler, overflow, max_pending, keep, self.error_callback)
+        with self._lock:
+            if name in self._consumers:
+                raise ValueError(f"Consumer already registered: {name}")
+            self._consumers[name] = consumer
+            self._consumer_list = tuple(self._consumers.values())
+            if self._running:
+                consumer.start()
+        return consumer
+
+    def unregister(self, name: str, drain: bool = True):
+        """Remove a consumer and stop its thread"""
+        with self._lock:
+            consumer = self._consumers.pop(name)
+            self._consumer_list = tuple(self._consumers.values())
+        consumer.stop(drain)
+
+    def get(self, name: str) -> Optional[Consumer]:
+        """Registered consumer by name (None if there is none)"""
+        return self._consumers.get(name)
+
+    def publish(self, batch: List[Any]):
+        """
+        Hand a batch to every consumer (producer thread)
+
+        Args:
+            batch: Records, in arrival order; shared by all consumers, which
+                must not modify it
+        """
+        if not batch:
+            return
+        published = time.monotonic()
+        for consumer in self._consumer_list:
+            consumer.offer(batch, published)
+        self.batches_published += 1
+
+    def start(self):
+        """Start all consumer threads"""
+        with self._lock:
+            self._running = True
+            for consumer in self._consumer_list:
+                consumer.start()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = 5.0) -> List[str]:
+        """
+        Stop all consumer threads
+
+        Args:
+            drain: Deliver the batches still waiting before stopping
+            timeout: Longest wait per consumer (None = no limit)
+
+        Returns:
+            Names of the consumers still busy after the timeout
+        """
+        with self._lock:
+            self._running = False
+            consumers = self._consumer_list
+        return [consumer.name for consumer in consumers if not consumer.stop(drain, timeout)]
+
+    def get_statistics(self) -> Dict[str, dict]:
+        """
+        Get statistics of every consumer
+
+        Returns:
+            Consumer name -> Consumer.get_statistics()
+        """
+        return {consumer.name: consumer.get_statistics() for consumer in self._consumer_list}
@@ -3,13 +3,32 @@ Live Plotter module - Consumer for real-time visualization
 Handles plotting of test data with PyQtGraph - changed on 6 feb in the comment to test workflow
 """
 
-import pyqtgraph as pg
-from PyQt5.QtCore import QTimer, pyqtSignal, QObject
+import time
 from collections import deque
-from typing import Optional
+import pyqtgraph as pg
+from PyQt5.QtCore import QEvent, Qt, QTimer, pyqtSignal, pyqtSlot, QObject
+from typing import Optional, List
 import numpy as np
-from config import PlotConfig
+from config import DetectionConfig, PlotConfig, PredictionConfig
 from data_parser import FatigueTestData
+from detection import Detection
+from plot_preparer import (CURVE_SOURCES, TREND_CURVES, TREND_PARTS, FrameRequest, PlotFrame,
+                           PlotFramePreparer, trend_key)
+from prediction import FailurePrediction, FailurePredictor
+from refresh_policy import RefreshPolicy
+
+
+# Detector column -> plot its events are marked on
+DETECTION_PLOTS = {
+    'force_lower': 'forces',
+    'force_upper': 'forces',
+    'position_1': 'travel',
+    'travel_1': 'travel',
+    'position_2': 'travel',
+    'travel_2': 'travel',
+    'travel_at_upper': 'travel',
+    'loss_of_stiffness': 'stiffness',
+}
 
 
 class LivePlotter(QObject):
@@ -20,40 +39,92 @@ class LivePlotter(QObject):
     
     # Signals for thread-safe GUI updates
     update_requested = pyqtSignal()
+    frame_ready = pyqtSignal(object)  # PlotFrame from the preparer thread
+    points_submitted = pyqtSignal(int)  # Points queued by submit_batch (any thread)
     
-    def __init__(self, config: PlotConfig):
+    def __init__(self, config: PlotConfig, prediction_config: Optional[PredictionConfig] = None,
+                 detection_config: Optional[DetectionConfig] = None):
         """
         Initialize live plotter
         
         Args:
             config: Plot configuration
+            prediction_config: Cycles-to-failure prediction settings (default: PredictionConfig())
+            detection_config: Detector settings, for the marker limit (default: DetectionConfig())
         """
         super().__init__()
         self.config = config
+        self.prediction_config = prediction_config or PredictionConfig()
+        self.detection_config = detection_config or DetectionConfig()
+        
+        # Fed with the loss of stiffness on the preparer thread; each frame
+        # carries the latest prediction and its projected curves
+        predictor = None
+        if self.prediction_config.enabled:
+            predictor = FailurePredictor(self.prediction_config.stiffness_loss_limit_percent,
+                                         model=self.prediction_config.model,
+                                         confidence=self.prediction_config.confidence,
+                                         min_points=self.prediction_config.min_points,
+                                         start_cycles=self.prediction_config.start_cycles)
+        self.prediction: Optional[FailurePrediction] = None
         
-        # Data buffers - no maxlen for unlimited points (V2 requirement)
-        self.cycles = deque()
-        self.force_lower = deque()
-        self.force_upper = deque()
-        self.travel_1 = deque()
-        self.travel_2 = deque()
-        self.travel_at_upper = deque()
-        self.loss_of_stiffness = deque()
+        # Data buffers, decimation and array preparation live in a worker
+        # thread; the GUI thread only requests frames and calls setData.
+        # One frame is in flight at a time (double-buffered arrays).
+        self.frame_ready.connect(self._apply_frame)
+        self.points_submitted.connect(self._points_submitted)
+        self.preparer = PlotFramePreparer(self.frame_ready.emit, predictor,
+                                          self.prediction_config.projection_horizon)
+        self.preparer.start()
+        self._generation = 0
+        if config.trend_bands:
+            self.preparer.request_trend(config.trend_window_cycles, config.trend_band_sigma)
+        
+        # Points drawn by the last update (high-water mark); ticks without
+        # new points skip setData unless a redraw was requested
+        self._drawn_length = 0
+        self._redraw_needed = False
         
         # Plot widgets
         self.plot_widget: Optional[pg.GraphicsLayoutWidget] = None
         self.plots = {}
         self.curves = {}
+        self.trend_curves = set()
+        
+        # Detector events: (cycles, value) per plot, newest max_markers kept
+        self.markers = {key: deque(maxlen=self.detection_config.max_markers)
+                        for key in set(DETECTION_PLOTS.values())}
+        self.marker_items = {}
         
-        # Update timer
+        # Update timer: periodic, or (adaptive refresh) single-shot and
+        # started when new data arrives, as soon as the frame budget allows
         self.update_timer = QTimer()
         self.update_timer.setInterval(config.update_interval_ms)
+        self.update_timer.setSingleShot(config.adaptive_refresh)
         self.update_timer.timeout.connect(self._update_plots)
+        self.refresh_policy = RefreshPolicy(config.min_refresh_interval_ms,
+                                            config.update_interval_ms,
+                                            config.max_plot_busy_fraction)
+        self._plotting = False
+        self._frame_started: Optional[float] = None
+        self._paint_started: Optional[float] = None
+        
+        # Visible cycles range per plot while zoomed (None = whole test);
+        # redrawn once the range has not changed for zoom_redraw_delay_ms
+        self.visible_ranges = {}
+        self.zoom_timer = QTimer()
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(config.zoom_redraw_delay_ms)
+        self.zoom_timer.timeout.connect(self._update_plots)
         
         # Statistics
         self.points_received = 0
         self.points_plotted = 0
+        self.updates_skipped = 0
         self.last_update_time = None
+        self.prepare_time_s = 0.0
+        self.apply_time_s = 0.0
+        self.paint_time_s = 0.0
         
     def setup_plots(self, parent_widget: pg.GraphicsLayoutWidget):
         """
@@ -103,10 +174,55 @@ class LivePlotter(QObject):
         self.curves['loss_stiffness'] = self.plots['stiffness'].plot(
             pen=pg.mkPen(color=(255, 140, 0), width=2))
         
+        # Failure prediction: projected trend (dashed) up to the stiffness
+        # loss limit, and the confidence band of the cycles at the limit
+        if self.prediction_config.enabled:
+            limit = self.prediction_config.stiffness_loss_limit_percent
+            self.plots['stiffness'].addItem(pg.InfiniteLine(
+                pos=limit, angle=0, pen=pg.mkPen(color=(200, 0, 0), width=1, style=Qt.DashLine),
+                label=f"Limit {limit:g}%", labelOpts={'position': 0.05}))
+            self.curves['stiffness_projection'] = self.plots['stiffness'].plot(
+                pen=pg.mkPen(color=(200, 0, 0), width=2, style=Qt.DashLine))
+            self.curves['stiffness_projection_band'] = self.plots['stiffness'].plot(
+                pen=pg.mkPen(color=(200, 0, 0, 120), width=8))
+        
+        # Trend overlays: moving mean (dashed) and +/- k sigma band (dotted),
+        # in the colour of their curve and without legend entries
+        self.trend_curves.clear()
+        for curve_key in TREND_CURVES:
+            plot_key = CURVE_SOURCES[curve_key][0]
+            color = self.curves[curve_key].opts['pen'].color()
+            styles = {'mean': Qt.DashLine, 'band_high': Qt.DotLine, 'band_low': Qt.DotLine}
+            for part in TREND_PARTS:
+                key = trend_key(curve_key, part)
+                self.curves[key] = self.plots[plot_key].plot(
+                    pen=pg.mkPen(color=color, width=1, style=styles[part]))
+                self.trend_curves.add(key)
+        
+        # Detector events as markers on the plot of their column
+        self.marker_items.clear()
+        for plot_key in self.markers:
+            self.marker_items[plot_key] = pg.ScatterPlotItem(
+                size=9, symbol='x', pen=pg.mkPen(color=(160, 0, 160), width=2), brush=None)
+            self.plots[plot_key].addItem(self.marker_items[plot_key])
+            self._draw_markers(plot_key)
+        
         # Configure auto-ranging
         if self.config.auto_range:
             for plot in self.plots.values():
                 plot.enableAutoRange()
+        
+        # Re-decimate from full resolution when the user zooms or pans
+        self.visible_ranges = {key: None for key in self.plots}
+        for key, plot in self.plots.items():
+            plot.getViewBox().sigXRangeChanged.connect(
+                lambda view_box, _, key=key: self._on_range_changed(key, view_box))
+        
+        # Repaints are posted after setData returns; timed separately
+        self.plot_widget.viewport().installEventFilter(self)
+        
+        # New curves start empty
+        self._redraw_needed = True
     
     def add_data(self, data: FatigueTestData):
         """
@@ -115,68 +231,227 @@ class LivePlotter(QObject):
         Args:
             data: Parsed fatigue test data
         """
-        self.cycles.append(data.cycles)
-        self.force_lower.append(data.force_lower_n)
-        self.force_upper.append(data.force_upper_n)
-        self.travel_1.append(data.travel_1_mm)
-        self.travel_2.append(data.travel_2_mm)
-        self.travel_at_upper.append(data.travel_at_upper_mm)
-        self.loss_of_stiffness.append(data.calculate_loss_of_stiffness())
+        self.add_batch([data])
+    
+    def add_batch(self, batch: List[FatigueTestData]):
+        """
+        Add several data points to buffers
+        
+        Args:
+            batch: Parsed fatigue test data, in arrival order
+        """
+        if not batch:
+            return
+        
+        # Converted to columns by the preparer thread
+        self.preparer.submit(batch)
+        self.points_received += len(batch)
+        self._schedule_refresh()
+    
+    def submit_batch(self, batch: List[FatigueTestData]):
+        """
+        Add several data points from any thread (e.g. a fan-out consumer)
+        
+        Args:
+            batch: Parsed fatigue test data, in arrival order
+        """
+        if not batch:
+            return
+        
+        # The preparer's queue is thread-safe; counting and the refresh
+        # timer belong to the GUI thread
+        self.preparer.submit(batch)
+        self.points_submitted.emit(len(batch))
+    
+    def _points_submitted(self, count: int):
+        """Count points queued by submit_batch and schedule a redraw (GUI thread)"""
+        self.points_received += count
+        self._schedule_refresh()
+    
+    def add_records(self, records: np.ndarray):
+        """
+        Add fixed-point records (e.g. received from the acquisition daemon)
+        
+        Args:
+            records: RECORD_DTYPE structured array, in arrival order
+        """
+        if not len(records):
+            return
         
-        self.points_received += 1
+        self.preparer.submit_records(records)
+        self.points_received += len(records)
+        self._schedule_refresh()
     
     def start_plotting(self):
         """Start the plot update timer"""
-        self.update_timer.start()
-        print(f"[LivePlotter] Started plotting with {self.config.update_interval_ms}ms interval")
+        self._plotting = True
+        if self.config.adaptive_refresh:
+            self.refresh_policy.reset()
+            self._schedule_refresh()
+            print(f"[LivePlotter] Started plotting with adaptive refresh "
+                  f"({self.config.min_refresh_interval_ms}-{self.config.update_interval_ms}ms)")
+        else:
+            self.update_timer.start()
+            print(f"[LivePlotter] Started plotting with {self.config.update_interval_ms}ms interval")
     
     def stop_plotting(self):
         """Stop the plot update timer"""
+        self._plotting = False
         self.update_timer.stop()
         print("[LivePlotter] Stopped plotting")
     
+    def shutdown(self):
+        """Stop plotting and the preparer thread"""
+        self.stop_plotting()
+        self.zoom_timer.stop()
+        self.preparer.stop()
+        self.preparer.join(timeout=1.0)
+    
+    def _schedule_refresh(self):
+        """Start the single-shot update timer for new data (adaptive refresh)"""
+        if (not self.config.adaptive_refresh or not self._plotting
+                or self.update_timer.isActive() or self._frame_started is not None):
+            return
+        self.update_timer.start(self.refresh_policy.next_delay_ms())
+    
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """Time repaints of the plot widget (viewport event filter)"""
+        if event.type() == QEvent.Paint and self._paint_started is None:
+            self._paint_started = time.monotonic()
+            # Runs once the paint event has been handled
+            QTimer.singleShot(0, self._paint_finished)
+        return False
+    
+    def _paint_finished(self):
+        """Record the duration of the last repaint"""
+        self.paint_time_s = time.monotonic() - self._paint_started
+        self._paint_started = None
+    
+    def _frame_finished(self):
+        """Record the cost of the last redraw"""
+        started, self._frame_started = self._frame_started, None
+        
+        # Frame cost: setData, the repaint it causes (as measured for the
+        # last one) and the preparation, which runs in the background but
+        # still takes CPU time from the same process
+        self.refresh_policy.record_frame(
+            started, self.apply_time_s + self.paint_time_s + self.prepare_time_s)
+        
+        # Data or view changes that arrived during the redraw
+        if self.points_received > self._drawn_length or self._redraw_needed:
+            self._schedule_refresh()
+    
     def _update_plots(self):
-        """Update all plots with current data (called by timer)"""
-        if not self.plot_widget or len(self.cycles) == 0:
+        """Request a frame for the current data and view (called by timer)"""
+        if not self.plot_widget or self.points_received == 0:
             return
         
-        try:
-            # Convert deques to numpy arrays for efficient plotting
-            cycles_array = np.array(self.cycles)
-            
-            # Update forces plot (Plot 1)
-            self.curves['force_lower'].setData(cycles_array, np.array(self.force_lower))
-            self.curves['force_upper'].setData(cycles_array, np.array(self.force_upper))
-            
-            # Update travel plot (Plot 2)
-            self.curves['travel_at_upper'].setData(cycles_array, np.array(self.travel_at_upper))
-            self.curves['travel_1'].setData(cycles_array, np.array(self.travel_1))
-            self.curves['travel_2'].setData(cycles_array, np.array(self.travel_2))
-            
-            # Update loss of stiffness plot (Plot 3)
-            self.curves['loss_stiffness'].setData(cycles_array, np.array(self.loss_of_stiffness))
-            
-            self.points_plotted = len(cycles_array)
-            
-        except Exception as e:
-            print(f"[LivePlotter] Error updating plots: {e}")
+        # The frame in flight is picked up by _frame_finished
+        if self._frame_started is not None:
+            return
+        
+        # Nothing new since the last update
+        if self.points_received == self._drawn_length and not self._redraw_needed:
+            self.updates_skipped += 1
+            return
+        
+        self._frame_started = time.monotonic()
+        self._redraw_needed = False
+        
+        # Extremes of every bucket, about 2 points per pixel, over the
+        # visible part of the test
+        self.preparer.request_frame(FrameRequest(
+            generation=self._generation,
+            decimation=self.config.decimation,
+            point_budgets={plot_key: self._point_budget(plot_key) for plot_key in self.plots},
+            visible_ranges=dict(self.visible_ranges)))
+    
+    @pyqtSlot(object)
+    def _apply_frame(self, frame: PlotFrame):
+        """Draw a prepared frame (GUI thread, via frame_ready)"""
+        apply_started = time.monotonic()
+        
+        # Frames prepared before the plots were cleared are dropped
+        if frame.generation == self._generation:
+            try:
+                for key, (x, y) in frame.curves.items():
+                    # Overlays of a frame prepared before they were turned off
+                    if key in self.trend_curves and not self.config.trend_bands:
+                        continue
+                    self.curves[key].setData(x, y)
+                
+                self.points_plotted = frame.points_plotted
+                self.prediction = frame.prediction
+                self._drawn_length = frame.length
+                
+            except Exception as e:
+                print(f"[LivePlotter] Error updating plots: {e}")
+        
+        self.prepare_time_s = frame.prepare_time_s
+        self.apply_time_s = time.monotonic() - apply_started
+        self._frame_finished()
+    
+    def _on_range_changed(self, plot_key: str, view_box: pg.ViewBox):
+        """Schedule a redraw for a new visible cycles range"""
+        # Auto-ranging follows the data, which is always drawn in full
+        if view_box.state['autoRange'][0]:
+            visible = None
+        else:
+            visible = tuple(view_box.viewRange()[0])
+        
+        if visible != self.visible_ranges.get(plot_key):
+            self.visible_ranges[plot_key] = visible
+            self._redraw_needed = True
+            # Restarted on every change: one redraw after a zoom or pan gesture
+            self.zoom_timer.start()
+    
+    def _point_budget(self, plot_key: str) -> int:
+        """Points per curve: max_points_display, or twice the plot width in pixels"""
+        if self.config.max_points_display > 0:
+            return self.config.max_points_display
+        width = int(self.plots[plot_key].getViewBox().width())
+        return 2 * width if width > 0 else 2000
+    
+    def add_detections(self, detections: List[Detection]):
+        """
+        Mark detector events on the plots
+        
+        Args:
+            detections: Detections from the processing worker's detector stage
+        """
+        changed = set()
+        for detection in detections:
+            plot_key = DETECTION_PLOTS[detection.column]
+            self.markers[plot_key].append((detection.cycles, detection.value))
+            changed.add(plot_key)
+        for plot_key in changed:
+            self._draw_markers(plot_key)
+    
+    def _draw_markers(self, plot_key: str):
+        """Show the stored markers of one plot"""
+        if plot_key not in self.marker_items:
+            return
+        markers = self.markers[plot_key]
+        self.marker_items[plot_key].setData([x for x, _ in markers], [y for _, y in markers])
     
     def clear_plots(self):
         """Clear all plot data"""
-        self.cycles.clear()
-        self.force_lower.clear()
-        self.force_upper.clear()
-        self.travel_1.clear()
-        self.travel_2.clear()
-        self.travel_at_upper.clear()
-        self.loss_of_stiffness.clear()
+        # Frames still in flight belong to the old data and are dropped
+        self._generation += 1
+        self.preparer.request_clear()
+        self._drawn_length = 0
         
         # Clear curves
         for curve in self.curves.values():
             curve.setData([], [])
         
+        for plot_key, markers in self.markers.items():
+            markers.clear()
+            self._draw_markers(plot_key)
+        
         self.points_received = 0
         self.points_plotted = 0
+        self.prediction = None
         
         print("[LivePlotter] Cleared all plots")
     
@@ -185,7 +460,14 @@ class LivePlotter(QObject):
         return {
             'points_received': self.points_received,
             'points_plotted': self.points_plotted,
-            'buffer_size': len(self.cycles),
+            'buffer_size': len(self.preparer),
+            'updates_skipped': self.updates_skipped,
+            'frame_time_ms': (self.refresh_policy.frame_time_s or 0.0) * 1000.0,
+            'prepare_time_ms': self.prepare_time_s * 1000.0,
+            'gui_time_ms': (self.apply_time_s + self.paint_time_s) * 1000.0,
+            'prediction': self.prediction,
+            'markers': sum(len(markers) for markers in self.markers.values()),
+            'refresh_rate_hz': self.refresh_policy.refresh_rate_hz(),
             'update_interval_ms': self.config.update_interval_ms
         }
     
@@ -198,8 +480,34 @@ class LivePlotter(QObject):
         """
         self.config.update_interval_ms = interval_ms
         self.update_timer.setInterval(interval_ms)
+        self.refresh_policy.max_interval_ms = interval_ms
         print(f"[LivePlotter] Update interval set to {interval_ms}ms")
     
+    def set_trend_bands(self, enable: bool, window_cycles: Optional[int] = None):
+        """
+        Show or hide the moving mean and +/- k sigma trend overlays
+        
+        Args:
+            enable: True to show the overlays
+            window_cycles: New moving window length in cycles (default: unchanged)
+        """
+        self.config.trend_bands = enable
+        if window_cycles is not None:
+            self.config.trend_window_cycles = window_cycles
+        
+        # Overlays are computed only while shown; enabling rebuilds them
+        # from the stored data on the preparer thread
+        self.preparer.request_trend(self.config.trend_window_cycles if enable else 0,
+                                    self.config.trend_band_sigma)
+        if not enable:
+            for key in self.trend_curves:
+                self.curves[key].setData([], [])
+        
+        self._redraw_needed = True
+        self._schedule_refresh()
+        print(f"[LivePlotter] Trend bands {'enabled' if enable else 'disabled'} "
+              f"({self.config.trend_window_cycles} cycles, +/-{self.config.trend_band_sigma:g} sigma)")
+    
     def enable_auto_range(self, enable: bool):
         """
         Enable or disable auto-ranging
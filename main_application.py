@@ -4,6 +4,7 @@ Orchestrates all components with PyQt5 GUI
 """
 
 import sys
+import multiprocessing
 import queue
 import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -11,31 +12,44 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QLineEdit, QGroupBox, QTextEdit, QStatusBar,
                              QFileDialog, QMessageBox, QSpinBox, QCheckBox,
                              QGridLayout, QTabWidget)
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QThread
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QThread, QObject
 from PyQt5.QtGui import QFont
 import pyqtgraph as pg
 
-from config import SerialConfig, PlotConfig, LogConfig, WatchdogConfig
-from data_parser import DataParser
-from serial_reader import SerialReader, MockSerialReader
+from config import (SerialConfig, PlotConfig, LogConfig, WatchdogConfig, BatchConfig, PredictionConfig,
+                    DetectionConfig, IpcConfig, FanOutConfig)
+from data_parser import (DataParser, FRAME_VALID, FRAME_TEST_END, FRAME_ERROR_CODE,
+                         FRAME_INVALID, FRAME_MALFORMED)
+from serial_reader import SerialReader, MockSerialReader, drain_batches
+from process_reader import create_serial_reader
 from data_logger import DataLogger
 from live_plotter import LivePlotter
+from detection import DetectorStage
+from fanout import FanOut
+from acquisition_ipc import AcquisitionClient
 
 
 class DataProcessorWorker(QThread):
     """
     Worker thread for processing data from queue
-    Implements the broker/processor layer
+    Implements the broker/processor layer: parsed batches are published to
+    the fan-out consumers (logger, plotter, detectors) and sent to the GUI
     """
     
-    data_processed = pyqtSignal(object)  # Emits FatigueTestData
+    batch_processed = pyqtSignal(list)  # Emits list of FatigueTestData
+    detections_found = pyqtSignal(list)  # Emits list of detection.Detection
     status_update = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, data_queue: queue.Queue, parser: DataParser):
+    def __init__(self, data_queue: queue.Queue, parser: DataParser,
+                 batch_config: BatchConfig = None, detector_stage: DetectorStage = None,
+                 fanout: FanOut = None):
         super().__init__()
         self.data_queue = data_queue
         self.parser = parser
+        self.batch_config = batch_config or BatchConfig()
+        self.detector_stage = detector_stage
+        self.fanout = fanout
         self.running = False
         
     def run(self):
@@ -43,42 +57,166 @@ class DataProcessorWorker(QThread):
         self.running = True
         self.status_update.emit("Data processor started")
         
+        # Records parsed since the last emit; sent to the GUI at most
+        # gui_emit_rate_hz times per second
+        emit_interval = 1.0 / self.batch_config.gui_emit_rate_hz
+        pending = []
+        last_emit = 0.0
+        
         while self.running:
+            if pending:
+                timeout = max(0.0, last_emit + emit_interval - time.monotonic())
+            else:
+                timeout = 0.1
+            
             try:
-                # Get data from queue with timeout
-                raw_data = self.data_queue.get(timeout=0.1)
-                
-                # Parse data
-                parsed_data = self.parser.parse(raw_data)
-                
-                if parsed_data:
-                    # Validate data
-                    is_valid, error_msg = self.parser.validate_data(parsed_data)
-                    
-                    if is_valid:
-                        # Emit parsed data to consumers
-                        self.data_processed.emit(parsed_data)
-                    else:
-                        self.error_occurred.emit(f"Validation error: {error_msg}")
-                        
-                    # Check for test end or errors
-                    if parsed_data.is_test_end():
-                        self.status_update.emit("Test ended")
-                    
-                    if parsed_data.has_error():
-                        error_desc = self.parser.get_error_description(parsed_data.error_code)
-                        self.error_occurred.emit(f"Test error: {error_desc}")
-                
+                # Take every batch that is waiting in one go
+                lines = drain_batches(self.data_queue, self.batch_config.max_batch_size, timeout=timeout)
             except queue.Empty:
-                continue
-            except Exception as e:
-                self.error_occurred.emit(f"Processing error: {e}")
+                lines = []
+            
+            for raw_data in lines:
+                try:
+                    parsed_data = self._process_line(raw_data)
+                    if parsed_data:
+                        pending.append(parsed_data)
+                except Exception as e:
+                    self.error_occurred.emit(f"Processing error: {e}")
+            
+            now = time.monotonic()
+            if pending and now - last_emit >= emit_interval:
+                self._emit_batch(pending)
+                pending = []
+                last_emit = now
+        
+        if pending:
+            self._emit_batch(pending)
+    
+    def _emit_batch(self, batch: list):
+        """Publish a batch to the consumers and send it to the GUI"""
+        if self.fanout:
+            self.fanout.publish(batch)
+        else:
+            self.detect(batch)
+        
+        self.batch_processed.emit(batch)
+    
+    def detect(self, batch: list):
+        """Run the detectors over a batch (this thread or the detectors consumer)"""
+        if not self.detector_stage:
+            return
+        
+        try:
+            detections = self.detector_stage.process(batch)
+        except Exception as e:
+            self.error_occurred.emit(f"Detection error: {e}")
+            return
+        
+        if detections:
+            self.detections_found.emit(detections)
+    
+    def _process_line(self, raw_data: bytes):
+        """
+        Parse, validate and classify a single frame
+        
+        Returns:
+            FatigueTestData to forward to consumers, or None
+        """
+        parsed_data, frame_class = self.parser.parse_frame(raw_data)
+        
+        # Fast path: valid DTA record without error code
+        if frame_class == FRAME_VALID:
+            return parsed_data
+        if frame_class & FRAME_MALFORMED:
+            return None
+        
+        if frame_class & FRAME_INVALID:
+            error_msg = self.parser.validate_data(parsed_data)[1]
+            self.error_occurred.emit(f"Validation error: {error_msg}")
+            
+        # Check for test end or errors
+        if frame_class & FRAME_TEST_END:
+            self.status_update.emit("Test ended")
+        
+        if frame_class & FRAME_ERROR_CODE:
+            error_desc = self.parser.get_error_description(parsed_data.error_code)
+            self.error_occurred.emit(f"Test error: {error_desc}")
+        
+        return None if frame_class & FRAME_INVALID else parsed_data
     
     def stop(self):
         """Stop the processor"""
         self.running = False
 
 
+class DaemonClientWorker(QObject):
+    """
+    Viewer connection to the acquisition daemon (acquire.py --serve)
+    
+    Records arrive on the client's socket thread, where the detectors run
+    too; everything reaches the GUI thread through queued signals. The
+    detectors are primed with the history, only live records report
+    detections.
+    """
+    
+    records_received = pyqtSignal(object, bool)  # RECORD_DTYPE array, is history
+    detections_found = pyqtSignal(list)  # Emits list of detection.Detection
+    statistics_received = pyqtSignal(dict)  # Daemon logger statistics
+    status_update = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+    disconnected = pyqtSignal()
+    
+    def __init__(self, ipc_config: IpcConfig, detector_stage: DetectorStage = None):
+        super().__init__()
+        self.ipc_config = ipc_config
+        self.detector_stage = detector_stage
+        self.client = AcquisitionClient(self._on_records, self._on_message,
+                                        self.statistics_received.emit, self.disconnected.emit)
+        
+    def attach(self) -> dict:
+        """
+        Connect to the daemon
+        
+        Returns:
+            Daemon information (current_file, source, history_rows, ...)
+            
+        Raises:
+            OSError: If no daemon is listening
+        """
+        return self.client.connect(self.ipc_config.host, self.ipc_config.port)
+    
+    def detach(self):
+        """Disconnect; the daemon keeps acquiring"""
+        self.client.close()
+    
+    def send_command(self, command: str, **arguments):
+        """Send a command to the daemon"""
+        try:
+            self.client.send_command(command, **arguments)
+        except OSError as e:
+            self.error_occurred.emit(f"Daemon command failed: {e}")
+    
+    def _on_records(self, records, history: bool):
+        """Run the detectors and pass records to the GUI (client thread)"""
+        detections = []
+        if self.detector_stage:
+            try:
+                detections = self.detector_stage.process_records(records)
+            except Exception as e:
+                self.error_occurred.emit(f"Detection error: {e}")
+        
+        self.records_received.emit(records, history)
+        if detections and not history:
+            self.detections_found.emit(detections)
+    
+    def _on_message(self, level: str, text: str):
+        """Forward a daemon status or error message (client thread)"""
+        if level == "error":
+            self.error_occurred.emit(text)
+        else:
+            self.status_update.emit(text)
+
+
 class WatchdogTimer(QTimer):
     """
     Watchdog timer to detect data reception timeout
@@ -108,6 +246,10 @@ class WatchdogTimer(QTimer):
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Thread-safe route for errors reported by the logger's writer thread
+    logger_error = pyqtSignal(str)
+    logger_event = pyqtSignal(str)  # Event file messages from the writer thread
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Fatigue Tester Data Acquisition System v2.0")
@@ -118,16 +260,30 @@ class MainWindow(QMainWindow):
         self.plot_config = PlotConfig()
         self.log_config = LogConfig()
         self.watchdog_config = WatchdogConfig()
+        self.batch_config = BatchConfig()
+        self.prediction_config = PredictionConfig()
+        self.detection_config = DetectionConfig()
+        self.ipc_config = IpcConfig()
+        self.fanout_config = FanOutConfig()
         
         # Initialize components
         self.data_queue = queue.Queue()
         self.parser = DataParser()
-        self.logger = DataLogger(self.log_config)
-        self.plotter = LivePlotter(self.plot_config)
+        self.logger = DataLogger(self.log_config, status_callback=self.logger_error.emit,
+                                 event_callback=self.logger_event.emit)
+        self.plotter = LivePlotter(self.plot_config, self.prediction_config, self.detection_config)
         
         # Serial reader (will be created on connect)
         self.serial_reader = None
         self.processor_worker = None
+        self.fanout = None  # Consumers of the processed batches (created on connect)
+        
+        # Acquisition daemon connection (attach mode) and its latest statistics
+        self.daemon_client = None
+        self.daemon_stats = None
+        
+        self.logger_error.connect(self.log_error)
+        self.logger_event.connect(self.log_status)
         
         # Watchdog
         self.watchdog = WatchdogTimer(self.watchdog_config.timeout_seconds)
@@ -255,6 +411,19 @@ class MainWindow(QMainWindow):
         self.mock_mode_check = QCheckBox("Use Mock Data (Testing)")
         layout.addWidget(self.mock_mode_check, 3, 0, 1, 2)
         
+        # Read loop in a child process, out of reach of the GUI thread
+        self.reader_process_check = QCheckBox("Read Port in Separate Process")
+        self.reader_process_check.setChecked(self.serial_config.reader_process)
+        self.reader_process_check.setToolTip("Keeps reading on time while the GUI is busy; "
+                                             "frames pass through a shared-memory ring")
+        layout.addWidget(self.reader_process_check, 4, 0, 1, 2)
+        
+        # Viewer mode: reading and logging run in the acquisition daemon
+        self.attach_check = QCheckBox(f"Attach to Acquisition Daemon (port {self.ipc_config.port})")
+        self.attach_check.setToolTip("Start the daemon with: python acquire.py --port COM3 --serve\n"
+                                     "It keeps logging when this window is closed")
+        layout.addWidget(self.attach_check, 5, 0, 1, 2)
+        
         group.setLayout(layout)
         return group
     
@@ -283,6 +452,13 @@ class MainWindow(QMainWindow):
         
         layout.addLayout(save_layout)
         
+        # Manual trigger of a full-resolution event file
+        self.capture_event_btn = QPushButton("Capture Event")
+        self.capture_event_btn.clicked.connect(self.capture_event)
+        self.capture_event_btn.setEnabled(False)
+        self.capture_event_btn.setVisible(self.log_config.event_capture)
+        layout.addWidget(self.capture_event_btn)
+        
         group.setLayout(layout)
         return group
     
@@ -297,6 +473,8 @@ class MainWindow(QMainWindow):
         self.update_interval_spin.setRange(100, 5000)
         self.update_interval_spin.setValue(self.plot_config.update_interval_ms)
         self.update_interval_spin.setSingleStep(100)
+        self.update_interval_spin.setToolTip("Longest time between redraws while data arrives "
+                                             "(with adaptive refresh, cheaper redraws run sooner)")
         self.update_interval_spin.valueChanged.connect(self.on_update_interval_changed)
         layout.addWidget(self.update_interval_spin, 0, 1)
         
@@ -306,10 +484,25 @@ class MainWindow(QMainWindow):
         self.auto_range_check.stateChanged.connect(self.on_auto_range_changed)
         layout.addWidget(self.auto_range_check, 1, 0, 1, 2)
         
+        # Trend overlays: moving mean and +/- k sigma bands
+        self.trend_bands_check = QCheckBox(f"Trend Bands (mean ± {self.plot_config.trend_band_sigma:g}σ)")
+        self.trend_bands_check.setChecked(self.plot_config.trend_bands)
+        self.trend_bands_check.stateChanged.connect(self.on_trend_bands_changed)
+        layout.addWidget(self.trend_bands_check, 2, 0, 1, 2)
+        
+        layout.addWidget(QLabel("Trend Window (cycles):"), 3, 0)
+        self.trend_window_spin = QSpinBox()
+        self.trend_window_spin.setRange(10, 10000000)
+        self.trend_window_spin.setValue(self.plot_config.trend_window_cycles)
+        self.trend_window_spin.setSingleStep(100)
+        self.trend_window_spin.setKeyboardTracking(False)
+        self.trend_window_spin.valueChanged.connect(self.on_trend_window_changed)
+        layout.addWidget(self.trend_window_spin, 3, 1)
+        
         # Clear plots button
         self.clear_plot_btn = QPushButton("Clear Plots")
         self.clear_plot_btn.clicked.connect(self.clear_plots)
-        layout.addWidget(self.clear_plot_btn, 2, 0, 1, 2)
+        layout.addWidget(self.clear_plot_btn, 4, 0, 1, 2)
         
         group.setLayout(layout)
         return group
@@ -356,14 +549,26 @@ class MainWindow(QMainWindow):
     
     def connect_serial(self):
         """Connect to serial port or start mock reader"""
+        if self.attach_check.isChecked():
+            self.attach_daemon()
+            return
+        
         try:
             # Update configuration from UI
             self.serial_config.port = self.port_combo.currentText()
             self.serial_config.baudrate = int(self.baudrate_combo.currentText())
+            self.serial_config.reader_process = self.reader_process_check.isChecked()
             
             # Create data processor
-            self.processor_worker = DataProcessorWorker(self.data_queue, self.parser)
-            self.processor_worker.data_processed.connect(self.on_data_received)
+            detector_stage = None
+            if self.detection_config.enabled:
+                detector_stage = DetectorStage.from_config(self.detection_config)
+            self.fanout = FanOut(error_callback=self.logger_error.emit)
+            self.processor_worker = DataProcessorWorker(self.data_queue, self.parser, self.batch_config,
+                                                        detector_stage, self.fanout)
+            self.register_consumers(self.fanout, self.processor_worker)
+            self.processor_worker.batch_processed.connect(self.on_batch_received)
+            self.processor_worker.detections_found.connect(self.on_detections)
             self.processor_worker.status_update.connect(self.log_status)
             self.processor_worker.error_occurred.connect(self.log_error)
             self.processor_worker.start()
@@ -378,10 +583,11 @@ class MainWindow(QMainWindow):
                 self.serial_reader.start()
                 success = True
             else:
-                self.serial_reader = SerialReader(
+                self.serial_reader = create_serial_reader(
                     self.serial_config,
                     self.data_queue,
-                    status_callback=self.log_status
+                    status_callback=self.log_status,
+                    batch_config=self.batch_config
                 )
                 success = self.serial_reader.connect()
                 if success:
@@ -395,12 +601,16 @@ class MainWindow(QMainWindow):
                 self.port_combo.setEnabled(False)
                 self.baudrate_combo.setEnabled(False)
                 self.mock_mode_check.setEnabled(False)
+                self.reader_process_check.setEnabled(False)
+                self.attach_check.setEnabled(False)
                 
-                # Start logger
+                # Start logger, then the consumers (batches published so far are waiting)
                 log_file = self.logger.start_new_log()
+                self.fanout.start()
                 self.current_log_label.setText(f"Logging to: {self.logger.current_filename}")
                 self.save_btn.setEnabled(True)
                 self.new_log_btn.setEnabled(True)
+                self.capture_event_btn.setEnabled(True)
                 
                 # Start plotter
                 self.plotter.start_plotting()
@@ -411,6 +621,11 @@ class MainWindow(QMainWindow):
                 self.update_status("Connected and logging")
                 self.log_status("System connected and running")
             else:
+                # Nothing to process without a reader
+                self.processor_worker.stop()
+                self.processor_worker.wait()
+                self.processor_worker = None
+                self.fanout = None
                 self.log_error("Failed to connect")
                 
         except Exception as e:
@@ -419,6 +634,10 @@ class MainWindow(QMainWindow):
     
     def disconnect_serial(self):
         """Disconnect from serial port"""
+        if self.daemon_client:
+            self.detach_daemon()
+            return
+        
         try:
             # Stop watchdog
             self.watchdog.stop()
@@ -440,8 +659,15 @@ class MainWindow(QMainWindow):
                 self.processor_worker.wait()
                 self.processor_worker = None
             
-            # Close logger
-            self.logger.close_log()
+            # Stop consumers once they have taken everything published
+            if self.fanout:
+                busy = self.fanout.stop()
+                if busy:
+                    self.log_error(f"Consumers still busy after stopping: {', '.join(busy)}")
+            
+            # Close logger after the records still waiting for it
+            self._logger_call(self.logger.close_log)
+            self.fanout = None
             
             self.is_connected = False
             self.connect_btn.setText("Connect")
@@ -449,6 +675,8 @@ class MainWindow(QMainWindow):
             self.port_combo.setEnabled(True)
             self.baudrate_combo.setEnabled(True)
             self.mock_mode_check.setEnabled(True)
+            self.reader_process_check.setEnabled(True)
+            self.attach_check.setEnabled(True)
             
             self.update_status("Disconnected")
             self.log_status("System disconnected")
@@ -456,21 +684,142 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.log_error(f"Disconnect error: {e}")
     
-    def on_data_received(self, data):
-        """Handle received and parsed data"""
-        # Reset watchdog
-        self.watchdog.reset()
+    def register_consumers(self, fanout: FanOut, processor_worker: DataProcessorWorker):
+        """Register the logger, plotter and detectors as consumers of the processed batches"""
+        config = self.fanout_config
+        fanout.register('logger', self.logger.log_batch, config.logger_overflow, config.max_pending_batches)
+        fanout.register('plotter', self.plotter.submit_batch, config.plotter_overflow,
+                        config.max_pending_batches, keep=lambda data: data.is_test_end() or data.has_error())
+        if processor_worker.detector_stage:
+            fanout.register('detectors', processor_worker.detect, config.detector_overflow,
+                            config.max_pending_batches)
+    
+    def _logger_call(self, function, *args):
+        """
+        Run a logger operation in order with the batches waiting for the logger consumer
+        
+        Returns:
+            The operation's result, or None if the logger did not get to it in time
+            (it still runs once the records queued before it are written)
+        """
+        consumer = self.fanout.get('logger') if self.fanout else None
+        if consumer:
+            timeout = self.fanout_config.logger_call_timeout_s
+            try:
+                return consumer.call(function, *args, timeout=timeout)
+            except TimeoutError:
+                self.log_error(f"Logger busy: {function.__name__} runs after the records "
+                               f"still waiting ({timeout:.0f} s timeout)")
+                return None
+        return function(*args)
+    
+    def attach_daemon(self):
+        """Attach to the acquisition daemon as a viewer"""
+        detector_stage = None
+        if self.detection_config.enabled:
+            detector_stage = DetectorStage.from_config(self.detection_config)
+        client = DaemonClientWorker(self.ipc_config, detector_stage)
+        client.records_received.connect(self.on_daemon_records)
+        client.detections_found.connect(self.on_detections)
+        client.statistics_received.connect(self.on_daemon_statistics)
+        client.status_update.connect(self.log_status)
+        client.error_occurred.connect(self.log_error)
+        client.disconnected.connect(self.on_daemon_disconnected)
+        
+        try:
+            info = client.attach()
+        except OSError as e:
+            self.log_error(f"No acquisition daemon on port {self.ipc_config.port}: {e}")
+            return
+        
+        self.daemon_client = client
+        self.daemon_stats = None
+        self.is_connected = True
+        self.connection_time = time.time()
+        self.connect_btn.setText("Detach")
+        self.connect_btn.setStyleSheet("background-color: #ffcccc")
+        self.port_combo.setEnabled(False)
+        self.baudrate_combo.setEnabled(False)
+        self.mock_mode_check.setEnabled(False)
+        self.reader_process_check.setEnabled(False)
+        self.attach_check.setEnabled(False)
+        
+        # Logging happens in the daemon; new logs and events are requested from it
+        self.current_log_label.setText(f"Daemon logging to: {info.get('current_file')}")
+        self.new_log_btn.setEnabled(True)
+        self.capture_event_btn.setEnabled(True)
+        
+        self.plotter.clear_plots()
+        self.plotter.start_plotting()
+        self.watchdog.start()
+        
+        self.update_status(f"Attached to acquisition daemon ({info.get('source')})")
+        self.log_status(f"Attached to acquisition daemon: {info.get('history_rows', 0)} history records")
+    
+    def detach_daemon(self):
+        """Detach from the acquisition daemon (it keeps reading and logging)"""
+        self.watchdog.stop()
+        self.plotter.stop_plotting()
+        if self.daemon_client:
+            self.daemon_client.detach()
+            self.daemon_client = None
         
-        # Log data
-        self.logger.log_data(data)
+        self.is_connected = False
+        self.connect_btn.setText("Connect")
+        self.connect_btn.setStyleSheet("")
+        self.port_combo.setEnabled(True)
+        self.baudrate_combo.setEnabled(True)
+        self.mock_mode_check.setEnabled(True)
+        self.reader_process_check.setEnabled(True)
+        self.attach_check.setEnabled(True)
+        self.new_log_btn.setEnabled(False)
+        self.capture_event_btn.setEnabled(False)
+        self.current_log_label.setText("No active log file")
         
-        # Add to plotter
-        self.plotter.add_data(data)
+        self.update_status("Detached")
+        self.log_status("Detached from acquisition daemon")
+    
+    def on_daemon_records(self, records, history):
+        """Handle records streamed by the acquisition daemon"""
+        if not history:
+            self.watchdog.reset()
+        self.plotter.add_records(records)
+    
+    def on_daemon_statistics(self, statistics):
+        """Handle the daemon's periodic statistics"""
+        self.daemon_stats = statistics
+        self.current_log_label.setText(f"Daemon logging to: {statistics.get('current_file')}")
+    
+    def on_daemon_disconnected(self):
+        """Handle a lost daemon connection"""
+        self.log_error("Connection to the acquisition daemon lost")
+        self.detach_daemon()
+    
+    def on_batch_received(self, batch):
+        """Handle a batch of received and parsed data"""
+        # Reset watchdog (logger, plotter and detectors get the batch from the fan-out)
+        self.watchdog.reset()
         
         # Check for errors
-        if data.has_error():
-            error_desc = self.parser.get_error_description(data.error_code)
-            self.log_error(f"Cycle {data.cycles}: {error_desc}")
+        for data in batch:
+            if data.has_error():
+                error_desc = self.parser.get_error_description(data.error_code)
+                self.log_error(f"Cycle {data.cycles}: {error_desc}")
+    
+    def on_detections(self, detections):
+        """Handle detector events of a batch"""
+        self.plotter.add_detections(detections)
+        
+        shown = self.detection_config.max_log_per_batch
+        for detection in detections[:shown]:
+            self.log_status(f"<span style='color: darkorange;'><b>{detection.detector}</b> "
+                            f"at cycle {detection.cycles}: {detection.message}</span>")
+        if len(detections) > shown:
+            self.log_status(f"... and {len(detections) - shown} more detections in this batch")
+        
+        if self.detection_config.trigger_events and detections:
+            # One trigger per batch: its detections fall into the same event window
+            self._trigger_event(", ".join(dict.fromkeys(detection.detector for detection in detections)))
     
     def on_watchdog_timeout(self, elapsed):
         """Handle watchdog timeout"""
@@ -490,7 +839,7 @@ class MainWindow(QMainWindow):
             # Extract filename without path and extension
             import os
             base_name = os.path.splitext(os.path.basename(filename))[0]
-            saved_path = self.logger.save_current_log(base_name)
+            saved_path = self._logger_call(self.logger.save_current_log, base_name)
             if saved_path:
                 QMessageBox.information(self, "Success", f"Log saved to:\n{saved_path}")
     
@@ -503,12 +852,29 @@ class MainWindow(QMainWindow):
             QMessageBox.Yes | QMessageBox.No
         )
         
-        if reply == QMessageBox.Yes:
-            self.logger.close_log()
-            log_file = self.logger.start_new_log()
+        if reply == QMessageBox.Yes and self.daemon_client:
+            self.daemon_client.send_command("new_log")
+        elif reply == QMessageBox.Yes and self._logger_call(self._restart_log):
             self.current_log_label.setText(f"Logging to: {self.logger.current_filename}")
             self.log_status(f"Started new log: {self.logger.current_filename}")
     
+    def _restart_log(self):
+        """Close the current log file and start a new one"""
+        self.logger.close_log()
+        return self.logger.start_new_log()
+    
+    def capture_event(self):
+        """Write an event file around the most recent data"""
+        self._trigger_event("Manual trigger")
+        self.log_status("Event capture triggered")
+    
+    def _trigger_event(self, reason: str):
+        """Trigger an event file in the local logger or the attached daemon"""
+        if self.daemon_client:
+            self.daemon_client.send_command("capture_event", reason=reason)
+        else:
+            self._logger_call(self.logger.trigger_event, reason)
+    
     def clear_plots(self):
         """Clear all plot data"""
         self.plotter.clear_plots()
@@ -522,6 +888,16 @@ class MainWindow(QMainWindow):
         """Handle auto-range checkbox change"""
         self.plotter.enable_auto_range(state == Qt.Checked)
     
+    def on_trend_bands_changed(self, state):
+        """Handle trend bands checkbox change"""
+        self.plotter.set_trend_bands(state == Qt.Checked, self.trend_window_spin.value())
+    
+    def on_trend_window_changed(self, value):
+        """Handle trend window change"""
+        self.plot_config.trend_window_cycles = value
+        if self.plot_config.trend_bands:
+            self.plotter.set_trend_bands(True, value)
+    
     def update_statistics(self):
         """Update statistics display"""
         stats = []
@@ -538,21 +914,68 @@ class MainWindow(QMainWindow):
             reader_stats = self.serial_reader.get_statistics() if hasattr(self.serial_reader, 'get_statistics') else {}
             if 'lines_received' in reader_stats:
                 stats.append(f"Lines Received: {reader_stats['lines_received']}")
+            if 'frames_overrun' in reader_stats:
+                stats.append(f"Ring Overruns: {reader_stats['frames_overrun']} frames "
+                             f"(peak fill {reader_stats['ring_peak_percent']:.1f}%)")
         
-        # Logger statistics
+        # Logger statistics (the daemon's while attached)
         logger_stats = self.logger.get_statistics()
+        if self.daemon_client and self.daemon_stats:
+            logger_stats = self.daemon_stats
+            stats.append(f"Daemon Records: {logger_stats['records_received']} "
+                         f"(up {logger_stats['up_seconds']:.0f}s, {logger_stats['viewers']} viewers)")
         stats.append(f"Points Logged: {logger_stats['total_points_logged']}")
+        stats.append(f"Log Queue: {logger_stats['queue_depth']} "
+                     f"(latency avg {logger_stats['write_latency_ms_avg']:.1f} ms, "
+                     f"max {logger_stats['write_latency_ms_max']:.1f} ms)")
+        if self.log_config.log_every_cycles > 1 or self.log_config.event_capture:
+            stats.append(f"Decimated: {logger_stats['points_decimated']}, "
+                         f"Event Files: {logger_stats['events_captured']} "
+                         f"({logger_stats['event_rows_written']} rows)")
+        if logger_stats['compression_ratio']:
+            stats.append(f"Compression: {logger_stats['compression_ratio']:.1f}:1")
         
         # Plotter statistics
         plotter_stats = self.plotter.get_statistics()
         stats.append(f"Points Plotted: {plotter_stats['points_plotted']}")
         stats.append(f"Buffer Size: {plotter_stats['buffer_size']}")
+        stats.append(f"Plot Frame: {plotter_stats['frame_time_ms']:.1f} ms "
+                     f"(GUI {plotter_stats['gui_time_ms']:.1f} ms, {plotter_stats['refresh_rate_hz']:.1f} Hz)")
+        if self.prediction_config.enabled:
+            stats.append(self._format_prediction(plotter_stats['prediction']))
+        
+        # Detector statistics
+        stage = self.processor_worker.detector_stage if self.processor_worker else None
+        if stage and stage.records_processed:
+            cost_us = stage.processing_time_s / stage.records_processed * 1e6
+            stats.append(f"Detections: {stage.detections_found} ({cost_us:.2f} us/record)")
+        
+        # Fan-out consumers
+        if self.fanout:
+            for name, consumer_stats in self.fanout.get_statistics().items():
+                stats.append(f"Consumer {name}: lag {consumer_stats['lag_ms_avg']:.1f} ms "
+                             f"(max {consumer_stats['lag_ms_max']:.1f} ms), "
+                             f"dropped {consumer_stats['records_dropped']}, "
+                             f"queue {consumer_stats['pending_batches']}/{self.fanout_config.max_pending_batches}")
         
         # Parser statistics
-        stats.append(f"Parse Errors: {self.parser.parse_errors}")
+        stats.append(f"Parse Errors: {logger_stats.get('parse_errors', self.parser.parse_errors)}")
         
         self.stats_text.setText('\n'.join(stats))
     
+    def _format_prediction(self, prediction) -> str:
+        """Statistics line for the cycles-to-failure prediction"""
+        limit = self.prediction_config.stiffness_loss_limit_percent
+        if prediction is None:
+            return f"Predicted {limit:g}% Loss: collecting data"
+        if prediction.cycles_to_limit is None:
+            return f"Predicted {limit:g}% Loss: none (stiffness loss not increasing)"
+        if prediction.remaining_cycles == 0:
+            return f"Predicted {limit:g}% Loss: reached (fit at {prediction.current_value:.1f}%)"
+        confidence = self.prediction_config.confidence * 100
+        return (f"Predicted {limit:g}% Loss: cycle {prediction.cycles_to_limit:,.0f} "
+                f"({confidence:g}%: {prediction.lower_cycles:,.0f} - {prediction.upper_cycles:,.0f})")
+    
     def log_status(self, message: str):
         """Log status message"""
         timestamp = time.strftime("%H:%M:%S")
@@ -587,6 +1010,13 @@ class MainWindow(QMainWindow):
    <li>Click "Connect" to see simulated data</li>
    </ul>
 </li>
+<li><b>Long Tests (Acquisition Daemon):</b>
+   <ul>
+   <li>Start the daemon: <code>python acquire.py --port COM3 --serve</code></li>
+   <li>Check "Attach to Acquisition Daemon" and click "Connect"</li>
+   <li>The window shows the history, then live data; closing it never stops logging</li>
+   </ul>
+</li>
 </ol>
 
 <h3>Plot Descriptions</h3>
@@ -602,6 +1032,8 @@ class MainWindow(QMainWindow):
 <li>Files are named with timestamps: fatigue_test_YYYYMMDD_HHMMSS.csv</li>
 <li>Use "Save Log As..." to save with a custom name</li>
 <li>Files are never overwritten</li>
+<li>Error records (and "Capture Event") write the surrounding full-resolution
+    data to a separate event file in logs/events/</li>
 </ul>
 
 <h3>Plot Controls</h3>
@@ -781,7 +1213,11 @@ with thread-safe communication.</p>
     
     def closeEvent(self, event):
         """Handle window close event"""
-        if self.is_connected:
+        if self.daemon_client:
+            # The daemon keeps acquiring without viewers
+            self.detach_daemon()
+            event.accept()
+        elif self.is_connected:
             reply = QMessageBox.question(
                 self,
                 "Exit",
@@ -796,6 +1232,9 @@ with thread-safe communication.</p>
                 event.ignore()
         else:
             event.accept()
+        
+        if event.isAccepted():
+            self.plotter.shutdown()
 
 
 def main():
@@ -810,4 +1249,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # The serial reader process is spawned from the frozen executable too
+    multiprocessing.freeze_support()
     main()
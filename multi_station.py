@@ -0,0 +1,625 @@
+"""
+Multi-Station Acquisition - Several fatigue testers in one acquisition loop
+Reads N serial ports (or pseudo terminal stand-ins) in a single selectors loop
+
+Each station keeps its own frame buffer, parser, log directory and
+statistics. One thread waits on all ports at once, so an idle station costs
+nothing, and after each wakeup the loop lingers for the batch linger time so
+that busy stations share the following wakeup instead of each paying for
+their own:
+
+    python multi_station.py --station A=/dev/ttyUSB0 --station B=/dev/ttyUSB1 --out logs
+    python multi_station.py --simulate 16 --duration 60
+
+station_grid.py shows the same engine as a grid of station tiles.
+"""
+
+import argparse
+import os
+import random
+import re
+import selectors
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional, TextIO
+
+import serial
+
+from config import SerialConfig, LogConfig, WatchdogConfig, BatchConfig, StationConfig
+from data_parser import (DataParser, FatigueTestData, FRAME_VALID, FRAME_TEST_END,
+                         FRAME_ERROR_CODE, FRAME_INVALID, FRAME_MALFORMED)
+from serial_reader import FrameBuffer
+from data_logger import DataLogger
+from acquire import HeadlessWatchdog, _rss_mb
+
+
+def station_directory(name: str) -> str:
+    """Log subdirectory name for a station (name with unsafe characters replaced)"""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('._') or "station"
+
+
+class Station:
+    """
+    One tester: its port, frame buffer, parser, logger and statistics
+
+    Driven by MultiStationAcquisition from its loop thread: read() takes
+    whatever the port has, process() parses and logs the complete frames.
+    """
+
+    def __init__(self, config: StationConfig, log_config: LogConfig, output_dir: str,
+                 watchdog_timeout: float, log_status: Callable, log_error: Callable):
+        """
+        Initialize station
+
+        Args:
+            config: Station configuration
+            log_config: Logging configuration (shared by all stations)
+            output_dir: Log directory of this station
+            watchdog_timeout: Seconds without data before a warning
+            log_status: Callback(station, message) for status lines
+            log_error: Callback(station, message) for error lines
+        """
+        self.config = config
+        self.name = config.name
+        self._log_status = log_status
+        self._log_error = log_error
+
+        self.parser = DataParser()
+        self.frame_buffer = FrameBuffer(config.serial.max_frame_size)
+        os.makedirs(output_dir, exist_ok=True)
+        self.logger = DataLogger(log_config, output_dir=output_dir,
+                                 status_callback=lambda message: log_error(self, message),
+                                 event_callback=lambda message: log_status(self, message))
+        self.watchdog = HeadlessWatchdog(watchdog_timeout)
+
+        self.port: Optional[serial.Serial] = None
+        self.fd: Optional[int] = None  # None where ports cannot be selected (Windows)
+        self.pending: List[bytes] = []
+
+        # Statistics
+        self.bytes_received = 0
+        self.records_received = 0
+        self.validation_errors = 0
+        self.test_errors = 0
+        self.processing_errors = 0
+        self.reconnects = 0
+        self.test_ended = False
+        self.last_record: Optional[FatigueTestData] = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.port is not None
+
+    def open(self) -> bool:
+        """
+        Open the serial port (non-blocking reads)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        serial_config = self.config.serial
+        try:
+            self.port = serial.Serial(port=serial_config.port, baudrate=serial_config.baudrate,
+                                      bytesize=serial_config.bytesize, parity=serial_config.parity,
+                                      stopbits=serial_config.stopbits, timeout=0)
+        except serial.SerialException as e:
+            self._log_error(self, f"Failed to connect: {e}")
+            return False
+
+        try:
+            self.fd = self.port.fileno()
+        except (AttributeError, NotImplementedError):
+            self.fd = None
+        self.frame_buffer.clear()
+        self.watchdog.reset()
+        self._log_status(self, f"Connected to {serial_config.port}")
+        return True
+
+    def close(self):
+        """Close the serial port (the log file stays open for a reconnect)"""
+        if self.port is not None:
+            try:
+                self.port.close()
+            except (OSError, serial.SerialException):
+                pass
+        self.port = None
+        self.fd = None
+
+    def read(self) -> bool:
+        """
+        Take the bytes waiting on the port and split them into frames
+
+        Returns:
+            False if the port failed (the caller closes it), otherwise True
+        """
+        try:
+            if self.fd is not None:
+                chunk = os.read(self.fd, self.config.serial.read_block_size)
+                if not chunk:
+                    raise OSError("Port closed")
+            else:
+                chunk = self.port.read(self.port.in_waiting)
+        except BlockingIOError:
+            return True
+        except (OSError, serial.SerialException) as e:
+            self._log_error(self, f"Serial error: {e}")
+            return False
+
+        self.bytes_received += len(chunk)
+        for frame in self.frame_buffer.feed(chunk):
+            if not frame.isspace():
+                self.pending.append(frame)
+        return True
+
+    def process(self) -> int:
+        """
+        Parse, validate and log the frames read so far
+
+        Errors are reported and counted for this station only; they never
+        reach the loop shared with the other stations.
+
+        Returns:
+            Number of records passed to the logger
+        """
+        lines = self.pending
+        self.pending = []
+        batch = []
+        for raw_data in lines:
+            try:
+                parsed_data = self._process_frame(raw_data)
+            except Exception as e:
+                self.processing_errors += 1
+                self._log_error(self, f"Processing error: {e}")
+                continue
+            if parsed_data is not None:
+                batch.append(parsed_data)
+
+        if lines:
+            self.watchdog.reset()
+        if batch:
+            self.records_received += len(batch)
+            self.last_record = batch[-1]
+            try:
+                self.logger.log_batch(batch)
+            except Exception as e:
+                self.processing_errors += 1
+                self._log_error(self, f"Logging error: {e}")
+        return len(batch)
+
+    def _process_frame(self, raw_data: bytes) -> Optional[FatigueTestData]:
+        """
+        Parse, validate and classify one frame
+
+        Returns:
+            Record to log, or None
+        """
+        parsed_data, frame_class = self.parser.parse_frame(raw_data)
+
+        # Fast path: valid DTA record without error code
+        if frame_class == FRAME_VALID:
+            return parsed_data
+        if frame_class & FRAME_MALFORMED:
+            return None
+
+        if frame_class & FRAME_INVALID:
+            self.validation_errors += 1
+            self._log_error(self, f"Validation error: {self.parser.validate_data(parsed_data)[1]}")
+
+        if frame_class & FRAME_TEST_END:
+            self.test_ended = True
+            self._log_status(self, "Test ended")
+
+        if frame_class & FRAME_ERROR_CODE:
+            self.test_errors += 1
+            self._log_error(self, f"Test error: {self.parser.get_error_description(parsed_data.error_code)}")
+
+        return None if frame_class & FRAME_INVALID else parsed_data
+
+    def get_statistics(self) -> dict:
+        """Station statistics (safe to call from other threads)"""
+        last = self.last_record
+        logger_stats = self.logger.get_statistics()
+        return {
+            'name': self.name,
+            'port': self.config.serial.port,
+            'is_connected': self.is_connected,
+            'bytes_received': self.bytes_received,
+            'records_received': self.records_received,
+            'parse_errors': self.parser.parse_errors,
+            'validation_errors': self.validation_errors,
+            'test_errors': self.test_errors,
+            'processing_errors': self.processing_errors,
+            'reconnects': self.reconnects,
+            'test_ended': self.test_ended,
+            'seconds_since_data': time.monotonic() - self.watchdog.last_data_time,
+            'cycles': last.cycles if last else None,
+            'force_upper_n': last.force_upper_n if last else None,
+            'force_lower_n': last.force_lower_n if last else None,
+            'loss_of_stiffness_percent': last.calculate_loss_of_stiffness() if last else None,
+            'error_code': last.error_code if last else None,
+            'current_file': logger_stats['current_file'],
+            'points_written': logger_stats['points_written'],
+            'write_errors': logger_stats['write_errors']
+        }
+
+
+class MultiStationAcquisition:
+    """
+    Acquisition of several testers from one thread
+
+    Every open port is registered with a selector; the loop sleeps in
+    select() until any port has data, reads all ready ports, then lets
+    every station with complete frames parse and log them. Ports that
+    cannot be selected (Windows) are polled once per loop instead.
+    Stations whose port fails, or could not be opened at start, are
+    retried every reconnect_interval while the others keep running.
+    """
+
+    def __init__(self, stations: List[StationConfig], log_config: LogConfig, output_dir: str = "./logs",
+                 batch_config: Optional[BatchConfig] = None,
+                 watchdog_config: Optional[WatchdogConfig] = None,
+                 stats_interval: float = 10.0, reconnect_interval: float = 5.0,
+                 out: Optional[TextIO] = None, status_callback: Optional[Callable] = None):
+        """
+        Initialize multi-station acquisition
+
+        Args:
+            stations: One configuration per tester (names must be unique)
+            log_config: Logging configuration used by every station
+            output_dir: Log directory; each station logs to a subdirectory
+            batch_config: Optional batching limits (max_linger_ms sets how
+                long the loop lingers after a wakeup)
+            watchdog_config: Optional watchdog configuration
+            stats_interval: Seconds between statistics lines (0 = none)
+            reconnect_interval: Seconds between attempts to reopen failed ports
+            out: Stream for status and statistics lines (default stdout)
+            status_callback: Optional callback(level, message) per status or
+                error line (called from the acquisition thread)
+        """
+        names = [station.name for station in stations]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Station names must be unique: {names}")
+
+        self.batch_config = batch_config or BatchConfig()
+        self.stats_interval = stats_interval
+        self.reconnect_interval = reconnect_interval
+        self.out = out or sys.stdout
+        self.status_callback = status_callback
+
+        watchdog_timeout = (watchdog_config or WatchdogConfig()).timeout_seconds
+        self.stations = [Station(config, log_config, os.path.join(output_dir, station_directory(config.name)),
+                                 watchdog_timeout, self._station_status, self._station_error)
+                         for config in stations]
+        self._selector = selectors.DefaultSelector()
+        self._registered = 0
+        self._stop_event = threading.Event()
+
+        # Statistics
+        self.wakeups = 0
+        self._start_time = 0.0
+        self._start_cpu = 0.0
+
+    @property
+    def records_received(self) -> int:
+        """Records received by all stations"""
+        return sum(station.records_received for station in self.stations)
+
+    def run(self, duration: Optional[float] = None) -> int:
+        """
+        Acquire until stop() is called or duration has elapsed
+
+        Args:
+            duration: Seconds to run (None = until stopped)
+
+        Returns:
+            Exit code: 0 after a normal stop, 1 if no port could be opened
+        """
+        self._stop_event.clear()
+        self._start_time = time.monotonic()
+        self._start_cpu = time.process_time()
+
+        for station in self.stations:
+            self._open_station(station)
+            station.logger.start_new_log()
+            self.log_status(f"[{station.name}] Logging to: {station.logger.current_file}")
+        if not any(station.is_connected for station in self.stations):
+            self.log_error("No station could be connected")
+            self._close()
+            return 1
+
+        self.log_status(f"Acquisition running: {len(self.stations)} stations")
+        deadline = self._start_time + duration if duration is not None else None
+        linger = self.batch_config.max_linger_ms / 1000.0
+        next_stats = self._start_time + self.stats_interval
+        next_check = self._start_time + 1.0
+        next_reconnect = self._start_time + self.reconnect_interval
+        last_stats = (self._start_time, self._start_cpu, 0)
+
+        try:
+            while not self._stop_event.is_set():
+                # Ports that cannot be selected are polled at the linger interval
+                polled = [station for station in self.stations if station.is_connected and station.fd is None]
+                timeout = linger if polled else 0.1
+
+                if self._registered:
+                    events = self._selector.select(timeout)
+                else:
+                    self._stop_event.wait(timeout)
+                    events = []
+                for key, _ in events:
+                    self._read_station(key.data)
+                for station in polled:
+                    if station.port.in_waiting:
+                        self._read_station(station)
+
+                for station in self.stations:
+                    if station.pending:
+                        station.process()
+
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+
+                if now >= next_check:
+                    next_check = now + 1.0
+                    self._check_watchdogs(now)
+                if now >= next_reconnect:
+                    next_reconnect = now + self.reconnect_interval
+                    self._reconnect_failed()
+                if self.stats_interval > 0 and now >= next_stats:
+                    next_stats = now + self.stats_interval
+                    last_stats = self._print_statistics(now, last_stats)
+
+                # Let more data arrive, so the next wakeup serves several stations
+                if events:
+                    self.wakeups += 1
+                    time.sleep(linger)
+        finally:
+            self._close()
+            if self.stats_interval > 0:
+                self._print_statistics(time.monotonic(), (self._start_time, self._start_cpu, 0))
+            self.log_status("Acquisition stopped")
+
+        return 0
+
+    def stop(self):
+        """Ask the acquisition loop to finish (safe from signal handlers and other threads)"""
+        self._stop_event.set()
+
+    def _open_station(self, station: Station) -> bool:
+        """Open a station's port and register it with the selector"""
+        if not station.open():
+            return False
+        if station.fd is not None:
+            self._selector.register(station.fd, selectors.EVENT_READ, station)
+            self._registered += 1
+        return True
+
+    def _close_station(self, station: Station):
+        """Unregister and close a station's port"""
+        if station.fd is not None:
+            self._selector.unregister(station.fd)
+            self._registered -= 1
+        station.close()
+
+    def _read_station(self, station: Station):
+        """Read a ready port; a port that fails is closed until the next reconnect"""
+        if not station.read():
+            self._close_station(station)
+
+    def _check_watchdogs(self, now: float):
+        """Warn about connected stations that have been silent too long"""
+        for station in self.stations:
+            if not station.is_connected or station.test_ended:
+                continue
+            elapsed = station.watchdog.check(now)
+            if elapsed is not None:
+                self._station_error(station, f"No data received for {elapsed:.1f} seconds")
+
+    def _reconnect_failed(self):
+        """Try to reopen the ports of disconnected stations"""
+        for station in self.stations:
+            if not station.is_connected and self._open_station(station):
+                station.reconnects += 1
+
+    def _close(self):
+        """Close all ports and log files"""
+        for station in self.stations:
+            self._close_station(station)
+            station.process()
+            station.logger.close_log()
+        self._selector.close()
+        self._selector = selectors.DefaultSelector()
+        self._registered = 0
+
+    def get_statistics(self) -> List[dict]:
+        """Statistics of every station, in station order"""
+        return [station.get_statistics() for station in self.stations]
+
+    def _print_statistics(self, now: float, last_stats: tuple) -> tuple:
+        """
+        Print a summary line and one line per station covering the time since last_stats
+
+        Returns:
+            (monotonic time, process CPU time, records) for the next call
+        """
+        last_time, last_cpu, last_records = last_stats
+        cpu = time.process_time()
+        interval = max(now - last_time, 1e-9)
+        records = self.records_received
+        connected = sum(station.is_connected for station in self.stations)
+        rss = _rss_mb()
+
+        self.log_status(
+            f"Up {now - self._start_time:.0f} s | Stations: {connected}/{len(self.stations)} connected | "
+            f"Records: {records} ({(records - last_records) / interval:.1f}/s) | "
+            f"CPU: {(cpu - last_cpu) / interval * 100:.1f}%"
+            + (f" | RSS: {rss:.1f} MB" if rss is not None else ""))
+        for station in self.stations:
+            self.log_status(
+                f"  [{station.name}] {'connected' if station.is_connected else 'DISCONNECTED'} | "
+                f"Records: {station.records_received} | Written: {station.logger.points_written} | "
+                f"Parse errors: {station.parser.parse_errors} | Test errors: {station.test_errors} | "
+                f"Watchdog: {station.watchdog.timeouts}")
+        return now, cpu, records
+
+    def _station_status(self, station: Station, message: str):
+        """Status line of one station"""
+        self.log_status(f"[{station.name}] {message}")
+
+    def _station_error(self, station: Station, message: str):
+        """Error line of one station"""
+        self.log_error(f"[{station.name}] {message}")
+
+    def log_status(self, message: str):
+        """Print a timestamped status line"""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", file=self.out, flush=True)
+        if self.status_callback:
+            self.status_callback("status", message)
+
+    def log_error(self, message: str):
+        """Print a timestamped error line"""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ERROR: {message}", file=self.out, flush=True)
+        if self.status_callback:
+            self.status_callback("error", message)
+
+
+class SimulatedTester(threading.Thread):
+    """
+    Simulated tester behind a pseudo terminal (POSIX only)
+
+    Writes records in the tester's format to the master side; the station
+    opens the slave device (port) like a real serial port.
+    """
+
+    def __init__(self, cycle_interval: float = 0.1, error_rate: float = 0.001,
+                 max_cycles: Optional[int] = None):
+        """
+        Initialize simulated tester
+
+        Args:
+            cycle_interval: Seconds between records
+            error_rate: Fraction of records carrying an error code
+            max_cycles: Stop after this many records (None = until stopped)
+        """
+        import tty
+        super().__init__(daemon=True)
+        self.cycle_interval = cycle_interval
+        self.error_rate = error_rate
+        self.max_cycles = max_cycles
+        self.master_fd, self._slave_fd = os.openpty()
+        tty.setraw(self._slave_fd)
+        self.port = os.ttyname(self._slave_fd)
+        self.cycle_count = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Write one record per cycle interval"""
+        next_time = time.monotonic()
+        while not self._stop_event.is_set():
+            if self.max_cycles is not None and self.cycle_count >= self.max_cycles:
+                break
+            self.cycle_count += 1
+            error_code = random.choice([11, 12]) if random.random() < self.error_rate else 0
+            frame = (f"DTA;{self.cycle_count};{180 + random.randint(-5, 5)};{250 + random.randint(-20, 20)};"
+                     f"{random.randint(-2, 2)};{790 + random.randint(-10, 10)};{2200 + random.randint(-50, 50)};"
+                     f"{random.randint(-3, 3)};{610 + random.randint(-5, 5)};{error_code};!\r\n")
+            try:
+                os.write(self.master_fd, frame.encode('ascii'))
+            except OSError:
+                break
+
+            next_time += self.cycle_interval
+            self._stop_event.wait(max(next_time - time.monotonic(), 0.0))
+
+    def stop(self):
+        """Stop writing"""
+        self._stop_event.set()
+
+    def close(self):
+        """Stop and release the pseudo terminal"""
+        self.stop()
+        if self.is_alive():
+            self.join(timeout=2.0)
+        os.close(self.master_fd)
+        os.close(self._slave_fd)
+
+
+def parse_station(value: str, baudrate: int) -> StationConfig:
+    """Station from a NAME=PORT command line value (PORT alone is named after the port)"""
+    name, separator, port = value.partition("=")
+    if not separator:
+        name, port = os.path.basename(value), value
+    return StationConfig(name=name, serial=SerialConfig(port=port, baudrate=baudrate))
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line options of the multi-station acquisition"""
+    parser = argparse.ArgumentParser(description="Fatigue tester data acquisition for several testers")
+    parser.add_argument("--station", action="append", default=[], metavar="NAME=PORT",
+                        help="Tester to acquire (repeat for each station)")
+    parser.add_argument("--baudrate", type=int, default=SerialConfig.baudrate,
+                        help="Baud rate of all stations (default: %(default)s)")
+    parser.add_argument("--out", default="./logs", help="Log directory (default: %(default)s)")
+    parser.add_argument("--format", dest="log_format", default=LogConfig.log_format,
+                        choices=["csv", "binary", "both", "compressed"],
+                        help="Log file format (default: %(default)s)")
+    parser.add_argument("--watchdog", type=float, default=WatchdogConfig.timeout_seconds,
+                        help="Seconds without data before a warning (default: %(default)s)")
+    parser.add_argument("--stats-interval", type=float, default=60.0,
+                        help="Seconds between statistics lines, 0 = none (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after this many seconds (default: run until interrupted)")
+    parser.add_argument("--simulate", type=int, default=0, metavar="N",
+                        help="Add N simulated testers on pseudo terminals (not on Windows)")
+    parser.add_argument("--simulate-interval", type=float, default=0.1,
+                        help="Seconds between records of simulated testers (default: %(default)s)")
+    return parser
+
+
+def create_from_args(args: argparse.Namespace, **kwargs):
+    """
+    Build the acquisition (and simulated testers) from parsed command line options
+
+    Returns:
+        (MultiStationAcquisition, list of started SimulatedTester)
+    """
+    stations = [parse_station(value, args.baudrate) for value in args.station]
+    testers = []
+    for index in range(args.simulate):
+        tester = SimulatedTester(cycle_interval=args.simulate_interval)
+        tester.start()
+        testers.append(tester)
+        stations.append(StationConfig(name=f"Sim {index + 1:0{len(str(args.simulate))}d}",
+                                      serial=SerialConfig(port=tester.port)))
+
+    acquisition = MultiStationAcquisition(
+        stations, LogConfig(log_format=args.log_format), output_dir=args.out,
+        watchdog_config=WatchdogConfig(timeout_seconds=args.watchdog),
+        stats_interval=args.stats_interval, **kwargs)
+    return acquisition, testers
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Multi-station entry point; stops cleanly on Ctrl+C or SIGTERM"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if not args.station and not args.simulate:
+        parser.error("give at least one --station or --simulate")
+
+    acquisition, testers = create_from_args(args)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: acquisition.stop())
+
+    try:
+        return acquisition.run(duration=args.duration)
+    finally:
+        for tester in testers:
+            tester.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
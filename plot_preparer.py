@@ -0,0 +1,448 @@
+"""
+Plot Preparer module - Background preparation of plot frames
+Converts incoming records to curve columns and decimates them off the GUI
+thread, so the GUI thread only hands ready-made arrays to the plot curves
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from data_parser import FatigueTestData
+from data_store import GrowableColumn
+from decimation import MinMaxPyramid
+from prediction import FailurePrediction, FailurePredictor
+from rolling_stats import RollingWindowStats
+
+
+# Curve key -> (plot key, data column)
+CURVE_SOURCES = {
+    'force_lower': ('forces', 'force_lower'),
+    'force_upper': ('forces', 'force_upper'),
+    'travel_at_upper': ('travel', 'travel_at_upper'),
+    'travel_1': ('travel', 'travel_1'),
+    'travel_2': ('travel', 'travel_2'),
+    'loss_stiffness': ('stiffness', 'loss_of_stiffness'),
+}
+
+# RECORD_DTYPE fields in the column order of PlotFramePreparer._append_raw
+RECORD_FIELDS = ('Cycles', 'Force_Lower_N', 'Force_Upper_N', 'Travel_1_mm', 'Travel_2_mm',
+                 'Travel_at_Upper_mm')
+
+# Curves that get trend overlays, and the overlay curves of each:
+# moving mean and mean +/- k standard deviations
+TREND_CURVES = ('force_lower', 'force_upper', 'loss_stiffness')
+TREND_PARTS = ('mean', 'band_high', 'band_low')
+
+
+# Stiffness plot curves of the failure prediction: projected trend up to
+# the limit, and the confidence band of the predicted cycles at the limit
+PROJECTION_CURVES = ('stiffness_projection', 'stiffness_projection_band')
+
+
+def trend_key(curve_key: str, part: str) -> str:
+    """Curve key of a trend overlay"""
+    return f"{curve_key}_{part}"
+
+
+@dataclass
+class FrameRequest:
+    """View state a frame is prepared for (snapshot taken on the GUI thread)"""
+    generation: int  # Data generation (incremented when the plots are cleared)
+    decimation: bool = True
+    point_budgets: Dict[str, int] = field(default_factory=dict)  # Plot key -> points per curve
+    visible_ranges: Dict[str, Optional[Tuple[float, float]]] = field(default_factory=dict)
+
+
+@dataclass
+class PlotFrame:
+    """Ready-to-draw curve arrays"""
+    generation: int
+    length: int  # Points in the data columns when the frame was prepared
+    curves: Dict[str, Tuple[np.ndarray, np.ndarray]]  # Curve key -> (x, y)
+    points_plotted: int = 0
+    prepare_time_s: float = 0.0
+    prediction: Optional[FailurePrediction] = None
+
+
+class FrameBuffers:
+    """
+    One set of output arrays for decimated curves
+
+    Arrays are reused from frame to frame and only grow. A set must not be
+    refilled while the curves still display it (see PlotFramePreparer).
+    """
+
+    def __init__(self):
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def take(self, key: str, x: np.ndarray, y: np.ndarray, indices: np.ndarray):
+        """
+        Gather x[indices] and y[indices] into this set's arrays for a curve
+
+        Returns:
+            (x, y) views of the filled arrays
+        """
+        count = len(indices)
+        x_out, y_out = self._arrays.get(key, (None, None))
+        if x_out is None or len(x_out) < count:
+            capacity = max(count, 2 * len(x_out) if x_out is not None else 1024)
+            x_out = np.empty(capacity, dtype=x.dtype)
+            y_out = np.empty(capacity, dtype=y.dtype)
+            self._arrays[key] = (x_out, y_out)
+        np.take(x, indices, out=x_out[:count])
+        np.take(y, indices, out=y_out[:count])
+        return x_out[:count], y_out[:count]
+
+
+class PlotFramePreparer(threading.Thread):
+    """
+    Worker thread that owns the plot data and prepares frames
+
+    Batches of records and frame requests arrive through one command queue
+    and are handled in order. Decimated frames are written into two
+    alternating FrameBuffers sets: the caller requests the next frame only
+    after it has drawn the previous one, so the set being filled is never
+    the one on screen. Frames are delivered through on_frame, called from
+    this thread.
+    """
+
+    def __init__(self, on_frame: Callable[[PlotFrame], None],
+                 predictor: Optional[FailurePredictor] = None, projection_horizon: float = 1.0):
+        """
+        Initialize preparer
+
+        Args:
+            on_frame: Called with each prepared PlotFrame (from the worker thread)
+            predictor: Optional cycles-to-failure predictor fed with the loss of stiffness
+            projection_horizon: Projection drawn at most this multiple of the tested cycles ahead
+        """
+        super().__init__(name="PlotFramePreparer", daemon=True)
+        self.on_frame = on_frame
+        self.predictor = predictor
+        self.projection_horizon = projection_horizon
+        self._commands = queue.Queue()
+
+        # Data columns - unlimited points (V2 requirement), grown by doubling
+        self.cycles = GrowableColumn(np.int64)
+        self.force_lower = GrowableColumn()
+        self.force_upper = GrowableColumn()
+        self.travel_1 = GrowableColumn()
+        self.travel_2 = GrowableColumn()
+        self.travel_at_upper = GrowableColumn()
+        self.loss_of_stiffness = GrowableColumn()
+
+        # Min/max level-of-detail pyramid per curve, fed as points arrive
+        self.pyramids = {key: MinMaxPyramid() for key in CURVE_SOURCES}
+
+        # Trend overlays (off while trend_window_cycles is 0): overlay
+        # key -> column, with a pyramid per overlay in self.pyramids
+        self.trend_window_cycles = 0
+        self.trend_sigma = 2.0
+        self.trend_columns: Dict[str, GrowableColumn] = {}
+        self._trend_stats: Optional[RollingWindowStats] = None
+
+        # Double buffer for decimated frames
+        self._buffers = [FrameBuffers(), FrameBuffers()]
+        self._back = 0
+
+        # Statistics
+        self.frames_prepared = 0  # Frames delivered by the worker loop
+
+    def __len__(self) -> int:
+        return len(self.cycles)
+
+    def submit(self, batch: List[FatigueTestData]):
+        """Queue a batch of records (any thread)"""
+        self._commands.put(('batch', batch))
+
+    def submit_records(self, records: np.ndarray):
+        """Queue a RECORD_DTYPE array of records (any thread)"""
+        self._commands.put(('records', records))
+
+    def request_frame(self, request: FrameRequest):
+        """Queue a frame request (any thread)"""
+        self._commands.put(('frame', request))
+
+    def request_clear(self):
+        """Queue removal of all data (any thread)"""
+        self._commands.put(('clear', None))
+
+    def request_trend(self, window_cycles: int, sigma: float):
+        """Queue a change of the trend overlays (any thread, window 0 = off)"""
+        self._commands.put(('trend', (window_cycles, sigma)))
+
+    def stop(self):
+        """Stop the worker after the commands queued so far"""
+        self._commands.put(('stop', None))
+
+    def run(self):
+        """
+        Worker loop - handles every waiting command, then prepares the newest frame request
+
+        A failing command is reported and skipped; every frame request is
+        answered (with a frame without curves if need be), so the requester
+        is never left waiting for a frame in flight.
+        """
+        while True:
+            command, payload = self._commands.get()
+            request = None
+            while True:
+                if command == 'stop':
+                    return
+                if command == 'frame':
+                    request = payload
+                else:
+                    self._handle_command(command, payload)
+                try:
+                    command, payload = self._commands.get_nowait()
+                except queue.Empty:
+                    break
+
+            if request is not None:
+                self._deliver_frame(request)
+
+    def _handle_command(self, command: str, payload):
+        """Apply a data command, reporting errors instead of ending the worker"""
+        try:
+            if command == 'batch':
+                self.add_batch(payload)
+            elif command == 'records':
+                self.add_records(payload)
+            elif command == 'clear':
+                self.clear()
+            elif command == 'trend':
+                self.set_trend(*payload)
+        except Exception as e:
+            print(f"[PlotFramePreparer] Error handling {command} command: {e}")
+
+    def _deliver_frame(self, request: FrameRequest):
+        """Prepare a frame and hand it to on_frame (a frame without curves on errors)"""
+        try:
+            frame = self.prepare_frame(request)
+        except Exception as e:
+            print(f"[PlotFramePreparer] Error preparing frame: {e}")
+            frame = PlotFrame(request.generation, len(self.cycles), {})
+        try:
+            self.on_frame(frame)
+        except Exception as e:
+            print(f"[PlotFramePreparer] Error delivering frame: {e}")
+        self.frames_prepared += 1
+
+    def add_batch(self, batch: List[FatigueTestData]):
+        """
+        Append records to the data columns
+
+        Args:
+            batch: Parsed fatigue test data, in arrival order
+        """
+        if not batch:
+            return
+
+        # Fixed-point fields of the whole batch in one array
+        self._append_raw(np.array([(data.cycles, data.force_lower_raw, data.force_upper_raw,
+                                    data.travel_1_raw, data.travel_2_raw, data.travel_at_upper_raw)
+                                   for data in batch]))
+
+    def add_records(self, records: np.ndarray):
+        """
+        Append fixed-point records to the data columns
+
+        Args:
+            records: RECORD_DTYPE structured array, in arrival order
+        """
+        if not len(records):
+            return
+        self._append_raw(np.column_stack([records[name].astype(np.int64) for name in RECORD_FIELDS]))
+
+    def _append_raw(self, raw: np.ndarray):
+        """Append rows of (cycles, force_lower, force_upper, travel_1, travel_2, travel_at_upper) integers"""
+        count = len(raw)
+        travel_2 = raw[:, 4] / 100.0
+        travel_at_upper = raw[:, 5] / 100.0
+
+        # Same arithmetic as FatigueTestData.calculate_loss_of_stiffness
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loss = np.where(travel_at_upper == 0, 0.0, travel_2 / travel_at_upper * 100.0)
+
+        self.cycles.extend(raw[:, 0])
+        self.force_lower.extend(raw[:, 1] / 10.0)
+        self.force_upper.extend(raw[:, 2] / 10.0)
+        self.travel_1.extend(raw[:, 3] / 100.0)
+        self.travel_2.extend(travel_2)
+        self.travel_at_upper.extend(travel_at_upper)
+        self.loss_of_stiffness.extend(loss)
+
+        for key, (_, column_name) in CURVE_SOURCES.items():
+            self.pyramids[key].append(getattr(self, column_name).view()[-count:])
+
+        if self._trend_stats is not None:
+            self._extend_trend(len(self.cycles) - count, len(self.cycles))
+
+        if self.predictor is not None:
+            self.predictor.update(raw[:, 0], loss)
+
+    def set_trend(self, window_cycles: int, sigma: float):
+        """
+        Enable, change or disable the trend overlays
+
+        Overlays are rebuilt from the stored data in one pass, then kept up
+        to date as batches arrive.
+
+        Args:
+            window_cycles: Moving window length in cycles (0 = no overlays)
+            sigma: Band half-width in standard deviations
+        """
+        for key in self.trend_columns:
+            del self.pyramids[key]
+        self.trend_columns = {}
+        self._trend_stats = None
+        self.trend_window_cycles = window_cycles
+        self.trend_sigma = sigma
+        if window_cycles <= 0:
+            return
+
+        self._trend_stats = RollingWindowStats(window_cycles, series=len(TREND_CURVES))
+        for curve_key in TREND_CURVES:
+            for part in TREND_PARTS:
+                self.trend_columns[trend_key(curve_key, part)] = GrowableColumn(
+                    capacity=self.cycles.capacity)
+                self.pyramids[trend_key(curve_key, part)] = MinMaxPyramid()
+
+        chunk_rows = 65536
+        for start in range(0, len(self.cycles), chunk_rows):
+            self._extend_trend(start, min(start + chunk_rows, len(self.cycles)))
+
+    def _extend_trend(self, start: int, stop: int):
+        """Add the trend overlay points for data rows [start, stop)"""
+        values = np.column_stack([getattr(self, CURVE_SOURCES[curve_key][1]).view()[start:stop]
+                                  for curve_key in TREND_CURVES])
+        mean, std = self._trend_stats.append(self.cycles.view()[start:stop], values)
+        band = self.trend_sigma * std
+
+        for index, curve_key in enumerate(TREND_CURVES):
+            parts = {'mean': mean[:, index],
+                     'band_high': mean[:, index] + band[:, index],
+                     'band_low': mean[:, index] - band[:, index]}
+            for part, part_values in parts.items():
+                key = trend_key(curve_key, part)
+                self.trend_columns[key].extend(part_values)
+                self.pyramids[key].append(part_values)
+
+    def _curve_series(self) -> Iterator[Tuple[str, str, np.ndarray]]:
+        """(curve key, plot key, values) of every curve to draw, overlays included"""
+        for key, (plot_key, column_name) in CURVE_SOURCES.items():
+            yield key, plot_key, getattr(self, column_name).view()
+        for curve_key in TREND_CURVES:
+            for part in TREND_PARTS:
+                key = trend_key(curve_key, part)
+                if key in self.trend_columns:
+                    yield key, CURVE_SOURCES[curve_key][0], self.trend_columns[key].view()
+
+    def prepare_frame(self, request: FrameRequest) -> PlotFrame:
+        """
+        Build the arrays to draw for a request
+
+        Without decimation the frame holds zero-copy views of the columns,
+        which appending never changes. Errors are reported and yield a frame
+        without curves, so the requester is never left waiting.
+        """
+        started = time.perf_counter()
+        length = len(self.cycles)
+        curves = {}
+        points_plotted = 0
+        prediction = None
+
+        try:
+            cycles_array = self.cycles.view()
+            buffers = self._buffers[self._back]
+
+            for key, plot_key, values in self._curve_series():
+                if request.decimation:
+                    # Extremes of every bucket over the visible part of the test
+                    start, stop = visible_slice(cycles_array, request.visible_ranges.get(plot_key))
+                    indices = self.pyramids[key].indices(request.point_budgets.get(plot_key, 2000),
+                                                         start, stop)
+                    curves[key] = buffers.take(key, cycles_array, values, indices)
+                    points_plotted = max(points_plotted, len(indices))
+                else:
+                    curves[key] = (cycles_array, values)
+                    points_plotted = length
+
+            if request.decimation:
+                self._back = 1 - self._back
+
+            if self.predictor is not None:
+                prediction = self.predictor.predict()
+                curves.update(self._projection_curves(prediction))
+
+        except Exception as e:
+            curves = {}
+            print(f"[PlotFramePreparer] Error preparing frame: {e}")
+
+        return PlotFrame(request.generation, length, curves, points_plotted,
+                         time.perf_counter() - started, prediction)
+
+    def _projection_curves(self, prediction: Optional[FailurePrediction]):
+        """Projected trend and band curves, clipped to the projection horizon"""
+        empty = np.empty(0)
+        curves = {key: (empty, empty) for key in PROJECTION_CURVES}
+        if prediction is None or prediction.cycles_to_limit is None:
+            return curves
+
+        first_cycles = self.cycles.view()[0] if len(self.cycles) else 0
+        horizon = prediction.current_cycles + self.projection_horizon * max(
+            prediction.current_cycles - first_cycles, 1)
+        end = min(prediction.cycles_to_limit, horizon)
+        if end > prediction.current_cycles:
+            x = np.linspace(prediction.current_cycles, end, 32)
+            y = np.array([self.predictor.fitted(cycles) for cycles in x])
+            curves['stiffness_projection'] = (x, y)
+
+        low = max(prediction.lower_cycles, prediction.current_cycles)
+        high = min(prediction.upper_cycles, horizon)
+        if high > low:
+            curves['stiffness_projection_band'] = (np.array([low, high]),
+                                                   np.array([prediction.limit, prediction.limit]))
+        return curves
+
+    def clear(self):
+        """Remove all data"""
+        self.cycles.clear()
+        self.force_lower.clear()
+        self.force_upper.clear()
+        self.travel_1.clear()
+        self.travel_2.clear()
+        self.travel_at_upper.clear()
+        self.loss_of_stiffness.clear()
+        for column in self.trend_columns.values():
+            column.clear()
+        for pyramid in self.pyramids.values():
+            pyramid.clear()
+        if self._trend_stats is not None:
+            self._trend_stats.clear()
+        if self.predictor is not None:
+            self.predictor.clear()
+
+
+def visible_slice(cycles_array: np.ndarray, visible: Optional[Tuple[float, float]]):
+    """
+    Index range of the samples inside a visible cycles range
+
+    Cycles increase during a test, so the range is found by binary
+    search; one sample beyond each edge keeps the lines continuous.
+
+    Args:
+        cycles_array: Cycles column
+        visible: (low, high) cycles range, or None for the whole test
+    """
+    if visible is None:
+        return 0, len(cycles_array)
+    # Integer keys: a float key would convert the whole column first
+    low = np.int64(np.clip(np.ceil(visible[0]), -2**62, 2**62))
+    high = np.int64(np.clip(np.floor(visible[1]), -2**62, 2**62))
+    start = int(np.searchsorted(cycles_array, low, side='left')) - 1
+    stop = int(np.searchsorted(cycles_array, high, side='right')) + 1
+    return max(start, 0), min(stop, len(cycles_array))
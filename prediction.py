@@ -0,0 +1,170 @@
+"""
+Prediction module - Online cycles-to-failure estimate
+Extrapolates the loss of stiffness trend to the cycle count at which a
+configured limit will be reached
+"""
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+import numpy as np
+
+
+@dataclass
+class FailurePrediction:
+    """Snapshot of the fitted trend and its extrapolation"""
+    points: int  # Records in the fit
+    current_cycles: int  # Last cycle count seen
+    current_value: float  # Fitted loss of stiffness at current_cycles (%)
+    slope: float  # Fitted change per cycle (of the loss, or of its logarithm)
+    limit: float  # Loss of stiffness limit (%)
+    cycles_to_limit: Optional[float] = None  # Cycle count at the limit (None: not degrading)
+    lower_cycles: Optional[float] = None  # Confidence band of cycles_to_limit
+    upper_cycles: Optional[float] = None
+
+    @property
+    def remaining_cycles(self) -> Optional[float]:
+        """Cycles left until the limit (0 once reached)"""
+        if self.cycles_to_limit is None:
+            return None
+        return max(0.0, self.cycles_to_limit - self.current_cycles)
+
+
+class FailurePredictor:
+    """
+    Incremental least-squares fit of loss of stiffness against cycles
+
+    Keeps only the count, means and co-moments of (cycles, value), merged
+    batch by batch with the pairwise update of Chan et al., so each record
+    costs O(1) and the history is never rescanned. The "linear" model fits
+    loss = a + b * cycles; the "exponential" model fits
+    ln(loss) = a + b * cycles (records with loss <= 0 are skipped).
+
+    The cycle count at the limit is the inverse of the fitted line; its
+    confidence band follows from the standard error of the fit (delta
+    method, normal quantile for the requested confidence level).
+    """
+
+    def __init__(self, limit: float, model: str = "linear", confidence: float = 0.95,
+                 min_points: int = 30, start_cycles: int = 0):
+        """
+        Initialize predictor
+
+        Args:
+            limit: Loss of stiffness limit in percent
+            model: "linear" or "exponential"
+            confidence: Confidence level of the band (0..1)
+            min_points: Records needed before predicting
+            start_cycles: Records before this cycle count are ignored (run-in)
+
+        Raises:
+            ValueError: If the model is unknown
+        """
+        if model not in ("linear", "exponential"):
+            raise ValueError(f"Unknown prediction model: {model}")
+        self.limit = limit
+        self.model = model
+        self.confidence = confidence
+        self.min_points = max(min_points, 3)
+        self.start_cycles = start_cycles
+        self._z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+        self.clear()
+
+    def clear(self):
+        """Forget all records"""
+        self.count = 0
+        self.last_cycles = None
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._sxx = 0.0
+        self._sxy = 0.0
+        self._syy = 0.0
+
+    def update(self, cycles, values):
+        """
+        Add records to the fit
+
+        Args:
+            cycles: 1-D array-like of cycle counts
+            values: Loss of stiffness (%) of each record
+        """
+        x = np.asarray(cycles, dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64)
+        if len(x) == 0:
+            return
+
+        # A decreasing cycle count means a new test
+        if self.last_cycles is not None and x[0] < self.last_cycles:
+            self.clear()
+        self.last_cycles = int(x[-1])
+
+        keep = x >= self.start_cycles
+        if self.model == "exponential":
+            keep &= y > 0
+        if not keep.all():
+            x, y = x[keep], y[keep]
+        if len(x) == 0:
+            return
+        if self.model == "exponential":
+            y = np.log(y)
+
+        # Merge the batch's moments into the running ones
+        count = len(x)
+        mean_x = float(x.mean())
+        mean_y = float(y.mean())
+        dx = x - mean_x
+        dy = y - mean_y
+        total = self.count + count
+        delta_x = mean_x - self._mean_x
+        delta_y = mean_y - self._mean_y
+        weight = self.count * count / total
+
+        self._sxx += float(dx @ dx) + delta_x * delta_x * weight
+        self._sxy += float(dx @ dy) + delta_x * delta_y * weight
+        self._syy += float(dy @ dy) + delta_y * delta_y * weight
+        self._mean_x += delta_x * count / total
+        self._mean_y += delta_y * count / total
+        self.count = total
+
+    def fitted(self, cycles: float) -> float:
+        """Fitted loss of stiffness (%) at a cycle count"""
+        slope = self._sxy / self._sxx if self._sxx > 0 else 0.0
+        value = self._mean_y + slope * (cycles - self._mean_x)
+        return math.exp(value) if self.model == "exponential" else value
+
+    def predict(self) -> Optional[FailurePrediction]:
+        """
+        Current extrapolation to the limit
+
+        Returns:
+            FailurePrediction, or None until min_points records spread over
+            more than one cycle count have been fitted
+        """
+        if self.count < self.min_points or self._sxx <= 0:
+            return None
+
+        slope = self._sxy / self._sxx
+        prediction = FailurePrediction(
+            points=self.count,
+            current_cycles=self.last_cycles,
+            current_value=self.fitted(self.last_cycles),
+            slope=slope,
+            limit=self.limit)
+
+        # Loss of stiffness not increasing: the limit is never reached
+        if slope <= 0 or (self.model == "exponential" and self.limit <= 0):
+            return prediction
+
+        target = math.log(self.limit) if self.model == "exponential" else self.limit
+        cycles_to_limit = self._mean_x + (target - self._mean_y) / slope
+
+        residual = max(self._syy - slope * self._sxy, 0.0) / (self.count - 2)
+        offset = cycles_to_limit - self._mean_x
+        spread = math.sqrt(residual / (slope * slope)
+                           * (1.0 / self.count + offset * offset / self._sxx))
+
+        prediction.cycles_to_limit = cycles_to_limit
+        prediction.lower_cycles = cycles_to_limit - self._z * spread
+        prediction.upper_cycles = cycles_to_limit + self._z * spread
+        return prediction
@@ -0,0 +1,410 @@
+"""
+Process Reader module - Serial port read loop in a child process
+Hands frames to the processing side through a shared-memory ring buffer
+
+A read loop running as a thread has to win the GIL back after every read,
+so a busy GUI or processing thread delays it and lets data pile up in the
+driver's receive buffer. ProcessSerialReader reads the port in its own
+process instead and copies complete frames into a lock-free
+single-producer/single-consumer ring (FrameRing) in shared memory. A thread
+on the processing side empties the ring into the usual reader queue, so
+everything downstream is unchanged.
+"""
+
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional
+
+import serial
+
+from config import SerialConfig, BatchConfig
+from serial_reader import FrameBuffer, ReadLoopStats, SerialReader
+
+
+class FrameRing:
+    """
+    Lock-free single-producer/single-consumer ring of frames in shared memory
+
+    The buffer starts with a header of uint64 slots, followed by the data
+    area. `head` and `tail` count the bytes ever written and read; only the
+    producer writes `head`, only the consumer writes `tail`, and the two
+    live on separate cache lines. Frames are stored newline-terminated (a
+    frame never contains a newline, see FrameBuffer). A batch is copied in
+    completely before `head` is advanced, so the consumer never sees part
+    of a frame; a batch that does not fit is dropped whole and counted as
+    an overrun.
+
+    Header slots 32-63 are free for the producer's own counters (user_slots).
+
+    Relies on aligned 8-byte stores being atomic and becoming visible in
+    program order, as on the x86/x64 machines the tester software runs on.
+    """
+
+    HEADER_SIZE = 512
+
+    # uint64 header slots
+    _HEAD = 0
+    _TAIL = 8  # Own cache line, written by the consumer
+    _STOP = 9  # Set by the consumer to end the producer
+    _FRAMES_WRITTEN = 16
+    _FRAMES_DROPPED = 17
+    _BYTES_DROPPED = 18
+    _PEAK_FILL = 19
+    _USER = 32
+
+    def __init__(self, buffer: memoryview, capacity: int):
+        """
+        Attach to a ring buffer
+
+        Args:
+            buffer: Writable buffer of at least size_for(capacity) bytes
+                (SharedMemory.buf); a new shared memory block is all zeros,
+                which is an empty ring
+            capacity: Size of the data area in bytes
+        """
+        if len(buffer) < self.size_for(capacity):
+            raise ValueError(f"Buffer of {len(buffer)} bytes too small for a ring of {capacity} bytes")
+        self.capacity = capacity
+        self._header = buffer[:self.HEADER_SIZE].cast('Q')
+        self._data = buffer[self.HEADER_SIZE:self.HEADER_SIZE + capacity]
+        self.user_slots = self._header[self._USER:]
+
+    @classmethod
+    def size_for(cls, capacity: int) -> int:
+        """Bytes of shared memory needed for a ring with this data capacity"""
+        return cls.HEADER_SIZE + capacity
+
+    def write(self, frames: List[bytes]) -> bool:
+        """
+        Append a batch of frames (producer side)
+
+        Args:
+            frames: Complete frames without newlines
+
+        Returns:
+            True if stored, False if the batch was dropped because the ring is full
+        """
+        header = self._header
+        payload = b'\n'.join(frames) + b'\n'
+        size = len(payload)
+        head = header[self._HEAD]
+        fill = head - header[self._TAIL]
+
+        if size > self.capacity - fill:
+            header[self._FRAMES_DROPPED] += len(frames)
+            header[self._BYTES_DROPPED] += size
+            return False
+
+        start = head % self.capacity
+        first = min(size, self.capacity - start)
+        self._data[start:start + first] = payload[:first]
+        if first < size:
+            self._data[:size - first] = payload[first:]
+
+        header[self._FRAMES_WRITTEN] += len(frames)
+        if fill + size > header[self._PEAK_FILL]:
+            header[self._PEAK_FILL] = fill + size
+
+        # Publish only after the data is in place
+        header[self._HEAD] = head + size
+        return True
+
+    def read(self) -> List[bytes]:
+        """
+        Take all frames written so far (consumer side)
+
+        Returns:
+            List of frames, oldest first (empty if nothing is waiting)
+        """
+        header = self._header
+        head = header[self._HEAD]
+        tail = header[self._TAIL]
+        size = head - tail
+        if not size:
+            return []
+
+        start = tail % self.capacity
+        first = min(size, self.capacity - start)
+        payload = self._data[start:start + first].tobytes()
+        if first < size:
+            payload += self._data[:size - first].tobytes()
+
+        # The space may be reused as soon as the tail moves
+        header[self._TAIL] = head
+
+        frames = payload.split(b'\n')
+        frames.pop()
+        return frames
+
+    def fill(self) -> int:
+        """Bytes written but not yet read"""
+        return self._header[self._HEAD] - self._header[self._TAIL]
+
+    def request_stop(self):
+        """Ask the producer to finish (consumer side)"""
+        self._header[self._STOP] = 1
+
+    @property
+    def stop_requested(self) -> bool:
+        """True once the consumer asked the producer to finish"""
+        return self._header[self._STOP] != 0
+
+    def get_statistics(self) -> dict:
+        """Ring counters"""
+        header = self._header
+        return {
+            'frames_written': header[self._FRAMES_WRITTEN],
+            'frames_overrun': header[self._FRAMES_DROPPED],
+            'bytes_overrun': header[self._BYTES_DROPPED],
+            'ring_peak_percent': header[self._PEAK_FILL] / self.capacity * 100.0
+        }
+
+    def release(self):
+        """Release the views on the buffer (required before SharedMemory.close())"""
+        self.user_slots.release()
+        self._header.release()
+        self._data.release()
+
+
+# Producer counters in FrameRing.user_slots
+_BYTES_RECEIVED = 0
+_BYTES_DISCARDED = 1
+_READ_STATS = 2
+
+
+def _read_port(config: SerialConfig, shm_name: str, capacity: int, status):
+    """
+    Reader process: block-read the port and write complete frames to the ring
+
+    Args:
+        config: Serial configuration
+        shm_name: Name of the shared memory block holding the ring
+        capacity: Data capacity of the ring
+        status: Connection end for ("connected" | "failed" | "error", message) tuples
+    """
+    # Ctrl+C reaches the whole process group; the parent decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = FrameRing(shm.buf, capacity)
+    counters = ring.user_slots
+    read_stats = ReadLoopStats(counters[_READ_STATS:_READ_STATS + ReadLoopStats.SIZE])
+
+    try:
+        port = serial.Serial(port=config.port, baudrate=config.baudrate, bytesize=config.bytesize,
+                             parity=config.parity, stopbits=config.stopbits, timeout=config.timeout)
+    except serial.SerialException as e:
+        status.send(("failed", str(e)))
+        port = None
+
+    if port is not None:
+        status.send(("connected", ""))
+        frame_buffer = FrameBuffer(config.max_frame_size)
+        block_size = config.read_block_size
+        try:
+            while not ring.stop_requested:
+                waiting = port.in_waiting
+                read_stats.record(waiting)
+
+                chunk = port.read(min(max(waiting, 1), block_size))
+                if not chunk:
+                    continue
+                counters[_BYTES_RECEIVED] += len(chunk)
+
+                frames = [frame for frame in frame_buffer.feed(chunk) if not frame.isspace()]
+                counters[_BYTES_DISCARDED] = frame_buffer.bytes_discarded
+                if frames:
+                    ring.write(frames)
+        except serial.SerialException as e:
+            status.send(("error", f"Serial error: {e}"))
+        finally:
+            port.close()
+
+    read_stats.values.release()
+    ring.release()
+    shm.close()
+    status.close()
+
+
+class ProcessSerialReader(SerialReader):
+    """
+    SerialReader whose read loop runs in a child process
+
+    connect() starts the reader process, which opens the port; the thread
+    itself only moves frames from the shared-memory ring to data_queue.
+    The thread ends when the reader process does (port error), like a
+    SerialReader thread would.
+    """
+
+    # Seconds to wait for the reader process to start and open the port
+    CONNECT_TIMEOUT = 10.0
+
+    # Seconds between polls of the ring after data arrived; doubles while
+    # the ring stays empty, up to the batch linger time. Polling keeps the
+    # reader process free of any lock the GIL-bound side could hold (a
+    # multiprocessing.Event would make it wait for a busy GUI thread)
+    POLL_INTERVAL = 0.005
+
+    # Seconds between checks of the reader process and its messages
+    CHECK_INTERVAL = 0.1
+
+    def __init__(self, config: SerialConfig, data_queue: queue.Queue,
+                 status_callback: Optional[Callable] = None,
+                 batch_config: Optional[BatchConfig] = None):
+        """
+        Initialize process serial reader
+
+        Args:
+            config: Serial configuration (ring_buffer_size sets the ring capacity)
+            data_queue: Queue to put received data (as lists of lines)
+            status_callback: Optional callback for status updates
+            batch_config: Optional batching limits for queue handoff
+        """
+        super().__init__(config, data_queue, status_callback, batch_config)
+        # Spawn also on Linux: forking a process that runs Qt threads is not safe
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self.ring: Optional[FrameRing] = None
+        self._status_conn = None
+        self._final_statistics: dict = {}
+
+    def connect(self) -> bool:
+        """
+        Start the reader process and wait until it has opened the port
+
+        Returns:
+            True if successful, False otherwise
+        """
+        capacity = self.config.ring_buffer_size
+        self._shm = shared_memory.SharedMemory(create=True, size=FrameRing.size_for(capacity))
+        self.ring = FrameRing(self._shm.buf, capacity)
+        self._status_conn, child_conn = self._context.Pipe(duplex=False)
+
+        self._process = self._context.Process(
+            target=_read_port, name="SerialReaderProcess", daemon=True,
+            args=(self.config, self._shm.name, capacity, child_conn))
+        self._process.start()
+        child_conn.close()
+
+        try:
+            if self._status_conn.poll(self.CONNECT_TIMEOUT):
+                kind, message = self._status_conn.recv()
+            else:
+                kind, message = "failed", "reader process did not respond"
+        except EOFError:
+            kind, message = "failed", "reader process ended"
+
+        if kind != "connected":
+            self._update_status(f"Failed to connect: {message}")
+            self._close_process()
+            return False
+
+        self._update_status(f"Connected to {self.config.port} (reader process {self._process.pid})")
+        return True
+
+    def disconnect(self):
+        """Stop the reader process and release the ring"""
+        self.stop()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=2.0)
+        if self._process is not None:
+            self._close_process()
+            self._update_status("Disconnected")
+
+    def run(self):
+        """Main thread loop - moves frames from the ring to the queue"""
+        self.running = True
+        self._update_status("Reader thread started")
+        ring = self.ring
+        max_interval = max(self.batch_config.max_linger_ms / 1000.0, self.POLL_INTERVAL)
+        interval = self.POLL_INTERVAL
+        next_check = 0.0
+
+        while not self._stop_event.is_set() and self.running:
+            frames = ring.read()
+            if frames:
+                self._put_batch(frames)
+                interval = self.POLL_INTERVAL
+                continue
+
+            now = time.monotonic()
+            if now >= next_check:
+                next_check = now + self.CHECK_INTERVAL
+                self._relay_status()
+                if not self._process.is_alive():
+                    # Frames written just before the process ended
+                    frames = ring.read()
+                    if frames:
+                        self._put_batch(frames)
+                    self.running = False
+                    break
+
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+
+        self._update_status("Reader thread stopped")
+
+    def _relay_status(self):
+        """Pass messages of the reader process on to the status callback"""
+        try:
+            while self._status_conn.poll():
+                self._update_status(self._status_conn.recv()[1])
+        except (EOFError, OSError):
+            pass
+
+    def _close_process(self):
+        """Stop the reader process, then close and remove the shared memory"""
+        self.ring.request_stop()
+        self._process.join(timeout=self.config.timeout + 2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=2.0)
+        self._relay_status()
+
+        self._final_statistics = self._ring_statistics()
+        self.ring.release()
+        self.ring = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+        self._status_conn.close()
+        self._process = None
+
+    def _ring_statistics(self) -> dict:
+        """Counters kept by the reader process in the ring"""
+        counters = self.ring.user_slots
+        read_stats = ReadLoopStats(list(counters[_READ_STATS:_READ_STATS + ReadLoopStats.SIZE]))
+        return {
+            'bytes_received': counters[_BYTES_RECEIVED],
+            'bytes_discarded': counters[_BYTES_DISCARDED],
+            **read_stats.as_dict(),
+            **self.ring.get_statistics()
+        }
+
+    def get_statistics(self) -> dict:
+        """Get reader statistics, including ring overruns"""
+        statistics = self._ring_statistics() if self.ring is not None else dict(self._final_statistics)
+        statistics.update({
+            'lines_received': self.lines_received,
+            'is_running': self.running,
+            'is_connected': self._process is not None and self._process.is_alive()
+        })
+        return statistics
+
+
+def create_serial_reader(config: SerialConfig, data_queue: queue.Queue,
+                         status_callback: Optional[Callable] = None,
+                         batch_config: Optional[BatchConfig] = None) -> SerialReader:
+    """
+    Create the serial reader selected by config.reader_process
+
+    Returns:
+        ProcessSerialReader or SerialReader (not yet connected)
+    """
+    reader_class = ProcessSerialReader if config.reader_process else SerialReader
+    return reader_class(config, data_queue, status_callback=status_callback, batch_config=batch_config)
@@ -0,0 +1,97 @@
+"""
+Refresh Policy module - Frame-budgeted redraw scheduling
+Decides when the next plot redraw may run from measured redraw costs
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+
+class RefreshPolicy:
+    """
+    Adaptive redraw timing for a GUI thread
+
+    Keeps a moving average of the time each redraw occupies the GUI thread.
+    After a redraw that took C seconds, the next one may start once the
+    thread has been free for C * (1 / max_busy_fraction - 1), so redraws
+    use at most max_busy_fraction of the thread. The delay is clamped to
+    [min_interval_ms, max_interval_ms]: cheap redraws follow new data
+    almost immediately, and the display never lags more than the maximum.
+    """
+
+    def __init__(self, min_interval_ms: int = 16, max_interval_ms: int = 1000,
+                 max_busy_fraction: float = 0.25, smoothing: float = 0.2,
+                 rate_window_s: float = 2.0):
+        """
+        Initialize refresh policy
+
+        Args:
+            min_interval_ms: Shortest time between redraw starts
+            max_interval_ms: Longest time a redraw may be held back
+            max_busy_fraction: Share of the GUI thread redraws may use
+            smoothing: Weight of the newest frame time in the moving average
+            rate_window_s: Time window for the effective refresh rate
+        """
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.max_busy_fraction = max_busy_fraction
+        self.smoothing = smoothing
+        self.rate_window_s = rate_window_s
+
+        self.frame_time_s: Optional[float] = None
+        self.frames = 0
+        self._last_start: Optional[float] = None
+        self._frame_starts = deque()
+
+    def record_frame(self, started: float, duration: float):
+        """
+        Record one finished redraw
+
+        Args:
+            started: time.monotonic() when the redraw started
+            duration: Seconds the redraw occupied the GUI thread
+        """
+        if self.frame_time_s is None:
+            self.frame_time_s = duration
+        else:
+            self.frame_time_s += self.smoothing * (duration - self.frame_time_s)
+
+        self.frames += 1
+        self._last_start = started
+        self._frame_starts.append(started)
+        while self._frame_starts and self._frame_starts[0] < started - self.rate_window_s:
+            self._frame_starts.popleft()
+
+    def interval_ms(self) -> float:
+        """Time between redraw starts allowed by the measured frame time"""
+        if self.frame_time_s is None:
+            return float(self.min_interval_ms)
+        interval = self.frame_time_s * 1000.0 / self.max_busy_fraction
+        return min(max(interval, self.min_interval_ms), self.max_interval_ms)
+
+    def next_delay_ms(self, now: Optional[float] = None) -> int:
+        """
+        Milliseconds to wait before starting the next redraw
+
+        Args:
+            now: Current time.monotonic() (default: now)
+        """
+        if self._last_start is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        elapsed_ms = (now - self._last_start) * 1000.0
+        return max(0, int(round(self.interval_ms() - elapsed_ms)))
+
+    def refresh_rate_hz(self, now: Optional[float] = None) -> float:
+        """Redraws per second over the last rate_window_s"""
+        now = time.monotonic() if now is None else now
+        recent = sum(1 for started in self._frame_starts if started >= now - self.rate_window_s)
+        return recent / self.rate_window_s
+
+    def reset(self):
+        """Forget measured frames"""
+        self.frame_time_s = None
+        self.frames = 0
+        self._last_start = None
+        self._frame_starts.clear()
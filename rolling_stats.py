@@ -0,0 +1,127 @@
+"""
+Rolling Statistics module - Moving mean and standard deviation
+Incremental windowed statistics over the cycles axis for live trend bands
+"""
+
+from typing import Tuple
+import numpy as np
+
+
+class RollingWindowStats:
+    """
+    Moving mean and standard deviation over a window of cycles
+
+    The window of a point at cycle c holds the points with cycles in
+    (c - window_cycles, c]. Statistics come from running sums of the values
+    and their squares over the retained points, so a new point costs a
+    difference of two running sums and a binary search for the window start
+    (log of the window length, independent of the test length). Points that
+    dropped out of the window are discarded, keeping memory proportional to
+    the window. Several series sharing one cycles axis are handled together.
+    """
+
+    def __init__(self, window_cycles: int, series: int = 1):
+        """
+        Initialize rolling statistics
+
+        Args:
+            window_cycles: Window length in cycles
+            series: Number of value series
+        """
+        self.window_cycles = window_cycles
+        self.series = series
+        self.clear()
+
+    def __len__(self) -> int:
+        """Points retained (at least the current window)"""
+        return self._length
+
+    def clear(self):
+        """Forget all points"""
+        capacity = 1024
+        self._cycles = np.empty(capacity, dtype=np.int64)
+        # Running sums over the retained points: entry j covers points [0, j)
+        self._sums = np.zeros((capacity + 1, self.series))
+        self._squares = np.zeros((capacity + 1, self.series))
+        self._length = 0
+        # Values are summed relative to the first point, which keeps the
+        # sum of squares small and the variance free of cancellation
+        self._reference = None
+
+    def append(self, cycles, values) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Add points and get their moving statistics
+
+        Args:
+            cycles: 1-D array-like of cycle counts, normally non-decreasing
+                (a decrease starts a new window history, e.g. a new test)
+            values: Array-like of shape (n, series), or (n,) for one series
+
+        Returns:
+            (mean, std) arrays of shape (n, series): statistics of the window
+            ending at each new point (population standard deviation)
+        """
+        cycles = np.asarray(cycles, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(cycles), self.series)
+        mean = np.empty_like(values)
+        std = np.empty_like(values)
+
+        # Split where the cycle count goes backwards
+        restarts = np.flatnonzero(np.diff(cycles) < 0) + 1
+        bounds = [0, *restarts.tolist(), len(cycles)]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start == stop:
+                continue
+            if self._length and cycles[start] < self._cycles[self._length - 1]:
+                self.clear()
+            mean[start:stop], std[start:stop] = self._append_sorted(cycles[start:stop],
+                                                                    values[start:stop])
+        return mean, std
+
+    def _append_sorted(self, cycles: np.ndarray, values: np.ndarray):
+        """Append points continuing the cycle order of the retained ones"""
+        if self._reference is None:
+            self._reference = values[0].copy()
+        shifted = values - self._reference
+
+        first = self._length
+        self._reserve(first + len(cycles))
+        end = first + len(cycles)
+        self._cycles[first:end] = cycles
+        self._sums[first + 1:end + 1] = self._sums[first] + np.cumsum(shifted, axis=0)
+        self._squares[first + 1:end + 1] = self._squares[first] + np.cumsum(shifted * shifted, axis=0)
+        self._length = end
+
+        # Window start of every new point; starts never move backwards
+        heads = np.searchsorted(self._cycles[:end], cycles - self.window_cycles, side='right')
+        rows = np.arange(first + 1, end + 1)
+        counts = (rows - heads)[:, np.newaxis]
+        mean = (self._sums[rows] - self._sums[heads]) / counts
+        variance = (self._squares[rows] - self._squares[heads]) / counts - mean * mean
+
+        self._discard(int(heads[-1]))
+        return mean + self._reference, np.sqrt(np.maximum(variance, 0.0))
+
+    def _reserve(self, size: int):
+        """Grow the arrays to hold at least size points, doubling the capacity"""
+        capacity = len(self._cycles)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        self._cycles = np.resize(self._cycles, capacity)
+        for name in ('_sums', '_squares'):
+            grown = np.zeros((capacity + 1, self.series))
+            grown[:self._length + 1] = getattr(self, name)[:self._length + 1]
+            setattr(self, name, grown)
+
+    def _discard(self, head: int):
+        """Drop points before head once they outnumber the retained ones"""
+        if head <= self._length - head:
+            return
+        retained = self._length - head
+        self._cycles[:retained] = self._cycles[head:self._length]
+        # Rebase the running sums on the new first point
+        self._sums[:retained + 1] = self._sums[head:self._length + 1] - self._sums[head]
+        self._squares[:retained + 1] = self._squares[head:self._length + 1] - self._squares[head]
+        self._length = retained
@@ -195,6 +195,17 @@ def performance_test(num_lines: int = 10000):
     print(f"Parsed {num_lines} lines in {elapsed:.3f} seconds")
     print(f"Rate: {rate:.0f} lines/second")
     print(f"Average time per line: {(elapsed/num_lines)*1000:.3f} ms")
+    
+    # Time vectorized batch parsing of the same lines
+    parser = DataParser()
+    start_time = time.time()
+    records, rejected = parser.parse_batch(data_lines)
+    batch_elapsed = time.time() - start_time
+    
+    print(f"\nBatch parsed {len(records)} lines in {batch_elapsed:.3f} seconds "
+          f"({rejected.sum()} rejected)")
+    print(f"Batch rate: {num_lines / batch_elapsed:.0f} lines/second "
+          f"({elapsed / batch_elapsed:.1f}x)")
     print("=" * 60)
 
 
@@ -3,12 +3,174 @@ Serial Reader module - Hardware Abstraction Layer (Producer)
 Handles serial communication in a separate thread
 """
 
+import re
 import serial
 import threading
 import queue
 import time
-from typing import Optional, Callable
-from config import SerialConfig
+from bisect import bisect_left
+from typing import Optional, Callable, List
+from config import SerialConfig, BatchConfig
+
+
+def drain_batches(data_queue: queue.Queue, max_items: int, timeout: float) -> list:
+    """
+    Take everything currently available from a reader queue
+    
+    Blocks until the first batch arrives, then empties the queue without
+    waiting until at least max_items lines are collected.
+    
+    Args:
+        data_queue: Queue filled by a reader (lists of frames, or single frames)
+        max_items: Stop draining once this many lines are collected
+        timeout: Seconds to wait for the first batch
+        
+    Returns:
+        List of frames (bytes from the readers; str is passed through too)
+        
+    Raises:
+        queue.Empty: If nothing arrived within timeout
+    """
+    item = data_queue.get(timeout=timeout)
+    lines = list(item) if isinstance(item, list) else [item]
+    
+    while len(lines) < max_items:
+        try:
+            item = data_queue.get_nowait()
+        except queue.Empty:
+            break
+        if isinstance(item, list):
+            lines.extend(item)
+        else:
+            lines.append(item)
+    
+    return lines
+
+
+class FrameBuffer:
+    """
+    Reusable receive buffer that splits a byte stream into frames
+    
+    Frames are terminated by '!' or a newline. Incomplete trailing data is
+    kept in the buffer until the rest of the frame arrives with a later read.
+    """
+    
+    # A frame is a run of non-terminator bytes, keeping its '!' if present
+    _FRAME_PATTERN = re.compile(rb'[^!\r\n]+!?')
+    
+    def __init__(self, max_frame_size: int = 1024):
+        """
+        Initialize frame buffer
+        
+        Args:
+            max_frame_size: Longest accepted partial frame (bytes) before the
+                buffer is discarded as garbage
+        """
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+        self.bytes_discarded = 0
+        
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Append received bytes and return all complete frames
+        
+        Args:
+            chunk: Bytes read from the port
+            
+        Returns:
+            List of complete frames (leading/trailing whitespace not stripped)
+        """
+        buffer = self._buffer
+        buffer += chunk
+        
+        end = max(buffer.rfind(b'!'), buffer.rfind(b'\n')) + 1
+        if end == 0:
+            # No terminator yet - keep partial frame unless it is runaway garbage
+            if len(buffer) > self.max_frame_size:
+                self.bytes_discarded += len(buffer)
+                buffer.clear()
+            return []
+        
+        # findall works directly on the bytearray, one copy per frame
+        frames = self._FRAME_PATTERN.findall(buffer, 0, end)
+        
+        # Deleting from the front of a bytearray does not reallocate
+        del buffer[:end]
+        return frames
+    
+    def pending(self) -> int:
+        """Number of buffered bytes belonging to an incomplete frame"""
+        return len(self._buffer)
+    
+    def clear(self):
+        """Discard any partial frame"""
+        self._buffer.clear()
+
+
+class ReadLoopStats:
+    """
+    Backlog seen by a block-read loop
+    
+    Records, for every read, how many bytes were already waiting on the
+    port. A loop that comes back late (after waiting for the GIL, say)
+    finds more data waiting; at a known data rate the backlog converts to
+    how late the read was, and a backlog near the driver's buffer size
+    means data is about to be lost. All values live in one flat sequence,
+    so the reader process can keep them in shared memory.
+    """
+    
+    # Upper edges of the backlog histogram buckets (bytes); the last bucket is open
+    BACKLOG_BUCKETS = (32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+    
+    # Layout of values: reads, largest backlog, histogram
+    SIZE = 2 + len(BACKLOG_BUCKETS) + 1
+    
+    def __init__(self, values=None):
+        """
+        Initialize statistics
+        
+        Args:
+            values: Mutable integer sequence of length SIZE to keep the
+                values in (default: a new zeroed list)
+        """
+        self.values = values if values is not None else [0] * self.SIZE
+    
+    def record(self, backlog: int):
+        """Record one read that found backlog bytes waiting"""
+        values = self.values
+        values[0] += 1
+        if backlog > values[1]:
+            values[1] = backlog
+        values[2 + bisect_left(self.BACKLOG_BUCKETS, backlog)] += 1
+    
+    def percentile(self, fraction: float) -> int:
+        """
+        Backlog below which the given fraction of reads fall
+        
+        Args:
+            fraction: 0..1
+            
+        Returns:
+            Upper edge of the histogram bucket in bytes (at most the largest backlog)
+        """
+        histogram = self.values[2:]
+        target = fraction * sum(histogram)
+        count = 0
+        for index, bucket in enumerate(histogram):
+            count += bucket
+            if bucket and count >= target:
+                if index < len(self.BACKLOG_BUCKETS):
+                    return min(self.BACKLOG_BUCKETS[index], self.values[1])
+                break
+        return self.values[1]
+    
+    def as_dict(self) -> dict:
+        """Statistics for get_statistics()"""
+        return {
+            'reads': int(self.values[0]),
+            'p99_backlog_bytes': int(self.percentile(0.99)),
+            'max_backlog_bytes': int(self.values[1])
+        }
 
 
 class SerialReader(threading.Thread):
@@ -18,17 +180,20 @@ class SerialReader(threading.Thread):
     """
     
     def __init__(self, config: SerialConfig, data_queue: queue.Queue, 
-                 status_callback: Optional[Callable] = None):
+                 status_callback: Optional[Callable] = None,
+                 batch_config: Optional[BatchConfig] = None):
         """
         Initialize serial reader
         
         Args:
             config: Serial configuration
-            data_queue: Queue to put received data
+            data_queue: Queue to put received data (as lists of lines)
             status_callback: Optional callback for status updates
+            batch_config: Optional batching limits for queue handoff
         """
         super().__init__(daemon=True)
         self.config = config
+        self.batch_config = batch_config or BatchConfig()
         self.data_queue = data_queue
         self.status_callback = status_callback
         self.serial_port: Optional[serial.Serial] = None
@@ -36,6 +201,8 @@ class SerialReader(threading.Thread):
         self._stop_event = threading.Event()
         self.bytes_received = 0
         self.lines_received = 0
+        self.frame_buffer = FrameBuffer(config.max_frame_size)
+        self.read_stats = ReadLoopStats()
         
     def connect(self) -> bool:
         """
@@ -71,6 +238,77 @@ class SerialReader(threading.Thread):
         self.running = True
         self._update_status("Reader thread started")
         
+        if self.config.read_mode == "readline":
+            self._run_readline()
+        else:
+            self._run_block()
+        
+        self._update_status("Reader thread stopped")
+    
+    def _run_block(self):
+        """
+        Block-read loop
+        
+        Blocks in read() until at least one byte arrives (or the port timeout
+        expires), then takes everything already waiting in one call, so an
+        idle line costs no CPU and a busy line is drained in large chunks.
+        """
+        block_size = self.config.read_block_size
+        max_batch_size = self.batch_config.max_batch_size
+        max_linger = self.batch_config.max_linger_ms / 1000.0
+        frame_buffer = self.frame_buffer
+        frame_buffer.clear()
+        read_stats = self.read_stats
+        
+        # Frames are handed over undecoded, as one list per batch: when the
+        # port has nothing more waiting, the batch is full, or it has lingered too long
+        batch: List[bytes] = []
+        batch_started = 0.0
+        
+        while not self._stop_event.is_set() and self.running:
+            try:
+                if self.serial_port and self.serial_port.is_open:
+                    waiting = self.serial_port.in_waiting
+                    read_stats.record(waiting)
+                    if batch and (waiting == 0 or len(batch) >= max_batch_size
+                                  or time.monotonic() - batch_started >= max_linger):
+                        self._put_batch(batch)
+                        batch = []
+                    
+                    chunk = self.serial_port.read(min(max(waiting, 1), block_size))
+                    if not chunk:
+                        continue
+                    self.bytes_received += len(chunk)
+                    
+                    if not batch:
+                        batch_started = time.monotonic()
+                    for frame in frame_buffer.feed(chunk):
+                        if not frame.isspace():
+                            batch.append(frame)
+                else:
+                    # Not connected, wait before checking again
+                    time.sleep(0.1)
+                    
+            except serial.SerialException as e:
+                self._update_status(f"Serial error: {e}")
+                self.running = False
+                break
+            except Exception as e:
+                self._update_status(f"Unexpected error: {e}")
+                time.sleep(0.1)
+        
+        if batch:
+            self._put_batch(batch)
+    
+    def _put_batch(self, batch: List[bytes]):
+        """Hand a list of raw frames to the processing side"""
+        self.lines_received += len(batch)
+        max_batch_size = self.batch_config.max_batch_size
+        for start in range(0, len(batch), max_batch_size):
+            self.data_queue.put(batch[start:start + max_batch_size])
+    
+    def _run_readline(self):
+        """Legacy loop - polls in_waiting and reads one line at a time"""
         while not self._stop_event.is_set() and self.running:
             try:
                 if self.serial_port and self.serial_port.is_open:
@@ -79,13 +317,12 @@ class SerialReader(threading.Thread):
                         raw_data = self.serial_port.readline()
                         self.bytes_received += len(raw_data)
                         
-                        # Decode and strip whitespace
-                        decoded_data = raw_data.decode('utf-8', errors='ignore').strip()
+                        # Strip whitespace, decoding is left to the parser
+                        frame = raw_data.strip()
                         
-                        if decoded_data:
-                            self.lines_received += 1
+                        if frame:
                             # Put data in queue for processing
-                            self.data_queue.put(decoded_data)
+                            self._put_batch([frame])
                     else:
                         # Small sleep to prevent CPU spinning
                         time.sleep(0.01)
@@ -100,8 +337,6 @@ class SerialReader(threading.Thread):
             except Exception as e:
                 self._update_status(f"Unexpected error: {e}")
                 time.sleep(0.1)
-        
-        self._update_status("Reader thread stopped")
     
     def stop(self):
         """Stop the reader thread"""
@@ -119,8 +354,10 @@ class SerialReader(threading.Thread):
         return {
             'bytes_received': self.bytes_received,
             'lines_received': self.lines_received,
+            'bytes_discarded': self.frame_buffer.bytes_discarded,
             'is_running': self.running,
-            'is_connected': self.serial_port.is_open if self.serial_port else False
+            'is_connected': self.serial_port.is_open if self.serial_port else False,
+            **self.read_stats.as_dict()
         }
 
 
@@ -136,7 +373,7 @@ class MockSerialReader(threading.Thread):
         Initialize mock reader
         
         Args:
-            data_queue: Queue to put simulated data
+            data_queue: Queue to put simulated data (as lists of byte frames)
             interval: Time between data points (seconds)
             status_callback: Optional callback for status updates
         """
@@ -172,7 +409,7 @@ class MockSerialReader(threading.Thread):
                         f"{travel_lower};{position_upper};{force_upper};"
                         f"{travel_upper};{travel_at_upper};{error_code};!")
             
-            self.data_queue.put(mock_data)
+            self.data_queue.put([mock_data.encode('ascii')])
             
             # Wait for interval or stop event
             self._stop_event.wait(self.interval)
@@ -0,0 +1,231 @@
+"""
+Station Grid - Overview window for multi-station acquisition
+One tile per tester, fed by MultiStationAcquisition running in a worker thread
+
+    python station_grid.py --station A=COM3 --station B=COM4 --out logs
+    python station_grid.py --simulate 16
+"""
+
+import math
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QGridLayout,
+                             QGroupBox, QLabel, QTextEdit, QStatusBar)
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal
+
+from multi_station import MultiStationAcquisition, SimulatedTester, build_arg_parser, create_from_args
+
+
+class StationTile(QGroupBox):
+    """Tile with the latest values and state of one station"""
+
+    # Value rows: statistics key, label
+    FIELDS = (
+        ('cycles', "Cycles"),
+        ('rate', "Rate"),
+        ('force_upper_n', "Force Upper"),
+        ('force_lower_n', "Force Lower"),
+        ('loss_of_stiffness_percent', "Loss of Stiffness"),
+        ('errors', "Errors"),
+        ('current_file', "Log File"),
+    )
+
+    # Background colour of the state label per state
+    STATE_COLORS = {
+        'running': "#ccffcc",
+        'silent': "#ffffcc",
+        'ended': "#cce5ff",
+        'disconnected': "#ffcccc",
+    }
+
+    def __init__(self, name: str, port: str, watchdog_timeout: float):
+        """
+        Initialize station tile
+
+        Args:
+            name: Station name
+            port: Serial port of the station
+            watchdog_timeout: Seconds without data before the tile turns yellow
+        """
+        super().__init__(f"{name} ({port})")
+        self.watchdog_timeout = watchdog_timeout
+        self._last_records = 0
+        self._last_time: Optional[float] = None
+
+        layout = QGridLayout()
+        self.state_label = QLabel("Starting")
+        self.state_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.state_label, 0, 0, 1, 2)
+
+        self.value_labels = {}
+        for row, (key, title) in enumerate(self.FIELDS, start=1):
+            layout.addWidget(QLabel(f"{title}:"), row, 0)
+            label = QLabel("-")
+            label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            layout.addWidget(label, row, 1)
+            self.value_labels[key] = label
+
+        self.setLayout(layout)
+
+    def update_statistics(self, stats: dict, now: float):
+        """
+        Show a station's statistics
+
+        Args:
+            stats: Station.get_statistics() result
+            now: Monotonic time of the statistics (for the record rate)
+        """
+        rate = 0.0
+        if self._last_time is not None and now > self._last_time:
+            rate = (stats['records_received'] - self._last_records) / (now - self._last_time)
+        self._last_records = stats['records_received']
+        self._last_time = now
+
+        if not stats['is_connected']:
+            state, text = 'disconnected', "Disconnected"
+        elif stats['test_ended']:
+            state, text = 'ended', "Test Ended"
+        elif stats['seconds_since_data'] >= self.watchdog_timeout:
+            state, text = 'silent', f"No Data for {stats['seconds_since_data']:.0f} s"
+        else:
+            state, text = 'running', "Running"
+        self.state_label.setText(text)
+        self.state_label.setStyleSheet(f"background-color: {self.STATE_COLORS[state]}; font-weight: bold")
+
+        labels = self.value_labels
+        if stats['cycles'] is not None:
+            labels['cycles'].setText(f"{stats['cycles']:,}")
+            labels['force_upper_n'].setText(f"{stats['force_upper_n']:.1f} N")
+            labels['force_lower_n'].setText(f"{stats['force_lower_n']:.1f} N")
+            labels['loss_of_stiffness_percent'].setText(f"{stats['loss_of_stiffness_percent']:.2f} %")
+        labels['rate'].setText(f"{rate:.1f} /s")
+        labels['errors'].setText(f"{stats['test_errors']} test, {stats['parse_errors']} parse")
+        if stats['current_file']:
+            labels['current_file'].setText(stats['current_file'])
+
+
+class StationGridWindow(QMainWindow):
+    """
+    Grid of station tiles plus the acquisition's status log
+
+    The acquisition runs in a worker thread started with the window;
+    tiles are refreshed from its statistics by a timer.
+    """
+
+    # Status lines from the acquisition thread (level, message)
+    status_message = pyqtSignal(str, str)
+
+    def __init__(self, acquisition: MultiStationAcquisition, testers: List[SimulatedTester] = (),
+                 duration: Optional[float] = None, refresh_ms: int = 1000):
+        """
+        Initialize station grid window
+
+        Args:
+            acquisition: Multi-station acquisition to run and show
+            testers: Simulated testers to close with the window
+            duration: Stop the acquisition after this many seconds (None = at close)
+            refresh_ms: Interval between tile updates
+        """
+        super().__init__()
+        self.acquisition = acquisition
+        self.testers = list(testers)
+        self.duration = duration
+        self.exit_code = 0
+
+        self.setWindowTitle(f"Fatigue Tester Station Grid ({len(acquisition.stations)} stations)")
+        self.setGeometry(100, 100, 1400, 900)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+
+        # Near-square grid of tiles
+        grid = QGridLayout()
+        columns = math.ceil(math.sqrt(len(acquisition.stations)))
+        self.tiles = []
+        for index, station in enumerate(acquisition.stations):
+            tile = StationTile(station.name, station.config.serial.port, station.watchdog.timeout_seconds)
+            grid.addWidget(tile, index // columns, index % columns)
+            self.tiles.append(tile)
+        layout.addLayout(grid, stretch=1)
+
+        self.status_log = QTextEdit()
+        self.status_log.setReadOnly(True)
+        self.status_log.setMaximumHeight(160)
+        self.status_log.document().setMaximumBlockCount(1000)
+        layout.addWidget(self.status_log)
+
+        self.statusBar = QStatusBar()
+        self.setStatusBar(self.statusBar)
+
+        # Status lines cross to the GUI thread through the signal
+        self.status_message.connect(self.on_status_message)
+        acquisition.status_callback = self.status_message.emit
+
+        self.refresh_timer = QTimer()
+        self.refresh_timer.timeout.connect(self.refresh_tiles)
+        self.refresh_timer.start(refresh_ms)
+
+        self._thread = threading.Thread(target=self._run_acquisition, name="MultiStationAcquisition",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run_acquisition(self):
+        """Worker thread: run the acquisition until stopped"""
+        self.exit_code = self.acquisition.run(duration=self.duration)
+
+    def refresh_tiles(self):
+        """Update every tile and the status bar summary"""
+        now = time.monotonic()
+        statistics = self.acquisition.get_statistics()
+        for tile, stats in zip(self.tiles, statistics):
+            tile.update_statistics(stats, now)
+
+        connected = sum(stats['is_connected'] for stats in statistics)
+        records = sum(stats['records_received'] for stats in statistics)
+        running = "running" if self._thread.is_alive() else "stopped"
+        self.statusBar.showMessage(f"Acquisition {running} | {connected}/{len(statistics)} stations connected | "
+                                   f"{records:,} records")
+
+    def on_status_message(self, level: str, message: str):
+        """Append a status line of the acquisition to the log"""
+        timestamp = time.strftime("%H:%M:%S")
+        if level == "error":
+            self.status_log.append(f"[{timestamp}] <span style='color: red;'><b>ERROR:</b> {message}</span>")
+        else:
+            self.status_log.append(f"[{timestamp}] {message}")
+
+    def closeEvent(self, event):
+        """Stop the acquisition (closing all log files) before the window closes"""
+        self.refresh_timer.stop()
+        self.acquisition.stop()
+        self._thread.join(timeout=10.0)
+        self.acquisition.status_callback = None
+        for tester in self.testers:
+            tester.close()
+        event.accept()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Station grid entry point"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if not args.station and not args.simulate:
+        parser.error("give at least one --station or --simulate")
+
+    app = QApplication(sys.argv[:1])
+    app.setStyle('Fusion')
+
+    acquisition, testers = create_from_args(args)
+    window = StationGridWindow(acquisition, testers, duration=args.duration)
+    window.show()
+
+    app.exec_()
+    sys.exit(window.exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# tests/test_acquire.py
+"""
+Unit tests for acquire module
+Tests the headless acquisition loop, its watchdog and the GUI-free imports
+"""
+
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from acquire import HeadlessAcquisition, HeadlessWatchdog
+from acquisition_ipc import AcquisitionClient
+from binary_log import read_binary_log
+from config import SerialConfig, LogConfig, IpcConfig
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+
+class TestHeadlessWatchdog(unittest.TestCase):
+    """Test cases for HeadlessWatchdog class"""
+
+    def test_alerts_once_per_timeout(self):
+        """Test that a silent line raises one alert per timeout period"""
+        watchdog = HeadlessWatchdog(5.0)
+        watchdog.reset(now=100.0)
+        self.assertIsNone(watchdog.check(now=104.9))
+        self.assertAlmostEqual(watchdog.check(now=105.0), 5.0)
+        self.assertIsNone(watchdog.check(now=109.0))
+        self.assertAlmostEqual(watchdog.check(now=110.5), 10.5)
+
+        watchdog.reset(now=111.0)
+        self.assertIsNone(watchdog.check(now=115.0))
+        self.assertEqual(watchdog.timeouts, 2)
+
+
+class TestHeadlessAcquisition(unittest.TestCase):
+    """Test cases for HeadlessAcquisition class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.out = io.StringIO()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_mock_run_logs_all_records(self):
+        """Test that every received record is logged and statistics are printed"""
+        acquisition = HeadlessAcquisition(SerialConfig(), LogConfig(log_format="binary", event_capture=False),
+                                          output_dir=self.temp_dir, mock_interval=0.002,
+                                          stats_interval=0.2, out=self.out)
+        self.assertEqual(acquisition.run(duration=0.6), 0)
+
+        log_files = list(Path(self.temp_dir).glob("*.ftb"))
+        self.assertEqual(len(log_files), 1)
+        cycles = read_binary_log(log_files[0])['Cycles']
+        self.assertGreater(len(cycles), 0)
+        self.assertEqual(len(cycles), acquisition.records_received)
+        self.assertEqual(cycles.tolist(), list(range(1, len(cycles) + 1)))
+
+        output = self.out.getvalue()
+        self.assertIn("Records:", output)
+        self.assertIn("Acquisition stopped", output)
+
+    def test_daemon_serves_viewer(self):
+        """Test that an attached viewer sees exactly the logged records, history and live"""
+        acquisition = HeadlessAcquisition(SerialConfig(), LogConfig(log_format="binary", event_capture=False),
+                                          output_dir=self.temp_dir, mock_interval=0.002, stats_interval=0,
+                                          out=self.out, ipc_config=IpcConfig(port=0))
+        thread = threading.Thread(target=acquisition.run, kwargs={'duration': 1.0})
+        thread.start()
+        while acquisition.records_received < 50:
+            time.sleep(0.01)
+
+        received = []
+        client = AcquisitionClient(lambda records, history: received.append(records.copy()))
+        info = client.connect("127.0.0.1", acquisition.server.port)
+        client.send_command("capture_event")
+        thread.join()
+        client._thread.join(timeout=5.0)  # Ends when the daemon closes the connection
+
+        self.assertGreater(info['history_rows'], 0)
+        self.assertGreater(client.live_rows, 0)
+        cycles = np.concatenate(received)['Cycles']
+        logged = read_binary_log(next(Path(self.temp_dir).glob("*.ftb")))['Cycles']
+        np.testing.assert_array_equal(cycles, logged)
+        self.assertIn("Event capture triggered by a viewer", self.out.getvalue())
+
+    def test_connect_failure(self):
+        """Test that a port that cannot be opened ends the run with exit code 1"""
+        acquisition = HeadlessAcquisition(SerialConfig(port="/nonexistent/tty"), LogConfig(),
+                                          output_dir=self.temp_dir, out=self.out)
+        self.assertEqual(acquisition.run(duration=0.1), 1)
+        self.assertIn("Failed to connect", self.out.getvalue())
+        self.assertEqual(list(Path(self.temp_dir).iterdir()), [])
+
+    def test_no_gui_imports(self):
+        """Test that the headless entry point loads neither Qt, pyqtgraph nor pandas"""
+        code = ("import sys, acquire; "
+                "print(sorted({m.split('.')[0] for m in sys.modules} & {'PyQt5', 'pyqtgraph', 'pandas'}))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_DIR,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
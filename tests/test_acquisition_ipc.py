@@ -0,0 +1,136 @@
+# tests/test_acquisition_ipc.py
+"""
+Unit tests for acquisition_ipc module
+Tests the message framing, history and live streaming, and slow viewers
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from acquisition_ipc import AcquisitionClient, AcquisitionServer, recv_message, send_message
+from config import IpcConfig
+from data_parser import RECORD_DTYPE
+
+
+def make_records(first_cycle: int, count: int) -> np.ndarray:
+    """Records with consecutive cycle counts"""
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['Cycles'] = np.arange(first_cycle, first_cycle + count)
+    records['Force_Upper_N'] = 2200
+    return records
+
+
+def wait_for(condition, timeout: float = 5.0):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not reached in time")
+        time.sleep(0.01)
+
+
+class TestMessages(unittest.TestCase):
+    """Test cases for message framing"""
+
+    def test_records_round_trip(self):
+        """Test that records arrive byte for byte, after a preceding message"""
+        left, right = socket.socketpair()
+        with left, right:
+            records = make_records(1, 100)
+            send_message(left, b'TEXT', b'{}')
+            send_message(left, b'LIVE', records[10:20])
+            self.assertEqual(recv_message(right), (b'TEXT', bytearray(b'{}')))
+            kind, payload = recv_message(right)
+            self.assertEqual(kind, b'LIVE')
+            np.testing.assert_array_equal(np.frombuffer(payload, dtype=RECORD_DTYPE), records[10:20])
+
+            left.close()
+            self.assertIsNone(recv_message(right))
+
+
+class TestAcquisitionServer(unittest.TestCase):
+    """Test cases for AcquisitionServer and AcquisitionClient"""
+
+    def setUp(self):
+        self.server = AcquisitionServer(IpcConfig(port=0, snapshot_chunk_rows=1000, max_pending_messages=8))
+        self.server.start()
+        self.received = []
+
+    def tearDown(self):
+        self.server.stop()
+
+    def attach(self, client: AcquisitionClient, history: np.ndarray) -> dict:
+        """Connect a client while the 'acquisition thread' serves the attach"""
+        info = {}
+        thread = threading.Thread(target=lambda: info.update(client.connect("127.0.0.1", self.server.port)))
+        thread.start()
+        wait_for(lambda: self.server._pending)
+        self.server.attach_pending(lambda: history, {'current_file': "test.csv"})
+        thread.join()
+        return info
+
+    def test_history_then_live(self):
+        """Test that a viewer gets the history in chunks, then live batches without gap"""
+        client = AcquisitionClient(lambda records, history: self.received.append((records, history)))
+        info = self.attach(client, make_records(1, 2500))
+        self.assertEqual((info['history_rows'], info['current_file']), (2500, "test.csv"))
+
+        self.server.publish(make_records(2501, 10))
+        self.server.publish(make_records(2511, 5))
+        wait_for(lambda: client.live_rows == 15)
+        client.close()
+
+        self.assertEqual([(len(records), history) for records, history in self.received],
+                         [(1000, True), (1000, True), (500, True), (10, False), (5, False)])
+        cycles = np.concatenate([records['Cycles'] for records, _ in self.received])
+        np.testing.assert_array_equal(cycles, np.arange(1, 2516))
+
+    def test_messages_and_commands(self):
+        """Test daemon messages to the viewer and viewer commands to the daemon"""
+        messages = []
+        statistics = []
+        client = AcquisitionClient(lambda *_: None, lambda level, text: messages.append((level, text)),
+                                   statistics.append)
+        self.attach(client, make_records(1, 0))
+
+        self.server.send_text("error", "Test error: E11")
+        self.server.send_statistics({'points_written': 5})
+        client.send_command("capture_event", reason="Manual trigger")
+        wait_for(lambda: statistics)
+        wait_for(lambda: self.server._commands.qsize())
+        client.close()
+
+        self.assertEqual(messages, [("error", "Test error: E11")])
+        self.assertEqual(statistics, [{'points_written': 5}])
+        self.assertEqual(self.server.take_commands(), [{'command': "capture_event", 'reason': "Manual trigger"}])
+
+    def test_frozen_viewer_detached(self):
+        """Test that a viewer that stops reading is detached instead of blocking the daemon"""
+        frozen = socket.create_connection(("127.0.0.1", self.server.port))
+        wait_for(lambda: self.server._pending)
+        self.server.attach_pending(lambda: make_records(1, 0), {})
+
+        started = time.perf_counter()
+        batch = make_records(1, 20000)
+        for _ in range(200):
+            self.server.publish(batch)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(self.server.viewers_dropped, 1)
+        self.assertEqual(self.server.viewer_count, 0)
+        frozen.close()
+
+    def test_disconnect_reported(self):
+        """Test that the client reports a daemon that went away"""
+        disconnected = []
+        client = AcquisitionClient(lambda *_: None, on_disconnect=lambda: disconnected.append(True))
+        self.attach(client, make_records(1, 10))
+        self.server.stop()
+        wait_for(lambda: disconnected)
+
+
+if __name__ == '__main__':
+    unittest.main()
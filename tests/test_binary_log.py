@@ -0,0 +1,124 @@
+# tests/test_binary_log.py
+"""
+Unit tests for binary_log module
+Tests writing, reading and CSV conversion of binary columnar logs
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from binary_log import BinaryLogWriter, read_binary_log, read_binary_log_header, convert_to_csv
+from config import LogConfig
+from data_logger import DataLogger
+from data_parser import DataParser, RECORD_DTYPE
+from sample_data_generator import generate_sample_data
+
+
+class TestBinaryLog(unittest.TestCase):
+    """Test cases for the binary log format"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "test.ftb")
+        parser = DataParser()
+        self.data = [parser.parse(line) for line in generate_sample_data(300, with_errors=True)]
+        self.records = np.array([data.to_record() for data in self.data], dtype=RECORD_DTYPE)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_round_trip(self):
+        """Test that every column reads back unchanged across chunks"""
+        writer = BinaryLogWriter(self.path, chunk_rows=64)
+        writer.write_records(self.records[:100])
+        writer.flush()
+        writer.write_records(self.records[100:])
+        writer.close()
+        
+        columns = read_binary_log(self.path)
+        for name in RECORD_DTYPE.names:
+            np.testing.assert_array_equal(columns[name], self.records[name])
+    
+    def test_flushed_rows_readable_while_open(self):
+        """Test that every row written before a flush is in the file before it is closed"""
+        writer = BinaryLogWriter(self.path, chunk_rows=64)
+        for start in range(0, 300, 10):
+            writer.write_records(self.records[start:start + 10])
+            writer.flush()
+            np.testing.assert_array_equal(read_binary_log(self.path)['Cycles'],
+                                          self.records['Cycles'][:start + 10])
+        writer.close()
+        
+        columns = read_binary_log(self.path)
+        for name in RECORD_DTYPE.names:
+            np.testing.assert_array_equal(columns[name], self.records[name])
+    
+    def test_header(self):
+        """Test that the header describes fields and scales"""
+        BinaryLogWriter(self.path).close()
+        header = read_binary_log_header(self.path)
+        
+        self.assertEqual([field[0] for field in header['fields']], list(RECORD_DTYPE.names))
+        self.assertEqual(header['scales']['Force_Lower_N'], 10)
+        self.assertEqual(len(read_binary_log(self.path)['Cycles']), 0)
+    
+    def test_truncated_chunk_ignored(self):
+        """Test that a partially written last chunk is skipped"""
+        writer = BinaryLogWriter(self.path, chunk_rows=100)
+        writer.write_records(self.records)
+        writer.close()
+        
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+        
+        self.assertEqual(len(read_binary_log(self.path)['Cycles']), 200)
+    
+    def test_not_a_binary_log(self):
+        """Test that other files are rejected"""
+        with open(self.path, 'w') as f:
+            f.write("Timestamp,Status\n")
+        with self.assertRaises(ValueError):
+            read_binary_log(self.path)
+    
+    def test_convert_to_csv(self):
+        """Test conversion back to the CSV log schema"""
+        writer = BinaryLogWriter(self.path)
+        writer.write_records(self.records)
+        writer.close()
+        
+        csv_path = convert_to_csv(self.path)
+        frame = pd.read_csv(csv_path)
+        expected = pd.DataFrame([data.to_dict() for data in self.data])
+        
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+    
+    def test_logger_writes_both_formats(self):
+        """Test that DataLogger writes a binary file next to the CSV"""
+        logger = DataLogger(LogConfig(log_format="both"), output_dir=self.temp_dir)
+        logger.start_new_log()
+        logger.log_batch(self.data)
+        binary_file = logger.binary_file
+        logger.close_log()
+        
+        self.assertEqual(len(read_binary_log(binary_file)['Cycles']), 300)
+        self.assertLess(os.path.getsize(binary_file), os.path.getsize(binary_file.with_suffix(".csv")) / 2)
+    
+    def test_logger_binary_only(self):
+        """Test that binary-only logging creates no CSV file"""
+        logger = DataLogger(LogConfig(log_format="binary"), output_dir=self.temp_dir)
+        path = logger.start_new_log()
+        logger.log_batch(self.data)
+        logger.close_log()
+        
+        self.assertTrue(path.endswith(".ftb"))
+        self.assertEqual(logger.get_log_files(), [os.path.basename(path)])
+        self.assertEqual(len(read_binary_log(path)['Cycles']), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
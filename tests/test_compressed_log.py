@@ -0,0 +1,154 @@
+# tests/test_compressed_log.py
+"""
+Unit tests for compressed_log module
+Tests swinging-door and deadband compression, reconstruction and logging
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from compressed_log import (ChannelCompressor, CompressedLogWriter, read_compressed_log,
+                            read_compressed_log_header, raw_tolerances)
+from config import LogConfig
+from data_logger import DataLogger
+from data_parser import DataParser, RECORD_DTYPE
+from sample_data_generator import generate_sample_data
+
+
+def make_records(count: int) -> np.ndarray:
+    """Constant, drifting and noisy channels with a few error records"""
+    rng = np.random.default_rng(0)
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['Cycles'] = np.arange(1, count + 1)
+    records['Timestamp_ns'] = np.arange(count) * 1_000_000_000 + rng.integers(0, 5_000_000, count)
+    records['Position_1_mm'] = 182
+    records['Force_Lower_N'] = 200 + rng.integers(-30, 30, count)
+    records['Force_Upper_N'] = 2100 + np.arange(count) // 50
+    records['Travel_2_mm'] = 49 + np.arange(count) // 1500
+    records['Travel_at_Upper_mm'] = 599
+    records['Error_Code'][[700, 701, 2500]] = 12
+    records['Status'][-1] = 1
+    return records
+
+
+class TestChannelCompressor(unittest.TestCase):
+    """Test cases for ChannelCompressor class"""
+
+    def reconstruct(self, compressor, count):
+        compressor.close_segment()
+        indices, values = compressor.take()
+        if compressor.kind == "step":
+            return values[np.searchsorted(indices, np.arange(count), side='right') - 1]
+        return np.interp(np.arange(count), indices, values)
+
+    def test_swinging_door_within_tolerance(self):
+        """Test that interpolation between archived points stays within tolerance"""
+        rng = np.random.default_rng(1)
+        values = np.cumsum(rng.normal(0, 1, 5000))
+        for tolerance in (0.5, 2.0, 10.0):
+            compressor = ChannelCompressor(tolerance, "swinging_door", max_gap=100000)
+            for start in range(0, 5000, 333):
+                compressor.add(start, values[start:start + 333].tolist())
+            restored = self.reconstruct(compressor, 5000)
+            self.assertLessEqual(np.abs(restored - values).max(), tolerance + 1e-9)
+
+    def test_straight_line_needs_two_points(self):
+        """Test that a linear channel is stored by its end points"""
+        compressor = ChannelCompressor(0.0, "swinging_door", max_gap=100000)
+        compressor.add(0, [float(3 * i + 7) for i in range(10000)])
+        compressor.close_segment()
+        indices, values = compressor.take()
+        self.assertEqual(indices.tolist(), [0, 9999])
+        self.assertEqual(values.tolist(), [7.0, 30004.0])
+
+    def test_deadband_and_max_gap(self):
+        """Test held values within tolerance and the forced point interval"""
+        values = [0.0] * 250 + [0.4] * 250 + [3.0] * 500
+        compressor = ChannelCompressor(0.5, "deadband", max_gap=200)
+        compressor.add(0, values)
+        restored = self.reconstruct(compressor, 1000)
+        self.assertLessEqual(np.abs(restored - values).max(), 0.5)
+
+        compressor = ChannelCompressor(0.5, "deadband", max_gap=200)
+        compressor.add(0, values)
+        indices, _ = compressor.take()
+        self.assertEqual(indices.tolist(), [0, 200, 400, 500, 700, 900])
+
+
+class TestCompressedLog(unittest.TestCase):
+    """Test cases for the compressed log format"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "test.ftz")
+        self.records = make_records(5000)
+        self.tolerances = raw_tolerances({'Force_Lower_N': 1.0, 'Force_Upper_N': 1.0}, 50.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip_within_tolerance(self):
+        """Test that every record is restored within its channel tolerance"""
+        for mode in ("swinging_door", "deadband"):
+            writer = CompressedLogWriter(self.path, self.tolerances, mode)
+            for start in range(0, 5000, 128):
+                writer.write_records(self.records[start:start + 128])
+                writer.flush()
+            writer.close()
+
+            columns = read_compressed_log(self.path)
+            self.assertEqual(read_compressed_log_header(self.path)['mode'], mode)
+            self.assertEqual(len(columns['Cycles']), 5000)
+            for name in RECORD_DTYPE.names:
+                error = np.abs(columns[name].astype(np.int64) - self.records[name].astype(np.int64))
+                self.assertLessEqual(error.max(), self.tolerances[name], (mode, name))
+            np.testing.assert_array_equal(columns['Cycles'], self.records['Cycles'])
+            self.assertGreater(writer.compression_ratio, 1.0)
+
+    def test_error_and_end_records_exact(self):
+        """Test that END and error records are stored exactly in every channel"""
+        writer = CompressedLogWriter(self.path, self.tolerances)
+        writer.write_records(self.records)
+        writer.close()
+
+        columns = read_compressed_log(self.path)
+        for index in (700, 701, 2500, 4999):
+            for name in RECORD_DTYPE.names:
+                self.assertEqual(columns[name][index], self.records[name][index], (index, name))
+        self.assertEqual(np.count_nonzero(columns['Error_Code']), 3)
+
+    def test_truncated_tail_ignored(self):
+        """Test that an interrupted file restores the records up to its last points"""
+        writer = CompressedLogWriter(self.path, self.tolerances, max_gap=500)
+        writer.write_records(self.records)
+        writer.flush()
+        size = os.path.getsize(self.path)
+        writer.close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
+
+        rows = len(read_compressed_log(self.path)['Cycles'])
+        self.assertGreaterEqual(rows, 5000 - 500)
+        self.assertLessEqual(rows, 5000)
+
+    def test_logger_compressed_format(self):
+        """Test that the logger writes a compressed file and reports its ratio"""
+        parser = DataParser()
+        data = [parser.parse(line) for line in generate_sample_data(300, with_errors=True)]
+        logger = DataLogger(LogConfig(log_format="compressed"), output_dir=self.temp_dir)
+        path = logger.start_new_log()
+        logger.log_batch(data)
+        logger.close_log()
+
+        self.assertTrue(path.endswith(".ftz"))
+        self.assertEqual(logger.get_log_files(), [os.path.basename(path)])
+        np.testing.assert_array_equal(read_compressed_log(path)['Cycles'], [d.cycles for d in data])
+        self.assertGreater(logger.get_statistics()['compression_ratio'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,8 +7,9 @@ Tests default values and configuration loading
 import unittest
 from config import (
     SerialConfig, PlotConfig, LogConfig, 
-    WatchdogConfig, ERROR_CODES, DATA_FIELDS
+    WatchdogConfig, BatchConfig, FanOutConfig, ERROR_CODES, DATA_FIELDS
 )
+from fanout import OVERFLOW_POLICIES
 
 
 class TestSerialConfig(unittest.TestCase):
@@ -84,6 +85,29 @@ class TestWatchdogConfig(unittest.TestCase):
         self.assertEqual(config.timeout_seconds, 5.0)
 
 
+class TestBatchConfig(unittest.TestCase):
+    """Test reader/processor batching configuration"""
+    
+    def test_batch_limits_positive(self):
+        """Test that batch size and linger time bound the handoff"""
+        config = BatchConfig()
+        self.assertGreater(config.max_batch_size, 0)
+        self.assertGreater(config.max_linger_ms, 0)
+
+
+class TestFanOutConfig(unittest.TestCase):
+    """Test per-consumer queue configuration"""
+    
+    def test_overflow_policies(self):
+        """Test that the logger never loses records and the others use known policies"""
+        config = FanOutConfig()
+        self.assertEqual(config.logger_overflow, "block")
+        self.assertIn(config.plotter_overflow, OVERFLOW_POLICIES)
+        self.assertIn(config.detector_overflow, OVERFLOW_POLICIES)
+        self.assertGreater(config.max_pending_batches, 0)
+        self.assertGreater(config.logger_call_timeout_s, 0)
+
+
 class TestErrorCodes(unittest.TestCase):
     """Test error code definitions"""
     
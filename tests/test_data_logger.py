@@ -15,6 +15,23 @@ from data_parser import FatigueTestData
 from config import LogConfig
 
 
+def make_data(cycle: int, status: str = "DTA", error_code: int = 0) -> FatigueTestData:
+    """Create a test data point for the given cycle"""
+    return FatigueTestData(
+        timestamp=datetime.now(), status=status, cycles=cycle,
+        position_1_mm=1.5, force_lower_n=25.0, travel_1_mm=0.1,
+        position_2_mm=7.5, force_upper_n=200.0, travel_2_mm=0.05,
+        travel_at_upper_mm=6.0, error_code=error_code,
+        raw_data=f"{status};{cycle};150;250;10;750;2000;5;600;{error_code};!"
+    )
+
+
+def count_rows(path) -> int:
+    """Count data rows currently visible in a CSV log file"""
+    with open(path, 'r') as f:
+        return len(f.read().splitlines()) - 1
+
+
 class TestDataLogger(unittest.TestCase):
     """Test cases for DataLogger class"""
     
@@ -100,6 +117,52 @@ class TestDataLogger(unittest.TestCase):
         # Verify counter
         self.assertEqual(self.logger.total_points_logged, 1)
     
+    def test_log_batch(self):
+        """Test logging several data points in one call"""
+        self.logger.start_new_log()
+        
+        self.logger.log_batch([make_data(cycle) for cycle in range(1, 4)])
+        self.logger.close_log()
+        
+        self.assertEqual(self.logger.total_points_logged, 3)
+        with open(self.logger.output_dir / self.logger.get_log_files()[0], 'r') as f:
+            lines = f.read().splitlines()
+        
+        # Header plus one row per data point, in order
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[3].endswith("DTA;3;150;250;10;750;2000;5;600;0;!"))
+    
+    def test_log_batch_out_of_range_values(self):
+        """Test that a value too large for its fixed-point column does not lose the batch"""
+        logger = DataLogger(LogConfig(log_format="both"), output_dir=self.temp_dir)
+        logger.start_new_log()
+        
+        logger.log_batch([make_data(1), make_data(2, error_code=99999), make_data(3)])
+        logger.close_log()
+        
+        self.assertEqual(logger.total_points_logged, 3)
+        self.assertEqual(logger.get_statistics()['write_errors'], 0)
+        csv_file = [name for name in logger.get_log_files() if name.endswith(".csv")][0]
+        with open(logger.output_dir / csv_file, 'r') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[2].endswith("DTA;2;150;250;10;750;2000;5;600;99999;!"))
+        
+        # The fixed-point store keeps the error code clipped to its int16 column
+        self.assertEqual(list(logger.data_store.columns()['Error_Code']), [0, 32767, 0])
+    
+    def test_export_to_dataframe(self):
+        """Test that logged data can be exported as a DataFrame"""
+        self.assertIsNone(self.logger.export_to_dataframe())
+        
+        self.logger.start_new_log()
+        self.logger.log_batch([make_data(cycle) for cycle in range(1, 6)])
+        frame = self.logger.export_to_dataframe()
+        
+        self.assertEqual(len(frame), 5)
+        self.assertEqual(list(frame['Cycles']), [1, 2, 3, 4, 5])
+        self.assertAlmostEqual(frame['Force_Upper_N'][0], 200.0)
+    
     def test_statistics(self):
         """Test statistics reporting"""
         stats = self.logger.get_statistics()
@@ -109,5 +172,181 @@ class TestDataLogger(unittest.TestCase):
         self.assertEqual(stats['total_points_logged'], 0)
 
 
+class TestDataLoggerFlushPolicy(unittest.TestCase):
+    """Test flushing of the persistent CSV file handle"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def make_logger(self, **kwargs) -> DataLogger:
+        config = LogConfig(flush_every_rows=0, flush_interval_ms=0, flush_on_event=False,
+                           background_writer=False)
+        for key, value in kwargs.items():
+            setattr(config, key, value)
+        logger = DataLogger(config, output_dir=self.temp_dir)
+        logger.start_new_log()
+        return logger
+    
+    def test_flush_every_n_rows(self):
+        """Test that rows reach the file once flush_every_rows is reached"""
+        logger = self.make_logger(flush_every_rows=3)
+        
+        logger.log_batch([make_data(1), make_data(2)])
+        self.assertEqual(count_rows(logger.current_file), 0)
+        
+        logger.log_data(make_data(3))
+        self.assertEqual(count_rows(logger.current_file), 3)
+        logger.close_log()
+    
+    def test_flush_on_error_record(self):
+        """Test that an error record is flushed immediately"""
+        logger = self.make_logger(flush_on_event=True)
+        
+        logger.log_data(make_data(1))
+        logger.log_data(make_data(2, error_code=11))
+        self.assertEqual(count_rows(logger.current_file), 2)
+        logger.close_log()
+    
+    def test_flush_on_end_record(self):
+        """Test that an END record is flushed immediately"""
+        logger = self.make_logger(flush_on_event=True)
+        
+        logger.log_data(make_data(1, status="END"))
+        self.assertEqual(count_rows(logger.current_file), 1)
+        logger.close_log()
+    
+    def test_close_log_flushes(self):
+        """Test that close_log writes out pending rows"""
+        logger = self.make_logger()
+        logger.log_batch([make_data(1), make_data(2)])
+        path = logger.current_file
+        
+        logger.close_log()
+        self.assertEqual(count_rows(path), 2)
+    
+    def test_save_current_log_flushes(self):
+        """Test that the saved copy contains all rows logged so far"""
+        logger = self.make_logger(fsync_on_flush=True)
+        logger.log_batch([make_data(1), make_data(2)])
+        
+        saved_path = logger.save_current_log("saved_copy")
+        self.assertEqual(count_rows(saved_path), 2)
+        logger.close_log()
+
+
+class TestDataLoggerBackgroundWriter(unittest.TestCase):
+    """Test the writer thread that keeps disk I/O off the caller"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.errors = []
+        self.logger = DataLogger(LogConfig(background_writer=True), output_dir=self.temp_dir,
+                                 status_callback=self.errors.append)
+        self.logger.start_new_log()
+    
+    def tearDown(self):
+        self.logger.close_log()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_slow_disk_does_not_block_caller(self):
+        """Test that log_batch returns while the writer is stalled"""
+        import threading
+        import time
+        release = threading.Event()
+        original_write = self.logger._write_batch_to_file
+        
+        def stalled_write(batch):
+            release.wait()
+            original_write(batch)
+        
+        self.logger._write_batch_to_file = stalled_write
+        
+        start_time = time.monotonic()
+        for cycle in range(1, 11):
+            self.logger.log_data(make_data(cycle))
+        self.assertLess(time.monotonic() - start_time, 0.5)
+        self.assertGreater(self.logger.get_statistics()['queue_depth'], 0)
+        
+        release.set()
+    
+    def test_close_log_drains_queue(self):
+        """Test that close_log waits for every queued row"""
+        for cycle in range(1, 101):
+            self.logger.log_data(make_data(cycle))
+        path = self.logger.current_file
+        
+        self.logger.close_log()
+        
+        self.assertEqual(count_rows(path), 100)
+        stats = self.logger.get_statistics()
+        self.assertEqual(stats['points_written'], 100)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertGreater(stats['write_latency_ms_max'], 0.0)
+    
+    def test_save_current_log_waits_for_writer(self):
+        """Test that a saved copy contains rows still queued at save time"""
+        self.logger.log_batch([make_data(cycle) for cycle in range(1, 51)])
+        
+        saved_path = self.logger.save_current_log("saved_copy")
+        self.assertEqual(count_rows(saved_path), 50)
+    
+    def test_write_errors_reported(self):
+        """Test that writer thread errors reach the status callback"""
+        class FailingWriter:
+            def writerows(self, rows):
+                raise OSError("disk full")
+        
+        self.logger._csv_writer = FailingWriter()
+        self.logger.log_data(make_data(1))
+        self.logger.close_log()
+        
+        self.assertEqual(self.logger.write_errors, 1)
+        self.assertTrue(any("disk full" in message for message in self.errors))
+
+    
+    def test_unexpected_error_keeps_writer_running(self):
+        """Test that an exception outside the file writes is reported and later batches are written"""
+        original_process = self.logger._process_batch
+        
+        def failing_process(batch, logged):
+            if batch[0].cycles == 1:
+                raise ValueError("bad record")
+            original_process(batch, logged)
+        
+        self.logger._process_batch = failing_process
+        for cycle in range(1, 11):
+            self.logger.log_data(make_data(cycle))
+        path = self.logger.current_file
+        self.logger.close_log()
+        
+        self.assertEqual(count_rows(path), 9)
+        self.assertEqual(self.logger.write_errors, 1)
+        self.assertTrue(any("bad record" in message for message in self.errors))
+    
+    def test_stalled_writer_does_not_hang_close(self):
+        """Test that save and close give up on a stalled writer after writer_timeout_s"""
+        import threading
+        import time
+        self.logger.config.writer_timeout_s = 0.2
+        release = threading.Event()
+        self.logger._write_batch_to_file = lambda batch: release.wait(5)
+        self.logger.log_data(make_data(1))
+        
+        start_time = time.monotonic()
+        self.assertIsNotNone(self.logger.save_current_log("saved_copy"))
+        self.logger.close_log()
+        self.assertLess(time.monotonic() - start_time, 2.0)
+        release.set()
+        
+        self.assertEqual(len(self.errors), 2)
+        self.assertIn("did not flush", self.errors[0])
+        self.assertIn("did not finish", self.errors[1])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -5,7 +5,10 @@ Tests the core data parsing functionality
 """
 
 import unittest
-from data_parser import DataParser, FatigueTestData
+import numpy as np
+from datetime import datetime
+from data_parser import (DataParser, FatigueTestData, RECORD_DTYPE, FRAME_VALID,
+                         FRAME_TEST_END, FRAME_ERROR_CODE, FRAME_INVALID, FRAME_MALFORMED)
 
 
 class TestDataParser(unittest.TestCase):
@@ -93,5 +96,181 @@ class TestDataParser(unittest.TestCase):
         self.assertEqual(result.error_code, 11)
 
 
+class TestFatigueTestData(unittest.TestCase):
+    """Test cases for the compact FatigueTestData representation"""
+    
+    def test_no_instance_dict(self):
+        """Test that records are slotted"""
+        data = DataParser().parse("DTA;31422;182;263;0;793;2238;0;611;0;!")
+        self.assertFalse(hasattr(data, '__dict__'))
+        self.assertEqual(data.position_1_raw, 182)
+    
+    def test_keyword_constructor_round_trip(self):
+        """Test that physical values given to the constructor read back unchanged"""
+        timestamp = datetime(2026, 3, 1, 12, 30, 15, 123456)
+        data = FatigueTestData(
+            timestamp=timestamp, status="DTA", cycles=100,
+            position_1_mm=1.5, force_lower_n=25.0, travel_1_mm=0.1,
+            position_2_mm=7.5, force_upper_n=200.0, travel_2_mm=0.05,
+            travel_at_upper_mm=6.0, error_code=0
+        )
+        
+        self.assertEqual(data.timestamp, timestamp)
+        self.assertEqual(data.travel_2_mm, 0.05)
+        self.assertEqual(data.force_upper_n, 200.0)
+        self.assertEqual(data.raw_data, "DTA;100;150;250;10;750;2000;5;600;0;!")
+        self.assertEqual(data.to_dict()['Timestamp'], "2026-03-01 12:30:15.123")
+    
+    def test_to_dict_matches_parsed_fields(self):
+        """Test the CSV dictionary of a parsed line"""
+        raw = "END;31422;182;263;-5;793;2238;44;611;11;!"
+        row = DataParser().parse(raw).to_dict()
+        
+        self.assertEqual(row['Status'], "END")
+        self.assertEqual(row['Force_Lower_N'], 26.3)
+        self.assertEqual(row['Travel_1_mm'], -0.05)
+        self.assertEqual(row['Loss_of_Stiffness_Percent'], (0.44 / 6.11) * 100.0)
+        self.assertEqual(row['Raw_Data'], raw)
+        self.assertEqual(len(row['Timestamp']), len("2026-03-01 12:30:15.123"))
+    
+    def test_from_scaled_equals_parse(self):
+        """Test that from_scaled builds the same record as parse()"""
+        parsed = DataParser().parse("DTA;7;1;2;3;4;5;6;7;0;!")
+        built = FatigueTestData.from_scaled(parsed.timestamp_ns, "DTA", 7, 1, 2, 3, 4, 5, 6, 7, 0)
+        self.assertEqual(parsed, built)
+
+
+class TestParseFrame(unittest.TestCase):
+    """Test cases for the fused DataParser.parse_frame"""
+    
+    def setUp(self):
+        """Create a fresh parser for each test"""
+        self.parser = DataParser()
+    
+    def test_valid_frame(self):
+        """Test a plain data frame from bytes"""
+        data, frame_class = self.parser.parse_frame(b"DTA;31422;182;263;0;793;2238;0;611;0;!\r\n")
+        
+        self.assertEqual(frame_class, FRAME_VALID)
+        self.assertEqual(data.cycles, 31422)
+        self.assertEqual(data.force_lower_n, 26.3)
+    
+    def test_memoryview_and_str(self):
+        """Test that memoryview and str frames give the same record"""
+        raw = "DTA;1;182;263;0;793;2238;0;611;0;!"
+        from_view, _ = self.parser.parse_frame(memoryview(raw.encode()))
+        from_str, _ = self.parser.parse_frame(raw)
+        self.assertEqual(from_view.to_record()[1:], from_str.to_record()[1:])
+    
+    def test_classification(self):
+        """Test END, error code and validation flags"""
+        cases = {
+            "END;100;182;263;0;793;2238;0;611;0;!": FRAME_TEST_END,
+            "DTA;100;182;263;0;793;2238;0;611;11;!": FRAME_ERROR_CODE,
+            "END;100;182;263;0;793;2238;0;611;12;!": FRAME_TEST_END | FRAME_ERROR_CODE,
+            "DTA;-1;182;263;0;793;2238;0;611;0;!": FRAME_INVALID,
+            "XYZ;100;182;263;0;793;2238;0;611;0;!": FRAME_INVALID,
+            " DTA ;100;182;263;0;793;2238;0;611;0;!": FRAME_VALID,
+        }
+        for raw, expected in cases.items():
+            data, frame_class = self.parser.parse_frame(raw.encode())
+            self.assertEqual(frame_class, expected, raw)
+            self.assertEqual(self.parser.validate_data(data)[0], not expected & FRAME_INVALID, raw)
+    
+    def test_out_of_range_matches_parse_batch(self):
+        """Test that values too large for their fixed-point column are invalid in both parsers"""
+        frames = [
+            "DTA;100;182;263;0;793;2238;0;611;99999;!",
+            "DTA;101;99999999999;263;0;793;2238;0;611;0;!",
+            "DTA;102;182;263;0;793;2238;0;611;32767;!",
+        ]
+        classes = [self.parser.parse_frame(frame.encode())[1] for frame in frames]
+        _, rejected = self.parser.parse_batch(frames)
+        
+        self.assertEqual(classes, [FRAME_INVALID | FRAME_ERROR_CODE, FRAME_INVALID, FRAME_ERROR_CODE])
+        self.assertEqual([bool(frame_class & FRAME_INVALID) for frame_class in classes], rejected.tolist())
+        data, _ = self.parser.parse_frame(frames[0].encode())
+        self.assertEqual(self.parser.validate_data(data), (False, "Value out of range: Error_Code"))
+    
+    def test_malformed(self):
+        """Test that unparseable frames return no record and count as errors"""
+        for raw in (b"garbage", b"DTA;1;2;3;!", b"DTA;1;18x;263;0;793;2238;0;611;0;!"):
+            self.assertEqual(self.parser.parse_frame(raw), (None, FRAME_MALFORMED))
+        self.assertEqual(self.parser.parse_errors, 3)
+
+
+class TestParseBatch(unittest.TestCase):
+    """Test cases for the vectorized DataParser.parse_batch"""
+    
+    LINES = [
+        "DTA;1;182;263;0;793;2238;0;611;0;!",
+        "DTA;2;-182;263;0;793;-2238;0;611;11;!",
+        "END;3;182;263;0;793;2238;0;611;0;",
+        " DTA;4;182;263;0;793;2238;0;611;0; ! ",
+        "garbage",
+        "DTA;5;182;263;0;793;2238;0;611;!",
+        "DTA;6;182;263;0;793;2238;0;611;0;1;!",
+        "DTA;7;18x;263;0;793;2238;0;611;0;!",
+        "DTA;8;1-2;263;0;793;2238;0;611;0;!",
+        "XYZ;9;182;263;0;793;2238;0;611;0;!",
+        "DTA;-10;182;263;0;793;2238;0;611;0;!",
+        "DTA;11;99999999999;263;0;793;2238;0;611;0;!",
+        "",
+    ]
+    
+    def setUp(self):
+        """Create a fresh parser for each test"""
+        self.parser = DataParser()
+    
+    def expected(self, lines):
+        """Records and rejected mask from the single-line path"""
+        records, rejected = [], []
+        for line in lines:
+            data = self.parser.parse(line)
+            ok = data is not None and self.parser.validate_data(data)[0]
+            if ok:
+                record = data.to_record()
+                # Values must fit their fixed-point column
+                ok = all(np.iinfo(RECORD_DTYPE[name]).min <= value <= np.iinfo(RECORD_DTYPE[name]).max
+                         for name, value in zip(RECORD_DTYPE.names[2:], record[2:]))
+            rejected.append(not ok)
+            if ok:
+                records.append(record[1:])
+        return records, rejected
+    
+    def test_matches_single_line_path(self):
+        """Test that accepted records and rejections match parse()/validate_data()"""
+        records, rejected = self.parser.parse_batch(self.LINES)
+        expected_records, expected_rejected = self.expected(self.LINES)
+        
+        self.assertEqual(rejected.tolist(), expected_rejected)
+        self.assertEqual([tuple(record.tolist()[1:]) for record in records], expected_records)
+    
+    def test_field_values(self):
+        """Test conversion of a well-formed line to fixed-point integers"""
+        records, rejected = self.parser.parse_batch(["DTA;31422;182;263;-5;793;2238;0;611;11;!"])
+        
+        self.assertFalse(rejected[0])
+        self.assertEqual(records.dtype, RECORD_DTYPE)
+        self.assertEqual(records[0].tolist()[1:], (0, 31422, 182, 263, -5, 793, 2238, 0, 611, 11))
+    
+    def test_bytes_block_input(self):
+        """Test that a raw capture block gives the same result as a list of lines"""
+        block = "\r\n".join(self.LINES[:4]).encode('utf-8')
+        records, rejected = self.parser.parse_batch(block)
+        expected_records, _ = self.parser.parse_batch(self.LINES[:4])
+        
+        self.assertFalse(rejected.any())
+        self.assertEqual(records[['Status', 'Cycles', 'Force_Lower_N']].tolist(),
+                         expected_records[['Status', 'Cycles', 'Force_Lower_N']].tolist())
+    
+    def test_empty_input(self):
+        """Test that empty input gives empty results"""
+        records, rejected = self.parser.parse_batch([])
+        self.assertEqual(len(records), 0)
+        self.assertEqual(len(rejected), 0)
+        self.assertEqual(len(self.parser.parse_batch(b"")[0]), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
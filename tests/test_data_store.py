@@ -0,0 +1,113 @@
+# tests/test_data_store.py
+"""
+Unit tests for data_store module
+Tests the bounded-memory column store and DataFrame export
+"""
+
+import unittest
+import numpy as np
+
+import pandas as pd
+
+from data_parser import DataParser
+from data_store import ColumnStore, GrowableColumn, CSV_COLUMNS, columns_to_dataframe
+from sample_data_generator import generate_sample_data
+
+
+class TestColumnStore(unittest.TestCase):
+    """Test cases for ColumnStore class"""
+    
+    def setUp(self):
+        parser = DataParser()
+        self.records = [parser.parse(line) for line in generate_sample_data(250, with_errors=True)]
+    
+    def test_append_and_length(self):
+        """Test that appended records are counted"""
+        store = ColumnStore(chunk_rows=100)
+        store.append(self.records[0])
+        store.extend(self.records[1:])
+        
+        self.assertEqual(len(store), 250)
+        self.assertEqual(store.spilled_rows, 0)
+    
+    def test_columns_in_order(self):
+        """Test that columns return every record in arrival order"""
+        store = ColumnStore(chunk_rows=64)
+        store.extend(self.records)
+        
+        columns = store.columns()
+        self.assertEqual(list(columns['Cycles']), [data.cycles for data in self.records])
+        self.assertEqual(columns['Force_Upper_N'][5], round(self.records[5].force_upper_n * 10))
+    
+    def test_spill_to_disk(self):
+        """Test that old chunks leave memory once over the limit"""
+        store = ColumnStore(chunk_rows=50, memory_limit_mb=0.005)
+        store.extend(self.records)
+        
+        self.assertGreater(store.spilled_rows, 0)
+        self.assertLessEqual(store.memory_bytes, 2 * 0.005 * 1024 * 1024)
+        
+        # Spilled rows come back on export
+        columns = store.columns()
+        self.assertEqual(list(columns['Cycles']), [data.cycles for data in self.records])
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_records_include_spilled(self):
+        """Test that records() returns every record, spilled ones included"""
+        store = ColumnStore(chunk_rows=50, memory_limit_mb=0.005)
+        store.extend(self.records)
+
+        records = store.records()
+        self.assertGreater(store.spilled_rows, 0)
+        self.assertEqual(records.tolist(), [data.to_record() for data in self.records])
+
+    def test_dataframe_matches_to_dict(self):
+        """Test that the export matches the per-record CSV conversion"""
+        store = ColumnStore(chunk_rows=64, memory_limit_mb=0.005)
+        store.extend(self.records)
+        
+        frame = columns_to_dataframe(store.columns())
+        expected = pd.DataFrame([data.to_dict() for data in self.records])
+        
+        self.assertEqual(list(frame.columns), CSV_COLUMNS)
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+
+
+class TestGrowableColumn(unittest.TestCase):
+    """Test cases for GrowableColumn class"""
+
+    def test_append_and_extend(self):
+        """Test that values are kept in order across growth"""
+        column = GrowableColumn(capacity=4)
+        column.append(1.0)
+        column.extend([2.0, 3.0, 4.0, 5.0])
+
+        self.assertEqual(len(column), 5)
+        self.assertEqual(column.capacity, 8)
+        np.testing.assert_array_equal(column.view(), [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    def test_view_is_zero_copy(self):
+        """Test that view() shares memory with the buffer"""
+        column = GrowableColumn(np.int64, capacity=16)
+        column.extend(np.arange(10))
+
+        self.assertTrue(np.shares_memory(column.view(), column.view()))
+        self.assertFalse(column.view().flags.owndata)
+
+    def test_old_views_survive_growth_and_clear(self):
+        """Test that earlier views are not modified by later appends"""
+        column = GrowableColumn(capacity=2)
+        column.extend([1.0, 2.0])
+        view = column.view()
+
+        column.extend([3.0, 4.0, 5.0])
+        column.clear()
+        column.extend([9.0, 9.0])
+
+        np.testing.assert_array_equal(view, [1.0, 2.0])
+        np.testing.assert_array_equal(column.view(), [9.0, 9.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_decimation.py
+"""
+Unit tests for decimation module
+Tests the incremental min/max pyramid used for plot level-of-detail
+"""
+
+import unittest
+import numpy as np
+
+from decimation import MinMaxPyramid
+
+
+class TestMinMaxPyramid(unittest.TestCase):
+    """Test cases for MinMaxPyramid class"""
+
+    def setUp(self):
+        """Random curve with two spikes, appended in uneven batches"""
+        rng = np.random.default_rng(42)
+        self.values = rng.normal(size=200003)
+        self.values[123457] = 50.0
+        self.values[7] = -50.0
+
+        self.pyramid = MinMaxPyramid(base=16, factor=4)
+        for start in range(0, len(self.values), 997):
+            self.pyramid.append(self.values[start:start + 997])
+
+    def test_levels_match_full_recomputation(self):
+        """Test that incremental blocks equal min/max over the raw samples"""
+        self.assertEqual(len(self.pyramid), len(self.values))
+        for level in range(self.pyramid.levels):
+            blocks = self.pyramid.level_blocks(level)
+            size = self.pyramid.block_size(level)
+            raw = self.values[:len(blocks) * size].reshape(len(blocks), size)
+
+            np.testing.assert_array_equal(blocks['min_value'], raw.min(axis=1))
+            np.testing.assert_array_equal(blocks['max_value'], raw.max(axis=1))
+            np.testing.assert_array_equal(self.values[blocks['max_index']], blocks['max_value'])
+
+    def test_point_budget(self):
+        """Test that a query returns about the requested number of points"""
+        indices = self.pyramid.indices(2000)
+
+        self.assertGreaterEqual(len(indices), 1000)
+        self.assertLessEqual(len(indices), 4200)
+        self.assertTrue(np.all(np.diff(indices) >= 0))
+
+    def test_spikes_kept(self):
+        """Test that extremes survive decimation"""
+        indices = self.pyramid.indices(500)
+
+        self.assertIn(123457, indices)
+        self.assertIn(7, indices)
+        self.assertEqual(self.values[indices].max(), self.values.max())
+        self.assertEqual(self.values[indices].min(), self.values.min())
+
+    def test_range_query(self):
+        """Test that a sub-range query stays inside the range"""
+        indices = self.pyramid.indices(1000, start=100000, stop=150000)
+
+        self.assertGreaterEqual(indices[0], 100000)
+        self.assertLess(indices[-1], 150000)
+        self.assertIn(123457, indices)
+        self.assertEqual(self.values[indices].max(), self.values[100000:150000].max())
+
+    def test_short_range_returned_in_full(self):
+        """Test that ranges within the budget are not decimated"""
+        np.testing.assert_array_equal(self.pyramid.indices(1000, start=10, stop=500),
+                                      np.arange(10, 500))
+
+    def test_clear(self):
+        """Test that clear removes all samples and levels"""
+        self.pyramid.clear()
+        self.assertEqual(len(self.pyramid), 0)
+        self.assertEqual(self.pyramid.levels, 0)
+        self.assertEqual(len(self.pyramid.indices(100)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
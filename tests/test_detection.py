@@ -0,0 +1,204 @@
+# tests/test_detection.py
+"""
+Unit tests for detection module
+Tests the streaming detectors, batch independence and the detector stage
+"""
+
+import unittest
+import numpy as np
+
+from config import DetectionConfig
+from data_parser import FatigueTestData, RECORD_DTYPE
+from detection import (CusumDetector, DetectorStage, EwmaDetector, RateOfChangeDetector,
+                       ThresholdDetector, build_detector)
+
+
+def run_in_batches(detector, cycles, values, size):
+    """Feed a detector in batches of the given size"""
+    detections = []
+    for start in range(0, len(values), size):
+        detections.extend(detector.update(cycles[start:start + size], values[start:start + size]))
+    return detections
+
+
+class TestThresholdDetector(unittest.TestCase):
+    """Test cases for ThresholdDetector class"""
+
+    def test_one_event_per_excursion(self):
+        """Test that an excursion is reported once, also across batches"""
+        detector = ThresholdDetector('force_upper', low=0.0, high=10.0)
+        cycles = np.arange(1, 11)
+        values = np.array([1, 11, 12, 5, 5, -1, -2, 3, 15, 15], dtype=float)
+
+        detections = run_in_batches(detector, cycles, values, 3)
+        self.assertEqual([d.cycles for d in detections], [2, 6, 9])
+        self.assertIn("above", detections[0].message)
+        self.assertIn("below", detections[1].message)
+        self.assertEqual(detections[0].value, 11.0)
+
+
+class TestRateOfChangeDetector(unittest.TestCase):
+    """Test cases for RateOfChangeDetector class"""
+
+    def test_rate_per_cycle_across_batches(self):
+        """Test that steps are divided by the cycle gap, including the batch boundary"""
+        detector = RateOfChangeDetector('loss_of_stiffness', max_rate=1.0)
+        cycles = np.array([1, 2, 3, 13, 14, 15])
+        values = np.array([0.0, 0.5, 1.0, 6.0, 9.0, 9.5])
+
+        detections = detector.update(cycles[:3], values[:3]) + detector.update(cycles[3:], values[3:])
+        self.assertEqual([d.cycles for d in detections], [14])
+
+
+class TestCusumDetector(unittest.TestCase):
+    """Test cases for CusumDetector class"""
+
+    def reference(self, z, k, h, warmup):
+        """Scalar two-sided CUSUM that learns a new mean from warmup records after an alarm"""
+        upper = lower = mean = 0.0
+        baseline = None
+        alarms = []
+        for index, value in enumerate(z):
+            if baseline is not None:
+                baseline.append(value)
+                if len(baseline) == warmup:
+                    mean = float(np.mean(baseline))
+                    baseline = None
+                continue
+            upper = max(0.0, upper + value - mean - k)
+            lower = max(0.0, lower - value + mean - k)
+            if upper > h or lower > h:
+                alarms.append(index)
+                upper = lower = 0.0
+                baseline = []
+        return alarms
+
+    def test_matches_scalar_recursion(self):
+        """Test that the vectorized recursion equals the record-by-record one"""
+        rng = np.random.default_rng(1)
+        values = np.concatenate([rng.normal(0, 1, 3000), rng.normal(1.5, 1, 500),
+                                 rng.normal(-1.0, 1, 500)])
+        cycles = np.arange(len(values))
+        expected = self.reference(values, 0.5, 5.0, 100)
+        self.assertGreater(len(expected), 2)
+
+        for size in (1, 7, 1000, len(values)):
+            detector = CusumDetector('force_upper', k=0.5, h=5.0, warmup=100, target=0.0, sigma=1.0)
+            detections = run_in_batches(detector, cycles, values, size)
+            self.assertEqual([d.cycles for d in detections], expected, size)
+
+    def test_warmup_baseline(self):
+        """Test that target and sigma are learned and a step is detected"""
+        rng = np.random.default_rng(2)
+        values = np.concatenate([rng.normal(220, 5, 2000), rng.normal(235, 5, 200)])
+        detector = CusumDetector('force_upper', warmup=1000)
+
+        detections = run_in_batches(detector, np.arange(len(values)), values, 64)
+        self.assertAlmostEqual(detector._mean, 220, delta=1.0)
+        self.assertAlmostEqual(detector._std, 5, delta=0.6)
+        self.assertTrue(detections)
+        self.assertGreaterEqual(detections[0].cycles, 2000)
+        self.assertLess(detections[0].cycles, 2020)
+        self.assertIn("upward", detections[0].message)
+
+    def test_persistent_step_detected_once(self):
+        """Test that a lasting level shift is reported once and becomes the new baseline"""
+        rng = np.random.default_rng(5)
+        values = np.concatenate([rng.normal(40.0, 0.5, 2000), rng.normal(30.0, 0.5, 20000)])
+        detector = CusumDetector('loss_of_stiffness', warmup=1000)
+
+        detections = run_in_batches(detector, np.arange(len(values)), values, 500)
+        self.assertEqual(len(detections), 1)
+        self.assertIn("downward", detections[0].message)
+        self.assertAlmostEqual(detector._mean, 30.0, delta=0.1)
+
+        # A further shift from the new level is detected again
+        detections = detector.update(np.arange(22000, 22100), rng.normal(20.0, 0.5, 100))
+        self.assertEqual(len(detections), 1)
+
+
+class TestEwmaDetector(unittest.TestCase):
+    """Test cases for EwmaDetector class"""
+
+    def test_matches_scalar_recursion(self):
+        """Test that the closed form equals the recursion over long batches"""
+        rng = np.random.default_rng(3)
+        values = rng.normal(0, 1, 20000) + np.linspace(0, 3, 20000)
+        detector = EwmaDetector('travel_at_upper', alpha=0.05, target=0.0, sigma=1.0)
+        smoothed = detector._smooth(values.copy())
+
+        average = 0.0
+        expected = np.empty_like(values)
+        for index, value in enumerate(values):
+            average = 0.95 * average + 0.05 * value
+            expected[index] = average
+        np.testing.assert_allclose(smoothed, expected, rtol=1e-9, atol=1e-9)
+
+    def test_drift_detected_once(self):
+        """Test that a drift raises one event while the average stays out"""
+        rng = np.random.default_rng(4)
+        values = np.concatenate([rng.normal(6.1, 0.02, 5000), rng.normal(6.2, 0.02, 2000)])
+        detector = EwmaDetector('travel_at_upper', alpha=0.1, limit_sigma=5.0)
+
+        detections = run_in_batches(detector, np.arange(len(values)), values, 100)
+        self.assertEqual(len(detections), 1)
+        self.assertGreaterEqual(detections[0].cycles, 5000)
+
+
+class TestDetectorStage(unittest.TestCase):
+    """Test cases for DetectorStage class"""
+
+    def make_batch(self, first_cycle, count, travel_2=150):
+        return [FatigueTestData.from_scaled(0, "DTA", cycle, 100, 250, 50, 200, 2200,
+                                            travel_2, 600, 0)
+                for cycle in range(first_cycle, first_cycle + count)]
+
+    def test_columns_from_records(self):
+        """Test that the stage scales fields and computes the loss of stiffness"""
+        stage = DetectorStage([ThresholdDetector('loss_of_stiffness', high=30.0),
+                               ThresholdDetector('force_upper', high=200.0)])
+        batch = self.make_batch(1, 10) + self.make_batch(11, 5, travel_2=200)
+
+        detections = stage.process(batch)
+        self.assertEqual([(d.column, d.cycles) for d in detections],
+                         [('loss_of_stiffness', 11), ('force_upper', 1)])
+        self.assertAlmostEqual(detections[0].value, batch[10].calculate_loss_of_stiffness())
+        self.assertAlmostEqual(detections[1].value, batch[0].force_upper_n)
+        self.assertEqual(stage.records_processed, 15)
+        self.assertEqual(stage.detections_found, 2)
+
+    def test_fixed_point_records(self):
+        """Test that RECORD_DTYPE arrays give the same detections as record objects"""
+        def detectors():
+            return [ThresholdDetector('loss_of_stiffness', high=30.0), ThresholdDetector('force_upper', high=200.0)]
+
+        batch = self.make_batch(1, 10) + self.make_batch(11, 5, travel_2=200)
+        records = np.array([data.to_record() for data in batch], dtype=RECORD_DTYPE)
+
+        self.assertEqual(DetectorStage(detectors()).process_records(records),
+                         DetectorStage(detectors()).process(batch))
+
+    def test_new_test_resets_detectors(self):
+        """Test that a decreasing cycle count starts the detectors over"""
+        stage = DetectorStage([ThresholdDetector('force_upper', high=200.0)])
+        self.assertEqual(len(stage.process(self.make_batch(1, 10))), 1)
+        self.assertEqual(len(stage.process(self.make_batch(11, 10))), 0)
+        self.assertEqual(len(stage.process(self.make_batch(1, 10))), 1)
+
+    def test_from_config(self):
+        """Test that the default configuration builds every detector type"""
+        stage = DetectorStage.from_config(DetectionConfig())
+        kinds = {type(detector) for detector in stage.detectors}
+        self.assertEqual(kinds, {CusumDetector, EwmaDetector, RateOfChangeDetector, ThresholdDetector})
+        self.assertEqual(stage.process(self.make_batch(1, 50)), [])
+
+    def test_invalid_specs(self):
+        """Test that unknown types and columns are rejected"""
+        with self.assertRaises(ValueError):
+            build_detector({'type': 'fft', 'column': 'force_upper'})
+        with self.assertRaises(ValueError):
+            build_detector({'type': 'threshold', 'column': 'temperature', 'high': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
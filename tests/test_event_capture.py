@@ -0,0 +1,155 @@
+# tests/test_event_capture.py
+"""
+Unit tests for event_capture module
+Tests the record ring buffer, pre/post-trigger windows and decimated logging
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import numpy as np
+
+from config import LogConfig
+from data_logger import DataLogger
+from data_parser import FatigueTestData, RECORD_DTYPE
+from binary_log import read_binary_log
+from event_capture import EventCapture, RecordRing
+
+
+def make_records(first_cycle: int, count: int, error_at=(), error_code: int = 11) -> np.ndarray:
+    """Records one per cycle, 10 ms apart, with error codes at the given cycles"""
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['Cycles'] = np.arange(first_cycle, first_cycle + count)
+    records['Timestamp_ns'] = records['Cycles'] * 10_000_000
+    records['Travel_at_Upper_mm'] = 600
+    for cycle in error_at:
+        records['Error_Code'][cycle - first_cycle] = error_code
+    return records
+
+
+class TestRecordRing(unittest.TestCase):
+    """Test cases for RecordRing class"""
+
+    def test_wraps_around(self):
+        """Test that the newest records are kept in order"""
+        ring = RecordRing(10)
+        ring.extend(make_records(1, 4))
+        ring.extend(make_records(5, 9))
+        self.assertEqual(len(ring), 10)
+        np.testing.assert_array_equal(ring.ordered()['Cycles'], np.arange(4, 14))
+
+        ring.extend(make_records(14, 25))
+        np.testing.assert_array_equal(ring.ordered()['Cycles'], np.arange(29, 39))
+
+
+class TestEventCapture(unittest.TestCase):
+    """Test cases for EventCapture class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.messages = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_capture(self, **settings) -> EventCapture:
+        config = LogConfig(log_format="binary", event_window_unit="cycles",
+                           event_pre_trigger=100, event_post_trigger=50, **settings)
+        capture = EventCapture(config, on_event=self.messages.append)
+        capture.start(Path(self.temp_dir) / "test.ftb")
+        return capture
+
+    def test_pre_and_post_window(self):
+        """Test that an event holds the window around the trigger, across batches"""
+        capture = self.make_capture()
+        records = make_records(1, 2000, error_at=[1000])
+        for start in range(0, 2000, 64):
+            capture.process(records[start:start + 64])
+
+        self.assertEqual(len(capture.events), 1)
+        event = capture.events[0]
+        self.assertEqual((event.cycles, event.rows, event.triggers), (1000, 151, 1))
+        self.assertIn("E11", event.reason)
+        cycles = read_binary_log(event.path)['Cycles']
+        np.testing.assert_array_equal(cycles, np.arange(900, 1051))
+        self.assertIn("cycle1000", Path(event.path).name)
+        self.assertEqual(len(self.messages), 1)
+
+    def test_triggers_merged_inside_window(self):
+        """Test that triggers during the post-trigger window extend no new event"""
+        capture = self.make_capture()
+        capture.process(make_records(1, 3000, error_at=[1000, 1020, 1050, 1051, 2980]))
+
+        self.assertEqual([(e.cycles, e.triggers) for e in capture.events], [(1000, 3), (1051, 1)])
+        # Still collecting; written as is when finished
+        capture.finish()
+        self.assertEqual((capture.events[-1].cycles, capture.events[-1].rows), (2980, 101 + 20))
+
+    def test_pre_window_limited_by_ring(self):
+        """Test that the pre-trigger window never exceeds the ring size"""
+        capture = self.make_capture(event_buffer_rows=30)
+        capture.process(make_records(1, 500))
+        capture.process(make_records(501, 200, error_at=[550]))
+
+        self.assertEqual(capture.events[0].rows, 30 + 50)
+
+    def test_manual_trigger_in_seconds(self):
+        """Test a user trigger with a window measured in seconds"""
+        config = LogConfig(log_format="csv", event_pre_trigger=0.5, event_post_trigger=0.2)
+        capture = EventCapture(config)
+        capture.start(Path(self.temp_dir) / "test.csv")
+        capture.process(make_records(1, 300))
+        capture.trigger("Manual trigger")
+        capture.process(make_records(301, 100))
+
+        event = capture.events[0]
+        self.assertEqual(event.reason, "Manual trigger")
+        # 50 records before the trigger at 10 ms spacing, plus the trigger and 20 after
+        self.assertEqual(event.rows, 71)
+        self.assertTrue(event.path.endswith(".csv"))
+        self.assertEqual(len(Path(event.path).read_text().splitlines()), 72)
+
+    def test_max_files(self):
+        """Test that events beyond the file limit are only counted"""
+        capture = self.make_capture(event_max_files=1)
+        capture.process(make_records(1, 1000, error_at=[200, 600]))
+        self.assertEqual((len(capture.events), capture.events_skipped), (1, 1))
+
+
+class TestDecimatedLogging(unittest.TestCase):
+    """Test cases for decimated logging with event files in DataLogger"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_decimation_with_events(self):
+        """Test that the log is decimated while the event file has full resolution"""
+        config = LogConfig(log_format="binary", log_every_cycles=100, event_window_unit="cycles",
+                           event_pre_trigger=20, event_post_trigger=20, background_writer=True)
+        logger = DataLogger(config, output_dir=self.temp_dir)
+        path = logger.start_new_log()
+        batch = [FatigueTestData.from_scaled(cycle * 1000, "DTA", cycle, 1, 2, 3, 4, 5, 6, 600,
+                                             12 if cycle == 2555 else 0)
+                 for cycle in range(1, 5001)]
+        for start in range(0, 5000, 250):
+            logger.log_batch(batch[start:start + 250])
+        logger.close_log()
+
+        # First record of every 100 cycles, plus the error record
+        cycles = read_binary_log(path)['Cycles']
+        self.assertEqual(cycles.tolist(), sorted({1, 2555} | set(range(100, 5001, 100))))
+        stats = logger.get_statistics()
+        self.assertEqual(stats['points_decimated'], 5000 - len(cycles))
+        self.assertEqual(stats['events_captured'], 1)
+
+        event_file = Path(self.temp_dir) / "events" / f"{Path(path).stem}_event001_cycle2555.ftb"
+        np.testing.assert_array_equal(read_binary_log(event_file)['Cycles'], np.arange(2535, 2576))
+        self.assertNotIn(event_file.name, logger.get_log_files())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+# tests/test_fanout.py
+"""
+Unit tests for fanout module
+Tests per-consumer queues, overflow policies, metrics and isolation
+"""
+
+import threading
+import time
+import unittest
+
+from fanout import FanOut, Consumer, OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DECIMATE
+
+
+class Gate:
+    """Handler that records what it gets and can be held closed"""
+
+    def __init__(self):
+        self.open = threading.Event()
+        self.open.set()
+        self.received = []
+        self.calls = 0
+
+    def __call__(self, records):
+        self.open.wait(5)
+        self.calls += 1
+        self.received.extend(records)
+
+
+class TestConsumer(unittest.TestCase):
+    """Test cases for Consumer class"""
+
+    def test_unknown_policy(self):
+        """Test that an unknown overflow policy is rejected"""
+        with self.assertRaises(ValueError):
+            Consumer("x", print, overflow="drop_newest")
+
+    def test_waiting_batches_joined(self):
+        """Test that batches waiting while the handler is busy arrive in one call, in order"""
+        gate = Gate()
+        consumer = Consumer("logger", gate)
+        consumer.start()
+        gate.open.clear()
+        consumer.offer([0])
+        time.sleep(0.02)  # The handler now holds [0]
+        for value in range(1, 10):
+            consumer.offer([value])
+        time.sleep(0.05)
+        gate.open.set()
+        consumer.stop()
+
+        self.assertEqual(gate.received, list(range(10)))
+        self.assertEqual(gate.calls, 2)
+        statistics = consumer.get_statistics()
+        self.assertEqual((statistics['records_delivered'], statistics['records_dropped']), (10, 0))
+        self.assertGreaterEqual(statistics['lag_ms_max'], 40)
+
+    def test_drop_oldest(self):
+        """Test that a full drop_oldest queue discards its oldest batches"""
+        gate = Gate()
+        consumer = Consumer("plotter", gate, OVERFLOW_DROP_OLDEST, max_pending=3)
+        for value in range(6):
+            consumer.offer([value, value])
+        consumer.start()
+        consumer.stop()
+
+        self.assertEqual(gate.received, [3, 3, 4, 4, 5, 5])
+        self.assertEqual(consumer.get_statistics()['records_dropped'], 6)
+
+    def test_decimate_keeps_marked_records(self):
+        """Test that decimate thins the backlog but keeps the whole span and kept records"""
+        gate = Gate()
+        consumer = Consumer("plotter", gate, OVERFLOW_DECIMATE, max_pending=2, keep=lambda value: value == 7)
+        consumer.offer([0, 1, 2, 3])
+        consumer.offer([4, 5, 6, 7])
+        consumer.offer([8, 9, 10, 11])
+        consumer.start()
+        consumer.stop()
+
+        self.assertEqual(gate.received, [0, 2, 4, 6, 7, 8, 10])
+        statistics = consumer.get_statistics()
+        self.assertEqual((statistics['records_delivered'], statistics['records_dropped']), (7, 5))
+        self.assertEqual(statistics['peak_pending_batches'], 2)
+
+    def test_block_holds_producer(self):
+        """Test that a full block queue makes the producer wait and loses nothing"""
+        gate = Gate()
+        gate.open.clear()
+        consumer = Consumer("logger", gate, OVERFLOW_BLOCK, max_pending=2)
+        consumer.start()
+        producer = threading.Thread(target=lambda: [consumer.offer([value]) for value in range(5)])
+        producer.start()
+        time.sleep(0.1)
+        self.assertTrue(producer.is_alive())
+
+        gate.open.set()
+        producer.join(timeout=5)
+        consumer.stop()
+        self.assertEqual(gate.received, list(range(5)))
+        statistics = consumer.get_statistics()
+        self.assertEqual(statistics['records_dropped'], 0)
+        self.assertGreater(statistics['producer_wait_ms'], 50)
+
+    def test_call_runs_in_order(self):
+        """Test that call() runs on the consumer thread after the batches queued before it"""
+        seen = []
+        consumer = Consumer("logger", lambda records: seen.extend(records))
+        consumer.start()
+        consumer.offer([1, 2])
+        result = consumer.call(lambda: (list(seen), threading.current_thread().name))
+        consumer.stop()
+
+        self.assertEqual(result, ([1, 2], "Consumer-logger"))
+        with self.assertRaises(ZeroDivisionError):
+            consumer.call(lambda: 1 / 0)
+
+    def test_stop_timeout_keeps_order(self):
+        """Test that a consumer still busy after stop() runs later calls after its batches"""
+        gate = Gate()
+        gate.open.clear()
+        consumer = Consumer("logger", gate)
+        consumer.start()
+        consumer.offer([1])
+        consumer.offer([2])
+        self.assertFalse(consumer.stop(timeout=0.05))
+        self.assertTrue(consumer.is_running)
+
+        closed = []
+        with self.assertRaises(TimeoutError):
+            consumer.call(lambda: closed.append(list(gate.received)), timeout=0.05)
+        gate.open.set()
+        self.assertTrue(consumer.stop(timeout=5))
+        self.assertFalse(consumer.is_running)
+
+        # The call still ran, on the consumer thread, after the batches
+        self.assertEqual(closed, [[1, 2]])
+        self.assertEqual(consumer.call(lambda: threading.current_thread().name), threading.current_thread().name)
+
+    def test_handler_error_reported(self):
+        """Test that a failing handler is counted and reported, and the consumer keeps going"""
+        messages = []
+
+        def handler(records):
+            if records == [0]:
+                raise RuntimeError("disk full")
+
+        consumer = Consumer("logger", handler, error_callback=messages.append)
+        consumer.start()
+        consumer.offer([0])
+        consumer.call(lambda: None)
+        consumer.offer([1])
+        consumer.stop()
+
+        self.assertEqual(messages, ["logger consumer error: disk full"])
+        statistics = consumer.get_statistics()
+        self.assertEqual((statistics['handler_errors'], statistics['records_delivered']), (1, 2))
+
+
+class TestFanOut(unittest.TestCase):
+    """Test cases for FanOut class"""
+
+    def test_every_consumer_gets_every_batch(self):
+        """Test delivery to all consumers, including one registered while running"""
+        fanout = FanOut()
+        first = Gate()
+        fanout.register('first', first)
+        fanout.start()
+        fanout.publish([1])
+        second = Gate()
+        fanout.register('second', second)
+        fanout.publish([2])
+        fanout.stop()
+
+        self.assertEqual(first.received, [1, 2])
+        self.assertEqual(second.received, [2])
+        self.assertEqual(set(fanout.get_statistics()), {'first', 'second'})
+        with self.assertRaises(ValueError):
+            fanout.register('first', first)
+
+    def test_slow_consumer_isolated(self):
+        """Test that a stalled consumer neither delays nor starves a fast one"""
+        fanout = FanOut()
+        fast = Gate()
+        slow = Gate()
+        slow.open.clear()
+        fanout.register('logger', fast, OVERFLOW_BLOCK, max_pending=4)
+        fanout.register('plotter', slow, OVERFLOW_DROP_OLDEST, max_pending=4)
+        fanout.start()
+
+        for value in range(100):
+            fanout.publish([value])
+            time.sleep(0.001)
+        fanout.get('logger').call(lambda: None)
+        self.assertEqual(fast.received, list(range(100)))
+        self.assertLess(fanout.get_statistics()['logger']['lag_ms_max'], 100)
+
+        self.assertEqual(fanout.stop(timeout=0.05), ['plotter'])
+        slow.open.set()
+        self.assertEqual(fanout.stop(), [])
+        statistics = fanout.get_statistics()
+        self.assertGreater(statistics['plotter']['records_dropped'], 0)
+        self.assertEqual(len(slow.received) + statistics['plotter']['records_dropped'], 100)
+        self.assertEqual(slow.received[-1], 99)
+
+    def test_unregister(self):
+        """Test that an unregistered consumer gets no further batches"""
+        fanout = FanOut()
+        gate = Gate()
+        fanout.register('detectors', gate)
+        fanout.start()
+        fanout.publish([1])
+        fanout.unregister('detectors')
+        fanout.publish([2])
+        fanout.stop()
+
+        self.assertEqual(gate.received, [1])
+        self.assertIsNone(fanout.get('detectors'))
+
+
+if __name__ == '__main__':
+    unittest.main()
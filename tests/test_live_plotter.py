@@ -0,0 +1,63 @@
+# tests/test_live_plotter.py
+"""
+Unit tests for live_plotter module
+Tests redraw scheduling of the plots (offscreen Qt platform)
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pyqtgraph as pg
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from config import PlotConfig
+from data_parser import FatigueTestData
+from live_plotter import LivePlotter
+
+
+def setUpModule():
+    global app
+    app = QApplication.instance() or QApplication([])
+
+
+class TestZoomRedraw(unittest.TestCase):
+    """Test cases for re-decimation after zooming and panning"""
+
+    def setUp(self):
+        self.plotter = LivePlotter(PlotConfig(zoom_redraw_delay_ms=150, auto_range=False))
+        self.widget = pg.GraphicsLayoutWidget()
+        self.plotter.setup_plots(self.widget)
+        self.plotter.add_batch([FatigueTestData.from_scaled(0, "DTA", cycle, 0, 500, 300, 11, 400, 200, 150, 0)
+                                for cycle in range(1, 1001)])
+
+        self.requests = []
+        request_frame = self.plotter.preparer.request_frame
+
+        def counting_request_frame(request):
+            self.requests.append(request)
+            request_frame(request)
+
+        self.plotter.preparer.request_frame = counting_request_frame
+
+    def tearDown(self):
+        self.plotter.shutdown()
+        self.widget.close()
+
+    def test_burst_of_range_changes_redraws_once(self):
+        """Test that a pan longer than the delay is re-decimated once, for the final range"""
+        view_box = self.plotter.plots['forces'].getViewBox()
+        for start in range(0, 500, 50):
+            view_box.setXRange(start, start + 100, padding=0)
+            QTest.qWait(20)
+        self.assertEqual(self.requests, [])
+
+        QTest.qWait(400)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0].visible_ranges['forces'], (450, 550))
+
+
+if __name__ == '__main__':
+    unittest.main()
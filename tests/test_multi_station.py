@@ -0,0 +1,181 @@
+# tests/test_multi_station.py
+"""
+Unit tests for multi_station module
+Tests one acquisition loop serving 16 simulated testers on pseudo terminals
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from binary_log import read_binary_log
+from config import LogConfig, SerialConfig, StationConfig
+from multi_station import MultiStationAcquisition, SimulatedTester, parse_station, station_directory
+
+
+def wait_for(condition, timeout: float = 10.0):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not reached in time")
+        time.sleep(0.01)
+
+
+class TestStationOptions(unittest.TestCase):
+    """Test cases for station names and command line values"""
+
+    def test_station_directory(self):
+        """Test that station names become safe directory names"""
+        self.assertEqual(station_directory("Tester 3"), "Tester_3")
+        self.assertEqual(station_directory("../A/B"), "A_B")
+        self.assertEqual(station_directory("///"), "station")
+
+    def test_parse_station(self):
+        """Test NAME=PORT and bare PORT values"""
+        self.assertEqual(parse_station("A=COM3", 9600),
+                         StationConfig(name="A", serial=SerialConfig(port="COM3", baudrate=9600)))
+        self.assertEqual(parse_station("/dev/ttyUSB1", 115200).name, "ttyUSB1")
+
+    def test_duplicate_names_rejected(self):
+        """Test that two stations may not share a name (and log directory)"""
+        with self.assertRaises(ValueError):
+            MultiStationAcquisition([StationConfig(name="A"), StationConfig(name="A")], LogConfig())
+
+
+@unittest.skipIf(sys.platform.startswith("win"), "Pseudo terminals are not available on Windows")
+class TestMultiStationAcquisition(unittest.TestCase):
+    """Test cases for MultiStationAcquisition class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.out = io.StringIO()
+        self.testers = []
+
+    def tearDown(self):
+        for tester in self.testers:
+            tester.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_acquisition(self, stations) -> MultiStationAcquisition:
+        return MultiStationAcquisition(stations, LogConfig(log_format="binary", event_capture=False),
+                                       output_dir=self.temp_dir, stats_interval=0, out=self.out)
+
+    def simulated_station(self, name: str, **kwargs) -> StationConfig:
+        tester = SimulatedTester(error_rate=0.0, **kwargs)
+        self.testers.append(tester)
+        return StationConfig(name=name, serial=SerialConfig(port=tester.port))
+
+    def test_sixteen_simulated_testers(self):
+        """Test that 16 testers are logged completely, each to its own file, from shared wakeups"""
+        stations = [self.simulated_station(f"Sim {index:02d}", cycle_interval=0.005, max_cycles=200)
+                    for index in range(16)]
+        acquisition = self.make_acquisition(stations)
+        thread = threading.Thread(target=acquisition.run)
+        thread.start()
+        time.sleep(0.2)  # Ports open before the testers start writing
+        for tester in self.testers:
+            tester.start()
+
+        wait_for(lambda: acquisition.records_received == 16 * 200)
+        acquisition.stop()
+        thread.join()
+
+        for station in stations:
+            log_files = list((Path(self.temp_dir) / station_directory(station.name)).glob("*.ftb"))
+            self.assertEqual(len(log_files), 1)
+            self.assertEqual(read_binary_log(log_files[0])['Cycles'].tolist(), list(range(1, 201)))
+        for stats in acquisition.get_statistics():
+            self.assertEqual((stats['records_received'], stats['parse_errors'], stats['cycles']), (200, 0, 200))
+
+        # One wakeup serves many stations: far fewer wakeups than records
+        self.assertLess(acquisition.wakeups, acquisition.records_received / 4)
+
+    def test_station_state_is_separate(self):
+        """Test that garbage, errors and END on one station leave the others untouched"""
+        quiet = self.simulated_station("Quiet", cycle_interval=0.01, max_cycles=20)
+        noisy = self.simulated_station("Noisy")
+        acquisition = self.make_acquisition([quiet, noisy])
+        thread = threading.Thread(target=acquisition.run)
+        thread.start()
+        time.sleep(0.2)
+        self.testers[0].start()
+        os.write(self.testers[1].master_fd, b"DTA;1;18\xff;garbage!\r\nDTA;2;182;263;0;793;2238;0;611;11;!\r\n"
+                                            b"END;3;182;263;0;793;2238;0;611;0;!\r\n")
+
+        wait_for(lambda: acquisition.records_received == 22)
+        acquisition.stop()
+        thread.join()
+
+        quiet_stats, noisy_stats = acquisition.get_statistics()
+        self.assertEqual((quiet_stats['parse_errors'], quiet_stats['test_errors'], quiet_stats['test_ended']),
+                         (0, 0, False))
+        self.assertEqual((noisy_stats['parse_errors'], noisy_stats['test_errors'], noisy_stats['test_ended']),
+                         (1, 1, True))
+        self.assertIn("[Noisy] Test ended", self.out.getvalue())
+
+    def test_bad_frames_stay_on_their_station(self):
+        """Test that out-of-range frames and processing failures on one station do not stop the loop"""
+        good = self.simulated_station("Good", cycle_interval=0.01, max_cycles=20)
+        bad = self.simulated_station("Bad")
+        acquisition = self.make_acquisition([good, bad])
+
+        # A frame that makes processing fail on the bad station
+        parser = acquisition.stations[1].parser
+        parse_frame = parser.parse_frame
+
+        def failing_parse_frame(frame):
+            if frame.startswith(b"DTA;3;"):
+                raise RuntimeError("parser failure")
+            return parse_frame(frame)
+
+        parser.parse_frame = failing_parse_frame
+        thread = threading.Thread(target=acquisition.run)
+        thread.start()
+        time.sleep(0.2)
+        self.testers[0].start()
+        os.write(self.testers[1].master_fd, b"DTA;1;182;263;0;793;2238;0;611;99999;!\r\n"
+                                            b"DTA;2;182;263;0;793;2238;0;611;0;!\r\n"
+                                            b"DTA;3;182;263;0;793;2238;0;611;0;!\r\n"
+                                            b"DTA;4;182;263;0;793;2238;0;611;0;!\r\n")
+
+        wait_for(lambda: acquisition.records_received == 22)
+        self.assertTrue(thread.is_alive())
+        acquisition.stop()
+        thread.join()
+
+        good_stats, bad_stats = acquisition.get_statistics()
+        self.assertEqual((good_stats['records_received'], good_stats['processing_errors']), (20, 0))
+        self.assertEqual((bad_stats['records_received'], bad_stats['validation_errors'],
+                          bad_stats['processing_errors'], bad_stats['cycles']), (2, 1, 1, 4))
+        self.assertIn("[Bad] Processing error: parser failure", self.out.getvalue())
+
+    def test_missing_port_does_not_stop_others(self):
+        """Test that a station that cannot be opened is reported while the rest run"""
+        good = self.simulated_station("Good", cycle_interval=0.01, max_cycles=10)
+        missing = StationConfig(name="Missing", serial=SerialConfig(port="/nonexistent/tty"))
+        acquisition = self.make_acquisition([good, missing])
+        # Opening the port discards input, so the tester starts once it is open
+        starter = threading.Timer(0.2, self.testers[0].start)
+        starter.start()
+
+        self.assertEqual(acquisition.run(duration=0.8), 0)
+        starter.join()
+        good_stats, missing_stats = acquisition.get_statistics()
+        self.assertEqual(good_stats['records_received'], 10)
+        self.assertFalse(missing_stats['is_connected'])
+        self.assertIn("[Missing] Failed to connect", self.out.getvalue())
+
+        # Nothing to acquire at all
+        acquisition = self.make_acquisition([missing])
+        self.assertEqual(acquisition.run(duration=0.1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
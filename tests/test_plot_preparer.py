@@ -0,0 +1,226 @@
+# tests/test_plot_preparer.py
+"""
+Unit tests for plot_preparer module
+Tests background conversion, decimation and double-buffered frames
+"""
+
+import queue
+import unittest
+import numpy as np
+
+from data_parser import FatigueTestData, RECORD_DTYPE
+from prediction import FailurePredictor
+from plot_preparer import CURVE_SOURCES, FrameRequest, PlotFramePreparer, trend_key, visible_slice
+
+
+def make_batch(first_cycle: int, count: int):
+    """Records with increasing cycles and varying values"""
+    return [FatigueTestData.from_scaled(0, "DTA", cycle, cycle % 7, cycle % 500, cycle % 300,
+                                        cycle % 11, cycle % 400, cycle % 200, 100 + cycle % 50, 0)
+            for cycle in range(first_cycle, first_cycle + count)]
+
+
+class TestPlotFramePreparer(unittest.TestCase):
+    """Test cases for PlotFramePreparer class"""
+
+    def setUp(self):
+        self.preparer = PlotFramePreparer(on_frame=lambda frame: None)
+        self.batch = make_batch(1, 5000)
+        self.preparer.add_batch(self.batch[:1234])
+        self.preparer.add_batch(self.batch[1234:])
+
+    def test_columns_converted(self):
+        """Test that fixed-point fields are scaled like FatigueTestData"""
+        data = self.batch[321]
+        self.assertEqual(len(self.preparer), 5000)
+        self.assertEqual(self.preparer.cycles.view()[321], data.cycles)
+        self.assertAlmostEqual(self.preparer.force_upper.view()[321], data.force_upper_n)
+        self.assertAlmostEqual(self.preparer.travel_2.view()[321], data.travel_2_mm)
+        self.assertAlmostEqual(self.preparer.loss_of_stiffness.view()[321],
+                               data.calculate_loss_of_stiffness())
+
+    def test_fixed_point_records(self):
+        """Test that RECORD_DTYPE arrays fill the same columns as record objects"""
+        preparer = PlotFramePreparer(on_frame=lambda frame: None)
+        records = np.array([data.to_record() for data in self.batch], dtype=RECORD_DTYPE)
+        preparer.add_records(records[:1000])
+        preparer.add_records(records[1000:])
+
+        for name in ('cycles', 'force_lower', 'force_upper', 'travel_1', 'travel_2',
+                     'travel_at_upper', 'loss_of_stiffness'):
+            np.testing.assert_array_equal(getattr(preparer, name).view(),
+                                          getattr(self.preparer, name).view())
+
+    def test_decimated_frame(self):
+        """Test that a frame holds the pyramid's points for every curve"""
+        frame = self.preparer.prepare_frame(FrameRequest(generation=3, point_budgets={
+            'forces': 200, 'travel': 200, 'stiffness': 200}))
+
+        self.assertEqual(frame.generation, 3)
+        self.assertEqual(frame.length, 5000)
+        self.assertEqual(set(frame.curves), set(CURVE_SOURCES))
+
+        indices = self.preparer.pyramids['force_upper'].indices(200)
+        x, y = frame.curves['force_upper']
+        np.testing.assert_array_equal(x, self.preparer.cycles.view()[indices])
+        np.testing.assert_array_equal(y, self.preparer.force_upper.view()[indices])
+        self.assertEqual(frame.points_plotted, len(indices))
+
+    def test_full_resolution_frame(self):
+        """Test that frames without decimation hold every point"""
+        frame = self.preparer.prepare_frame(FrameRequest(generation=0, decimation=False))
+
+        x, y = frame.curves['travel_1']
+        self.assertEqual(len(x), 5000)
+        self.assertEqual(frame.points_plotted, 5000)
+
+    def test_visible_range(self):
+        """Test that a zoomed plot only gets points of its range"""
+        frame = self.preparer.prepare_frame(FrameRequest(
+            generation=0, point_budgets={'forces': 100},
+            visible_ranges={'forces': (1000.0, 2000.0)}))
+
+        x, _ = frame.curves['force_lower']
+        self.assertGreaterEqual(x[0], 999)
+        self.assertLessEqual(x[-1], 2001)
+        self.assertEqual(frame.curves['travel_1'][0][0], 1)
+
+    def test_double_buffering(self):
+        """Test that consecutive frames never share arrays"""
+        request = FrameRequest(generation=0, point_budgets={'forces': 200})
+        first = self.preparer.prepare_frame(request)
+        first_x = first.curves['force_lower'][0].copy()
+        second = self.preparer.prepare_frame(request)
+        third = self.preparer.prepare_frame(request)
+
+        self.assertFalse(np.shares_memory(first.curves['force_lower'][0],
+                                          second.curves['force_lower'][0]))
+        self.assertTrue(np.shares_memory(first.curves['force_lower'][0],
+                                         third.curves['force_lower'][0]))
+        np.testing.assert_array_equal(first_x, second.curves['force_lower'][0])
+
+    def test_trend_overlays(self):
+        """Test that overlays are rebuilt on enable and extended with new batches"""
+        self.preparer.set_trend(window_cycles=100, sigma=2.0)
+        self.preparer.add_batch(make_batch(5001, 500))
+
+        mean = self.preparer.trend_columns[trend_key('force_upper', 'mean')].view()
+        high = self.preparer.trend_columns[trend_key('force_upper', 'band_high')].view()
+        low = self.preparer.trend_columns[trend_key('force_upper', 'band_low')].view()
+        self.assertEqual(len(mean), 5500)
+
+        window = self.preparer.force_upper.view()[5400:5500]
+        self.assertAlmostEqual(mean[-1], window.mean())
+        self.assertAlmostEqual(high[-1] - mean[-1], 2.0 * window.std())
+        self.assertAlmostEqual(mean[-1] - low[-1], 2.0 * window.std())
+
+        frame = self.preparer.prepare_frame(FrameRequest(generation=0, point_budgets={'stiffness': 100}))
+        self.assertIn(trend_key('loss_stiffness', 'band_low'), frame.curves)
+
+    def test_trend_disabled(self):
+        """Test that turning overlays off removes their data"""
+        self.preparer.set_trend(window_cycles=100, sigma=2.0)
+        self.preparer.set_trend(window_cycles=0, sigma=2.0)
+
+        frame = self.preparer.prepare_frame(FrameRequest(generation=0))
+        self.assertEqual(set(frame.curves), set(CURVE_SOURCES))
+        self.assertEqual(set(self.preparer.pyramids), set(CURVE_SOURCES))
+
+    def test_prediction_projection(self):
+        """Test that frames carry the prediction and its projected curves"""
+        preparer = PlotFramePreparer(on_frame=lambda frame: None,
+                                     predictor=FailurePredictor(limit=50.0), projection_horizon=1.0)
+        # Loss of stiffness rises from 10 % by 0.01 % per cycle: 50 % at cycle 4000
+        preparer.add_batch([FatigueTestData.from_scaled(0, "DTA", cycle, 0, 100, 200, 0, 100,
+                                                        1000 + cycle, 10000, 0)
+                            for cycle in range(1, 3001)])
+
+        frame = preparer.prepare_frame(FrameRequest(generation=0))
+        self.assertAlmostEqual(frame.prediction.cycles_to_limit, 4000.0, places=3)
+        x, y = frame.curves['stiffness_projection']
+        self.assertEqual(x[0], 3000)
+        self.assertAlmostEqual(x[-1], 4000.0, places=6)
+        self.assertAlmostEqual(y[-1], 50.0)
+
+    def test_clear(self):
+        """Test that clear removes data and pyramids"""
+        self.preparer.clear()
+        self.assertEqual(len(self.preparer), 0)
+        self.assertEqual(len(self.preparer.pyramids['force_lower']), 0)
+
+
+class TestPreparerThread(unittest.TestCase):
+    """Test cases for the preparer worker loop"""
+
+    def test_commands_handled_in_order(self):
+        """Test that frames see every batch queued before the request"""
+        frames = queue.Queue()
+        preparer = PlotFramePreparer(on_frame=frames.put)
+        preparer.start()
+        try:
+            preparer.submit(make_batch(1, 300))
+            preparer.request_frame(FrameRequest(generation=0))
+            first = frames.get(timeout=5)
+
+            preparer.request_clear()
+            preparer.submit(make_batch(1, 40))
+            preparer.request_frame(FrameRequest(generation=1))
+            second = frames.get(timeout=5)
+        finally:
+            preparer.stop()
+            preparer.join(timeout=5)
+
+        self.assertEqual(first.length, 300)
+        self.assertEqual((second.generation, second.length), (1, 40))
+        self.assertFalse(preparer.is_alive())
+
+    def test_error_yields_empty_frame(self):
+        """Test that a failing frame is still delivered"""
+        preparer = PlotFramePreparer(on_frame=lambda frame: None)
+        preparer.add_batch(make_batch(1, 10))
+        frame = preparer.prepare_frame(FrameRequest(generation=0, point_budgets={'forces': 'many'}))
+        self.assertEqual(frame.curves, {})
+
+    def test_failing_commands_do_not_stop_worker(self):
+        """Test that errors in data commands and on_frame leave the worker answering requests"""
+        frames = queue.Queue()
+
+        def on_frame(frame):
+            frames.put(frame)
+            if frames.qsize() == 1:
+                raise RuntimeError("receiver gone")
+
+        preparer = PlotFramePreparer(on_frame=on_frame)
+        preparer.start()
+        try:
+            preparer.submit([None])
+            preparer.submit_records(np.zeros(3, dtype=[('Cycles', np.int64)]))
+            preparer.request_trend("long", 2.0)
+            preparer.request_frame(FrameRequest(generation=0))
+            first = frames.get(timeout=5)
+
+            preparer.submit(make_batch(1, 25))
+            preparer.request_frame(FrameRequest(generation=0))
+            second = frames.get(timeout=5)
+        finally:
+            preparer.stop()
+            preparer.join(timeout=5)
+
+        self.assertEqual((first.length, second.length), (0, 25))
+        self.assertEqual(preparer.frames_prepared, 2)
+        self.assertFalse(preparer.is_alive())
+
+
+class TestVisibleSlice(unittest.TestCase):
+    """Test cases for visible_slice function"""
+
+    def test_range_with_edge_samples(self):
+        """Test that one sample beyond each edge is included"""
+        cycles = np.arange(0, 1000, 10, dtype=np.int64)
+        self.assertEqual(visible_slice(cycles, None), (0, 100))
+        self.assertEqual(visible_slice(cycles, (105.5, 200.0)), (10, 22))
+        self.assertEqual(visible_slice(cycles, (-1e300, 1e300)), (0, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
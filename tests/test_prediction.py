@@ -0,0 +1,104 @@
+# tests/test_prediction.py
+"""
+Unit tests for prediction module
+Tests the incremental cycles-to-failure fit of loss of stiffness
+"""
+
+import unittest
+import numpy as np
+
+from prediction import FailurePredictor
+
+
+class TestFailurePredictor(unittest.TestCase):
+    """Test cases for FailurePredictor class"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.cycles = np.arange(1, 20001)
+        # Reaches 50 % at cycle 20000
+        self.loss = 10.0 + 0.002 * self.cycles + rng.normal(0.0, 1.0, size=len(self.cycles))
+
+    def feed(self, predictor, stop, batch_size=250):
+        """Feed records [0, stop) in batches"""
+        for start in range(0, stop, batch_size):
+            end = min(start + batch_size, stop)
+            predictor.update(self.cycles[start:end], self.loss[start:end])
+
+    def test_matches_batch_least_squares(self):
+        """Test that the incremental fit equals a full least-squares fit"""
+        predictor = FailurePredictor(limit=50.0)
+        self.feed(predictor, 12000, batch_size=997)
+
+        slope, intercept = np.polyfit(self.cycles[:12000], self.loss[:12000], 1)
+        prediction = predictor.predict()
+        self.assertAlmostEqual(prediction.slope, slope, places=12)
+        self.assertAlmostEqual(prediction.current_value, intercept + slope * 12000, places=6)
+        self.assertAlmostEqual(prediction.cycles_to_limit, (50.0 - intercept) / slope, places=3)
+
+    def test_prediction_and_band(self):
+        """Test that the band contains the true cycle count and narrows with data"""
+        predictor = FailurePredictor(limit=50.0, confidence=0.95)
+        self.feed(predictor, 5000)
+        early = predictor.predict()
+        self.feed(predictor, 15000)
+        late = predictor.predict()
+
+        for prediction in (early, late):
+            self.assertLess(prediction.lower_cycles, 20000)
+            self.assertGreater(prediction.upper_cycles, 20000)
+        self.assertLess(late.upper_cycles - late.lower_cycles,
+                        early.upper_cycles - early.lower_cycles)
+        self.assertAlmostEqual(late.remaining_cycles, late.cycles_to_limit - 15000)
+
+    def test_not_degrading(self):
+        """Test that a flat or improving trend predicts no failure"""
+        predictor = FailurePredictor(limit=50.0)
+        predictor.update(self.cycles[:1000], 30.0 - 0.001 * self.cycles[:1000])
+
+        prediction = predictor.predict()
+        self.assertIsNone(prediction.cycles_to_limit)
+        self.assertIsNone(prediction.remaining_cycles)
+
+    def test_min_points(self):
+        """Test that nothing is predicted before min_points records"""
+        predictor = FailurePredictor(limit=50.0, min_points=100)
+        self.feed(predictor, 99)
+        self.assertIsNone(predictor.predict())
+        self.feed(predictor, 100)
+        self.assertIsNotNone(predictor.predict())
+
+    def test_exponential_model(self):
+        """Test the fit of ln(loss) against cycles"""
+        predictor = FailurePredictor(limit=40.0, model="exponential")
+        cycles = np.arange(1, 3001)
+        predictor.update(cycles, 5.0 * np.exp(cycles / 1000.0))
+        # Skipped by the logarithmic fit
+        predictor.update([3001], [0.0])
+
+        prediction = predictor.predict()
+        self.assertEqual(prediction.points, 3000)
+        self.assertAlmostEqual(prediction.cycles_to_limit, 1000.0 * np.log(8.0), places=6)
+        self.assertAlmostEqual(predictor.fitted(2000), 5.0 * np.exp(2.0), places=9)
+
+    def test_start_cycles(self):
+        """Test that run-in records are ignored"""
+        predictor = FailurePredictor(limit=50.0, start_cycles=10001)
+        self.feed(predictor, 20000)
+        self.assertEqual(predictor.predict().points, 10000)
+
+    def test_new_test_restarts_fit(self):
+        """Test that a decreasing cycle count clears the fit"""
+        predictor = FailurePredictor(limit=50.0)
+        self.feed(predictor, 20000)
+        predictor.update(self.cycles[:50], self.loss[:50])
+        self.assertEqual(predictor.count, 50)
+
+    def test_unknown_model(self):
+        """Test that an unknown model is rejected"""
+        with self.assertRaises(ValueError):
+            FailurePredictor(limit=50.0, model="weibull")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# tests/test_process_reader.py
+"""
+Unit tests for process_reader module
+Tests the shared-memory frame ring and the reader process over a pseudo terminal
+"""
+
+import os
+import queue
+import sys
+import unittest
+from multiprocessing import shared_memory
+
+from config import SerialConfig
+from process_reader import FrameRing, ProcessSerialReader, create_serial_reader
+from serial_reader import ReadLoopStats, SerialReader
+
+
+def make_ring(capacity: int) -> FrameRing:
+    """Ring on a plain buffer (shared memory is not needed within one process)"""
+    return FrameRing(memoryview(bytearray(FrameRing.size_for(capacity))), capacity)
+
+
+class TestFrameRing(unittest.TestCase):
+    """Test cases for FrameRing class"""
+
+    def test_round_trip(self):
+        """Test that batches come out as frames in write order"""
+        ring = make_ring(1024)
+        self.assertEqual(ring.read(), [])
+        self.assertTrue(ring.write([b"DTA;1;!", b"DTA;2;!"]))
+        self.assertTrue(ring.write([b"END;3;!"]))
+
+        self.assertEqual(ring.fill(), 24)
+        self.assertEqual(ring.read(), [b"DTA;1;!", b"DTA;2;!", b"END;3;!"])
+        self.assertEqual(ring.fill(), 0)
+        self.assertEqual(ring.get_statistics()['frames_written'], 3)
+
+    def test_wraparound(self):
+        """Test that frames split over the end of the data area are reassembled"""
+        ring = make_ring(50)
+        for cycle in range(200):
+            batch = [f"DTA;{cycle};{'9' * (cycle % 7)};!".encode(), f"DTA;{cycle};!".encode()]
+            self.assertTrue(ring.write(batch))
+            self.assertEqual(ring.read(), batch)
+
+    def test_overrun_drops_whole_batch(self):
+        """Test that a batch that does not fit is dropped whole and counted"""
+        ring = make_ring(32)
+        self.assertTrue(ring.write([b"DTA;1;182;!", b"DTA;2;!"]))
+        self.assertFalse(ring.write([b"DTA;3;182;!", b"DTA;4;!"]))
+
+        statistics = ring.get_statistics()
+        self.assertEqual((statistics['frames_overrun'], statistics['bytes_overrun']), (2, 20))
+        self.assertAlmostEqual(statistics['ring_peak_percent'], 20 / 32 * 100)
+
+        self.assertEqual(ring.read(), [b"DTA;1;182;!", b"DTA;2;!"])
+        self.assertTrue(ring.write([b"DTA;5;182;!", b"DTA;6;!"]))
+        self.assertEqual(ring.read(), [b"DTA;5;182;!", b"DTA;6;!"])
+
+    def test_stop_request(self):
+        """Test the stop flag set by the consumer"""
+        ring = make_ring(64)
+        self.assertFalse(ring.stop_requested)
+        ring.request_stop()
+        self.assertTrue(ring.stop_requested)
+
+
+class TestReadLoopStats(unittest.TestCase):
+    """Test cases for ReadLoopStats class"""
+
+    def test_record_and_percentile(self):
+        """Test read count, largest backlog and histogram percentiles"""
+        stats = ReadLoopStats()
+        for _ in range(97):
+            stats.record(0)
+        stats.record(40)
+        stats.record(900)
+        stats.record(5000)
+
+        self.assertEqual(stats.as_dict(), {'reads': 100, 'p99_backlog_bytes': 1024, 'max_backlog_bytes': 5000})
+        self.assertEqual(stats.percentile(0.5), 32)
+        self.assertEqual(stats.percentile(0.98), 64)
+        self.assertEqual(stats.percentile(1.0), 5000)
+
+
+@unittest.skipIf(sys.platform.startswith("win"), "Pseudo terminals are not available on Windows")
+class TestProcessSerialReader(unittest.TestCase):
+    """Test cases for ProcessSerialReader class"""
+
+    def setUp(self):
+        import tty
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.data_queue = queue.Queue()
+
+    def tearDown(self):
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
+
+    def test_frames_reach_queue(self):
+        """Test that frames read by the child process arrive in order, then cleanup"""
+        config = SerialConfig(port=os.ttyname(self.slave_fd), reader_process=True)
+        reader = create_serial_reader(config, self.data_queue)
+        self.assertIsInstance(reader, ProcessSerialReader)
+        self.assertTrue(reader.connect())
+        shm_name = reader._shm.name
+        reader.start()
+
+        payload = ''.join(f"DTA;{cycle};182;263;0;793;2238;0;611;0;!\r\n" for cycle in range(1, 501))
+        os.write(self.master_fd, payload.encode())
+        frames = []
+        while len(frames) < 500:
+            frames.extend(self.data_queue.get(timeout=5))
+
+        self.assertEqual(frames[0], b"DTA;1;182;263;0;793;2238;0;611;0;!")
+        self.assertEqual([int(frame.split(b';')[1]) for frame in frames], list(range(1, 501)))
+
+        reader.disconnect()
+        reader.join(timeout=2)
+        statistics = reader.get_statistics()
+        self.assertEqual(statistics['bytes_received'], len(payload))
+        self.assertEqual((statistics['lines_received'], statistics['frames_overrun']), (500, 0))
+        self.assertFalse(statistics['is_connected'])
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shm_name)
+
+    def test_connect_failure(self):
+        """Test that a port the child cannot open fails connect()"""
+        reader = ProcessSerialReader(SerialConfig(port="/nonexistent/tty"), self.data_queue)
+        self.assertFalse(reader.connect())
+        self.assertIsNone(reader.ring)
+
+    def test_thread_reader_by_default(self):
+        """Test that the thread reader stays the default"""
+        reader = create_serial_reader(SerialConfig(), self.data_queue)
+        self.assertIs(type(reader), SerialReader)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_refresh_policy.py
+"""
+Unit tests for refresh_policy module
+Tests frame-budgeted redraw timing
+"""
+
+import unittest
+
+from refresh_policy import RefreshPolicy
+
+
+class TestRefreshPolicy(unittest.TestCase):
+    """Test cases for RefreshPolicy class"""
+
+    def setUp(self):
+        self.policy = RefreshPolicy(min_interval_ms=16, max_interval_ms=1000,
+                                    max_busy_fraction=0.25, smoothing=1.0)
+
+    def test_first_frame_immediate(self):
+        """Test that the first redraw is not delayed"""
+        self.assertEqual(self.policy.next_delay_ms(now=10.0), 0)
+
+    def test_cheap_frames_use_min_interval(self):
+        """Test low-latency mode when redraws are cheap"""
+        self.policy.record_frame(started=10.0, duration=0.001)
+
+        self.assertEqual(self.policy.interval_ms(), 16)
+        self.assertEqual(self.policy.next_delay_ms(now=10.006), 10)
+        self.assertEqual(self.policy.next_delay_ms(now=10.100), 0)
+
+    def test_expensive_frames_back_off(self):
+        """Test that redraws are spaced to stay within the busy fraction"""
+        self.policy.record_frame(started=10.0, duration=0.050)
+
+        # 50 ms of work may use at most 25 % of the thread: one redraw per 200 ms
+        self.assertAlmostEqual(self.policy.interval_ms(), 200.0)
+        self.assertEqual(self.policy.next_delay_ms(now=10.050), 150)
+
+    def test_max_interval_caps_delay(self):
+        """Test that very slow redraws still happen at max_interval_ms"""
+        self.policy.record_frame(started=10.0, duration=2.0)
+        self.assertEqual(self.policy.interval_ms(), 1000)
+
+    def test_frame_time_smoothing(self):
+        """Test the moving average of frame times"""
+        policy = RefreshPolicy(smoothing=0.5)
+        policy.record_frame(started=1.0, duration=0.010)
+        policy.record_frame(started=2.0, duration=0.030)
+        self.assertAlmostEqual(policy.frame_time_s, 0.020)
+
+    def test_refresh_rate(self):
+        """Test the effective refresh rate over the window"""
+        policy = RefreshPolicy(rate_window_s=1.0)
+        for index in range(30):
+            policy.record_frame(started=5.0 + index * 0.05, duration=0.001)
+
+        self.assertAlmostEqual(policy.refresh_rate_hz(now=6.475), 20.0)
+        self.assertEqual(policy.refresh_rate_hz(now=60.0), 0.0)
+
+    def test_reset(self):
+        """Test that reset forgets measured frames"""
+        self.policy.record_frame(started=10.0, duration=0.5)
+        self.policy.reset()
+        self.assertIsNone(self.policy.frame_time_s)
+        self.assertEqual(self.policy.next_delay_ms(now=10.0), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
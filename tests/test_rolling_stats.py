@@ -0,0 +1,83 @@
+# tests/test_rolling_stats.py
+"""
+Unit tests for rolling_stats module
+Tests incremental moving mean and standard deviation over a cycles window
+"""
+
+import unittest
+import numpy as np
+
+from rolling_stats import RollingWindowStats
+
+
+def brute_force(cycles, values, window_cycles):
+    """Mean and std of every window, recomputed from scratch"""
+    means, stds = [], []
+    for index, cycle in enumerate(cycles):
+        window = values[:index + 1][cycles[:index + 1] > cycle - window_cycles]
+        means.append(window.mean(axis=0))
+        stds.append(window.std(axis=0))
+    return np.array(means), np.array(stds)
+
+
+class TestRollingWindowStats(unittest.TestCase):
+    """Test cases for RollingWindowStats class"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        # Irregular cycle steps, including repeated cycle counts
+        self.cycles = np.cumsum(rng.integers(0, 4, size=5000)) + 100
+        self.values = np.column_stack([rng.normal(1500.0, 3.0, size=5000),
+                                       np.linspace(0.0, 40.0, 5000)])
+
+    def test_matches_brute_force(self):
+        """Test incremental statistics against full recomputation"""
+        stats = RollingWindowStats(window_cycles=60, series=2)
+        means, stds = [], []
+        for start in range(0, 5000, 333):
+            mean, std = stats.append(self.cycles[start:start + 333], self.values[start:start + 333])
+            means.append(mean)
+            stds.append(std)
+
+        expected_mean, expected_std = brute_force(self.cycles, self.values, 60)
+        np.testing.assert_allclose(np.concatenate(means), expected_mean, atol=1e-9)
+        np.testing.assert_allclose(np.concatenate(stds), expected_std, atol=1e-7)
+
+    def test_memory_bounded_by_window(self):
+        """Test that points outside the window are discarded"""
+        stats = RollingWindowStats(window_cycles=60)
+        for start in range(0, 5000, 100):
+            stats.append(self.cycles[start:start + 100], self.values[start:start + 100, 0])
+
+        self.assertLess(len(stats), 200)
+
+    def test_single_series(self):
+        """Test one-dimensional values"""
+        stats = RollingWindowStats(window_cycles=3)
+        mean, std = stats.append([1, 2, 3, 4], [2.0, 4.0, 6.0, 8.0])
+
+        np.testing.assert_allclose(mean[:, 0], [2.0, 3.0, 4.0, 6.0])
+        self.assertAlmostEqual(std[3, 0], np.std([4.0, 6.0, 8.0]))
+
+    def test_cycles_restart(self):
+        """Test that a decreasing cycle count starts a new window"""
+        stats = RollingWindowStats(window_cycles=100)
+        stats.append([10, 20, 30], [5.0, 5.0, 5.0])
+        mean, std = stats.append([1, 2], [1.0, 3.0])
+
+        np.testing.assert_allclose(mean[:, 0], [1.0, 2.0])
+        self.assertAlmostEqual(std[1, 0], 1.0)
+
+    def test_clear(self):
+        """Test that clear forgets earlier points"""
+        stats = RollingWindowStats(window_cycles=100)
+        stats.append([1, 2], [100.0, 200.0])
+        stats.clear()
+        mean, _ = stats.append([3], [7.0])
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(mean[0, 0], 7.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
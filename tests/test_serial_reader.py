@@ -0,0 +1,151 @@
+# tests/test_serial_reader.py
+"""
+Unit tests for serial_reader module
+Tests stream framing and the block-read loop without hardware
+"""
+
+import unittest
+import queue
+
+from serial_reader import FrameBuffer, SerialReader, MockSerialReader, drain_batches
+from config import SerialConfig, BatchConfig
+
+
+class FakeSerialPort:
+    """Minimal stand-in for serial.Serial that replays fixed chunks"""
+
+    def __init__(self, chunks, reader=None):
+        self.chunks = list(chunks)
+        self.reader = reader
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size=1):
+        if not self.chunks:
+            # Nothing left - stop the reader like a port timeout would
+            self.reader.stop()
+            return b''
+        chunk = self.chunks.pop(0)
+        if len(chunk) > size:
+            self.chunks.insert(0, chunk[size:])
+            chunk = chunk[:size]
+        return chunk
+
+
+class TestFrameBuffer(unittest.TestCase):
+    """Test cases for FrameBuffer class"""
+
+    def setUp(self):
+        self.buffer = FrameBuffer()
+
+    def test_single_frame(self):
+        """Test that one complete frame is returned"""
+        frames = self.buffer.feed(b"DTA;1;182;263;0;793;2238;0;611;0;!\r\n")
+        self.assertEqual(frames, [b"DTA;1;182;263;0;793;2238;0;611;0;!"])
+        self.assertEqual(self.buffer.pending(), 0)
+
+    def test_multiple_frames_in_one_chunk(self):
+        """Test splitting of several frames received together"""
+        frames = self.buffer.feed(b"DTA;1;!\r\nDTA;2;!\r\nEND;3;!\r\n")
+        self.assertEqual(frames, [b"DTA;1;!", b"DTA;2;!", b"END;3;!"])
+
+    def test_partial_frame_kept_across_reads(self):
+        """Test that a frame split over two reads is reassembled"""
+        self.assertEqual(self.buffer.feed(b"DTA;1;18"), [])
+        self.assertEqual(self.buffer.pending(), 8)
+
+        frames = self.buffer.feed(b"2;!\r\nDTA;2")
+        self.assertEqual(frames, [b"DTA;1;182;!"])
+        self.assertEqual(self.buffer.pending(), 5)
+
+    def test_newline_terminated_frame(self):
+        """Test that frames without '!' are split on newline"""
+        frames = self.buffer.feed(b"DTA;1;182;263;0;793;2238;0;611;0;\n")
+        self.assertEqual(frames, [b"DTA;1;182;263;0;793;2238;0;611;0;"])
+
+    def test_runaway_garbage_discarded(self):
+        """Test that unterminated data beyond max_frame_size is dropped"""
+        buffer = FrameBuffer(max_frame_size=16)
+        self.assertEqual(buffer.feed(b"x" * 20), [])
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(buffer.bytes_discarded, 20)
+
+
+class TestSerialReaderBlockMode(unittest.TestCase):
+    """Test the block-read loop against a fake port"""
+
+    def test_frames_reach_queue(self):
+        """Test that frames split across reads are queued as raw frames"""
+        data_queue = queue.Queue()
+        reader = SerialReader(SerialConfig(read_block_size=7), data_queue)
+        reader.serial_port = FakeSerialPort(
+            [b"DTA;1;182;263;0;793;2238;0;611;0;!\r\nDTA;2;", b"182;263;0;793;2238;0;611;0;!\r\n"],
+            reader)
+
+        reader.run()
+
+        lines = drain_batches(data_queue, max_items=100, timeout=0)
+        self.assertEqual(lines, [b"DTA;1;182;263;0;793;2238;0;611;0;!",
+                                 b"DTA;2;182;263;0;793;2238;0;611;0;!"])
+        self.assertEqual(reader.lines_received, 2)
+
+    def test_batch_size_limit(self):
+        """Test that no queued batch exceeds max_batch_size"""
+        data_queue = queue.Queue()
+        reader = SerialReader(SerialConfig(), data_queue,
+                              batch_config=BatchConfig(max_batch_size=2))
+        reader.serial_port = FakeSerialPort([b"DTA;1;!\nDTA;2;!\nDTA;3;!\n", b"DTA;4;!\n"], reader)
+
+        reader.run()
+
+        batches = []
+        while not data_queue.empty():
+            batches.append(data_queue.get_nowait())
+        self.assertEqual(batches, [[b"DTA;1;!", b"DTA;2;!"], [b"DTA;3;!"], [b"DTA;4;!"]])
+
+
+class TestDrainBatches(unittest.TestCase):
+    """Test batched queue handoff"""
+
+    def test_drains_all_waiting_batches(self):
+        """Test that several queued batches are returned as one list"""
+        data_queue = queue.Queue()
+        data_queue.put(["a", "b"])
+        data_queue.put(["c"])
+        data_queue.put("d")
+
+        self.assertEqual(drain_batches(data_queue, max_items=100, timeout=0.1), ["a", "b", "c", "d"])
+        self.assertTrue(data_queue.empty())
+
+    def test_stops_at_max_items(self):
+        """Test that draining stops once max_items lines are collected"""
+        data_queue = queue.Queue()
+        data_queue.put(["a", "b"])
+        data_queue.put(["c"])
+
+        self.assertEqual(drain_batches(data_queue, max_items=2, timeout=0.1), ["a", "b"])
+        self.assertEqual(data_queue.qsize(), 1)
+
+    def test_empty_queue_raises(self):
+        """Test that an empty queue raises queue.Empty after the timeout"""
+        with self.assertRaises(queue.Empty):
+            drain_batches(queue.Queue(), max_items=10, timeout=0.01)
+
+    def test_mock_reader_puts_lists(self):
+        """Test that the mock reader uses the batched transport"""
+        data_queue = queue.Queue()
+        reader = MockSerialReader(data_queue, interval=0.01)
+        reader.start()
+        item = data_queue.get(timeout=2)
+        reader.stop()
+        reader.join(timeout=2)
+
+        self.assertIsInstance(item, list)
+        self.assertTrue(item[0].startswith(b"DTA;1;"))
+
+
+if __name__ == '__main__':
+    unittest.main()